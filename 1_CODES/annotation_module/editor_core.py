@@ -0,0 +1,719 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+✏️ ORTAK ETİKET EDİTÖRÜ MOTORU
+=============================
+advanced_editor, hybrid_editor, color_editor, simple_editor, edit_annotations,
+view_annotations ve color_viewer betiklerinin ortak motoru. Betikler artık
+sadece bir mod seçer (EDITOR_MODES).
+
+- AnnotationStore: oturum boyunca bellekte tutulan etiket modeli. Her kare
+  ilk ziyaret edildiğinde bir kez okunur; sonraki ziyaretler dosyaya gitmez
+- Kaydetme "write-behind": düzenlemeler kirli olarak işaretlenir, arka plan
+  thread'i kısa bir bekleme sonrası biriken kareleri tek seferde atomik yazar
+- Geri al / yinele (Z / Y) kareler arası çalışır
+- Kareler annotation_module.image_cache.ImageCache'ten gelir; gezinme süresi
+  veri seti boyutundan bağımsızdır (dict erişimi + önceden hazırlanmış kare)
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import deque
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from annotation_module.image_cache import ImageCache
+from dataset_module.label_io import atomic_write_text, format_yolo_line, read_yolo_labels
+
+# Sınıf renkleri (BGR)
+CLASS_COLORS = {
+    0: (0, 255, 0),     # person_swimming -> YEŞİL
+    1: (0, 0, 255),     # person_drowning -> KIRMIZI
+    2: (255, 0, 0),     # person_poolside -> MAVİ
+    3: (0, 255, 255)    # pool_equipment -> SARI
+}
+DROWNING_CLASS = 1
+HEADER_HEIGHT = 100
+
+# Mod ayarları:
+#   max_width: ekran genişliği, header: üst bilgi paneli (False: resim üstüne yazı)
+#   box_labels: kutuların üstünde "#: sınıf" etiketi, mouse: kutu çizme/seçme
+#   ask_class: yeni kutudan sonra sınıf sor, autosave: write-behind kaydet
+#   (False: sadece S ile), wrap: son kareden ilk kareye dön, min_box: piksel
+#   readonly: sadece görüntüleme
+EDITOR_MODES = {
+    'advanced': {
+        'title': '🚀 Gelişmiş Editör', 'max_width': 1200, 'header': True,
+        'box_labels': False, 'mouse': True, 'ask_class': False, 'autosave': True,
+        'wrap': False, 'min_box': 15, 'readonly': False,
+    },
+    'hybrid': {
+        'title': 'Hybrid Editor', 'max_width': 1000, 'header': True,
+        'box_labels': True, 'mouse': True, 'ask_class': True, 'autosave': False,
+        'wrap': True, 'min_box': 20, 'readonly': False,
+    },
+    'color': {
+        'title': '🎨 Renkli Editör', 'max_width': 1000, 'header': False,
+        'box_labels': False, 'mouse': True, 'ask_class': False, 'autosave': True,
+        'wrap': False, 'min_box': 10, 'readonly': False,
+    },
+    'manual': {
+        'title': 'Manual Annotation Editor', 'max_width': 1200, 'header': True,
+        'box_labels': True, 'mouse': True, 'ask_class': False, 'autosave': False,
+        'wrap': True, 'min_box': 20, 'readonly': False,
+    },
+    'simple': {
+        'title': 'Simple Keyboard Editor', 'max_width': 1000, 'header': True,
+        'box_labels': True, 'mouse': False, 'ask_class': False, 'autosave': False,
+        'wrap': True, 'min_box': 20, 'readonly': False,
+    },
+    'viewer': {
+        'title': 'Annotation Viewer - Press SPACE=next, ESC=quit', 'max_width': 1200,
+        'header': False, 'box_labels': True, 'mouse': False, 'ask_class': False,
+        'autosave': False, 'wrap': False, 'min_box': 0, 'readonly': True,
+    },
+    'color_viewer': {
+        'title': '🎨 Renkli Annotation Viewer', 'max_width': 1200, 'header': False,
+        'box_labels': True, 'mouse': False, 'ask_class': False, 'autosave': False,
+        'wrap': False, 'min_box': 0, 'readonly': True,
+    },
+}
+
+
+class AnnotationStore:
+    """
+    🗃️ Bellek içi etiket modeli (write-behind kayıt + geri al / yinele)
+
+    Etiketler kare indeksine göre dict listesi olarak tutulur:
+    {'class_id', 'x_center', 'y_center', 'width', 'height'} (normalize).
+    Listeler yerinde değiştirilir; editör aynı listeyi referansla kullanır.
+    """
+
+    def __init__(self, frame_files, labels_dir, autosave=True, flush_delay=0.5, undo_limit=200):
+        """
+        Args:
+            frame_files (list): Kare dosyaları (editördeki sırayla)
+            labels_dir (str): Etiket klasörü
+            autosave (bool): Kirli kareleri arka planda kendiliğinden yaz
+            flush_delay (float): Yazmadan önce düzenlemelerin biriktirildiği süre (sn)
+            undo_limit (int): Geri alma geçmişi uzunluğu
+        """
+        self.frame_files = list(frame_files)
+        self.labels_dir = Path(labels_dir)
+        self.autosave = autosave
+        self.flush_delay = flush_delay
+
+        self._frames = {}
+        self._dirty = set()
+        self._undo = deque(maxlen=undo_limit)
+        self._redo = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._closed_event = threading.Event()
+
+        self.writes = 0
+
+        self._writer = None
+        if autosave:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+
+    def label_path(self, index):
+        return self.labels_dir / f"{self.frame_files[index].stem}.txt"
+
+    def get(self, index):
+        """Karenin etiket listesi (ilk erişimde diskten okunur)"""
+        boxes = self._frames.get(index)
+        if boxes is None:
+            class_ids, xywh = read_yolo_labels(self.label_path(index))
+            loaded = [
+                {'class_id': int(class_id), 'x_center': float(box[0]), 'y_center': float(box[1]),
+                 'width': float(box[2]), 'height': float(box[3])}
+                for class_id, box in zip(class_ids, xywh)
+            ]
+            with self._lock:
+                boxes = self._frames.setdefault(index, loaded)
+        return boxes
+
+    def _snapshot(self, index):
+        return [dict(ann) for ann in self.get(index)]
+
+    def record(self, index):
+        """Düzenlemeden ÖNCE çağrılır: mevcut hali geri alma geçmişine ekle"""
+        self._undo.append((index, self._snapshot(index)))
+        self._redo.clear()
+
+    def mark_dirty(self, index):
+        """Düzenlemeden SONRA çağrılır: kareyi yazılacaklar listesine ekle"""
+        with self._lock:
+            self._dirty.add(index)
+        if self.autosave:
+            self._wake.set()
+
+    def _restore(self, source, target):
+        if not source:
+            return None
+        index, snapshot = source.pop()
+        target.append((index, self._snapshot(index)))
+        # Editör listeyi referansla tuttuğu için yerinde değiştir
+        self.get(index)[:] = snapshot
+        self.mark_dirty(index)
+        return index
+
+    def undo(self):
+        """Son düzenlemeyi geri al; etkilenen kare indeksi (yoksa None)"""
+        return self._restore(self._undo, self._redo)
+
+    def redo(self):
+        """Geri alınanı yinele; etkilenen kare indeksi (yoksa None)"""
+        return self._restore(self._redo, self._undo)
+
+    @property
+    def dirty_count(self):
+        with self._lock:
+            return len(self._dirty)
+
+    def flush(self, indices=None):
+        """
+        Kirli kareleri atomik yaz
+
+        Args:
+            indices (iterable): Sadece bu kareler (None: hepsi)
+
+        Returns:
+            int: Yazılan dosya sayısı
+        """
+        # Aynı dosyanın iki yazımı sırasını korusun (S tuşu + arka plan thread'i)
+        with self._flush_lock:
+            with self._lock:
+                selected = set(self._dirty) if indices is None else self._dirty & set(indices)
+                self._dirty -= selected
+                jobs = [(index, [dict(ann) for ann in self._frames[index]]) for index in sorted(selected)]
+
+            written = 0
+            for index, boxes in jobs:
+                text = ''.join(format_yolo_line(ann['class_id'], ann['x_center'], ann['y_center'],
+                                                ann['width'], ann['height']) + '\n' for ann in boxes)
+                try:
+                    self.labels_dir.mkdir(parents=True, exist_ok=True)
+                    atomic_write_text(self.label_path(index), text)
+                    written += 1
+                except OSError as e:
+                    print(f"❌ Etiket yazılamadı: {self.label_path(index).name} ({e})")
+                    with self._lock:
+                        self._dirty.add(index)
+
+            self.writes += written
+            return written
+
+    def _write_loop(self):
+        while not self._closed:
+            self._wake.wait()
+            if self._closed:
+                break
+            # Peş peşe düzenlemeleri tek yazımda topla; beklerken kapatılırsa
+            # close() kalanları kendisi yazar, olay bir daha temizlenmez
+            if self._closed_event.wait(self.flush_delay):
+                break
+            self._wake.clear()
+            self.flush()
+
+    def close(self, save=True):
+        """Arka plan yazıcısını durdur; save=True ise kalanları yaz"""
+        self._closed = True
+        self._closed_event.set()
+        self._wake.set()
+        if self._writer is not None:
+            self._writer.join()
+        if save:
+            self.flush()
+
+
+class AnnotationEditor:
+    """
+    ✏️ Mod tabanlı etiket editörü
+    """
+
+    def __init__(self, frames_dir, labels_dir, classes_file, mode='advanced'):
+        """
+        Args:
+            frames_dir (str): Kare klasörü (*.jpg)
+            labels_dir (str): YOLO etiket klasörü
+            classes_file (str): Sınıf isimleri (satır başına bir)
+            mode (str): EDITOR_MODES anahtarı
+        """
+        if mode not in EDITOR_MODES:
+            raise ValueError(f"Bilinmeyen editör modu: {mode} ({', '.join(EDITOR_MODES)})")
+        self.mode = mode
+        self.settings = EDITOR_MODES[mode]
+        self.title = self.settings['title']
+
+        self.frames_dir = Path(frames_dir)
+        self.labels_dir = Path(labels_dir)
+
+        # Sınıfları yükle
+        with open(classes_file, 'r') as f:
+            self.classes = [line.strip() for line in f.readlines()]
+        print(f"📋 Classes: {self.classes}")
+
+        # Frame dosyalarını al
+        self.frame_files = sorted(self.frames_dir.glob("*.jpg"))
+        print(f"📸 {len(self.frame_files)} frame bulundu")
+
+        self.image_cache = ImageCache(self.frame_files, max_width=self.settings['max_width'])
+        self.store = AnnotationStore(self.frame_files, self.labels_dir,
+                                     autosave=self.settings['autosave'] and not self.settings['readonly'])
+
+        self.current_idx = 0
+        self.current_annotations = []
+        self.selected_annotation = -1
+        self.frame = None
+        self.header_height = HEADER_HEIGHT if self.settings['header'] else 0
+
+        # Mouse drawing (ekran koordinatları, header hariç)
+        self.drawing = False
+        self.start_point = None
+        self.end_point = None
+
+    # ------------------------------------------------------------------
+    # Yardımcılar
+    # ------------------------------------------------------------------
+
+    def class_name(self, class_id, short=False):
+        name = self.classes[class_id] if 0 <= class_id < len(self.classes) else str(class_id)
+        if short and '_' in name:
+            return name.split('_')[1]
+        return name
+
+    def class_counts(self):
+        counts = {}
+        for ann in self.current_annotations:
+            name = self.class_name(ann['class_id'])
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def box_to_display(self, ann):
+        """YOLO kutusu -> ekran piksel köşeleri"""
+        h, w = self.frame.shape[:2]
+        scale = self.frame.scale
+        x_center = ann['x_center'] * w * scale
+        y_center = ann['y_center'] * h * scale
+        box_width = ann['width'] * w * scale
+        box_height = ann['height'] * h * scale
+        return (int(x_center - box_width / 2), int(y_center - box_height / 2),
+                int(x_center + box_width / 2), int(y_center + box_height / 2))
+
+    def annotation_at(self, x, y):
+        """Ekran noktasındaki en küçük kutunun indeksi (yoksa -1)"""
+        best, best_area = -1, None
+        for i, ann in enumerate(self.current_annotations):
+            x1, y1, x2, y2 = self.box_to_display(ann)
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                area = (x2 - x1) * (y2 - y1)
+                if best_area is None or area < best_area:
+                    best, best_area = i, area
+        return best
+
+    # ------------------------------------------------------------------
+    # Gezinme
+    # ------------------------------------------------------------------
+
+    def load_frame(self, index):
+        """Kareyi ve etiketlerini (bellekten) yükle"""
+        self.current_idx = index
+        self.frame = self.image_cache.get(index)
+        self.current_annotations = self.store.get(index)
+        self.selected_annotation = 0 if self.current_annotations else -1
+        if self.frame is None:
+            print(f"❌ Frame yüklenemedi: {self.frame_files[index]}")
+
+    def go_to(self, index):
+        """Kareye git (wrap moduna göre sınırla)"""
+        count = len(self.frame_files)
+        if self.settings['wrap']:
+            index %= count
+        elif index >= count:
+            print("📄 Son frame!")
+            return
+        elif index < 0:
+            print("📄 İlk frame!")
+            return
+
+        self.load_frame(index)
+        print(f"📄 Frame {self.current_idx + 1}/{count}")
+        self.draw_annotations()
+
+    # ------------------------------------------------------------------
+    # Çizim
+    # ------------------------------------------------------------------
+
+    def draw_annotations(self):
+        """Önbellekteki ölçekli kare üzerine kutuları çiz ve göster"""
+        if self.frame is None:
+            return
+
+        image = self.frame.image.copy()
+
+        for i, ann in enumerate(self.current_annotations):
+            color = CLASS_COLORS.get(ann['class_id'], (128, 128, 128))
+            x1, y1, x2, y2 = self.box_to_display(ann)
+
+            if i == self.selected_annotation and not self.settings['readonly']:
+                # Seçili: kalın çerçeve + köşe noktaları
+                cv2.rectangle(image, (x1 - 3, y1 - 3), (x2 + 3, y2 + 3), color, 2)
+                cv2.rectangle(image, (x1, y1), (x2, y2), color, 4)
+                for corner in ((x1, y1), (x2, y2), (x1, y2), (x2, y1)):
+                    cv2.circle(image, corner, 5, color, -1)
+            else:
+                cv2.rectangle(image, (x1, y1), (x2, y2), color, 2)
+
+            if self.settings['box_labels']:
+                label = f"{i + 1}: {self.class_name(ann['class_id'])}"
+                (label_w, label_h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+                cv2.rectangle(image, (x1, y1 - label_h - 10), (x1 + label_w, y1), color, -1)
+                cv2.putText(image, label, (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+
+        # Çizilen kutu
+        if self.drawing and self.start_point and self.end_point:
+            cv2.rectangle(image, self.start_point, self.end_point, (255, 255, 255), 2)
+            cv2.putText(image, "YENI KUTU", (self.start_point[0], self.start_point[1] - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+
+        if self.settings['header']:
+            image = np.vstack([self.draw_header(image.shape[1]), image])
+        else:
+            self.draw_overlay(image)
+
+        cv2.imshow(self.title, image)
+
+    def draw_header(self, width):
+        """İlerleme, renk rehberi, istatistik ve kontrol satırları"""
+        header = np.full((self.header_height, width, 3), 45, dtype=np.uint8)
+
+        # İlerleme çubuğu
+        progress = (self.current_idx + 1) / len(self.frame_files)
+        bar_x, bar_y, bar_width, bar_height = 20, 10, width - 40, 20
+        cv2.rectangle(header, (bar_x, bar_y), (bar_x + bar_width, bar_y + bar_height), (70, 70, 70), -1)
+        cv2.rectangle(header, (bar_x, bar_y), (bar_x + int(bar_width * progress), bar_y + bar_height),
+                      (255, 140, 0), -1)
+        progress_text = f"Frame {self.current_idx + 1}/{len(self.frame_files)} ({progress * 100:.1f}%)"
+        if not self.store.autosave and not self.settings['readonly']:
+            dirty = self.store.dirty_count
+            if dirty:
+                progress_text += f" | Kaydedilmemis: {dirty} (S)"
+        cv2.putText(header, progress_text, (bar_x, bar_y + bar_height + 20),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+
+        # Renk rehberi
+        legend_y = 50
+        cv2.putText(header, "RENKLER:", (20, legend_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        for text, color, x_pos in (("HAVUZDA", CLASS_COLORS[0], 100), ("BOGULAN", CLASS_COLORS[1], 200),
+                                   ("KENAR", CLASS_COLORS[2], 290), ("EKIPMAN", CLASS_COLORS[3], 360)):
+            cv2.rectangle(header, (x_pos, legend_y - 15), (x_pos + 15, legend_y), color, -1)
+            cv2.rectangle(header, (x_pos, legend_y - 15), (x_pos + 15, legend_y), (255, 255, 255), 1)
+            cv2.putText(header, text, (x_pos + 20, legend_y - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+
+        # İstatistikler
+        stats_y = 75
+        counts = self.class_counts()
+        stats_text = f"Bu Frame: {len(self.current_annotations)} etiket"
+        if counts:
+            counts_text = " | ".join(f"{name.split('_')[1] if '_' in name else name}:{count}"
+                                     for name, count in counts.items())
+            stats_text += f" ({counts_text})"
+        cv2.putText(header, stats_text, (20, stats_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+        if 0 <= self.selected_annotation < len(self.current_annotations):
+            selected = self.current_annotations[self.selected_annotation]
+            selected_text = f"Secili: #{self.selected_annotation + 1} ({self.class_name(selected['class_id'], short=True)})"
+            cv2.putText(header, selected_text, (300, stats_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+
+        # Kontroller
+        controls = "1-4: Class | B: Drowning | Q/W: Sec | DEL: Sil | Z/Y: Geri al/Yinele | SPACE/D/A: Frame"
+        if self.settings['mouse']:
+            controls = "DRAG: Yeni | CLICK: Sec | " + controls
+        if not self.store.autosave:
+            controls += " | S: Kaydet"
+        cv2.putText(header, controls, (20, 95), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (180, 180, 180), 1)
+
+        return header
+
+    def draw_overlay(self, image):
+        """Header'sız modlar: bilgi satırı resmin üstüne"""
+        counts = self.class_counts()
+        info_text = f"Frame {self.current_idx + 1}/{len(self.frame_files)}"
+        if counts:
+            info_text += " | " + " | ".join(f"{name}:{count}" for name, count in counts.items())
+        else:
+            info_text += " | Annotation yok"
+        cv2.putText(image, info_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        cv2.putText(image, info_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 1)
+
+    # ------------------------------------------------------------------
+    # Mouse
+    # ------------------------------------------------------------------
+
+    def mouse_callback(self, event, x, y, flags, param):
+        """Sol drag: yeni kutu, sol/sağ click: kutu seç"""
+        if self.frame is None or y < self.header_height:
+            return
+        display_y = y - self.header_height
+
+        if event == cv2.EVENT_LBUTTONDOWN:
+            self.drawing = True
+            self.start_point = (x, display_y)
+            self.end_point = (x, display_y)
+
+        elif event == cv2.EVENT_MOUSEMOVE:
+            if self.drawing:
+                self.end_point = (x, display_y)
+                self.draw_annotations()
+
+        elif event == cv2.EVENT_LBUTTONUP:
+            if self.drawing:
+                self.drawing = False
+                self.end_point = (x, display_y)
+                start, end = self.start_point, self.end_point
+                self.start_point = None
+                self.end_point = None
+                min_box = self.settings['min_box']
+                if abs(end[0] - start[0]) < min_box or abs(end[1] - start[1]) < min_box:
+                    # Sürükleme yok: tıklanan kutuyu seç
+                    self.select_at(x, display_y)
+                else:
+                    self.add_annotation(start, end)
+
+        elif event == cv2.EVENT_RBUTTONDOWN:
+            self.select_at(x, display_y)
+
+    def select_at(self, x, y):
+        clicked = self.annotation_at(x, y)
+        if clicked >= 0:
+            self.selected_annotation = clicked
+            ann = self.current_annotations[clicked]
+            print(f"👆 #{clicked + 1} seçildi: {self.class_name(ann['class_id'])}")
+        else:
+            print("📍 Hiçbir etiket seçilmedi")
+        self.draw_annotations()
+
+    # ------------------------------------------------------------------
+    # Düzenleme
+    # ------------------------------------------------------------------
+
+    def add_annotation(self, start, end):
+        """Ekran koordinatlarındaki kutuyu YOLO etiketi olarak ekle"""
+        x1, x2 = sorted((start[0], end[0]))
+        y1, y2 = sorted((start[1], end[1]))
+        h, w = self.frame.shape[:2]
+        scale = self.frame.scale
+
+        class_id = 0  # Varsayılan person_swimming
+        if self.settings['ask_class']:
+            # Kutu sınıf seçilene kadar geçici olarak gösterilir
+            self.drawing, self.start_point, self.end_point = True, start, end
+            self.draw_annotations()
+            class_id = self.ask_class()
+            self.drawing, self.start_point, self.end_point = False, None, None
+            if class_id is None:
+                print("❌ İptal edildi")
+                self.draw_annotations()
+                return
+
+        new_annotation = {
+            'class_id': class_id,
+            'x_center': (x1 + x2) / 2 / scale / w,
+            'y_center': (y1 + y2) / 2 / scale / h,
+            'width': (x2 - x1) / scale / w,
+            'height': (y2 - y1) / scale / h
+        }
+
+        self.store.record(self.current_idx)
+        self.current_annotations.append(new_annotation)
+        self.selected_annotation = len(self.current_annotations) - 1
+        self.store.mark_dirty(self.current_idx)
+        print(f"✅ #{len(self.current_annotations)}: {self.class_name(new_annotation['class_id'])} eklendi")
+        self.draw_annotations()
+
+    def ask_class(self):
+        """Yeni kutu için sınıf bekle (1-4, ENTER=0, ESC=iptal)"""
+        print(f"\n🎯 Class seç: 1:Swimming 2:DROWNING 3:Poolside 4:Equipment (ENTER=Swimming)")
+        while True:
+            key = cv2.waitKey(0) & 0xFF
+            if ord('1') <= key <= ord('4'):
+                return key - ord('1')
+            if key == 13:  # ENTER
+                return 0
+            if key == 27:  # ESC
+                return None
+
+    def change_class(self, new_class_id):
+        """Seçili annotation'ın class'ını değiştir"""
+        if not 0 <= self.selected_annotation < len(self.current_annotations):
+            print("⚠️  Önce bir etiket seç!")
+            return
+
+        ann = self.current_annotations[self.selected_annotation]
+        if ann['class_id'] == new_class_id:
+            return
+        self.store.record(self.current_idx)
+        old_class = ann['class_id']
+        ann['class_id'] = new_class_id
+        self.store.mark_dirty(self.current_idx)
+        print(f"🔄 #{self.selected_annotation + 1}: {self.class_name(old_class, short=True)} → "
+              f"{self.class_name(new_class_id, short=True)}")
+        self.draw_annotations()
+
+    def delete_selected(self):
+        """Seçili annotation'ı sil"""
+        if not 0 <= self.selected_annotation < len(self.current_annotations):
+            print("⚠️  Silinecek etiket yok!")
+            return
+
+        self.store.record(self.current_idx)
+        deleted = self.current_annotations.pop(self.selected_annotation)
+        self.store.mark_dirty(self.current_idx)
+        print(f"🗑️  {self.class_name(deleted['class_id'])} silindi (Kalan: {len(self.current_annotations)})")
+        self.selected_annotation = min(self.selected_annotation, len(self.current_annotations) - 1)
+        self.draw_annotations()
+
+    def select_annotation(self, step):
+        """Seçimi step kadar kaydır (Q/W)"""
+        if self.current_annotations:
+            self.selected_annotation = (self.selected_annotation + step) % len(self.current_annotations)
+            ann = self.current_annotations[self.selected_annotation]
+            print(f"{'➡️' if step > 0 else '⬅️'}  #{self.selected_annotation + 1}/{len(self.current_annotations)}: "
+                  f"{self.class_name(ann['class_id'])}")
+            self.draw_annotations()
+
+    def select_number(self, number):
+        """Numarayla seç (5-9 tuşları: 5=1. etiket)"""
+        if number < len(self.current_annotations):
+            self.selected_annotation = number
+            self.draw_annotations()
+        else:
+            print(f"⚠️  Annotation #{number + 1} bulunamadı! (Toplam: {len(self.current_annotations)})")
+
+    def undo(self, redo=False):
+        """Geri al / yinele; gerekirse ilgili kareye geç"""
+        index = self.store.redo() if redo else self.store.undo()
+        if index is None:
+            print("⚠️  Yinelenecek işlem yok!" if redo else "⚠️  Geri alınacak işlem yok!")
+            return
+        if index != self.current_idx:
+            self.load_frame(index)
+        self.selected_annotation = min(max(self.selected_annotation, 0), len(self.current_annotations) - 1)
+        print(f"{'↪️  Yinelendi' if redo else '↩️  Geri alındı'}: Frame {index + 1}")
+        self.draw_annotations()
+
+    def save(self):
+        written = self.store.flush()
+        print(f"💾 {written} frame kaydedildi")
+        self.draw_annotations()
+
+    def print_status(self):
+        """Mevcut durumu yazdır"""
+        counts = self.class_counts()
+        summary = " | ".join(f"{name}:{count}" for name, count in counts.items()) or "Annotation yok"
+        print(f"📊 Frame {self.current_idx + 1}/{len(self.frame_files)} | {summary} | "
+              f"Kaydedilmemiş: {self.store.dirty_count}")
+
+    # ------------------------------------------------------------------
+    # Ana döngü
+    # ------------------------------------------------------------------
+
+    def handle_key(self, key):
+        """Klavye olayı; False dönerse editör kapanır"""
+        if key == 27:  # ESC
+            return False
+        if key in (ord(' '), ord('d'), ord('D')):
+            self.go_to(self.current_idx + 1)
+        elif key in (ord('a'), ord('A')):
+            self.go_to(self.current_idx - 1)
+        elif key in (ord('i'), ord('I')):
+            self.print_status()
+        elif self.settings['readonly']:
+            pass
+        elif key in (ord('q'), ord('Q')):
+            self.select_annotation(-1)
+        elif key in (ord('w'), ord('W')):
+            self.select_annotation(1)
+        elif ord('1') <= key <= ord('4'):
+            self.change_class(key - ord('1'))
+        elif key in (ord('b'), ord('B')):
+            self.change_class(DROWNING_CLASS)
+        elif ord('5') <= key <= ord('9'):
+            self.select_number(key - ord('5'))
+        elif key in (8, 9, 127):  # Backspace / TAB / DEL
+            self.delete_selected()
+        elif key in (ord('s'), ord('S')):
+            self.save()
+        elif key in (ord('r'), ord('R')):
+            self.selected_annotation = -1
+            self.draw_annotations()
+        elif key in (ord('z'), ord('Z'), 26):  # Z / Ctrl+Z
+            self.undo()
+        elif key in (ord('y'), ord('Y'), 25):  # Y / Ctrl+Y
+            self.undo(redo=True)
+        return True
+
+    def print_controls(self):
+        print(f"\n{self.title}")
+        print("=" * 60)
+        if self.settings['readonly']:
+            print("⌨️  SPACE/D: Sonraki | A: Önceki | ESC: Çıkış")
+        else:
+            if self.settings['mouse']:
+                print("🖱️  SOL DRAG: Yeni etiket | CLICK: Etiket seç")
+            print("⌨️  1-4: Class | B: Drowning | Q/W veya 5-9: Etiket seç | DEL/TAB: Sil")
+            print("⌨️  Z/Y: Geri al / Yinele | I: Durum | R: Seçimi kaldır")
+            print("⌨️  SPACE/D: Sonraki frame | A: Önceki frame | ESC: Çıkış")
+            if self.store.autosave:
+                print("💾 Değişiklikler otomatik kaydedilir")
+            else:
+                print("💾 S: Kaydet (çıkışta kaydedilmemişler sorulur)")
+        print("=" * 60)
+
+    def run(self):
+        """Ana döngü"""
+        if not self.frame_files:
+            print("❌ Frame bulunamadı!")
+            return
+
+        cv2.namedWindow(self.title, cv2.WINDOW_AUTOSIZE)
+        if self.settings['mouse'] and not self.settings['readonly']:
+            cv2.setMouseCallback(self.title, self.mouse_callback)
+
+        self.print_controls()
+        self.load_frame(self.current_idx)
+        self.draw_annotations()
+
+        try:
+            while True:
+                # Mouse olayları waitKey içinde işlenir
+                key = cv2.waitKey(1 if self.settings['mouse'] else 0) & 0xFF
+                if key != 255 and not self.handle_key(key):
+                    break
+        finally:
+            cv2.destroyAllWindows()
+            self.close()
+        print("👋 Editör kapatıldı!")
+
+    def close(self):
+        """Önbelleği kapat, kaydedilmemiş değişiklikleri yaz / sor"""
+        self.image_cache.close()
+        save = True
+        if not self.store.autosave and self.store.dirty_count:
+            answer = input(f"💾 {self.store.dirty_count} frame kaydedilmedi. Kaydedilsin mi? (E/h): ")
+            save = answer.strip().lower() not in ('h', 'hayir', 'hayır', 'n', 'no')
+        self.store.close(save=save)
+        if self.store.writes:
+            print(f"💾 Oturumda {self.store.writes} etiket dosyası yazıldı")
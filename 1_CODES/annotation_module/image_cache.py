@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🖼️ EDİTÖR GÖRÜNTÜ ÖNBELLEĞİ
+==========================
+Etiket editörleri için ölçeklenmiş kare önbelleği.
+
+- Kareler bir kez decode edilip ekran genişliğine küçültülür; yeniden çizim
+  (ör. kutu sürüklerken her EVENT_MOUSEMOVE) sadece önbellekteki temel
+  görüntünün kopyası üzerine kutuları çizer - imread/resize yok
+- Arka planda mevcut karenin önündeki ve arkasındaki `radius` kare önceden
+  hazırlanır; ileri/geri gezinme bekleme yapmaz
+- LRU: en fazla `capacity` kare bellekte tutulur, pencere dışına çıkan
+  bekleyen ön yüklemeler iptal edilir
+
+Kullanım:
+    cache = ImageCache(frame_files, max_width=1200)
+    frame = cache.get(index)        # ScaledFrame(image, scale, shape)
+    display = frame.image.copy()
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+import cv2
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_module.auto_labeler import read_image
+
+# image: ekran boyutunda BGR, scale: ekran / orijinal, shape: orijinal (h, w, c)
+ScaledFrame = namedtuple('ScaledFrame', ['image', 'scale', 'shape'])
+
+
+def load_scaled(path, max_width=None):
+    """
+    Kareyi oku ve `max_width`'e küçült
+
+    Returns:
+        ScaledFrame veya okunamazsa None
+    """
+    image = read_image(path)
+    if image is None:
+        return None
+
+    height, width = image.shape[:2]
+    if max_width and width > max_width:
+        scale = max_width / width
+        display = cv2.resize(image, (int(width * scale), int(height * scale)),
+                             interpolation=cv2.INTER_AREA)
+    else:
+        scale = 1.0
+        display = image
+    return ScaledFrame(display, scale, image.shape)
+
+
+class ImageCache:
+    """
+    🗂️ Ön yüklemeli LRU kare önbelleği
+    """
+
+    def __init__(self, paths, max_width=1200, radius=3, capacity=None, threads=2):
+        """
+        Args:
+            paths (list): Kare dosyaları (editördeki sırayla)
+            max_width (int): Ekran genişliği (None: küçültme yok)
+            radius (int): Önce/sonra ön yüklenecek kare sayısı
+            capacity (int): Bellekteki maksimum kare (None: 2 * radius + 3)
+            threads (int): Decode thread sayısı
+        """
+        self.paths = list(paths)
+        self.max_width = max_width
+        self.radius = radius
+        self.capacity = capacity or (2 * radius + 3)
+
+        self._frames = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=threads)
+
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, index):
+        frame = load_scaled(self.paths[index], self.max_width)
+        with self._lock:
+            self._pending.pop(index, None)
+            if frame is not None:
+                self._store(index, frame)
+        return frame
+
+    def _store(self, index, frame):
+        self._frames[index] = frame
+        self._frames.move_to_end(index)
+        while len(self._frames) > self.capacity:
+            self._frames.popitem(last=False)
+
+    def get(self, index):
+        """
+        Kareyi döndür (önbellekte yoksa hemen yükle) ve komşuları ön yükle
+
+        Returns:
+            ScaledFrame veya okunamazsa None
+        """
+        if not 0 <= index < len(self.paths):
+            return None
+
+        with self._lock:
+            frame = self._frames.get(index)
+            if frame is not None:
+                self._frames.move_to_end(index)
+                self.hits += 1
+            future = self._pending.get(index) if frame is None else None
+
+        if frame is None:
+            self.misses += 1
+            try:
+                frame = future.result() if future is not None else self._load(index)
+            except CancelledError:
+                frame = self._load(index)
+
+        self.prefetch(index)
+        return frame
+
+    def prefetch(self, index):
+        """`index` çevresindeki kareleri arka planda hazırla"""
+        window = set(range(max(0, index - self.radius), min(len(self.paths), index + self.radius + 1)))
+        # Yakındakiler önce: +1, -1, +2, -2 ...
+        order = sorted(window - {index}, key=lambda i: (abs(i - index), i < index))
+
+        with self._lock:
+            for pending_index, future in list(self._pending.items()):
+                if pending_index not in window and future.cancel():
+                    del self._pending[pending_index]
+            for neighbor in order:
+                if neighbor not in self._frames and neighbor not in self._pending:
+                    self._pending[neighbor] = self._executor.submit(self._load, neighbor)
+
+    def invalidate(self, index=None):
+        """Kare(ler)i önbellekten çıkar (dosya değiştiyse)"""
+        with self._lock:
+            if index is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(index, None)
+
+    def close(self):
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+        self._executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -59,6 +59,7 @@ class Detection:
     
     # Tespit eşikleri
     CONFIDENCE_THRESHOLD = 0.3
+    LOW_CONFIDENCE_THRESHOLD = 0.1  # Arası: sadece mevcut track'leri uzatır (iki aşamalı eşleştirme)
     IOU_THRESHOLD = 0.3
     MIN_AREA = 500
     
@@ -129,3 +130,33 @@ class Pool:
     POLYGON_COLOR = (0, 0, 255)  # Kırmızı
     POINT_COLOR = (0, 255, 0)    # Yeşil
     LINE_THICKNESS = 2
+
+# ⏱️ PROFİL AYARLARI
+class Profiling:
+    """Aşama bazlı zamanlama ayarları"""
+    ENABLED = os.environ.get("POOL_PROFILING", "1") != "0"
+    PROMETHEUS_FILE = os.environ.get("POOL_PROMETHEUS_FILE")  # Örn: /var/lib/node_exporter/pool.prom
+
+# 🎞️ ÇIKTI AYARLARI
+class Output:
+    """Video / analitik çıktı ayarları"""
+    # 0: sadece analitik (çizim + encode yok); video sonradan tespit logundan render edilebilir
+    RENDER_VIDEO = os.environ.get("POOL_RENDER_VIDEO", "1") != "0"
+    DETECTION_LOG_NAME = "detections.jsonl"
+
+# 🔄 ÇALIŞMA ZAMANI AYARLARI
+class Runtime:
+    """Yeniden başlatmadan değiştirilebilen eşik / tracker / havuz ayarları"""
+    CONFIG_FILE = os.environ.get("POOL_RUNTIME_CONFIG")        # İzlenen JSON dosyası (örn: runtime.json)
+    CONTROL_PORT = int(os.environ.get("POOL_CONTROL_PORT", "0"))  # 0: kontrol soketi kapalı (sadece 127.0.0.1)
+    CHECK_INTERVAL = 1.0                                        # Dosya / havuz klasörü kontrol aralığı (sn)
+    CHANGE_LOG_NAME = "runtime_changes.jsonl"
+
+# 🧠 MERKEZİ INFERENCE SUNUCUSU
+class Inference:
+    """Kameralar arası ortak model sunucusu (detection_module.inference_server)"""
+    SERVER = os.environ.get("POOL_INFERENCE_SERVER")           # "127.0.0.1:7700"; boşsa her pipeline kendi modelini yükler
+    PORT = int(os.environ.get("POOL_INFERENCE_PORT", "7700"))  # Sunucu dinleme portu (sadece 127.0.0.1)
+    MAX_BATCH_SIZE = 8                                          # Mikro-batch üst sınırı (kare)
+    MAX_WAIT_MS = 10.0                                          # İlk istekten sonra batch doldurma bekleme süresi
+    TIMEOUT = 30.0                                              # İstemci soket zaman aşımı (sn)
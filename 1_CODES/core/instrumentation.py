@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+⏱️ AŞAMA BAZLI ZAMANLAYICILAR
+============================
+Video pipeline'larının sıcak yolunu (decode, preprocess, inference, NMS,
+zone test, tracking, çizim, encode) aşama aşama ölçer.
+
+- Context manager (`with timers.stage("decode"):`) ve decorator
+  (`@timers.timed("tracking")`) ile kullanılır
+- Her aşama HDR tarzı log-lineer histograma yazılır (sabit bellek,
+  ~%1.5 göreli hata), p50/p95/p99 doğrudan histogramdan okunur
+- Kapalıyken `stage()` paylaşılan boş bir nesne döndürür, ölçüm yapılmaz
+- Aynı kare içinde bir aşama birden fazla kez ölçülürse süreler toplanır;
+  `end_frame()` çağrısı kare başına tek örnek olarak histograma aktarır
+"""
+
+import os
+import json
+import time
+import functools
+
+# Ultralytics Results.speed anahtarları -> aşama isimleri
+YOLO_SPEED_STAGES = {
+    'preprocess': 'preprocess',
+    'inference': 'inference',
+    'postprocess': 'nms',
+}
+
+
+class StageHistogram:
+    """
+    📊 HDR tarzı log-lineer histogram
+
+    Değerler mikrosaniye olarak saklanır. 2^precision altındaki değerler
+    birebir, üstündekiler her ikinin kuvveti aralığında 2^(precision-1)
+    alt kovaya bölünür.
+    """
+
+    __slots__ = ('precision', '_half', '_limit', 'counts', 'count', 'total_us', 'min_us', 'max_us')
+
+    def __init__(self, precision=7):
+        self.precision = precision
+        self._half = 1 << (precision - 1)
+        self._limit = 1 << precision
+        self.counts = []
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _bucket_index(self, value_us):
+        """Değerin kova indeksini hesapla"""
+        if value_us < self._limit:
+            return value_us
+        shift = value_us.bit_length() - self.precision
+        return shift * self._half + (value_us >> shift)
+
+    def _bucket_value(self, index):
+        """Kovanın temsil ettiği değer (aralık ortası)"""
+        if index < self._limit:
+            return index
+        shift = index // self._half - 1
+        mantissa = index - shift * self._half
+        lower = mantissa << shift
+        upper = ((mantissa + 1) << shift) - 1
+        return (lower + upper) // 2
+
+    def record(self, seconds):
+        """Süreyi (saniye) histograma ekle"""
+        value_us = int(seconds * 1e6)
+        if value_us < 0:
+            value_us = 0
+
+        index = self._bucket_index(value_us)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+
+        self.count += 1
+        self.total_us += value_us
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def percentile(self, q):
+        """
+        Yüzdelik değeri (saniye) döndür
+
+        Args:
+            q (float): 0-100 arası yüzdelik
+
+        Returns:
+            float: Süre (saniye)
+        """
+        if self.count == 0:
+            return 0.0
+
+        target = max(1, int(round(q / 100.0 * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            if seen >= target:
+                value_us = min(self._bucket_value(index), self.max_us)
+                return value_us / 1e6
+
+        return self.max_us / 1e6
+
+    def mean(self):
+        """Ortalama süre (saniye)"""
+        return (self.total_us / self.count) / 1e6 if self.count else 0.0
+
+
+class _NullStage:
+    """Profil kapalıyken kullanılan boş context manager"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Tek aşama ölçümü yapan context manager"""
+
+    __slots__ = ('_pending', '_name', '_start')
+
+    def __init__(self, pending, name):
+        self._pending = pending
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._start
+        pending = self._pending
+        pending[self._name] = pending.get(self._name, 0.0) + elapsed
+        return False
+
+
+class StageTimers:
+    """
+    ⏱️ Pipeline aşama zamanlayıcıları
+
+    Kullanım:
+        timers = StageTimers(enabled=True, pipeline="live_tester")
+        with timers.stage("decode"):
+            ret, frame = cap.read()
+        ...
+        timers.end_frame()
+        metrics['stage_timings'] = timers.summary()
+    """
+
+    def __init__(self, enabled=True, pipeline="pipeline", precision=7):
+        """
+        Args:
+            enabled (bool): Ölçüm açık mı
+            pipeline (str): Prometheus etiketi için pipeline adı
+            precision (int): Histogram hassasiyeti (bit)
+        """
+        self.enabled = enabled
+        self.pipeline = pipeline
+        self.precision = precision
+        self.histograms = {}
+        self._pending = {}
+        self.frames = 0
+
+    def stage(self, name):
+        """Aşama için context manager döndür"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self._pending, name)
+
+    def timed(self, name):
+        """Fonksiyonu aşama olarak ölçen decorator"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.add(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def add(self, name, seconds):
+        """Dışarıda ölçülmüş bir süreyi mevcut kareye ekle"""
+        if not self.enabled:
+            return
+        self._pending[name] = self._pending.get(name, 0.0) + seconds
+
+    def record_yolo_speed(self, results):
+        """
+        Ultralytics sonuçlarındaki preprocess/inference/NMS sürelerini ekle
+
+        Args:
+            results: model(frame) çıktısı (Results listesi)
+        """
+        if not self.enabled:
+            return
+        for result in results:
+            speed = getattr(result, 'speed', None)
+            if not speed:
+                continue
+            for key, stage_name in YOLO_SPEED_STAGES.items():
+                value_ms = speed.get(key)
+                if value_ms is not None:
+                    self.add(stage_name, value_ms / 1000.0)
+
+    def end_frame(self):
+        """Karedeki aşama sürelerini histogramlara aktar"""
+        if not self.enabled or not self._pending:
+            return
+
+        total = 0.0
+        for name, seconds in self._pending.items():
+            self._histogram(name).record(seconds)
+            if name not in YOLO_SPEED_STAGES.values():
+                total += seconds
+        self._histogram('total').record(total)
+
+        self._pending.clear()
+        self.frames += 1
+
+    def _histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = StageHistogram(self.precision)
+            self.histograms[name] = histogram
+        return histogram
+
+    def summary(self):
+        """
+        Aşama istatistiklerini döndür
+
+        Returns:
+            dict: stage -> {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}
+        """
+        self.end_frame()
+
+        result = {}
+        for name, histogram in self.histograms.items():
+            result[name] = {
+                'count': histogram.count,
+                'mean_ms': round(histogram.mean() * 1000, 3),
+                'p50_ms': round(histogram.percentile(50) * 1000, 3),
+                'p95_ms': round(histogram.percentile(95) * 1000, 3),
+                'p99_ms': round(histogram.percentile(99) * 1000, 3),
+                'max_ms': round(histogram.max_us / 1000, 3),
+            }
+        return result
+
+    def format_lines(self):
+        """Metin loglarına yazmak için satır listesi"""
+        lines = []
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<12} n={stats['count']:<6} "
+                         f"p50={stats['p50_ms']:.2f}ms p95={stats['p95_ms']:.2f}ms "
+                         f"p99={stats['p99_ms']:.2f}ms max={stats['max_ms']:.2f}ms")
+        return lines
+
+    def write_prometheus(self, path, labels=None):
+        """
+        Prometheus textfile collector formatında yaz (atomik)
+
+        Args:
+            path (str): Hedef .prom dosyası
+            labels (dict): Ek etiketler (ör. {'camera': 'KAMERA_1'})
+        """
+        base_labels = {'pipeline': self.pipeline}
+        if labels:
+            base_labels.update(labels)
+
+        def format_labels(extra):
+            merged = dict(base_labels, **extra)
+            return ",".join(f'{key}="{value}"' for key, value in merged.items())
+
+        lines = [
+            "# HELP pool_stage_latency_seconds Pipeline aşama süreleri (kare başına)",
+            "# TYPE pool_stage_latency_seconds summary",
+        ]
+        self.end_frame()
+        for name, histogram in self.histograms.items():
+            for q in (0.5, 0.95, 0.99):
+                value = histogram.percentile(q * 100)
+                lines.append(f"pool_stage_latency_seconds{{{format_labels({'stage': name, 'quantile': q})}}} {value:.6f}")
+            lines.append(f"pool_stage_latency_seconds_sum{{{format_labels({'stage': name})}}} {histogram.total_us / 1e6:.6f}")
+            lines.append(f"pool_stage_latency_seconds_count{{{format_labels({'stage': name})}}} {histogram.count}")
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+    def save(self, json_path, prometheus_path=None, labels=None):
+        """
+        Özeti JSON olarak kaydet, istenirse Prometheus dosyasını da yaz
+
+        Args:
+            json_path (str): stage_timings.json yolu
+            prometheus_path (str): Opsiyonel .prom dosyası
+            labels (dict): Prometheus ek etiketleri
+
+        Returns:
+            dict: summary() çıktısı
+        """
+        summary = self.summary()
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({'pipeline': self.pipeline, 'frames': self.frames, 'stages': summary},
+                      f, indent=2, ensure_ascii=False)
+
+        if prometheus_path:
+            self.write_prometheus(prometheus_path, labels)
+
+        return summary
+
+    def reset(self):
+        """Tüm ölçümleri sıfırla"""
+        self.histograms.clear()
+        self._pending.clear()
+        self.frames = 0
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🔄 ÇALIŞMA ZAMANI AYARLARI (HOT-RELOAD)
+======================================
+Havuz alanı, tespit eşikleri (confidence, min alan, IoU) ve tracker
+parametreleri süreci yeniden başlatmadan değiştirilir; model ve track'ler
+bellekte kalır.
+
+Kaynaklar (sonraki öncekini ezer):
+1. core.config varsayılanları + pipeline'ın kendi varsayılanları
+2. İzlenen JSON dosyası (Runtime.CONFIG_FILE / POOL_RUNTIME_CONFIG)
+3. Yerel kontrol soketi (127.0.0.1:Runtime.CONTROL_PORT), satır başına JSON
+
+Dosya / komut formatı:
+    {
+      "confidence_threshold": 0.35,
+      "min_area": 400,
+      "tracker": {"max_distance": 120, "max_disappeared": 45},
+      "cameras": {"KAMERA_2": {"confidence_threshold": 0.4, "pool_version": "20250804_101500"}}
+    }
+    Sokete {"reset": true} gönderilirse soket ile yapılan değişiklikler silinir.
+
+Değişiklikler sadece poll() içinde, iki kare arasında uygulanır: her kare
+tek bir değişmez RuntimeSettings görür. Her değişiklik, geçerli olduğu kare
+numarasıyla loglanır.
+
+Kullanım:
+    runtime = RuntimeConfig(change_log_path=..., logger=self.logger)
+    runtime.register("KAMERA_1", max_distance=150, max_disappeared=30)
+    settings = runtime.settings_for("KAMERA_1")
+    ...
+    if runtime.poll(frame_number):          # her kare başında
+        settings = runtime.settings_for("KAMERA_1")
+        settings.apply_to_tracker(tracker)
+
+Komut göndermek için:
+    python runtime_config.py --port 8765 '{"confidence_threshold": 0.4}'
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import logging
+import argparse
+import threading
+import socketserver
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.config import Detection, Runtime
+from pool_module.pool_registry import PoolArea, get_registry, normalize_key
+
+# Ayar adı -> (tip, alt sınır, üst sınır)
+FIELDS = {
+    'confidence_threshold': (float, 0.0, 1.0),
+    'low_confidence_threshold': (float, 0.0, 1.0),
+    'iou_threshold': (float, 0.0, 1.0),
+    'min_area': (float, 0.0, None),
+    'max_distance': (float, 1.0, None),
+    'max_disappeared': (int, 0, None),
+    'pool_key': (str, None, None),
+    'pool_version': (str, None, None),
+}
+
+DEFAULTS = {
+    'confidence_threshold': Detection.CONFIDENCE_THRESHOLD,
+    'low_confidence_threshold': Detection.LOW_CONFIDENCE_THRESHOLD,
+    'iou_threshold': Detection.IOU_THRESHOLD,
+    'min_area': Detection.MIN_AREA,
+    'max_distance': 150.0,
+    'max_disappeared': 30,
+    'pool_key': None,       # None: kamera adı
+    'pool_version': None,   # None: en yeni sürüm
+}
+
+ALL_CAMERAS = '*'
+
+
+@dataclass(frozen=True)
+class RuntimeSettings:
+    """Bir kamera için o anda geçerli, değişmez ayarlar"""
+    camera: str
+    confidence_threshold: float
+    low_confidence_threshold: float
+    iou_threshold: float
+    min_area: float
+    max_distance: float
+    max_disappeared: int
+    pool_zone: Optional[PoolArea] = field(compare=False)
+    revision: int = 0
+
+    def accepts(self, confidence, bbox):
+        """Tespit eşiklerini geçiyor mu (bbox: x1, y1, x2, y2)"""
+        x1, y1, x2, y2 = bbox
+        return confidence > self.confidence_threshold and (x2 - x1) * (y2 - y1) >= self.min_area
+
+    def tier(self, confidence, bbox):
+        """
+        İki aşamalı eşleştirme için sınıf
+
+        Returns:
+            'high' (yeni track açabilir), 'low' (sadece mevcut track'i uzatır) veya None
+        """
+        x1, y1, x2, y2 = bbox
+        if (x2 - x1) * (y2 - y1) < self.min_area:
+            return None
+        if confidence > self.confidence_threshold:
+            return 'high'
+        if confidence > self.low_confidence_threshold:
+            return 'low'
+        return None
+
+    def apply_to_tracker(self, tracker):
+        """ObjectTracker parametrelerini güncelle (track'ler korunur)"""
+        tracker.max_distance = self.max_distance
+        tracker.max_disappeared = self.max_disappeared
+
+    def describe(self):
+        """Loglanabilir değerler"""
+        return {
+            'confidence_threshold': self.confidence_threshold,
+            'low_confidence_threshold': self.low_confidence_threshold,
+            'iou_threshold': self.iou_threshold,
+            'min_area': self.min_area,
+            'max_distance': self.max_distance,
+            'max_disappeared': self.max_disappeared,
+            'pool_zone': self.pool_zone.file_name if self.pool_zone is not None else None,
+            # Aynı ada yerinde yazılan havuz dosyası da değişiklik sayılır
+            'pool_geometry': self.pool_zone.signature if self.pool_zone is not None else None,
+        }
+
+
+def parse_overrides(data):
+    """
+    Dosya / komut içeriğini kamera bazlı, doğrulanmış değerlere çevir
+
+    Returns:
+        tuple: ({kamera: {ayar: değer}}, [hata mesajları])
+    """
+    if not isinstance(data, dict):
+        return {}, ["JSON nesnesi bekleniyordu"]
+
+    errors = []
+
+    def clean(section, scope):
+        values = {}
+        flat = dict(section)
+        tracker = flat.pop('tracker', None)
+        if isinstance(tracker, dict):
+            flat.update(tracker)
+        for name, value in flat.items():
+            if name in ('cameras', 'reset'):
+                continue
+            if name not in FIELDS:
+                errors.append(f"{scope}: bilinmeyen ayar '{name}'")
+                continue
+            kind, low, high = FIELDS[name]
+            if value is None:
+                values[name] = None
+                continue
+            try:
+                value = kind(value)
+            except (TypeError, ValueError):
+                errors.append(f"{scope}: {name}={value!r} geçersiz")
+                continue
+            if (low is not None and value < low) or (high is not None and value > high):
+                errors.append(f"{scope}: {name}={value} aralık dışı")
+                continue
+            values[name] = value
+        return values
+
+    overrides = {}
+    common = clean(data, ALL_CAMERAS)
+    if common:
+        overrides[ALL_CAMERAS] = common
+    cameras = data.get('cameras') or {}
+    if isinstance(cameras, dict):
+        for camera, section in cameras.items():
+            if isinstance(section, dict):
+                values = clean(section, camera)
+                if values:
+                    overrides[normalize_key(camera)] = values
+    return overrides, errors
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    """Satır başına bir JSON komut; komut kuyruğa alınır, poll() uygular"""
+
+    def handle(self):
+        for raw in self.rfile:
+            line = raw.decode('utf-8', errors='replace').strip()
+            if not line:
+                continue
+            try:
+                command = json.loads(line)
+            except ValueError as e:
+                self.wfile.write(f"ERR {e}\n".encode('utf-8'))
+                continue
+            self.server.commands.put(command)
+            self.wfile.write(b"OK\n")
+
+
+class _ControlServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class RuntimeConfig:
+    """
+    🔄 Süreç içi ayar kanalı (dosya + kontrol soketi + havuz registry)
+    """
+
+    def __init__(self, config_path=None, control_port=None, pool_dir=None,
+                 check_interval=None, change_log_path=None, logger=None):
+        """
+        Args:
+            config_path (str): İzlenen JSON dosyası (None: Runtime.CONFIG_FILE)
+            control_port (int): Kontrol soketi portu (None: Runtime.CONTROL_PORT, 0: kapalı)
+            pool_dir (str): pool_area_*.json klasörü (None: Paths.OUTPUT_DIR)
+            check_interval (float): Dosya / havuz kontrol aralığı (sn)
+            change_log_path (str): Değişikliklerin yazılacağı JSONL (opsiyonel)
+            logger (logging.Logger): Değişiklik logları için
+        """
+        self.config_path = config_path or Runtime.CONFIG_FILE
+        self.control_port = Runtime.CONTROL_PORT if control_port is None else control_port
+        self.check_interval = Runtime.CHECK_INTERVAL if check_interval is None else check_interval
+        self.change_log_path = change_log_path
+        self.logger = logger or logging.getLogger("runtime_config")
+        self.registry = get_registry(pool_dir)
+
+        self._defaults = {}           # kamera -> pipeline varsayılanları
+        self._file_overrides = {}     # kamera / '*' -> {ayar: değer}
+        self._socket_overrides = {}
+        self._settings = {}           # kamera -> RuntimeSettings (poll'lar arası sabit)
+        self._file_signature = None
+        self._last_check = time.monotonic()
+        self._pool_generation = self.registry.generation
+        self._commands = queue.Queue()
+        self._server = None
+        self.revision = 0
+
+        if self.config_path:
+            self._file_signature = self._stat_config()
+            self._load_config_file()
+            self.logger.info(f"🔄 Runtime config izleniyor: {self.config_path}")
+        if self.control_port:
+            self._start_server()
+
+    # ------------------------------------------------------------------
+    # Kaynaklar
+    # ------------------------------------------------------------------
+
+    def _stat_config(self):
+        try:
+            stat = os.stat(self.config_path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+
+    def _load_config_file(self):
+        """Dosyayı oku; hatalıysa eski ayarlar korunur"""
+        if self._file_signature is None:
+            if self._file_overrides:
+                self.logger.warning(f"⚠️ Runtime config dosyası kaldırıldı: {self.config_path}")
+                self._file_overrides = {}
+                return True
+            return False
+        try:
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"❌ Runtime config okunamadı, eski ayarlar korunuyor: {e}")
+            return False
+        overrides, errors = parse_overrides(data)
+        for error in errors:
+            self.logger.warning(f"⚠️ Runtime config: {error}")
+        if overrides == self._file_overrides:
+            return False
+        self._file_overrides = overrides
+        return True
+
+    def _apply_command(self, command):
+        if isinstance(command, dict) and command.get('reset'):
+            changed = bool(self._socket_overrides)
+            self._socket_overrides = {}
+            return changed
+        overrides, errors = parse_overrides(command)
+        for error in errors:
+            self.logger.warning(f"⚠️ Kontrol komutu: {error}")
+        changed = False
+        for scope, values in overrides.items():
+            current = self._socket_overrides.setdefault(scope, {})
+            for name, value in values.items():
+                if current.get(name, object()) != value:
+                    current[name] = value
+                    changed = True
+        return changed
+
+    def _start_server(self):
+        try:
+            self._server = _ControlServer(('127.0.0.1', self.control_port), _ControlHandler)
+        except OSError as e:
+            self.logger.error(f"❌ Kontrol soketi açılamadı (port {self.control_port}): {e}")
+            self._server = None
+            return
+        self._server.commands = self._commands
+        self.control_port = self._server.server_address[1]
+        thread = threading.Thread(target=self._server.serve_forever, name="runtime-control", daemon=True)
+        thread.start()
+        self.logger.info(f"🔌 Runtime kontrol soketi: 127.0.0.1:{self.control_port}")
+
+    # ------------------------------------------------------------------
+    # Ayarlar
+    # ------------------------------------------------------------------
+
+    def register(self, camera, **defaults):
+        """Kamera / pipeline için varsayılanları kaydet (örn: max_distance=150)"""
+        camera = normalize_key(camera)
+        unknown = set(defaults) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Bilinmeyen ayar(lar): {', '.join(sorted(unknown))}")
+        self._defaults[camera] = defaults
+        self._settings.pop(camera, None)
+        return self.settings_for(camera)
+
+    def settings_for(self, camera):
+        """Kamera için geçerli ayarlar (bir sonraki poll'a kadar aynı nesne)"""
+        camera = normalize_key(camera)
+        settings = self._settings.get(camera)
+        if settings is not None:
+            return settings
+
+        values = dict(DEFAULTS)
+        values.update(self._defaults.get(camera, {}))
+        for layer in (self._file_overrides, self._socket_overrides):
+            for scope in (ALL_CAMERAS, camera):
+                values.update({k: v for k, v in layer.get(scope, {}).items() if v is not None})
+
+        pool_zone = self.registry.find(values['pool_key'] or camera, values['pool_version'])
+        if pool_zone is None and values['pool_version'] is not None:
+            self.logger.warning(f"⚠️ {camera}: havuz sürümü bulunamadı ({values['pool_version']}), en yenisi kullanılıyor")
+            pool_zone = self.registry.find(values['pool_key'] or camera)
+
+        settings = RuntimeSettings(
+            camera=camera,
+            confidence_threshold=float(values['confidence_threshold']),
+            low_confidence_threshold=float(values['low_confidence_threshold']),
+            iou_threshold=float(values['iou_threshold']),
+            min_area=float(values['min_area']),
+            max_distance=float(values['max_distance']),
+            max_disappeared=int(values['max_disappeared']),
+            pool_zone=pool_zone,
+            revision=self.revision,
+        )
+        self._settings[camera] = settings
+        return settings
+
+    def poll(self, frame_number):
+        """
+        Kareler arasında çağrılır: bekleyen değişiklikleri tek seferde uygula
+
+        Returns:
+            dict: {kamera: {ayar: (eski, yeni)}}; değişiklik yoksa boş
+        """
+        changed = False
+        while True:
+            try:
+                command = self._commands.get_nowait()
+            except queue.Empty:
+                break
+            changed |= self._apply_command(command)
+
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            self._last_check = now
+            if self.config_path:
+                signature = self._stat_config()
+                if signature != self._file_signature:
+                    self._file_signature = signature
+                    changed |= self._load_config_file()
+            self.registry.refresh()
+            if self.registry.generation != self._pool_generation:
+                self._pool_generation = self.registry.generation
+                changed = True
+
+        if not changed:
+            return {}
+
+        previous = self._settings
+        self._settings = {}
+        self.revision += 1
+        diffs = {}
+        for camera, old in previous.items():
+            old_values = old.describe()
+            new_values = self.settings_for(camera).describe()
+            diff = {name: (old_values[name], new_values[name])
+                    for name in new_values if old_values[name] != new_values[name]}
+            if diff:
+                diffs[camera] = diff
+                self._log_change(frame_number, camera, diff)
+        return diffs
+
+    def _log_change(self, frame_number, camera, diff):
+        detail = ", ".join(f"{name}: {old} → {new}" for name, (old, new) in diff.items())
+        self.logger.info(f"🔄 Ayar değişti [{camera}] @ frame {frame_number}: {detail}")
+        if not self.change_log_path:
+            return
+        record = {
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'frame': frame_number,
+            'camera': camera,
+            'revision': self.revision,
+            'changes': {name: {'old': old, 'new': new} for name, (old, new) in diff.items()},
+        }
+        try:
+            with open(self.change_log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            self.logger.error(f"❌ Ayar değişiklik logu yazılamadı: {e}")
+
+    def close(self):
+        """Kontrol soketini kapat"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def send_command(command, port=None, host='127.0.0.1', timeout=5.0):
+    """Çalışan pipeline'a komut gönder; sunucu yanıtını döndür ('OK' / 'ERR ...')"""
+    port = port or Runtime.CONTROL_PORT
+    if isinstance(command, dict):
+        command = json.dumps(command)
+    with socket.create_connection((host, port), timeout=timeout) as conn:
+        conn.sendall(command.strip().encode('utf-8') + b"\n")
+        conn.shutdown(socket.SHUT_WR)
+        return conn.makefile('r', encoding='utf-8').readline().strip()
+
+
+def main():
+    """Komut satırından ayar gönder"""
+    parser = argparse.ArgumentParser(description="🔄 Çalışan pipeline'a runtime ayarı gönder")
+    parser.add_argument("command", help='JSON, örn: \'{"confidence_threshold": 0.4}\' veya \'{"reset": true}\'')
+    parser.add_argument("--port", type=int, default=Runtime.CONTROL_PORT, help="Kontrol soketi portu")
+    args = parser.parse_args()
+
+    if not args.port:
+        print("❌ Port belirtilmedi (--port veya POOL_CONTROL_PORT)")
+        return 1
+    try:
+        print(send_command(args.command, port=args.port))
+    except OSError as e:
+        print(f"❌ Bağlantı hatası: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
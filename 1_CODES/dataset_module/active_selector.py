@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🎯 AKTİF ÖĞRENME KARE SEÇİCİ
+===========================
+Etiketlenecek sonraki kare grubunu dosya boyutu yerine model belirsizliğine
+göre seçer.
+
+Kare başına üç belirsizlik skoru (0..1):
+- margin      : Aynı kişi için rakip sınıf kutusu (IoU >= 0.5) ile güven
+                farkı küçük veya tek kutu güveni 0.5 civarında
+- ambiguity   : person_swimming / person_drowning kutuları aynı kişide
+                yakın güvenle çakışıyor
+- disagreement: Genel model (YOLOv8x, kişi) ile özel model (drowning_detection)
+                kişi kutuları eşleşmiyor - `TwoStageDetector`'daki model çifti
+
+- Inference batch halinde yapılır; tahminler dataset indeksinde kare içerik
+  hash'i + model hash'i ile saklanır, sonraki gece sadece yeni kareler ve
+  değişen model için model çalışır
+- Skorlama tüm kareler için (F, K, 6) dolgulu dizilerde vektöreldir ve
+  bloklar halinde çekirdeklere dağıtılır
+- Çeşitlilik: adaylar dHash yakın kopya gruplarına ayrılır, her gruptan en
+  belirsiz kare alınır
+
+Kullanım:
+    python active_selector.py 9_TICKETv2 --model drowning_detection_v12_working.pt \
+        --general-model 4_MODELS/yolov8x.pt --count 200 --output 9_TICKETv2/to_annotate
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_module.auto_labeler import iter_image_batches, file_sha256, MANIFEST_NAME
+from dataset_module.dataset_index import DatasetIndex
+from dataset_module.near_duplicates import index_dhashes, cluster_hashes, DEFAULT_THRESHOLD
+from dataset_module.materialize import materialize_pairs, print_materialize_result
+from dataset_module.label_io import atomic_write_text
+
+MAX_BOXES = 32              # Kare başına skorlanan en güvenli kutu sayısı
+SCORE_BLOCK = 2048          # İşçi başına kare bloğu
+PREDICT_CONF = 0.05         # Önbelleğe alınan tahminlerin alt güven eşiği
+MATCH_IOU = 0.5
+PERSON_CLASSES = (0, 1, 2)  # person_swimming, person_drowning, person_poolside
+SWIMMING_CLASS = 0
+DROWNING_CLASS = 1
+DEFAULT_WEIGHTS = {'margin': 1.0, 'ambiguity': 1.5, 'disagreement': 1.0}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    frame_hash TEXT,
+    model TEXT,
+    data BLOB,
+    PRIMARY KEY (frame_hash, model)
+);
+"""
+
+
+class ModelRunner:
+    """
+    🤖 Önbellek anahtarlı batch YOLO çalıştırıcı
+    """
+
+    def __init__(self, model_path, imgsz=640, device=None, classes=None, conf=PREDICT_CONF):
+        from ultralytics import YOLO
+
+        self.model_path = str(model_path)
+        self.imgsz = imgsz
+        self.device = device
+        self.classes = classes
+        self.conf = conf
+
+        print(f"🤖 Model yükleniyor: {self.model_path}")
+        self.model = YOLO(self.model_path)
+        model_hash = file_sha256(self.model_path)[:16] if os.path.exists(self.model_path) else self.model_path
+        self.key = f"{model_hash}:{imgsz}:{conf}:{classes}"
+
+    def predict(self, images):
+        """
+        Returns:
+            list: Her görüntü için (N, 6) float32 [x1n, y1n, x2n, y2n, conf, cls]
+        """
+        kwargs = {'conf': self.conf, 'imgsz': self.imgsz, 'verbose': False}
+        if self.device is not None:
+            kwargs['device'] = self.device
+        if self.classes is not None:
+            kwargs['classes'] = list(self.classes)
+
+        outputs = []
+        for result in self.model(images, **kwargs):
+            boxes = result.boxes
+            if boxes is None or len(boxes) == 0:
+                outputs.append(np.zeros((0, 6), np.float32))
+                continue
+            outputs.append(np.column_stack([
+                boxes.xyxyn.cpu().numpy(),
+                boxes.conf.cpu().numpy(),
+                boxes.cls.cpu().numpy(),
+            ]).astype(np.float32))
+        return outputs
+
+
+def cached_predictions(index, runner, rows, batch_size=16, decode_threads=4):
+    """
+    Kareler için tahminler (indeks önbelleğinden, eksikler batch inference ile)
+
+    Returns:
+        dict: {frame_hash: (N, 6) float32}
+    """
+    index.conn.executescript(_SCHEMA)
+    predictions = {}
+    for digest, data in index.conn.execute(
+            "SELECT frame_hash, data FROM predictions WHERE model = ?", (runner.key,)):
+        predictions[digest] = np.frombuffer(data, dtype=np.float32).reshape(-1, 6)
+
+    missing = {}
+    for row in rows:
+        if row['frame_hash'] not in predictions:
+            missing.setdefault(row['frame_hash'], index.frames_dir / row['file_name'])
+    if not missing:
+        return predictions
+
+    print(f"🔮 {Path(runner.model_path).name}: {len(missing)} kare için inference "
+          f"({len(predictions)} önbellekte)")
+    started = time.time()
+    path_to_hash = {path: digest for digest, path in missing.items()}
+    done = 0
+    for batch in iter_image_batches(list(missing.values()), batch_size, decode_threads):
+        valid = [(path, image) for path, image in batch if image is not None]
+        if not valid:
+            continue
+        outputs = runner.predict([image for _, image in valid])
+        new_rows = []
+        for (path, _), output in zip(valid, outputs):
+            digest = path_to_hash[path]
+            predictions[digest] = output
+            new_rows.append((digest, runner.key, output.tobytes()))
+        with index.conn:
+            index.conn.executemany(
+                "INSERT OR REPLACE INTO predictions (frame_hash, model, data) VALUES (?, ?, ?)", new_rows)
+        done += len(valid)
+        if done % (batch_size * 20) < len(valid):
+            print(f"   📊 {done}/{len(missing)} kare - {done / (time.time() - started):.1f} kare/sn")
+
+    return predictions
+
+
+def pack_predictions(prediction_list, max_boxes=MAX_BOXES):
+    """
+    Değişken uzunluklu tahminleri (F, K, 6) dolgulu diziye çevir (conf=0 dolgu)
+
+    Kare başına en güvenli `max_boxes` kutu tutulur.
+    """
+    packed = np.zeros((len(prediction_list), max_boxes, 6), np.float32)
+    for i, prediction in enumerate(prediction_list):
+        if len(prediction) > max_boxes:
+            prediction = prediction[np.argsort(-prediction[:, 4])[:max_boxes]]
+        packed[i, :len(prediction)] = prediction
+    return packed
+
+
+def batched_iou(a, b):
+    """(F, Ka, 4) ve (F, Kb, 4) xyxy kutular için (F, Ka, Kb) IoU"""
+    ax1, ay1, ax2, ay2 = (a[..., i][:, :, None] for i in range(4))
+    bx1, by1, bx2, by2 = (b[..., i][:, None, :] for i in range(4))
+    inter_w = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+    inter_h = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None)
+    inter = inter_w * inter_h
+    union = (ax2 - ax1) * (ay2 - ay1) + (bx2 - bx1) * (by2 - by1) - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+def score_block(specific, general=None, agree_conf=0.25):
+    """
+    Bir kare bloğu için belirsizlik skorları (vektörel)
+
+    Args:
+        specific (np.ndarray): (F, K, 6) özel model tahminleri
+        general (np.ndarray): (F, G, 6) genel model kişi tahminleri (opsiyonel)
+        agree_conf (float): Uyuşma kontrolünde sayılan minimum güven
+
+    Returns:
+        dict: {'margin', 'ambiguity', 'disagreement'} -> (F,) float32
+    """
+    conf = specific[..., 4]
+    cls = specific[..., 5].astype(np.int32)
+    valid = conf > 0
+
+    iou = batched_iou(specific[..., :4], specific[..., :4])
+    pair_valid = valid[:, :, None] & valid[:, None, :] & (iou >= MATCH_IOU)
+
+    # Margin: aynı kişideki en güçlü rakip sınıfa göre güven farkı
+    rival = pair_valid & (cls[:, :, None] != cls[:, None, :])
+    rival_conf = np.where(rival, conf[:, None, :], 0).max(axis=2)
+    box_margin = np.where(rival_conf > 0,
+                          1.0 - np.abs(conf - rival_conf),
+                          1.0 - np.abs(2.0 * conf - 1.0))
+    margin = np.where(valid, box_margin, 0).max(axis=1)
+
+    # Yüzme / boğulma çakışması
+    swim_drown = pair_valid & (cls[:, :, None] == SWIMMING_CLASS) & (cls[:, None, :] == DROWNING_CLASS)
+    low = np.minimum(conf[:, :, None], conf[:, None, :])
+    high = np.maximum(conf[:, :, None], conf[:, None, :])
+    ambiguity = np.where(swim_drown, low / np.maximum(high, 1e-9), 0).max(axis=(1, 2))
+
+    # Genel ve özel model kişi kutularının uyuşmazlığı
+    disagreement = np.zeros(len(specific), np.float32)
+    if general is not None:
+        person_s = valid & (conf >= agree_conf) & np.isin(cls, PERSON_CLASSES)
+        person_g = general[..., 4] >= agree_conf
+        cross = batched_iou(general[..., :4], specific[..., :4]) >= MATCH_IOU
+        matched_g = (cross & person_s[:, None, :]).any(axis=2)
+        matched_s = (cross & person_g[:, :, None]).any(axis=1)
+        unmatched = (person_g & ~matched_g).sum(axis=1) + (person_s & ~matched_s).sum(axis=1)
+        total = person_g.sum(axis=1) + person_s.sum(axis=1)
+        disagreement = unmatched / np.maximum(total, 1)
+
+    return {
+        'margin': margin.astype(np.float32),
+        'ambiguity': ambiguity.astype(np.float32),
+        'disagreement': disagreement.astype(np.float32),
+    }
+
+
+def _score_job(job):
+    specific, general = job
+    return score_block(pack_predictions(specific),
+                       pack_predictions(general) if general is not None else None)
+
+
+def score_predictions(specific_list, general_list=None, workers=None, block=SCORE_BLOCK):
+    """
+    Tüm kareleri bloklar halinde, çekirdeklere dağıtarak skorla
+
+    Returns:
+        dict: {'margin', 'ambiguity', 'disagreement'} -> (F,) float32
+    """
+    jobs = []
+    for start in range(0, len(specific_list), block):
+        general = general_list[start:start + block] if general_list is not None else None
+        jobs.append((specific_list[start:start + block], general))
+
+    if len(jobs) <= 1 or workers == 1:
+        parts = [_score_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_score_job, jobs))
+
+    names = ('margin', 'ambiguity', 'disagreement')
+    if not parts:
+        return {name: np.zeros(0, np.float32) for name in names}
+    return {name: np.concatenate([part[name] for part in parts]) for name in names}
+
+
+class ActiveSelector:
+    """
+    🎯 Belirsizlik + çeşitlilik ile etiketleme kuyruğu seçici
+    """
+
+    def __init__(self, dataset_dir, model_path, general_model_path=None, batch_size=16, imgsz=640,
+                 device=None, decode_threads=4, workers=None, weights=None):
+        """
+        Args:
+            dataset_dir (str): Dataset klasörü (01_frames / 02_labels)
+            model_path (str): Özel model (drowning_detection_*.pt)
+            general_model_path (str): Genel kişi modeli (ör. 4_MODELS/yolov8x.pt, opsiyonel)
+            batch_size (int): Inference batch boyutu
+            imgsz (int): Model giriş boyutu
+            device (str): Model cihazı
+            decode_threads (int): JPEG decode thread sayısı
+            workers (int): Skorlama süreç sayısı (None: çekirdek sayısı)
+            weights (dict): Skor ağırlıkları (margin / ambiguity / disagreement)
+        """
+        self.index = DatasetIndex(dataset_dir)
+        self.index.refresh()
+        self.batch_size = batch_size
+        self.decode_threads = decode_threads
+        self.workers = workers
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+
+        self.specific = ModelRunner(model_path, imgsz, device)
+        self.general = ModelRunner(general_model_path, imgsz, device, classes=(0,)) if general_model_path else None
+
+    def candidate_rows(self, pool='unreviewed'):
+        """
+        Aday kareler
+
+        Args:
+            pool (str): 'unlabeled' (etiketsiz) | 'unreviewed' (etiketsiz + elle
+                        dokunulmamış otomatik etiketli) | 'all'
+        """
+        rows = self.index.frames(order_by='name')
+        if pool == 'all':
+            return rows
+        if pool == 'unlabeled':
+            return [row for row in rows if row['label_size'] is None]
+
+        try:
+            with open(self.index.labels_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                auto_labeled = json.load(f).get('frames', {})
+        except (OSError, ValueError):
+            auto_labeled = {}
+
+        candidates = []
+        for row in rows:
+            entry = auto_labeled.get(row['file_name'])
+            untouched = (entry is not None and entry.get('label_size') == row['label_size']
+                         and entry.get('label_mtime') == row['label_mtime'])
+            if row['label_size'] is None or untouched:
+                candidates.append(row)
+        return candidates
+
+    def score(self, rows):
+        """
+        Kareleri skorla
+
+        Returns:
+            list: Skor sırasına göre dict listesi (stem, file_name, score, margin, ambiguity, disagreement)
+        """
+        specific = cached_predictions(self.index, self.specific, rows, self.batch_size, self.decode_threads)
+        general = None
+        if self.general is not None:
+            general = cached_predictions(self.index, self.general, rows, self.batch_size, self.decode_threads)
+
+        rows = [row for row in rows if row['frame_hash'] in specific
+                and (general is None or row['frame_hash'] in general)]
+        specific_list = [specific[row['frame_hash']] for row in rows]
+        general_list = [general[row['frame_hash']] for row in rows] if general is not None else None
+
+        started = time.time()
+        scores = score_predictions(specific_list, general_list, self.workers)
+        total = sum(self.weights[name] * scores[name] for name in scores)
+        print(f"🧮 {len(rows)} kare skorlandı ({time.time() - started:.1f}s)")
+
+        order = np.argsort(-total, kind='stable')
+        return [{
+            'stem': rows[i]['stem'],
+            'file_name': rows[i]['file_name'],
+            'score': round(float(total[i]), 4),
+            'margin': round(float(scores['margin'][i]), 4),
+            'ambiguity': round(float(scores['ambiguity'][i]), 4),
+            'disagreement': round(float(scores['disagreement'][i]), 4),
+        } for i in order]
+
+    def select(self, count=200, pool='unreviewed', diversity_threshold=DEFAULT_THRESHOLD, candidate_factor=5):
+        """
+        Etiketlenecek sonraki kare grubunu seç
+
+        Args:
+            count (int): Seçilecek kare sayısı
+            pool (str): Aday havuzu (bkz. candidate_rows)
+            diversity_threshold (int): Yakın kopya dHash eşiği (None: çeşitlilik kapalı)
+            candidate_factor (int): Çeşitlilik için incelenen en belirsiz aday katsayısı
+
+        Returns:
+            list: score() formatında seçilen kareler
+        """
+        ranked = self.score(self.candidate_rows(pool))
+        if diversity_threshold is None:
+            return ranked[:count]
+
+        # En belirsiz adaylar arasında her yakın kopya grubundan tek kare
+        shortlist = ranked[:count * candidate_factor]
+        stems, hashes = index_dhashes(self.index, [item['stem'] for item in shortlist])
+        group_of = dict(zip(stems, cluster_hashes(hashes, diversity_threshold)))
+
+        selected = []
+        seen_groups = set()
+        for item in shortlist:
+            group = group_of.get(item['stem'], ('okunamayan', item['stem']))
+            if group in seen_groups:
+                continue
+            seen_groups.add(group)
+            selected.append(item)
+            if len(selected) == count:
+                break
+        return selected
+
+    def export(self, selection, output_dir):
+        """
+        Seçimi etiketleyicilere hazırla
+
+        `output_dir` altına selection.csv (skorlar), selection.txt (kare adları)
+        ve 01_frames / 02_labels (hardlink; varsa otomatik etiket ön-taslak) yazılır.
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(output_dir / "selection.csv", 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=['stem', 'file_name', 'score', 'margin',
+                                                   'ambiguity', 'disagreement'])
+            writer.writeheader()
+            writer.writerows(selection)
+        atomic_write_text(output_dir / "selection.txt", ''.join(f"{item['file_name']}\n" for item in selection))
+
+        labeled = {row['stem'] for row in self.index.frames(labeled_only=True)}
+        pairs = [(item['file_name'], f"{item['stem']}.txt" if item['stem'] in labeled else None)
+                 for item in selection]
+        result = materialize_pairs(pairs, self.index.frames_dir, self.index.labels_dir,
+                                   output_dir / "01_frames", output_dir / "02_labels")
+        print_materialize_result(result, "Etiketleme kuyruğu")
+
+    def close(self):
+        self.index.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model belirsizliğine göre etiketlenecek kareleri seç")
+    parser.add_argument("dataset", help="Dataset klasörü (01_frames / 02_labels içeren)")
+    parser.add_argument("--model", required=True, help="Özel model (drowning_detection_*.pt)")
+    parser.add_argument("--general-model", help="Genel kişi modeli (uyuşmazlık skoru için)")
+    parser.add_argument("--count", type=int, default=200, help="Seçilecek kare sayısı")
+    parser.add_argument("--pool", choices=['unreviewed', 'unlabeled', 'all'], default='unreviewed')
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD,
+                        help="Çeşitlilik için yakın kopya eşiği (-1: kapalı)")
+    parser.add_argument("--output", help="Seçimin yazılacağı klasör")
+    parser.add_argument("--batch", type=int, default=16, help="Inference batch boyutu")
+    parser.add_argument("--imgsz", type=int, default=640, help="Model giriş boyutu")
+    parser.add_argument("--device", help="Model cihazı (ör. 0, cpu)")
+    parser.add_argument("--workers", type=int, help="Skorlama süreç sayısı")
+    args = parser.parse_args()
+
+    selector = ActiveSelector(args.dataset, args.model, args.general_model, batch_size=args.batch,
+                              imgsz=args.imgsz, device=args.device, workers=args.workers)
+    try:
+        selection = selector.select(args.count, args.pool,
+                                    args.threshold if args.threshold >= 0 else None)
+        print(f"✅ {len(selection)} kare seçildi")
+        for item in selection[:10]:
+            print(f"   {item['file_name']}: {item['score']:.3f} (margin {item['margin']:.2f}, "
+                  f"ambiguity {item['ambiguity']:.2f}, disagreement {item['disagreement']:.2f})")
+        if args.output:
+            selector.export(selection, args.output)
+            print(f"📁 Etiketleme kuyruğu: {args.output}")
+    finally:
+        selector.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🤖 TOPLU OTOMATİK ETİKETLEME
+============================
+Kareleri YOLO modeliyle toplu (batch) etiketler.
+
+- JPEG'ler thread havuzunda önden decode edilir, model diziler üzerinde
+  batch halinde çalışır (kare başına `model(str(path))` yok)
+- Havuz poligonu bir kez rasterize edilir; kutu merkezleri tek dizi
+  indekslemesiyle havuz içi (person_swimming) / dışı (person_poolside) olur
+- Etiketler atomik yazılır; `autolabel_manifest.json` hangi karenin hangi
+  model hash'i, eşik ve havuz poligonuyla etiketlendiğini tutar. Tekrar
+  çalıştırmada sadece yeni/değişen kareler (veya model/eşik değişince
+  hepsi) işlenir
+- Elle düzenlenmiş etiketler (manifest dışı dolu dosyalar ya da manifest
+  yazımından sonra değişenler) `force=True` verilmedikçe korunur
+
+Kullanım:
+    python auto_labeler.py --model yolov8x.pt --frames 01_frames --labels 02_labels \
+        --pool-area pool_area.json --conf 0.4
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_module.label_io import atomic_write_json, write_yolo_labels
+from pool_module.pool_geometry import PoolMask, load_pool_polygon
+
+MANIFEST_NAME = "autolabel_manifest.json"
+MANIFEST_VERSION = 1
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+SWIMMING_CLASS = 0   # person_swimming
+POOLSIDE_CLASS = 2   # person_poolside
+
+
+def read_image(path, flags=cv2.IMREAD_COLOR):
+    """Görüntüyü oku (ASCII dışı yollarda da çalışır, ör. 5_TİCKET_DATA)"""
+    data = np.fromfile(str(path), dtype=np.uint8)
+    if data.size == 0:
+        return None
+    return cv2.imdecode(data, flags)
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Dosyanın SHA-256 hash'i"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_image_batches(paths, batch_size=16, decode_threads=4):
+    """
+    Görüntüleri thread havuzunda önden decode edip batch'ler halinde döndür
+
+    Yields:
+        list: [(path, BGR görüntü veya None), ...]
+    """
+    paths = iter(paths)
+    window = batch_size * 3
+
+    with ThreadPoolExecutor(max_workers=decode_threads) as executor:
+        pending = deque()
+
+        def fill():
+            while len(pending) < window:
+                path = next(paths, None)
+                if path is None:
+                    return
+                pending.append((path, executor.submit(read_image, path)))
+
+        fill()
+        while pending:
+            batch = []
+            while pending and len(batch) < batch_size:
+                path, future = pending.popleft()
+                batch.append((path, future.result()))
+                fill()
+            yield batch
+
+
+def list_frames(frames_dir):
+    """Klasördeki görüntüleri sıralı listele"""
+    return sorted(p for p in Path(frames_dir).iterdir()
+                  if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS)
+
+
+class AutoLabeler:
+    """
+    🏷️ Batch inference + manifest ile artımlı etiketleyici
+    """
+
+    def __init__(self, model_path, frames_dir, labels_dir, conf=0.3, pool_polygon=None,
+                 batch_size=16, imgsz=640, decode_threads=4, device=None, person_class=0):
+        """
+        Args:
+            model_path (str): YOLO model dosyası
+            frames_dir (str): Kare klasörü
+            labels_dir (str): Etiket klasörü
+            conf (float): Güven eşiği
+            pool_polygon (array-like): Havuz poligonu (None: hepsi person_swimming)
+            batch_size (int): Inference batch boyutu
+            imgsz (int): Model giriş boyutu
+            decode_threads (int): JPEG decode thread sayısı
+            device (str): Model cihazı (None: ultralytics varsayılanı)
+            person_class (int): Modeldeki kişi sınıfı (COCO: 0)
+        """
+        from ultralytics import YOLO
+
+        self.model_path = str(model_path)
+        self.frames_dir = Path(frames_dir)
+        self.labels_dir = Path(labels_dir)
+        self.conf = float(conf)
+        self.batch_size = batch_size
+        self.imgsz = imgsz
+        self.decode_threads = decode_threads
+        self.device = device
+        self.person_class = person_class
+        self.pool_mask = PoolMask(pool_polygon)
+
+        print(f"🤖 Model yükleniyor: {self.model_path}")
+        self.model = YOLO(self.model_path)
+        self.model_hash = file_sha256(self.model_path)[:16] if os.path.exists(self.model_path) else self.model_path
+        self.pool_hash = self._polygon_hash(pool_polygon)
+
+        self.labels_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.labels_dir / MANIFEST_NAME
+        self.manifest = self._load_manifest()
+
+    @staticmethod
+    def _polygon_hash(polygon):
+        if polygon is None:
+            return None
+        points = np.asarray(polygon, dtype=np.int64).reshape(-1, 2).tolist()
+        return hashlib.sha1(json.dumps(points).encode()).hexdigest()[:12]
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': MANIFEST_VERSION, 'frames': {}}
+
+    def _save_manifest(self):
+        self.manifest['updated'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        atomic_write_json(self.manifest_path, self.manifest)
+
+    def plan(self, force=False, frames=None):
+        """
+        İşlenecek kareleri belirle
+
+        Args:
+            force (bool): Manifest ve elle düzenlemeleri yok say
+            frames (iterable): Sadece bu kareler (None: klasördeki tümü)
+
+        Returns:
+            tuple: (kare listesi, {'up_to_date': n, 'manual': n})
+        """
+        candidates = list_frames(self.frames_dir) if frames is None else sorted(Path(p) for p in frames)
+        frames = self.manifest['frames']
+        todo = []
+        up_to_date = 0
+        manual = 0
+
+        for frame_path in candidates:
+            label_path = self.labels_dir / f"{frame_path.stem}.txt"
+            entry = frames.get(frame_path.name)
+            frame_stat = frame_path.stat()
+            label_stat = label_path.stat() if label_path.exists() else None
+
+            if not force and label_stat is not None:
+                # Elle düzenlenmiş etiketleri koru
+                if entry is None and label_stat.st_size > 0:
+                    manual += 1
+                    continue
+                if entry is not None and (entry['label_size'] != label_stat.st_size
+                                          or entry['label_mtime'] != label_stat.st_mtime_ns):
+                    manual += 1
+                    continue
+
+            if (not force and entry is not None and label_stat is not None
+                    and entry['size'] == frame_stat.st_size
+                    and entry['mtime'] == frame_stat.st_mtime_ns
+                    and entry['model'] == self.model_hash
+                    and entry['conf'] == self.conf
+                    and entry['pool'] == self.pool_hash):
+                up_to_date += 1
+                continue
+
+            todo.append(frame_path)
+
+        return todo, {'up_to_date': up_to_date, 'manual': manual}
+
+    # ------------------------------------------------------------------
+    # Decode + inference
+    # ------------------------------------------------------------------
+
+    def _iter_batches(self, paths):
+        """Görüntüleri thread havuzunda önden decode edip batch'ler halinde döndür"""
+        return iter_image_batches(paths, self.batch_size, self.decode_threads)
+
+    def detect(self, images):
+        """
+        Görüntü listesinde tespit + havuz sınıflandırması
+
+        Args:
+            images (list): BGR görüntüler
+
+        Returns:
+            list: Her görüntü için (class_ids, xywhn kutular, güvenler) dizileri
+        """
+        kwargs = {'conf': self.conf, 'imgsz': self.imgsz, 'verbose': False}
+        if self.device is not None:
+            kwargs['device'] = self.device
+        results = self.model(images, **kwargs)
+
+        outputs = []
+        for image, result in zip(images, results):
+            boxes = result.boxes
+            if boxes is None or len(boxes) == 0:
+                outputs.append((np.zeros(0, np.int32), np.zeros((0, 4), np.float32), np.zeros(0, np.float32)))
+                continue
+
+            cls = boxes.cls.cpu().numpy().astype(np.int32)
+            confs = boxes.conf.cpu().numpy()
+            keep = (cls == self.person_class) & (confs > self.conf)
+            xywhn = boxes.xywhn.cpu().numpy()[keep]
+            xywh = boxes.xywh.cpu().numpy()[keep]
+
+            # Tüm kutuların merkezi tek seferde havuz maskesine bakılır
+            in_pool = self.pool_mask.contains(image.shape, xywh[:, 0], xywh[:, 1])
+            class_ids = np.where(in_pool, SWIMMING_CLASS, POOLSIDE_CLASS).astype(np.int32)
+            outputs.append((class_ids, xywhn, confs[keep]))
+
+        return outputs
+
+    def run(self, force=False, save_every=10, frames=None):
+        """
+        Eksik/değişen kareleri etiketle
+
+        Args:
+            force (bool): Manifest ve elle düzenlemeleri yok sayıp hepsini etiketle
+            save_every (int): Kaç batch'te bir manifest kaydedilsin
+            frames (iterable): Sadece bu kareler arasından seç (None: klasördeki tümü)
+
+        Returns:
+            dict: Özet
+        """
+        todo, plan_stats = self.plan(force, frames)
+        print(f"📊 Etiketleme planı: {len(todo)} işlenecek, {plan_stats['up_to_date']} güncel, "
+              f"{plan_stats['manual']} elle düzenlenmiş (korunuyor)")
+
+        frames = self.manifest['frames']
+        started = time.time()
+        processed = 0
+        unreadable = 0
+        total_detections = 0
+        class_counts = {SWIMMING_CLASS: 0, POOLSIDE_CLASS: 0}
+
+        for batch_index, batch in enumerate(self._iter_batches(todo), 1):
+            valid = [(path, image) for path, image in batch if image is not None]
+            unreadable += len(batch) - len(valid)
+            if not valid:
+                continue
+
+            outputs = self.detect([image for _, image in valid])
+
+            for (frame_path, _), (class_ids, boxes, _) in zip(valid, outputs):
+                label_path = self.labels_dir / f"{frame_path.stem}.txt"
+                write_yolo_labels(str(label_path), class_ids, boxes)
+
+                frame_stat = frame_path.stat()
+                label_stat = label_path.stat()
+                frames[frame_path.name] = {
+                    'size': frame_stat.st_size,
+                    'mtime': frame_stat.st_mtime_ns,
+                    'label_size': label_stat.st_size,
+                    'label_mtime': label_stat.st_mtime_ns,
+                    'model': self.model_hash,
+                    'conf': self.conf,
+                    'pool': self.pool_hash,
+                    'detections': int(len(class_ids)),
+                }
+                total_detections += len(class_ids)
+                for class_id in class_ids:
+                    class_counts[int(class_id)] = class_counts.get(int(class_id), 0) + 1
+
+            processed += len(valid)
+            if batch_index % save_every == 0:
+                self._save_manifest()
+                elapsed = time.time() - started
+                print(f"   📊 {processed}/{len(todo)} kare - {processed / elapsed:.1f} kare/sn")
+
+        self.manifest['model_path'] = self.model_path
+        self._save_manifest()
+
+        elapsed = time.time() - started
+        summary = {
+            'processed': processed,
+            'up_to_date': plan_stats['up_to_date'],
+            'manual': plan_stats['manual'],
+            'unreadable': unreadable,
+            'detections': total_detections,
+            'swimming': class_counts.get(SWIMMING_CLASS, 0),
+            'poolside': class_counts.get(POOLSIDE_CLASS, 0),
+            'seconds': round(elapsed, 1),
+        }
+        print(f"✅ {processed} kare etiketlendi, {total_detections} tespit "
+              f"({summary['swimming']} havuz içi, {summary['poolside']} havuz dışı) - {elapsed:.1f}s")
+        if unreadable:
+            print(f"⚠️  {unreadable} kare okunamadı")
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kareleri toplu ve artımlı otomatik etiketle")
+    parser.add_argument("--model", required=True, help="YOLO model dosyası")
+    parser.add_argument("--frames", default="01_frames", help="Kare klasörü")
+    parser.add_argument("--labels", default="02_labels", help="Etiket klasörü")
+    parser.add_argument("--pool-area", help="pool_area.json (havuz içi/dışı sınıflandırma)")
+    parser.add_argument("--conf", type=float, default=0.3, help="Güven eşiği")
+    parser.add_argument("--batch", type=int, default=16, help="Batch boyutu")
+    parser.add_argument("--imgsz", type=int, default=640, help="Model giriş boyutu")
+    parser.add_argument("--device", help="Cihaz (cpu, 0, mps...)")
+    parser.add_argument("--force", action="store_true", help="Hepsini yeniden etiketle")
+
+    args = parser.parse_args()
+    polygon = load_pool_polygon(args.pool_area) if args.pool_area else None
+
+    labeler = AutoLabeler(args.model, args.frames, args.labels, conf=args.conf, pool_polygon=polygon,
+                          batch_size=args.batch, imgsz=args.imgsz, device=args.device)
+    labeler.run(force=args.force)
+
+
+if __name__ == "__main__":
+    main()
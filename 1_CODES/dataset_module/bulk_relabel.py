@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🔧 TOPLU HAVUZ İÇİ / DIŞI ETİKET DÜZELTME
+========================================
+Tüm etiket kutularını havuz poligonuna göre person_swimming (içi) /
+person_poolside (dışı) olarak yeniden sınıflandırır.
+
+- Kare boyutları dataset indeksinden (varsa) ya da JPEG/PNG başlığından,
+  kare başına bir kez okunur - görüntü decode edilmez
+- Tüm kutular tek NumPy dizisinde toplanır; her kare boyutu için havuz
+  maskesi bir kez rasterize edilir ve kutu merkezleri tek indekslemeyle
+  sınıflandırılır
+- Sadece sınıfı değişen dosyalar paralel ve atomik yazılır; `dry_run=True`
+  hiçbir şey yazmadan değişiklik özetini döndürür
+"""
+
+import os
+import sys
+from pathlib import Path
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_module.label_io import read_yolo_labels, write_yolo_labels, CLASS_NAMES
+from dataset_module.dataset_index import DatasetIndex, INDEX_NAME, read_image_size
+from pool_module.pool_geometry import PoolMask
+
+SWIMMING_CLASS = 0   # person_swimming
+POOLSIDE_CLASS = 2   # person_poolside
+
+
+def frame_sizes(frame_files, workers=8):
+    """
+    Karelerin (width, height) boyutları
+
+    Dataset klasöründe indeks varsa oradan, yoksa dosya başlıklarından okunur.
+
+    Returns:
+        dict: {stem: (width, height)} - okunamayanlar yok
+    """
+    frame_files = [Path(f) for f in frame_files]
+    sizes = {}
+    if frame_files:
+        dataset_dir = frame_files[0].parent.parent
+        if (dataset_dir / INDEX_NAME).exists():
+            with DatasetIndex(dataset_dir, frames_subdir=frame_files[0].parent.name) as index:
+                index.refresh()
+                sizes = {row['stem']: (row['width'], row['height']) for row in index.frames()
+                         if row['width'] and row['height']}
+
+    def header_size(path):
+        try:
+            return path.stem, read_image_size(path)
+        except OSError:
+            return path.stem, None
+
+    missing = [f for f in frame_files if f.stem not in sizes]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for stem, size in executor.map(header_size, missing):
+            if size:
+                sizes[stem] = size
+    return sizes
+
+
+def relabel_by_pool(frame_files, labels_dir, pool_polygon, dry_run=False, workers=8):
+    """
+    Etiketleri havuz içi/dışına göre toplu düzelt
+
+    Args:
+        frame_files (list): Kare dosyaları
+        labels_dir (str): Etiket klasörü
+        pool_polygon (array-like): Havuz poligonu (piksel)
+        dry_run (bool): Sadece özet çıkar, dosya yazma
+        workers (int): Okuma/yazma thread sayısı
+
+    Returns:
+        dict: inside, outside, fixed, files_changed, transitions {(eski, yeni): n},
+              samples [(etiket dosyası, [(eski, yeni), ...])], missing_size, written
+    """
+    labels_dir = Path(labels_dir)
+    frame_files = [Path(f) for f in frame_files]
+    label_files = [labels_dir / f"{f.stem}.txt" for f in frame_files]
+    sizes = frame_sizes(frame_files, workers)
+
+    present = [i for i, path in enumerate(label_files) if path.exists()]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        loaded = list(executor.map(read_yolo_labels, [str(label_files[i]) for i in present]))
+
+    # Tüm kutular tek diziye: (dosya, sınıf, xywhn, kare boyutu)
+    owner, classes, boxes, frame_wh = [], [], [], []
+    missing_size = 0
+    for i, (class_ids, file_boxes) in zip(present, loaded):
+        size = sizes.get(frame_files[i].stem)
+        if size is None:
+            missing_size += 1
+            continue
+        owner.append(np.full(len(class_ids), i, dtype=np.int64))
+        classes.append(class_ids)
+        boxes.append(file_boxes)
+        frame_wh.append(np.tile(np.asarray(size, dtype=np.int64), (len(class_ids), 1)))
+
+    summary = {'inside': 0, 'outside': 0, 'fixed': 0, 'files_changed': 0, 'transitions': {},
+               'samples': [], 'missing_size': missing_size, 'written': 0}
+    if not owner:
+        return summary
+
+    owner = np.concatenate(owner)
+    classes = np.concatenate(classes)
+    boxes = np.concatenate(boxes).reshape(-1, 4)
+    frame_wh = np.concatenate(frame_wh).reshape(-1, 2)
+
+    # Her kare boyutu için maske bir kez; merkezler tek seferde
+    pool_mask = PoolMask(pool_polygon)
+    in_pool = np.zeros(len(classes), dtype=bool)
+    for width, height in np.unique(frame_wh, axis=0):
+        rows = (frame_wh[:, 0] == width) & (frame_wh[:, 1] == height)
+        xs = (boxes[rows, 0] * width).astype(np.int64)
+        ys = (boxes[rows, 1] * height).astype(np.int64)
+        in_pool[rows] = pool_mask.contains((int(height), int(width)), xs, ys)
+
+    new_classes = np.where(in_pool, SWIMMING_CLASS, POOLSIDE_CLASS).astype(np.int32)
+    changed = new_classes != classes
+
+    summary['inside'] = int(in_pool.sum())
+    summary['outside'] = int((~in_pool).sum())
+    summary['fixed'] = int(changed.sum())
+    summary['transitions'] = dict(Counter(zip(classes[changed].tolist(), new_classes[changed].tolist())))
+
+    changed_files = np.unique(owner[changed])
+    summary['files_changed'] = len(changed_files)
+    for i in changed_files[:5]:
+        rows = (owner == i) & changed
+        summary['samples'].append((label_files[i].name, list(zip(classes[rows].tolist(),
+                                                                  new_classes[rows].tolist()))))
+
+    if dry_run or not len(changed_files):
+        return summary
+
+    # Sadece değişen dosyalar: paralel, atomik
+    order = np.argsort(owner, kind='stable')
+    starts = np.searchsorted(owner[order], changed_files, 'left')
+    ends = np.searchsorted(owner[order], changed_files, 'right')
+
+    def write(job):
+        i, start, end = job
+        rows = order[start:end]
+        write_yolo_labels(str(label_files[i]), new_classes[rows], boxes[rows])
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(write, zip(changed_files, starts, ends)))
+    summary['written'] = len(changed_files)
+    return summary
+
+
+def print_relabel_summary(summary, dry_run=False, classes=CLASS_NAMES):
+    """relabel_by_pool() özetini yazdır"""
+    name = lambda class_id: classes[class_id] if 0 <= class_id < len(classes) else str(class_id)
+
+    print(f"   🏊 Havuz içi: {summary['inside']}")
+    print(f"   🏖️ Havuz dışı: {summary['outside']}")
+    print(f"   🔧 {'Düzeltilecek' if dry_run else 'Düzeltilen'}: {summary['fixed']} kutu, "
+          f"{summary['files_changed']} dosya")
+    for (old, new), count in sorted(summary['transitions'].items(), key=lambda item: -item[1]):
+        print(f"      {name(old)} → {name(new)}: {count}")
+    if dry_run:
+        for file_name, changes in summary['samples']:
+            diff = ", ".join(f"{name(old)}→{name(new)}" for old, new in changes[:3])
+            more = f" (+{len(changes) - 3})" if len(changes) > 3 else ""
+            print(f"      📄 {file_name}: {diff}{more}")
+    if summary['missing_size']:
+        print(f"   ⚠️ {summary['missing_size']} etiketin karesi okunamadı (atlandı)")
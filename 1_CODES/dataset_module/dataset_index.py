@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🗃️ DATASET İNDEKSİ (SQLite)
+==========================
+`01_frames` / `02_labels` yapısındaki bir dataset için kalıcı indeks.
+
+Her kare için: dosya adı, boyut, mtime, içerik hash'i (BLAKE2b), görüntü
+boyutları (JPEG/PNG başlığından, decode yok), etiket boyutu/mtime, sınıf
+bazlı kutu sayıları ve kaynak video. İndeks `<dataset>/dataset_index.sqlite`
+dosyasında tutulur.
+
+- `refresh()` sadece yeni/değişen dosyaları hash'ler ve etiketleri yeniden
+  okur; kareler de etiketler gibi her seferinde stat ile karşılaştırılır
+  (yerinde üzerine yazılan kare yeniden hash'lenir, dHash / tahmin önbellekleri
+  frame_hash ile anahtarlı olduğundan kendiliğinden geçersizleşir).
+  `quick=True` ile kare klasörünün mtime'ı değişmediyse kareler hiç taranmaz
+- İstatistik, geçerli çift listesi ve boyuta göre seçim gibi sorgular
+  dosya sistemine dokunmadan SQL ile cevaplanır
+
+Kullanım:
+    with DatasetIndex("5_TİCKET_DATA") as index:
+        index.refresh()
+        print(index.stats())
+        pairs = index.valid_pairs()
+"""
+
+import os
+import re
+import sys
+import struct
+import sqlite3
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_module.label_io import read_yolo_labels, CLASS_NAMES
+
+INDEX_NAME = "dataset_index.sqlite"
+INDEX_VERSION = 1
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# frame_extractor / eski scriptlerin adlandırmaları: video_00012, havuz_telefon_0012s, frame_001_2.0s
+_SOURCE_VIDEO_PATTERN = re.compile(r'^(?P<video>.+?)_\d+(?:_\d+(?:\.\d+)?s|s)?$')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS frames (
+    stem TEXT PRIMARY KEY,
+    file_name TEXT,
+    frame_size INTEGER,
+    frame_mtime INTEGER,
+    frame_hash TEXT,
+    width INTEGER,
+    height INTEGER,
+    label_size INTEGER,
+    label_mtime INTEGER,
+    box_count INTEGER DEFAULT 0,
+    source_video TEXT
+);
+CREATE TABLE IF NOT EXISTS label_classes (
+    stem TEXT,
+    class_id INTEGER,
+    count INTEGER,
+    PRIMARY KEY (stem, class_id)
+);
+CREATE INDEX IF NOT EXISTS idx_frames_size ON frames(frame_size);
+CREATE INDEX IF NOT EXISTS idx_frames_video ON frames(source_video);
+"""
+
+
+def read_image_size(path):
+    """
+    Görüntü boyutlarını sadece dosya başlığından oku (JPEG SOF / PNG IHDR)
+
+    Returns:
+        tuple: (width, height) veya okunamazsa None
+    """
+    with open(path, 'rb') as f:
+        head = f.read(26)
+        if head[:8] == b'\x89PNG\r\n\x1a\n':
+            width, height = struct.unpack('>II', head[16:24])
+            return width, height
+        if head[:2] != b'\xff\xd8':
+            return None
+
+        f.seek(2)
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            code = marker[1]
+            if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+                continue
+            length_bytes = f.read(2)
+            if len(length_bytes) < 2:
+                return None
+            length = struct.unpack('>H', length_bytes)[0]
+            # SOF0..SOF15 (DHT=C4, JPG=C8, DAC=CC hariç)
+            if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+                data = f.read(5)
+                height, width = struct.unpack('>HH', data[1:5])
+                return width, height
+            f.seek(length - 2, 1)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Dosya içeriğinin BLAKE2b (128 bit) hash'i"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_video_from_name(stem):
+    """Kare adından kaynak video adını çıkar (bilinmiyorsa None)"""
+    match = _SOURCE_VIDEO_PATTERN.match(stem)
+    return match.group('video') if match else None
+
+
+def _scan_dir(directory, extensions):
+    """Klasörü tek scandir ile listele: {stem: (ad, boyut, mtime_ns)}"""
+    entries = {}
+    if not os.path.isdir(directory):
+        return entries
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            stem, ext = os.path.splitext(name)
+            if ext.lower() in extensions and entry.is_file():
+                stat = entry.stat()
+                entries[stem] = (name, stat.st_size, stat.st_mtime_ns)
+    return entries
+
+
+def _frame_facts(path):
+    """Yeni/değişen kare için hash + boyut (thread işçisi)"""
+    try:
+        size = read_image_size(path)
+    except OSError:
+        size = None
+    width, height = size if size else (None, None)
+    return file_digest(path), width, height
+
+
+class DatasetIndex:
+    """
+    🗃️ Kare/etiket indeksi
+    """
+
+    def __init__(self, source_dir, frames_subdir="01_frames", labels_subdir="02_labels", db_path=None):
+        """
+        Args:
+            source_dir (str): Dataset kök klasörü
+            frames_subdir (str): Kare klasörü
+            labels_subdir (str): Etiket klasörü
+            db_path (str): İndeks dosyası (varsayılan: <source_dir>/dataset_index.sqlite)
+        """
+        self.source_dir = Path(source_dir)
+        self.frames_dir = self.source_dir / frames_subdir
+        self.labels_dir = self.source_dir / labels_subdir
+        self.db_path = Path(db_path) if db_path else self.source_dir / INDEX_NAME
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+
+        if self._meta('version') != str(INDEX_VERSION):
+            with self.conn:
+                self.conn.execute("DELETE FROM frames")
+                self.conn.execute("DELETE FROM label_classes")
+                self.conn.execute("DELETE FROM meta")
+                self._set_meta('version', INDEX_VERSION)
+
+    def _meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    # ------------------------------------------------------------------
+    # Güncelleme
+    # ------------------------------------------------------------------
+
+    def refresh(self, full=False, hash_workers=8, quick=False):
+        """
+        İndeksi dosya sistemiyle artımlı eşitle
+
+        Args:
+            full (bool): Kare klasörü mtime kısayolunu kullanma (quick'i ezer)
+            hash_workers (int): Hash hesaplayan thread sayısı
+            quick (bool): Kare klasörünün mtime'ı aynıysa kareleri tarama. Klasör
+                mtime'ı sadece dosya ekleme/silme/yeniden adlandırmada değişir;
+                yerinde üzerine yazılan kareler kaçar
+
+        Returns:
+            dict: {'frames_added', 'frames_updated', 'frames_removed', 'labels_updated'}
+        """
+        result = {'frames_added': 0, 'frames_updated': 0, 'frames_removed': 0, 'labels_updated': 0}
+
+        known = {row['stem']: row for row in self.conn.execute(
+            "SELECT stem, file_name, frame_size, frame_mtime, label_size, label_mtime FROM frames")}
+
+        with self.conn:
+            # Kareler de yerinde üzerine yazılabilir: klasör mtime kısayolu sadece istenirse
+            frames_mtime = self.frames_dir.stat().st_mtime_ns if self.frames_dir.exists() else 0
+            if full or not quick or self._meta('frames_dir_mtime') != str(frames_mtime):
+                self._refresh_frames(known, result, hash_workers)
+                self._set_meta('frames_dir_mtime', frames_mtime)
+                known = {row['stem']: row for row in self.conn.execute(
+                    "SELECT stem, file_name, frame_size, frame_mtime, label_size, label_mtime FROM frames")}
+
+            # Etiketler editörlerde yerinde yazılabilir: her zaman stat karşılaştır
+            self._refresh_labels(known, result)
+
+        changed = sum(result.values())
+        if changed:
+            print(f"🗃️  İndeks güncellendi: +{result['frames_added']} kare, "
+                  f"~{result['frames_updated']} değişen, -{result['frames_removed']} silinen, "
+                  f"{result['labels_updated']} etiket")
+        return result
+
+    def _refresh_frames(self, known, result, hash_workers):
+        on_disk = _scan_dir(self.frames_dir, IMAGE_EXTENSIONS)
+
+        removed = [stem for stem in known if stem not in on_disk]
+        if removed:
+            self.conn.executemany("DELETE FROM frames WHERE stem = ?", [(s,) for s in removed])
+            self.conn.executemany("DELETE FROM label_classes WHERE stem = ?", [(s,) for s in removed])
+            result['frames_removed'] = len(removed)
+
+        changed = []
+        for stem, (name, size, mtime) in on_disk.items():
+            row = known.get(stem)
+            if row is None or row['file_name'] != name or row['frame_size'] != size or row['frame_mtime'] != mtime:
+                changed.append((stem, name, size, mtime, row is None))
+        if not changed:
+            return
+
+        with ThreadPoolExecutor(max_workers=hash_workers) as executor:
+            facts = executor.map(_frame_facts, [str(self.frames_dir / c[1]) for c in changed])
+            rows = []
+            for (stem, name, size, mtime, is_new), (digest, width, height) in zip(changed, facts):
+                rows.append((stem, name, size, mtime, digest, width, height, source_video_from_name(stem)))
+                if is_new:
+                    result['frames_added'] += 1
+                else:
+                    result['frames_updated'] += 1
+
+        self.conn.executemany("""
+            INSERT INTO frames (stem, file_name, frame_size, frame_mtime, frame_hash, width, height, source_video)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(stem) DO UPDATE SET
+                file_name = excluded.file_name, frame_size = excluded.frame_size,
+                frame_mtime = excluded.frame_mtime, frame_hash = excluded.frame_hash,
+                width = excluded.width, height = excluded.height, source_video = excluded.source_video
+        """, rows)
+
+    def _refresh_labels(self, known, result):
+        on_disk = _scan_dir(self.labels_dir, ('.txt',))
+
+        updates = []
+        class_rows = []
+        cleared = []
+        for stem, row in known.items():
+            label = on_disk.get(stem)
+            if label is None:
+                if row['label_size'] is not None:
+                    updates.append((None, None, 0, stem))
+                    cleared.append((stem,))
+                continue
+
+            _, size, mtime = label
+            if row['label_size'] == size and row['label_mtime'] == mtime:
+                continue
+
+            class_ids, _ = read_yolo_labels(str(self.labels_dir / label[0]))
+            updates.append((size, mtime, int(len(class_ids)), stem))
+            cleared.append((stem,))
+            if len(class_ids):
+                counts = np.bincount(class_ids[class_ids >= 0])
+                class_rows.extend((stem, int(c), int(n)) for c, n in enumerate(counts) if n)
+
+        if not updates:
+            return
+
+        self.conn.executemany("DELETE FROM label_classes WHERE stem = ?", cleared)
+        self.conn.executemany(
+            "UPDATE frames SET label_size = ?, label_mtime = ?, box_count = ? WHERE stem = ?", updates)
+        self.conn.executemany("INSERT INTO label_classes (stem, class_id, count) VALUES (?, ?, ?)", class_rows)
+        result['labels_updated'] = len(updates)
+
+    # ------------------------------------------------------------------
+    # Sorgular
+    # ------------------------------------------------------------------
+
+    def frame_path(self, stem):
+        row = self.conn.execute("SELECT file_name FROM frames WHERE stem = ?", (stem,)).fetchone()
+        return self.frames_dir / (row[0] if row else f"{stem}.jpg")
+
+    def label_path(self, stem):
+        return self.labels_dir / f"{stem}.txt"
+
+    def valid_pairs(self, order_by=None, limit=None):
+        """
+        Etiketi olan karelerin stem listesi
+
+        Args:
+            order_by (str): None | 'size' (büyükten küçüğe) | 'name'
+            limit (int): Maksimum sonuç
+        """
+        query = "SELECT stem FROM frames WHERE label_size IS NOT NULL"
+        if order_by == 'size':
+            query += " ORDER BY frame_size DESC"
+        elif order_by == 'name':
+            query += " ORDER BY stem"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        return [row[0] for row in self.conn.execute(query)]
+
+    def frames(self, labeled_only=False, order_by=None):
+        """
+        Kare kayıtları (dict listesi)
+
+        Args:
+            labeled_only (bool): Sadece etiketi olanlar
+            order_by (str): None | 'size' | 'pair_size' (kare+etiket, büyükten küçüğe) | 'name'
+        """
+        query = "SELECT * FROM frames"
+        if labeled_only:
+            query += " WHERE label_size IS NOT NULL"
+        if order_by == 'size':
+            query += " ORDER BY frame_size DESC"
+        elif order_by == 'pair_size':
+            query += " ORDER BY frame_size + COALESCE(label_size, 0) DESC"
+        elif order_by == 'name':
+            query += " ORDER BY stem"
+        return [dict(row) for row in self.conn.execute(query)]
+
+    def class_totals(self):
+        """{class_id: toplam kutu}"""
+        return {row[0]: row[1] for row in self.conn.execute(
+            "SELECT class_id, SUM(count) FROM label_classes GROUP BY class_id ORDER BY class_id")}
+
+    def stats(self):
+        """
+        Dataset özeti
+
+        Returns:
+            dict: frames, labels, valid_pairs, annotations, class_counts, videos, bytes
+        """
+        row = self.conn.execute("""
+            SELECT COUNT(*), COUNT(label_size), COALESCE(SUM(box_count), 0),
+                   COALESCE(SUM(frame_size), 0) + COALESCE(SUM(label_size), 0)
+            FROM frames
+        """).fetchone()
+        videos = {r[0] or '?': r[1] for r in self.conn.execute(
+            "SELECT source_video, COUNT(*) FROM frames GROUP BY source_video ORDER BY 2 DESC")}
+        return {
+            'frames': row[0],
+            'labels': row[1],
+            'valid_pairs': row[1],
+            'annotations': row[2],
+            'class_counts': self.class_totals(),
+            'videos': videos,
+            'bytes': row[3],
+        }
+
+    def duplicates(self):
+        """Aynı içerik hash'ine sahip kare grupları"""
+        groups = {}
+        for stem, digest in self.conn.execute("""
+            SELECT stem, frame_hash FROM frames WHERE frame_hash IN (
+                SELECT frame_hash FROM frames GROUP BY frame_hash HAVING COUNT(*) > 1)
+            ORDER BY frame_hash, stem
+        """):
+            groups.setdefault(digest, []).append(stem)
+        return list(groups.values())
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def print_stats(stats, classes=CLASS_NAMES):
+    """stats() çıktısını yazdır"""
+    print(f"📸 Toplam frame: {stats['frames']}")
+    print(f"🏷️ Toplam label dosyası: {stats['labels']}")
+    print(f"📊 Toplam annotation: {stats['annotations']}")
+    print("📈 Sınıf dağılımı:")
+    total = stats['annotations']
+    for class_id, class_name in enumerate(classes):
+        count = stats['class_counts'].get(class_id, 0)
+        percentage = (count / total * 100) if total > 0 else 0
+        print(f"   {class_name}: {count} ({percentage:.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dataset indeksini güncelle ve özetle")
+    parser.add_argument("dataset", help="Dataset klasörü (01_frames / 02_labels içeren)")
+    parser.add_argument("--full", action="store_true", help="Tüm kareleri yeniden tara")
+    parser.add_argument("--quick", action="store_true",
+                        help="Kare klasörü değişmediyse kareleri tarama (yerinde düzenlemeleri kaçırır)")
+    args = parser.parse_args()
+
+    with DatasetIndex(args.dataset) as index:
+        index.refresh(full=args.full, quick=args.quick)
+        stats = index.stats()
+        print_stats(stats)
+        print(f"🎬 Kaynak videolar: {stats['videos']}")
+        print(f"💾 Toplam boyut: {stats['bytes'] / (1024 * 1024):.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
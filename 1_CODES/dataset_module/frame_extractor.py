@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🎬 PARALEL KARE ÇIKARMA (ANNOTATION DATASETİ)
+=============================================
+Videolardan belirli aralıklarla kare çıkarır.
+
+- Hedef kareler zaman aralıklarına bölünür, her aralık ayrı süreçte
+  decode edilir (birden fazla video aynı havuzda işlenir)
+- Seek indeksi (ffprobe) varsa atlanacak bölümler keyframe'e zıplanarak
+  geçilir; ara kareler sadece grab() edilir (renk dönüşümü yapılmaz)
+- JPEG encode + yazma süreç içi thread havuzunda yapılır, kalite ayarlanabilir
+- Dosyalar önce .tmp olarak yazılıp atomik taşınır; diskte olan kareler
+  atlandığı için yarıda kalan çalıştırma kaldığı yerden devam eder
+
+Kullanım:
+    python frame_extractor.py video1.MOV video2.MOV --output 01_frames --interval 1
+"""
+
+import os
+import sys
+import math
+import time
+import bisect
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import cv2
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from video_module.seek_index import load_seek_index
+
+DEFAULT_NAME_PATTERN = "{video}_{index:05d}.jpg"
+SEEK_GAP_SECONDS = 2.0     # Keyframe bilgisi yoksa bundan uzun boşluklarda seek yap
+
+
+def _write_jpeg(path, frame, quality):
+    """Kareyi JPEG olarak atomik yaz (imencode + tofile: ASCII dışı yollarda da çalışır)"""
+    ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+    if not ok:
+        return False
+    temp_path = path + ".tmp"
+    buffer.tofile(temp_path)
+    os.replace(temp_path, path)
+    return True
+
+
+def _plan_targets(video_path, output_dir, interval, name_pattern, max_frames=None):
+    """
+    Videodan çıkarılacak kareleri belirle
+
+    Returns:
+        tuple: (hedefler [(kare no, zaman, çıktı yolu)], keyframe zamanları, süre)
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"❌ Video açılamadı: {video_path}")
+        return [], [], 0.0
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    # Tam tarama çıkarma işinin kendisi kadar sürer: sadece ffprobe/önbellek
+    index = load_seek_index(video_path, allow_scan=False)
+    pts = index['pts'] if index else None
+    keyframe_times = [pts[i] for i in index['keyframes']] if index else []
+    duration = pts[-1] if pts else total_frames / fps
+
+    video_name = os.path.splitext(os.path.basename(video_path))[0]
+    targets = []
+    last_frame = -1
+    k = 0
+    while max_frames is None or len(targets) < max_frames:
+        t = k * interval
+        if pts:
+            frame_index = bisect.bisect_left(pts, t - 1e-6)
+            if frame_index >= len(pts):
+                break
+            t = pts[frame_index]
+        else:
+            frame_index = int(round(t * fps))
+            if frame_index >= total_frames:
+                break
+
+        if frame_index != last_frame:
+            name = name_pattern.format(video=video_name, index=len(targets),
+                                       number=len(targets) + 1, time=t, frame=frame_index)
+            targets.append((frame_index, t, os.path.join(output_dir, name)))
+            last_frame = frame_index
+        k += 1
+
+    return targets, keyframe_times, duration
+
+
+def _extract_chunk(job):
+    """
+    Tek zaman aralığındaki hedef kareleri çıkar (süreç işçisi)
+
+    Args:
+        job (dict): video_path, targets, keyframe_times, fps, quality, writer_threads
+
+    Returns:
+        tuple: (video_path, yazılan kare sayısı, okunamayan kare sayısı)
+    """
+    cap = cv2.VideoCapture(job['video_path'])
+    if not cap.isOpened():
+        return job['video_path'], 0, len(job['targets'])
+
+    keyframe_times = job['keyframe_times']
+    tolerance = 0.5 / job['fps']
+    position = None          # Son grab edilen karenin zamanı
+    written = 0
+    failed = 0
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=job['writer_threads']) as writers:
+        for _, target_time, path in job['targets']:
+            # Keyframe hedefle mevcut konum arasındaysa zıpla, değilse ileri grab et
+            k = bisect.bisect_right(keyframe_times, target_time + tolerance) - 1
+            if keyframe_times:
+                if k >= 0 and (position is None or keyframe_times[k] > position + tolerance):
+                    cap.set(cv2.CAP_PROP_POS_MSEC, keyframe_times[k] * 1000.0)
+            elif position is None or target_time - position > SEEK_GAP_SECONDS:
+                cap.set(cv2.CAP_PROP_POS_MSEC, target_time * 1000.0)
+
+            found = False
+            while cap.grab():
+                position = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                if position >= target_time - tolerance:
+                    found = True
+                    break
+
+            ret, frame = cap.retrieve() if found else (False, None)
+            if not ret:
+                failed += 1
+                continue
+
+            pending.append(writers.submit(_write_jpeg, path, frame, job['quality']))
+            # 4K karelerle bellek şişmesin: bekleyen yazma sayısını sınırla
+            while len(pending) > job['writer_threads'] * 2:
+                written += pending.popleft().result()
+
+        while pending:
+            written += pending.popleft().result()
+
+    cap.release()
+    return job['video_path'], written, failed
+
+
+def extract_frames(video_paths, output_dir, interval=1.0, name_pattern=DEFAULT_NAME_PATTERN,
+                   quality=95, workers=None, writer_threads=4, resume=True, max_frames=None,
+                   with_summary=False):
+    """
+    Videolardan paralel kare çıkar
+
+    Args:
+        video_paths (str | list): Video dosyası veya listesi
+        output_dir (str): Çıktı klasörü
+        interval (float): Kareler arası süre (saniye)
+        name_pattern (str): Dosya adı şablonu; {video}, {index} (0 tabanlı),
+            {number} (1 tabanlı), {time} (saniye), {frame} (kare no)
+        quality (int): JPEG kalitesi (0-100)
+        workers (int): Süreç sayısı (None: CPU sayısı)
+        writer_threads (int): Süreç başına JPEG yazma thread'i
+        resume (bool): Diskte olan kareleri atla
+        max_frames (int): Video başına maksimum kare
+        with_summary (bool): Sayaçları da döndür
+
+    Returns:
+        dict: {video_path: [kare yolları (sıralı, atlananlar dahil)]};
+            with_summary=True ise (dict, {'written', 'skipped', 'failed', 'seconds'})
+    """
+    if isinstance(video_paths, str):
+        video_paths = [video_paths]
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    started = time.time()
+    results = {}
+    jobs = []
+    total_duration = 0.0
+    skipped = 0
+
+    for video_path in video_paths:
+        if not os.path.exists(video_path):
+            print(f"❌ Video bulunamadı: {video_path}")
+            continue
+
+        targets, keyframe_times, duration = _plan_targets(
+            video_path, output_dir, interval, name_pattern, max_frames)
+        results[video_path] = [path for _, _, path in targets]
+        total_duration += duration
+
+        if resume:
+            remaining = [t for t in targets if not (os.path.exists(t[2]) and os.path.getsize(t[2]) > 0)]
+            skipped += len(targets) - len(remaining)
+            targets = remaining
+
+        if not targets:
+            continue
+
+        cap = cv2.VideoCapture(video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        cap.release()
+
+        # Her süreç birkaç parça alsın (yük dengesi), parçalar zaman sırasında
+        chunk_size = max(1, math.ceil(len(targets) / (workers * 2)))
+        for i in range(0, len(targets), chunk_size):
+            chunk = targets[i:i + chunk_size]
+            # İşçiye sadece kendi aralığını etkileyen keyframe'ler gönderilir
+            first = max(0, bisect.bisect_right(keyframe_times, chunk[0][1]) - 1)
+            last = bisect.bisect_right(keyframe_times, chunk[-1][1] + 1.0)
+            jobs.append({
+                'video_path': video_path,
+                'targets': chunk,
+                'keyframe_times': keyframe_times[first:last],
+                'fps': fps,
+                'quality': quality,
+                'writer_threads': writer_threads,
+            })
+
+    total_targets = sum(len(job['targets']) for job in jobs)
+    print(f"🎬 {len(results)} video, {total_targets} kare çıkarılacak "
+          f"({skipped} kare zaten mevcut), {workers} süreç")
+
+    written = 0
+    failed = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_chunk, job) for job in jobs]
+            for done, future in enumerate(as_completed(futures), 1):
+                _, chunk_written, chunk_failed = future.result()
+                written += chunk_written
+                failed += chunk_failed
+                print(f"   📊 Parça {done}/{len(jobs)} - yazılan: {written}/{total_targets}")
+
+    elapsed = time.time() - started
+    speed = total_duration / elapsed if elapsed > 0 else 0.0
+    print(f"✅ {written} kare yazıldı, {failed} okunamadı - {elapsed:.1f}s "
+          f"(video süresinin {speed:.1f}x hızı)")
+    if with_summary:
+        return results, {'written': written, 'skipped': skipped, 'failed': failed,
+                         'seconds': round(elapsed, 1)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Videolardan paralel kare çıkar")
+    parser.add_argument("videos", nargs="+", help="Video dosyaları")
+    parser.add_argument("--output", required=True, help="Çıktı klasörü")
+    parser.add_argument("--interval", type=float, default=1.0, help="Kareler arası süre (saniye)")
+    parser.add_argument("--pattern", default=DEFAULT_NAME_PATTERN, help="Dosya adı şablonu")
+    parser.add_argument("--quality", type=int, default=95, help="JPEG kalitesi")
+    parser.add_argument("--workers", type=int, help="Süreç sayısı")
+    parser.add_argument("--writers", type=int, default=4, help="Süreç başına yazma thread'i")
+    parser.add_argument("--max-frames", type=int, help="Video başına maksimum kare")
+    parser.add_argument("--no-resume", action="store_true", help="Mevcut kareleri yeniden yaz")
+
+    args = parser.parse_args()
+    extract_frames(args.videos, args.output, interval=args.interval, name_pattern=args.pattern,
+                   quality=args.quality, workers=args.workers, writer_threads=args.writers,
+                   resume=not args.no_resume, max_frames=args.max_frames)
+
+
+if __name__ == "__main__":
+    main()
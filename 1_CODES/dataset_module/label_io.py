@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🏷️ YOLO ETİKET OKUMA / YAZMA
+===========================
+Etiket dosyaları için ortak yardımcılar. Yazma işlemleri önce .tmp dosyaya
+yapılıp atomik olarak taşınır; yarıda kesilen bir çalıştırma yarım
+etiket dosyası bırakmaz.
+"""
+
+import os
+import json
+
+import numpy as np
+
+CLASS_NAMES = ['person_swimming', 'person_drowning', 'person_poolside', 'pool_equipment']
+
+
+def atomic_write_text(path, text):
+    """Metni atomik yaz"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def atomic_write_json(path, data):
+    """JSON'u atomik yaz"""
+    atomic_write_text(path, json.dumps(data, ensure_ascii=False, indent=1))
+
+
+def format_yolo_line(class_id, x_center, y_center, width, height):
+    """YOLO satırı: class x_center y_center width height (normalize)"""
+    return f"{int(class_id)} {x_center:.6f} {y_center:.6f} {width:.6f} {height:.6f}"
+
+
+def write_yolo_labels(path, class_ids, boxes):
+    """
+    Etiketleri atomik yaz
+
+    Args:
+        path (str): .txt etiket yolu
+        class_ids (array-like): Sınıf ID'leri
+        boxes (array-like): (N, 4) normalize xywh
+    """
+    lines = [format_yolo_line(c, *box) for c, box in zip(class_ids, boxes)]
+    atomic_write_text(path, '\n'.join(lines))
+
+
+def read_yolo_labels(path):
+    """
+    Etiket dosyasını oku
+
+    Returns:
+        tuple: (sınıflar (N,) int32, kutular (N, 4) float32 normalize xywh);
+            dosya yoksa / boşsa boş diziler. Bozuk satırlar atlanır.
+    """
+    classes, boxes = [], []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 5:
+                    continue
+                try:
+                    box = [float(v) for v in parts[1:5]]
+                    classes.append(int(parts[0]))
+                except ValueError:
+                    continue
+                boxes.append(box)
+    except OSError:
+        pass
+
+    return (np.asarray(classes, dtype=np.int32),
+            np.asarray(boxes, dtype=np.float32).reshape(-1, 4))
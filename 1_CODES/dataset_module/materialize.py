@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🔗 DATASET MATERIALIZATION (LINK / LİSTE)
+=========================================
+Train/val, chunk ve mini-set klasörlerini JPEG'leri kopyalamadan kurar.
+
+Kare başına sırasıyla denenir (mode='auto'):
+  1. hardlink  - aynı dosya sisteminde anında, ek disk alanı yok
+  2. reflink   - copy-on-write klon (Linux FICLONE: btrfs/xfs)
+  3. copy      - farklı dosya sistemi vb. durumlarda `shutil.copy2`
+Symlink sadece açıkça istenirse kullanılır (git'e eklenecek mini setlerde
+içerik yerine bağlantı saklanacağı için otomatik seçilmez).
+
+Etiketler küçük ve editörlerde değiştirilebildiği için her zaman kopyalanır;
+böylece hedefte yapılan bir düzenleme kaynağı bozmaz.
+
+Alternatif olarak `write_image_list()` hiçbir dosya oluşturmadan YOLO'nun
+doğrudan okuyabileceği bir görüntü listesi (train.txt / val.txt) yazar.
+"""
+
+import os
+import sys
+import shutil
+from pathlib import Path
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_module.dataset_index import file_digest
+
+LINK_MODES = ('auto', 'hardlink', 'reflink', 'symlink', 'copy')
+_FICLONE = 0x40049409   # linux/fs.h
+
+
+def _reflink(src, dst):
+    """Copy-on-write klon (sadece destekleyen Linux dosya sistemlerinde)"""
+    import fcntl
+
+    with open(src, 'rb') as source, open(dst, 'wb') as target:
+        try:
+            fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+        except OSError:
+            target.close()
+            os.remove(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def link_file(src, dst, mode='auto'):
+    """
+    Tek dosyayı hedefe bağla/kopyala
+
+    Args:
+        src (str): Kaynak dosya
+        dst (str): Hedef yol (varsa değiştirilir)
+        mode (str): 'auto' | 'hardlink' | 'reflink' | 'symlink' | 'copy'
+
+    Returns:
+        str: Kullanılan yöntem
+    """
+    src, dst = str(src), str(dst)
+    if os.path.lexists(dst):
+        if mode in ('auto', 'hardlink') and os.path.exists(dst) and os.path.samefile(src, dst):
+            return 'hardlink'
+        os.remove(dst)
+
+    if mode == 'symlink':
+        os.symlink(os.path.abspath(src), dst)
+        return 'symlink'
+
+    if mode in ('auto', 'hardlink'):
+        try:
+            os.link(src, dst)
+            return 'hardlink'
+        except OSError:
+            if mode == 'hardlink':
+                raise
+
+    if mode in ('auto', 'reflink') and sys.platform.startswith('linux'):
+        try:
+            _reflink(src, dst)
+            return 'reflink'
+        except (OSError, ImportError):
+            if mode == 'reflink':
+                raise
+
+    shutil.copy2(src, dst)
+    return 'copy'
+
+
+def materialize_pairs(pairs, frames_dir, labels_dir, target_images, target_labels,
+                      mode='auto', workers=8):
+    """
+    Kare/etiket çiftlerini hedef klasörlere kur
+
+    Args:
+        pairs (list): (kare dosya adı, etiket dosya adı veya None) listesi
+        frames_dir, labels_dir (Path): Kaynak klasörler
+        target_images, target_labels (Path): Hedef klasörler
+        mode (str): Kare bağlama yöntemi (bkz. link_file)
+        workers (int): Dosya işlemi thread sayısı
+
+    Returns:
+        dict: {'ok': n, 'failed': [(ad, hata)], 'methods': {yöntem: n}}
+    """
+    frames_dir, labels_dir = Path(frames_dir), Path(labels_dir)
+    target_images, target_labels = Path(target_images), Path(target_labels)
+    target_images.mkdir(parents=True, exist_ok=True)
+    target_labels.mkdir(parents=True, exist_ok=True)
+
+    def place(pair):
+        frame_name, label_name = pair
+        try:
+            method = link_file(frames_dir / frame_name, target_images / frame_name, mode)
+            if label_name is not None:
+                shutil.copy2(labels_dir / label_name, target_labels / label_name)
+            return frame_name, method, None
+        except OSError as e:
+            return frame_name, None, e
+
+    methods = Counter()
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for frame_name, method, error in executor.map(place, pairs):
+            if error is None:
+                methods[method] += 1
+            else:
+                failed.append((frame_name, error))
+
+    return {'ok': sum(methods.values()), 'failed': failed, 'methods': dict(methods)}
+
+
+def materialize_from_index(index, stems, target_images, target_labels, mode='auto', workers=8):
+    """
+    İndeksteki karelerden hedef klasör kur
+
+    Args:
+        index (DatasetIndex): Kaynak dataset indeksi
+        stems (list): Kare stem listesi
+
+    Returns:
+        dict: materialize_pairs() çıktısı
+    """
+    rows = {row['stem']: row for row in index.frames()}
+    pairs = []
+    for stem in stems:
+        row = rows.get(stem)
+        if row is None:
+            continue
+        label_name = f"{stem}.txt" if row['label_size'] is not None else None
+        pairs.append((row['file_name'], label_name))
+    return materialize_pairs(pairs, index.frames_dir, index.labels_dir,
+                             target_images, target_labels, mode, workers)
+
+
+def verify_materialized(index, stems, target_images, target_labels, check_hash=False, workers=8):
+    """
+    Hedefin indeksle birebir eşleştiğini doğrula
+
+    Args:
+        check_hash (bool): Boyuta ek olarak içerik hash'ini de karşılaştır
+
+    Returns:
+        list: (stem, sorun) listesi - boşsa hedef tutarlı
+    """
+    rows = {row['stem']: row for row in index.frames()}
+    target_images, target_labels = Path(target_images), Path(target_labels)
+
+    def check(stem):
+        row = rows.get(stem)
+        if row is None:
+            return stem, "indekste yok"
+        image = target_images / row['file_name']
+        if not image.exists():
+            return stem, "görüntü eksik"
+        if image.stat().st_size != row['frame_size']:
+            return stem, "görüntü boyutu farklı"
+        if row['label_size'] is not None:
+            label = target_labels / f"{stem}.txt"
+            if not label.exists():
+                return stem, "etiket eksik"
+            if label.stat().st_size != row['label_size']:
+                return stem, "etiket boyutu farklı"
+        if check_hash and file_digest(image) != row['frame_hash']:
+            return stem, "görüntü içeriği farklı"
+        return stem, None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [(stem, problem) for stem, problem in executor.map(check, stems) if problem]
+
+
+def write_image_list(index, stems, list_path):
+    """
+    YOLO'nun okuyabileceği görüntü listesi yaz (hiç dosya kopyalamadan)
+
+    YOLO etiket yolunu görüntü yolundaki `images` bileşenini `labels` ile
+    değiştirerek bulur; bu yüzden dataset kökünde `images -> 01_frames` ve
+    `labels -> 02_labels` bağlantıları (bir kez) oluşturulur.
+
+    Returns:
+        int: Listeye yazılan görüntü sayısı
+    """
+    root = index.source_dir.resolve()
+    for alias, target in (('images', index.frames_dir), ('labels', index.labels_dir)):
+        alias_path = root / alias
+        if not os.path.lexists(alias_path):
+            os.symlink(Path(target).resolve(), alias_path, target_is_directory=True)
+
+    rows = {row['stem']: row['file_name'] for row in index.frames()}
+    lines = [str(root / 'images' / rows[stem]) for stem in stems if stem in rows]
+
+    list_path = Path(list_path)
+    list_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = list_path.with_name(list_path.name + ".tmp")
+    temp_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    os.replace(temp_path, list_path)
+    return len(lines)
+
+
+def print_materialize_result(result, set_name):
+    """materialize_* çıktısını yazdır"""
+    methods = ", ".join(f"{name}: {count}" for name, count in sorted(result['methods'].items()))
+    print(f"✅ {set_name}: {result['ok']} dosya ({methods or '-'})")
+    for name, error in result['failed'][:5]:
+        print(f"⚠️ Hata {name}: {error}")
+    if len(result['failed']) > 5:
+        print(f"⚠️ ... ve {len(result['failed']) - 5} hata daha")
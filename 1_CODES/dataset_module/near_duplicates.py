@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🪞 YAKIN KOPYA (NEAR-DUPLICATE) FİLTRESİ
+=======================================
+Sabit havuz kamerasından 1 fps ile çıkarılan kareler çoğunlukla neredeyse
+aynıdır. Bu modül her kare için 64 bit dHash hesaplar, Hamming mesafesi
+`threshold` altındaki kareleri gruplar ve gruplardan çeşitli temsilciler seçer.
+
+- dHash: JPEG 1/8 ölçekte gri decode edilir (IMREAD_REDUCED_GRAYSCALE_8),
+  9x8'e küçültülür; bitler batch halinde numpy ile çıkarılır
+- Hash'ler dataset indeksinde içerik hash'ine göre saklanır; sadece yeni
+  kareler decode edilir
+- Gruplama: multi-index hashing - 64 bit 4 x 16 bitlik tabloya bölünür;
+  güvercin yuvası ilkesiyle yakın her çift en az bir parçada
+  threshold // 4 bit içinde eşleşir. Aday çiftlerin mesafesi vektörel
+  hesaplanır, bileşenler vektörel union-find ile birleştirilir
+- `group_split()` aynı gruptaki karelerin train ve val'e bölünmesini engeller
+
+Kullanım:
+    with DatasetIndex("9_TICKETv2") as index:
+        index.refresh()
+        groups = near_duplicate_groups(index, index.valid_pairs())
+        keep = select_representatives(groups, index)
+"""
+
+import os
+import sys
+import random
+import argparse
+from itertools import combinations
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dataset_module.auto_labeler import read_image
+from dataset_module.dataset_index import DatasetIndex
+
+HASH_SIZE = 8               # 8x8 = 64 bit
+DEFAULT_THRESHOLD = 6       # 64 bitten en fazla 6 farklı bit -> yakın kopya
+_CHUNKS = 4                 # Multi-index: 4 x 16 bit tablo
+_CHUNK_BITS = 16
+_BLOCK_ELEMENTS = 1 << 22   # Aday çift bloğu (bellek sınırı)
+
+_POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS perceptual_hashes (
+    frame_hash TEXT PRIMARY KEY,
+    dhash INTEGER
+);
+"""
+
+
+def popcount64(values):
+    """uint64 dizisindeki her elemanın 1 bit sayısı"""
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):   # numpy >= 2.0
+        return np.bitwise_count(values).astype(np.int32)
+    counts = _POPCOUNT8[values.view(np.uint8)]
+    return counts.reshape(values.shape + (8,)).sum(axis=-1, dtype=np.int32)
+
+
+def _load_thumbnail(path):
+    """dHash için küçük gri görüntü (decode sırasında 1/8 ölçek)"""
+    image = read_image(path, cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if image is None:
+        return None
+    return cv2.resize(image, (HASH_SIZE + 1, HASH_SIZE), interpolation=cv2.INTER_AREA)
+
+
+def dhash_batch(thumbnails):
+    """
+    Küçük görüntü yığınından dHash (vektörel)
+
+    Args:
+        thumbnails (np.ndarray): (N, 8, 9) uint8
+
+    Returns:
+        np.ndarray: (N,) uint64
+    """
+    thumbnails = np.asarray(thumbnails, dtype=np.int16)
+    bits = thumbnails[:, :, 1:] > thumbnails[:, :, :-1]
+    packed = np.packbits(bits.reshape(len(thumbnails), -1), axis=1)
+    return packed.view('>u8').ravel().astype(np.uint64)
+
+
+def compute_dhashes(paths, workers=8, batch_size=256):
+    """
+    Dosyaların dHash'lerini hesapla
+
+    Returns:
+        tuple: (hashes uint64 (N,), valid bool (N,)) - okunamayanlar valid=False
+    """
+    paths = [str(p) for p in paths]
+    hashes = np.zeros(len(paths), dtype=np.uint64)
+    valid = np.zeros(len(paths), dtype=bool)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(paths), batch_size):
+            thumbnails = list(executor.map(_load_thumbnail, paths[start:start + batch_size]))
+            ok = [i for i, thumb in enumerate(thumbnails) if thumb is not None]
+            if ok:
+                positions = start + np.array(ok)
+                hashes[positions] = dhash_batch(np.stack([thumbnails[i] for i in ok]))
+                valid[positions] = True
+
+    return hashes, valid
+
+
+def index_dhashes(index, stems=None, workers=8):
+    """
+    İndeksteki karelerin dHash'leri (indekste önbelleklenir)
+
+    Hash, kare içerik hash'ine bağlı saklanır; yeniden adlandırılan veya
+    kopyalanan kareler tekrar decode edilmez.
+
+    Args:
+        index (DatasetIndex): Güncel (refresh edilmiş) indeks
+        stems (list): Sadece bu kareler (None = hepsi)
+
+    Returns:
+        tuple: (stem listesi, hashes uint64) - okunamayan kareler listede yok
+    """
+    index.conn.executescript(_SCHEMA)
+    rows = index.frames()
+    if stems is not None:
+        wanted = set(stems)
+        rows = [row for row in rows if row['stem'] in wanted]
+
+    cached = {digest: value for digest, value in index.conn.execute(
+        "SELECT frame_hash, dhash FROM perceptual_hashes")}
+    missing = [row for row in rows if row['frame_hash'] not in cached]
+
+    if missing:
+        print(f"🪞 {len(missing)} kare için dHash hesaplanıyor...")
+        hashes, valid = compute_dhashes([index.frames_dir / row['file_name'] for row in missing], workers)
+        new_rows = [(row['frame_hash'], int(value))
+                    for row, value, ok in zip(missing, hashes.view(np.int64), valid) if ok]
+        with index.conn:
+            # SQLite INTEGER işaretli 64 bit: int64 görünümüyle saklanır
+            index.conn.executemany(
+                "INSERT OR REPLACE INTO perceptual_hashes (frame_hash, dhash) VALUES (?, ?)", new_rows)
+        cached.update(new_rows)
+
+    rows = [row for row in rows if row['frame_hash'] in cached]
+    values = np.array([cached[row['frame_hash']] for row in rows], dtype=np.int64)
+    return [row['stem'] for row in rows], values.view(np.uint64)
+
+
+def _roots(parent, nodes):
+    """Union-find kökleri (vektörel)"""
+    roots = parent[nodes]
+    while True:
+        upper = parent[roots]
+        if np.array_equal(upper, roots):
+            return roots
+        roots = upper
+
+
+def _union(parent, a, b):
+    """a[i] - b[i] kenarlarını birleştir (vektörel; kök her zaman küçük indeks)"""
+    while len(a):
+        root_a, root_b = _roots(parent, a), _roots(parent, b)
+        differ = root_a != root_b
+        if not differ.any():
+            return
+        a, b = a[differ], b[differ]
+        low = np.minimum(root_a[differ], root_b[differ])
+        high = np.maximum(root_a[differ], root_b[differ])
+        np.minimum.at(parent, high, low)
+
+
+def _flip_masks(radius):
+    """16 bitlik parçada en fazla `radius` bit çeviren maskeler"""
+    masks = [0]
+    for count in range(1, radius + 1):
+        masks.extend(sum(1 << bit for bit in bits) for bits in combinations(range(_CHUNK_BITS), count))
+    return np.array(masks, dtype=np.uint64)
+
+
+def cluster_hashes(hashes, threshold=DEFAULT_THRESHOLD):
+    """
+    Hamming mesafesi <= threshold olan hash'leri grupla (tek bağlantı)
+
+    Args:
+        hashes (np.ndarray): (N,) uint64
+        threshold (int): Maksimum farklı bit sayısı
+
+    Returns:
+        np.ndarray: (N,) grup etiketi (0..G-1)
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    if len(hashes) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Birebir aynı hash'ler tek düğüm (sabit kamerada çok sık)
+    unique, inverse = np.unique(hashes, return_inverse=True)
+    parent = np.arange(len(unique))
+
+    if threshold > 0 and len(unique) > 1:
+        # Mesafe <= threshold ise 4 parçadan en az biri <= threshold // 4 bit farklıdır
+        flips = _flip_masks(threshold // _CHUNKS)
+        for chunk in range(_CHUNKS):
+            keys = (unique >> np.uint64(chunk * _CHUNK_BITS)) & np.uint64((1 << _CHUNK_BITS) - 1)
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            for flip in flips:
+                query = keys ^ flip
+                low = np.searchsorted(sorted_keys, query, 'left')
+                high = np.searchsorted(sorted_keys, query, 'right')
+                _link_candidates(parent, unique, order, low, high - low, threshold)
+
+    labels = _roots(parent, np.arange(len(unique)))
+    _, labels = np.unique(labels, return_inverse=True)
+    return labels[inverse]
+
+
+def _link_candidates(parent, unique, order, low, counts, threshold):
+    """Kova eşleşmelerinden aday çiftleri üret, mesafe <= threshold olanları birleştir"""
+    cumulative = np.cumsum(counts)
+    start = 0
+    while start < len(counts):
+        # Bellek sınırı: blok başına en fazla _BLOCK_ELEMENTS aday
+        base = cumulative[start - 1] if start else 0
+        end = max(start + 1, int(np.searchsorted(cumulative, base + _BLOCK_ELEMENTS, 'right')))
+        block_counts = counts[start:end]
+        total = int(block_counts.sum())
+        if total:
+            left = np.repeat(np.arange(start, end), block_counts)
+            offsets = np.arange(total) - np.repeat(np.cumsum(block_counts) - block_counts, block_counts)
+            right = order[np.repeat(low[start:end], block_counts) + offsets]
+
+            keep = left < right
+            left, right = left[keep], right[keep]
+            close = popcount64(unique[left] ^ unique[right]) <= threshold
+            _union(parent, left[close], right[close])
+        start = end
+
+
+def near_duplicate_groups(index, stems=None, threshold=DEFAULT_THRESHOLD, workers=8):
+    """
+    İndeksteki kareleri yakın kopya gruplarına ayır
+
+    Returns:
+        list: Stem grupları (büyükten küçüğe; tekil kareler tek elemanlı grup)
+    """
+    hashed_stems, hashes = index_dhashes(index, stems, workers)
+    labels = cluster_hashes(hashes, threshold)
+
+    groups = {}
+    for stem, label in zip(hashed_stems, labels):
+        groups.setdefault(int(label), []).append(stem)
+
+    # Hash'lenemeyen (okunamayan) kareler kendi gruplarında kalır
+    if stems is not None:
+        hashed = set(hashed_stems)
+        for stem in stems:
+            if stem not in hashed:
+                groups[('okunamayan', stem)] = [stem]
+
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def select_representatives(groups, index, per_group=1, min_distance=DEFAULT_THRESHOLD + 1):
+    """
+    Her gruptan çeşitli temsilciler seç
+
+    İlk temsilci en büyük JPEG (en detaylı kare), sonrakiler seçilenlere
+    en uzak kare (farthest-point); mesafe `min_distance` altına inince durur.
+
+    Returns:
+        list: Temsilci stem listesi
+    """
+    sizes = {row['stem']: row['frame_size'] for row in index.frames()}
+    need_hash = [group for group in groups if len(group) > 1 and per_group > 1]
+    hash_of = {}
+    if need_hash:
+        stems, hashes = index_dhashes(index, [s for group in need_hash for s in group])
+        hash_of = dict(zip(stems, hashes))
+
+    selected = []
+    for group in groups:
+        ordered = sorted(group, key=lambda s: sizes.get(s, 0), reverse=True)
+        selected.append(ordered[0])
+        if per_group <= 1 or len(ordered) == 1:
+            continue
+
+        candidates = [s for s in ordered[1:] if s in hash_of]
+        if ordered[0] not in hash_of or not candidates:
+            continue
+        candidate_hashes = np.array([hash_of[s] for s in candidates], dtype=np.uint64)
+        distance = popcount64(candidate_hashes ^ np.uint64(hash_of[ordered[0]]))
+        for _ in range(per_group - 1):
+            best = int(np.argmax(distance))
+            if distance[best] < min_distance:
+                break
+            selected.append(candidates[best])
+            distance = np.minimum(distance, popcount64(candidate_hashes ^ candidate_hashes[best]))
+
+    return selected
+
+
+def group_split(stems, groups, val_split=0.2, seed=None):
+    """
+    Grup bütünlüğünü koruyarak train/val böl
+
+    Args:
+        stems (list): Bölünecek kareler
+        groups (list): near_duplicate_groups() çıktısı
+        val_split (float): Validation oranı
+
+    Returns:
+        tuple: (train_stems, val_stems)
+    """
+    group_of = {}
+    for group_id, group in enumerate(groups):
+        for stem in group:
+            group_of[stem] = group_id
+
+    members = {}
+    for stem in stems:
+        members.setdefault(group_of.get(stem, ('tekil', stem)), []).append(stem)
+
+    buckets = list(members.values())
+    random.Random(seed).shuffle(buckets)
+
+    target = int(len(stems) * val_split)
+    train, val = [], []
+    for bucket in buckets:
+        (val if len(val) < target else train).extend(bucket)
+    return train, val
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yakın kopya kareleri bul")
+    parser.add_argument("dataset", help="Dataset klasörü (01_frames / 02_labels içeren)")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD, help="Maksimum farklı bit (64 bitte)")
+    parser.add_argument("--per-group", type=int, default=1, help="Grup başına temsilci sayısı")
+    parser.add_argument("--keep-list", help="Temsilci kare adlarını bu dosyaya yaz")
+    args = parser.parse_args()
+
+    with DatasetIndex(args.dataset) as index:
+        index.refresh()
+        groups = near_duplicate_groups(index, threshold=args.threshold)
+        keep = select_representatives(groups, index, args.per_group)
+
+        total = sum(len(group) for group in groups)
+        print(f"📸 Toplam kare: {total}")
+        print(f"🪞 Yakın kopya grubu: {sum(1 for g in groups if len(g) > 1)} "
+              f"(en büyüğü {len(groups[0]) if groups else 0} kare)")
+        print(f"✅ Temsilci: {len(keep)} kare ({total - len(keep)} kare elenebilir)")
+
+        if args.keep_list:
+            names = {row['stem']: row['file_name'] for row in index.frames()}
+            with open(args.keep_list, 'w', encoding='utf-8') as f:
+                f.writelines(f"{names[stem]}\n" for stem in keep)
+            print(f"📝 Liste yazıldı: {args.keep_list}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧠 MERKEZİ INFERENCE SUNUCUSU (DİNAMİK MİKRO-BATCH)
+==================================================
+Model ağırlıkları tek bir süreçte bir kez yüklenir; kamera pipeline'ları
+kareleri yerel bir TCP soketi üzerinden gönderir. Sunucu gelen istekleri
+`max_batch_size` ve `max_wait_ms` sınırlarıyla mikro-batch'lere toplar,
+modeli batch başına bir kez çağırır ve her isteğe kendi sonucunu döndürür.
+Altı kamera aynı CPU'da altı model kopyasıyla çekirdek paylaşmak zorunda
+kalmaz.
+
+- İlk istek geldiğinde en fazla `max_wait_ms` beklenir; batch dolarsa hemen çalışır
+- Batch farklı eşikli istekleri karıştırabilir: model en düşük confidence ile
+  çalışır, sonuçlar istek başına confidence / sınıf filtresinden geçer
+- İstatistikler: batch boyutu ve kuyruk derinliği histogramları, istek
+  gecikmesi ({"op": "stats"} ile okunur)
+
+Protokol (mesaj = 4 bayt uzunluk + JSON başlık + ham veri):
+    {"op": "detect", "frames": [{"shape": [h, w, 3], "conf": 0.1, "classes": [0]}]}  + uint8 kareler
+    -> {"ok": true, "results": [{"count": n, "speed": {...}}]}                        + float32 (n, 6)
+    {"op": "info"}  -> {"ok": true, "names": {...}, ...}
+    {"op": "stats"} -> {"ok": true, "stats": {...}}
+
+Kullanım:
+    python inference_server.py --model yolov8x.pt --port 7700
+
+    # Pipeline tarafında (POOL_INFERENCE_SERVER=127.0.0.1:7700)
+    model = InferenceClient.connect("127.0.0.1:7700")
+    results = model(frame, conf=0.1, verbose=False)   # YOLO çağrısıyla aynı kullanım
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import struct
+import argparse
+import threading
+import socketserver
+from collections import Counter
+
+import numpy as np
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.config import Inference
+
+_HEADER = struct.Struct('!I')
+
+
+def _send_message(stream, meta, payload=b''):
+    """JSON başlık + ham veri gönder (stream: socket veya wfile)"""
+    header = json.dumps(meta).encode('utf-8')
+    data = _HEADER.pack(len(header)) + header
+    write = stream.sendall if hasattr(stream, 'sendall') else stream.write
+    write(data)
+    if payload:
+        write(payload)
+
+
+def _read_exact(read, size):
+    chunks = []
+    while size:
+        chunk = read(size)
+        if not chunk:
+            raise ConnectionError("bağlantı kapandı")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _recv_message(read, payload_size=None):
+    """
+    Başlığı oku; payload_size(meta) verilirse ardından gelen ham veriyi de oku
+
+    Returns:
+        tuple: (meta, payload) veya bağlantı kapandıysa (None, b'')
+    """
+    prefix = read(_HEADER.size)
+    if not prefix:
+        return None, b''
+    if len(prefix) < _HEADER.size:
+        prefix += _read_exact(read, _HEADER.size - len(prefix))
+    (length,) = _HEADER.unpack(prefix)
+    meta = json.loads(_read_exact(read, length).decode('utf-8'))
+    size = payload_size(meta) if payload_size else 0
+    return meta, _read_exact(read, size) if size else b''
+
+
+def _frames_size(meta):
+    return sum(int(np.prod(frame['shape'])) for frame in meta.get('frames', ()))
+
+
+def _results_size(meta):
+    return sum(result['count'] * 6 * 4 for result in meta.get('results', ()))
+
+
+# ----------------------------------------------------------------------
+# Sunucu
+# ----------------------------------------------------------------------
+
+class InferenceStats:
+    """Batch boyutu / kuyruk derinliği histogramları ve gecikme"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.batch_sizes = Counter()
+        self.queue_depths = Counter()
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_inference = 0.0
+
+    def record_batch(self, size, queue_depth, inference_time, latencies):
+        with self.lock:
+            self.batches += 1
+            self.requests += size
+            self.batch_sizes[size] += 1
+            self.queue_depths[queue_depth] += 1
+            self.total_inference += inference_time
+            self.total_latency += sum(latencies)
+            self.max_latency = max(self.max_latency, max(latencies))
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'uptime_s': round(time.time() - self.started, 1),
+                'requests': self.requests,
+                'batches': self.batches,
+                'errors': self.errors,
+                'avg_batch_size': round(self.requests / max(1, self.batches), 2),
+                'batch_size_histogram': {str(k): v for k, v in sorted(self.batch_sizes.items())},
+                'queue_depth_histogram': {str(k): v for k, v in sorted(self.queue_depths.items())},
+                'avg_latency_ms': round(self.total_latency / max(1, self.requests) * 1000, 2),
+                'max_latency_ms': round(self.max_latency * 1000, 2),
+                'avg_batch_inference_ms': round(self.total_inference / max(1, self.batches) * 1000, 2),
+            }
+
+
+class _Request:
+    """Kuyruktaki tek kare isteği"""
+
+    __slots__ = ('frame', 'conf', 'classes', 'enqueued', 'done', 'boxes', 'speed', 'error')
+
+    def __init__(self, frame, conf, classes):
+        self.frame = frame
+        self.conf = conf
+        self.classes = classes
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.boxes = None
+        self.speed = None
+        self.error = None
+
+
+class _InferenceHandler(socketserver.StreamRequestHandler):
+    """Bağlantı başına bir thread; istekler ortak batch kuyruğuna gider"""
+
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        server = self.server.inference
+        while True:
+            try:
+                meta, payload = _recv_message(self.rfile.read, _frames_size)
+            except (ConnectionError, ValueError):
+                return
+            if meta is None:
+                return
+            op = meta.get('op')
+            if op == 'detect':
+                self._detect(server, meta, payload)
+            elif op == 'info':
+                _send_message(self.wfile, {'ok': True, 'names': server.names,
+                                           'max_batch_size': server.max_batch_size,
+                                           'max_wait_ms': server.max_wait * 1000})
+            elif op == 'stats':
+                _send_message(self.wfile, {'ok': True, 'stats': server.stats.to_dict()})
+            else:
+                _send_message(self.wfile, {'ok': False, 'error': f"bilinmeyen op: {op}"})
+
+    def _detect(self, server, meta, payload):
+        requests, offset = [], 0
+        for frame_meta in meta['frames']:
+            shape = tuple(frame_meta['shape'])
+            size = int(np.prod(shape))
+            frame = np.frombuffer(payload, dtype=np.uint8, count=size, offset=offset).reshape(shape)
+            offset += size
+            requests.append(server.submit(frame, frame_meta.get('conf'), frame_meta.get('classes')))
+
+        results, chunks = [], []
+        for request in requests:
+            request.done.wait()
+            if request.error is not None:
+                _send_message(self.wfile, {'ok': False, 'error': request.error})
+                return
+            results.append({'count': len(request.boxes), 'speed': request.speed})
+            chunks.append(request.boxes.tobytes())
+        _send_message(self.wfile, {'ok': True, 'results': results}, b''.join(chunks))
+
+
+class _InferenceTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class InferenceServer:
+    """
+    🧠 Tek model, çok istemci, dinamik mikro-batch
+    """
+
+    def __init__(self, model, port=None, host='127.0.0.1', max_batch_size=None, max_wait_ms=None,
+                 default_conf=0.25):
+        """
+        Args:
+            model: Yüklü model (ultralytics YOLO) veya model yolu
+            port (int): Dinleme portu (0: otomatik)
+            max_batch_size (int): Batch başına en fazla kare
+            max_wait_ms (float): İlk istekten sonra batch doldurma süresi
+            default_conf (float): İstek confidence belirtmezse
+        """
+        if isinstance(model, str):
+            from ultralytics import YOLO
+            model = YOLO(model)
+        self.model = model
+        self.names = {int(k): v for k, v in getattr(model, 'names', {}).items()}
+        self.host = host
+        self.port = Inference.PORT if port is None else port
+        self.max_batch_size = max_batch_size or Inference.MAX_BATCH_SIZE
+        self.max_wait = (Inference.MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000.0
+        self.default_conf = default_conf
+
+        self.queue = queue.Queue()
+        self.stats = InferenceStats()
+        self._stop = threading.Event()
+        self._server = None
+        self._threads = []
+
+    # -- batch döngüsü ------------------------------------------------
+
+    def submit(self, frame, conf=None, classes=None):
+        """Kareyi kuyruğa ekle; sonuç request.done ile beklenir"""
+        request = _Request(frame, self.default_conf if conf is None else float(conf), classes)
+        self.queue.put(request)
+        return request
+
+    def _collect(self):
+        """
+        Bir mikro-batch topla
+
+        Returns:
+            tuple: (batch, kuyruk derinliği) veya boş kuyrukta (None, 0)
+        """
+        try:
+            first = self.queue.get(timeout=0.1)
+        except queue.Empty:
+            return None, 0
+        queue_depth = self.queue.qsize() + 1
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch, queue_depth
+
+    def _run_batch(self, batch, queue_depth):
+        conf = min(request.conf for request in batch)
+        classes = None
+        if all(request.classes is not None for request in batch):
+            classes = sorted({c for request in batch for c in request.classes})
+
+        start = time.perf_counter()
+        try:
+            results = self.model([request.frame for request in batch], conf=conf, classes=classes, verbose=False)
+        except Exception as e:
+            with self.stats.lock:
+                self.stats.errors += len(batch)
+            for request in batch:
+                request.error = str(e)
+                request.done.set()
+            return
+        inference_time = time.perf_counter() - start
+
+        finished = time.perf_counter()
+        latencies = []
+        for request, result in zip(batch, results):
+            boxes = result.boxes
+            if boxes is not None and len(boxes):
+                data = np.column_stack((
+                    boxes.xyxy.cpu().numpy(), boxes.conf.cpu().numpy(), boxes.cls.cpu().numpy()
+                )).astype(np.float32)
+                keep = data[:, 4] >= request.conf
+                if request.classes is not None:
+                    keep &= np.isin(data[:, 5].astype(int), request.classes)
+                data = data[keep]
+            else:
+                data = np.empty((0, 6), dtype=np.float32)
+            request.boxes = np.ascontiguousarray(data)
+            request.speed = dict(getattr(result, 'speed', None) or {})
+            request.speed['queue'] = (start - request.enqueued) * 1000
+            latencies.append(finished - request.enqueued)
+            request.done.set()
+        self.stats.record_batch(len(batch), queue_depth, inference_time, latencies)
+
+    def _batch_loop(self):
+        while not self._stop.is_set():
+            batch, queue_depth = self._collect()
+            if batch:
+                self._run_batch(batch, queue_depth)
+
+    # -- yaşam döngüsü ------------------------------------------------
+
+    def start(self):
+        """Soket ve batch thread'lerini başlat (bloklamaz)"""
+        self._server = _InferenceTCPServer((self.host, self.port), _InferenceHandler)
+        self._server.inference = self
+        self.port = self._server.server_address[1]
+        for name, target in (("inference-batch", self._batch_loop), ("inference-socket", self._server.serve_forever)):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"🧠 Inference sunucusu: {self.host}:{self.port} "
+              f"(batch <= {self.max_batch_size}, bekleme <= {self.max_wait * 1000:.0f} ms)")
+        return self
+
+    def serve_forever(self):
+        self.start()
+        try:
+            while not self._stop.wait(60):
+                stats = self.stats.to_dict()
+                print(f"📊 {stats['requests']} istek, ort. batch {stats['avg_batch_size']}, "
+                      f"ort. gecikme {stats['avg_latency_ms']} ms")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+
+
+# ----------------------------------------------------------------------
+# İstemci (YOLO çağrısının yerine geçer)
+# ----------------------------------------------------------------------
+
+class HostArray(np.ndarray):
+    """Pipeline'ların torch tensörlerinde kullandığı .cpu().numpy() zinciri için numpy dizisi"""
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.view(np.ndarray)
+
+    def __getitem__(self, key):
+        item = super().__getitem__(key)
+        return item if isinstance(item, np.ndarray) else np.asarray(item).view(HostArray)
+
+
+class RemoteBoxes:
+    """ultralytics Boxes'ın pipeline'larda kullanılan kısmı (xyxy, conf, cls, len, iterasyon)"""
+
+    def __init__(self, data):
+        self.data = data  # (N, 6): x1, y1, x2, y2, conf, cls
+
+    @property
+    def xyxy(self):
+        return self.data[:, :4].view(HostArray)
+
+    @property
+    def conf(self):
+        return self.data[:, 4].view(HostArray)
+
+    @property
+    def cls(self):
+        return self.data[:, 5].view(HostArray)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        for i in range(len(self.data)):
+            yield RemoteBoxes(self.data[i:i + 1])
+
+
+class RemoteResult:
+    """Tek karenin sonucu (ultralytics Results benzeri)"""
+
+    def __init__(self, data, speed, names):
+        self.boxes = RemoteBoxes(data)
+        self.speed = speed
+        self.names = names
+
+
+class InferenceClient:
+    """
+    📡 Inference sunucusu istemcisi
+
+    YOLO modeli gibi çağrılır: client(frame) veya client([frame1, frame2]).
+    Bir bağlantıda aynı anda tek istek vardır (thread'ler arasında kilitli);
+    aynı süreçteki kameralar birden fazla kareyi tek çağrıda gönderebilir.
+    """
+
+    def __init__(self, host='127.0.0.1', port=None, timeout=None):
+        self.address = (host, Inference.PORT if port is None else port)
+        self.timeout = Inference.TIMEOUT if timeout is None else timeout
+        self._lock = threading.Lock()
+        self._sock = None
+        self._read = None
+        self.names = self.info()['names']
+
+    @classmethod
+    def connect(cls, address=None, timeout=None):
+        """'host:port' veya port ile bağlan (varsayılan: Inference.SERVER)"""
+        address = str(address or Inference.SERVER or Inference.PORT)
+        host, _, port = address.rpartition(':')
+        return cls(host or '127.0.0.1', int(port), timeout)
+
+    def _connection(self):
+        if self._sock is None:
+            self._sock = socket.create_connection(self.address, timeout=self.timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._read = self._sock.makefile('rb').read
+        return self._sock
+
+    def _request(self, meta, payload=b'', payload_size=None):
+        with self._lock:
+            try:
+                _send_message(self._connection(), meta, payload)
+                response, data = _recv_message(self._read, payload_size)
+            except (OSError, ConnectionError):
+                self.close()
+                raise
+        if response is None:
+            self.close()
+            raise ConnectionError("inference sunucusu bağlantıyı kapattı")
+        if not response.get('ok'):
+            raise RuntimeError(f"inference sunucusu hatası: {response.get('error')}")
+        return response, data
+
+    def info(self):
+        response, _ = self._request({'op': 'info'})
+        response['names'] = {int(k): v for k, v in response['names'].items()}
+        return response
+
+    def stats(self):
+        return self._request({'op': 'stats'})[0]['stats']
+
+    def __call__(self, source, conf=None, classes=None, verbose=False, **kwargs):
+        """
+        Kare(ler)i sunucuya gönder
+
+        Args:
+            source: BGR kare veya kare listesi
+            conf (float): Confidence eşiği (None: sunucu varsayılanı)
+            classes (list): Sınıf filtresi
+
+        Returns:
+            list: Kare başına RemoteResult
+        """
+        frames = source if isinstance(source, (list, tuple)) else [source]
+        frames = [np.ascontiguousarray(frame, dtype=np.uint8) for frame in frames]
+        meta = {'op': 'detect', 'frames': [
+            {'shape': list(frame.shape), 'conf': conf, 'classes': list(classes) if classes is not None else None}
+            for frame in frames
+        ]}
+        response, data = self._request(meta, b''.join(frame.tobytes() for frame in frames), _results_size)
+
+        results, offset = [], 0
+        boxes = np.frombuffer(data, dtype=np.float32).reshape(-1, 6)
+        for result in response['results']:
+            count = result['count']
+            results.append(RemoteResult(boxes[offset:offset + count], result['speed'], self.names))
+            offset += count
+        return results
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+                self._read = None
+
+
+def main():
+    """Sunucuyu başlat veya çalışan sunucunun istatistiklerini yazdır"""
+    parser = argparse.ArgumentParser(description="🧠 Merkezi inference sunucusu (dinamik mikro-batch)")
+    parser.add_argument("--model", default="yolov8x.pt", help="Model dosyası")
+    parser.add_argument("--port", type=int, default=Inference.PORT, help="Dinleme portu (127.0.0.1)")
+    parser.add_argument("--max-batch", type=int, default=Inference.MAX_BATCH_SIZE, help="Batch başına en fazla kare")
+    parser.add_argument("--max-wait-ms", type=float, default=Inference.MAX_WAIT_MS, help="Batch doldurma süresi")
+    parser.add_argument("--stats", action="store_true", help="Çalışan sunucunun istatistiklerini yazdır")
+    args = parser.parse_args()
+
+    if args.stats:
+        try:
+            client = InferenceClient(port=args.port)
+        except OSError as e:
+            print(f"❌ Bağlantı hatası: {e}")
+            return 1
+        print(json.dumps(client.stats(), indent=2, ensure_ascii=False))
+        client.close()
+        return 0
+
+    InferenceServer(args.model, port=args.port, max_batch_size=args.max_batch,
+                    max_wait_ms=args.max_wait_ms).serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
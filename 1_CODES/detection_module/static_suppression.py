@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🧱 STATİK YANLIŞ POZİTİF BASTIRMA HARİTASI
+=========================================
+Kamera başına düşük çözünürlüklü bir ızgara, hiç hareket etmeyen ve gerçek
+track oluşturmayan tespitleri (parlama, merdiven, kulvar halatı, cankurtaran
+sandalyesi) öğrenir. Güvenle "sabit gürültü" sayılan hücrelerdeki düşük
+confidence'lı tespitler tracker'a gitmeden düşürülür.
+
+- Hücre güncellemeleri vektörel (`np.add.at`), kare başına O(tespit sayısı)
+- Kanıt üstel olarak söner (decay): sahne değişirse harita kendini unutur
+- Bastırma `suppress_ratio` üstünde başlar; bastırılan tespitler hücrenin
+  statik kanıtı sayılmaya devam eder (hareket kanıtı eklemez), böylece sabit
+  gürültü sürdükçe hücre bastırılmış kalır
+- Bastırma, hücrede gerçek hareket kanıtı (`motion_ratio`) oluşunca ya da
+  gürültü kaybolup statik oran `release_ratio` altına inince biter
+- Hareket eden (veya tracker'ın gerçek dediği) tespitler hücreyi temizler;
+  tracker'ın `moving` dediği tespitler bastırılmaz
+- Yüksek confidence'lı tespitler asla bastırılmaz
+- `eligible` ile sadece izin verilen bölgelerde bastırılır (su içi bölgeler
+  hariç tutulur: suda hareketsiz kalan kişi olası kurbandır)
+- Harita .npz olarak kaydedilir / yüklenir
+
+Kullanım:
+    suppression = StaticSuppressionMap.load_or_create(path, frame.shape)
+    keep = suppression.process(xs, ys, confidences, eligible=eligible)   # her kare
+    ...
+    suppression.save(path)
+"""
+
+import os
+
+import numpy as np
+
+
+class StaticSuppressionMap:
+    """
+    🧱 Öğrenilen statik gürültü ızgarası
+    """
+
+    def __init__(self, frame_shape, cell_size=32, decay=0.9995, still_distance=8.0,
+                 suppress_ratio=0.6, release_ratio=0.4, motion_ratio=0.05, max_confidence=0.5):
+        """
+        Args:
+            frame_shape (tuple): (height, width[, ...])
+            cell_size (int): Izgara hücre boyutu (piksel)
+            decay (float): Kare başına kanıt sönümü (0.9995 ≈ 14 FPS'te ~2.4 dk zaman sabiti)
+            still_distance (float): Önceki karedeki bir tespite bu kadar yakınsa "hareketsiz"
+            suppress_ratio (float): Hareketsiz doluluk oranı bu değeri geçince bastır
+            release_ratio (float): Bu değerin altına inince bastırmayı bırak
+            motion_ratio (float): Hücrede bu orandan fazla hareket varsa bastırma
+            max_confidence (float): Bu değerden yüksek confidence'lı tespitler bastırılmaz
+        """
+        height, width = frame_shape[:2]
+        self.frame_shape = (int(height), int(width))
+        self.cell_size = int(cell_size)
+        self.grid_shape = (-(-self.frame_shape[0] // self.cell_size), -(-self.frame_shape[1] // self.cell_size))
+        self.decay = float(decay)
+        self.still_distance = float(still_distance)
+        self.suppress_ratio = float(suppress_ratio)
+        self.release_ratio = float(release_ratio)
+        self.motion_ratio = float(motion_ratio)
+        self.max_confidence = float(max_confidence)
+
+        # Üstel hareketli toplamlar; oran = toplam * (1 - decay) ∈ [0, 1]
+        self.static_heat = np.zeros(self.grid_shape, dtype=np.float32)
+        self.motion_heat = np.zeros(self.grid_shape, dtype=np.float32)
+        self.suppressed = np.zeros(self.grid_shape, dtype=bool)
+        self.frames = 0
+
+        self._previous = np.empty((0, 2), dtype=np.float32)
+        self._static_hits = np.zeros(self.grid_shape, dtype=np.float32)
+        self._motion_hits = np.zeros(self.grid_shape, dtype=np.float32)
+
+    def cells(self, xs, ys):
+        """Piksel koordinatları -> (satır, sütun) hücre indeksleri (kareye kırpılır)"""
+        rows = np.clip(np.asarray(ys, dtype=np.int64) // self.cell_size, 0, self.grid_shape[0] - 1)
+        cols = np.clip(np.asarray(xs, dtype=np.int64) // self.cell_size, 0, self.grid_shape[1] - 1)
+        return rows, cols
+
+    def _still(self, points):
+        """Önceki karedeki bir tespite yakın (hareketsiz) olanlar"""
+        if not len(points) or not len(self._previous):
+            return np.zeros(len(points), dtype=bool)
+        distances = np.linalg.norm(points[:, None, :] - self._previous[None, :, :], axis=2)
+        return distances.min(axis=1) <= self.still_distance
+
+    def update(self, xs, ys, moving=None, suppressed=None):
+        """
+        Bir karenin tespitleriyle haritayı güncelle
+
+        Args:
+            xs, ys (array-like): Tespit merkezleri
+            moving (array-like): Tracker'dan: gerçek / hareket eden track'e ait mi
+                (None: önceki kareye uzaklıktan tahmin edilir)
+            suppressed (array-like): Bu karede bastırılan tespitler; hareketlerine
+                bakılmadan statik kanıt sayılır
+        """
+        points = np.column_stack((np.asarray(xs, dtype=np.float32), np.asarray(ys, dtype=np.float32))) \
+            if len(xs) else np.empty((0, 2), dtype=np.float32)
+        still = self._still(points)
+        if moving is not None:
+            still &= ~np.asarray(moving, dtype=bool)
+        if suppressed is not None and len(points):
+            still |= np.asarray(suppressed, dtype=bool)
+
+        self._static_hits.fill(0)
+        self._motion_hits.fill(0)
+        if len(points):
+            rows, cols = self.cells(points[:, 0], points[:, 1])
+            np.add.at(self._static_hits, (rows[still], cols[still]), 1)
+            np.add.at(self._motion_hits, (rows[~still], cols[~still]), 1)
+            # Hücre başına kare başına en fazla bir kanıt
+            np.minimum(self._static_hits, 1, out=self._static_hits)
+            np.minimum(self._motion_hits, 1, out=self._motion_hits)
+
+        self.static_heat *= self.decay
+        self.static_heat += self._static_hits
+        self.motion_heat *= self.decay
+        self.motion_heat += self._motion_hits
+        self.frames += 1
+        self._previous = points
+
+        static_ratio = self.static_heat * (1.0 - self.decay)
+        motion_ratio = self.motion_heat * (1.0 - self.decay)
+        start = (static_ratio >= self.suppress_ratio) & (motion_ratio <= self.motion_ratio)
+        keep = self.suppressed & (static_ratio >= self.release_ratio) & (motion_ratio <= self.motion_ratio)
+        self.suppressed = start | keep
+
+    def suppress_mask(self, xs, ys, confidences=None, eligible=None, moving=None):
+        """Bastırılacak tespitler (bool dizisi)"""
+        if not len(xs):
+            return np.zeros(0, dtype=bool)
+        rows, cols = self.cells(xs, ys)
+        mask = self.suppressed[rows, cols]
+        if confidences is not None:
+            mask &= np.asarray(confidences) < self.max_confidence
+        if eligible is not None:
+            mask &= np.asarray(eligible, dtype=bool)
+        if moving is not None:
+            mask &= ~np.asarray(moving, dtype=bool)
+        return mask
+
+    def process(self, xs, ys, confidences=None, moving=None, eligible=None):
+        """
+        Kare başına tek çağrı: önce mevcut haritayla filtrele, sonra haritayı
+        güncelle (bastırılanlar statik kanıt olarak)
+
+        Args:
+            moving (array-like): Tracker'ın onayladığı (gerçek) tespitler
+            eligible (array-like): Bastırılabilir tespitler (None: hepsi)
+
+        Returns:
+            np.ndarray: Tutulacak tespitler (bool dizisi)
+        """
+        suppressed = self.suppress_mask(xs, ys, confidences, eligible, moving)
+        self.update(xs, ys, moving, suppressed=suppressed)
+        return ~suppressed
+
+    @property
+    def suppressed_cells(self):
+        return int(self.suppressed.sum())
+
+    def overlay(self):
+        """Bastırılan hücrelerin kare boyutunda maskesi (görselleştirme için)"""
+        mask = np.repeat(np.repeat(self.suppressed, self.cell_size, axis=0), self.cell_size, axis=1)
+        return mask[:self.frame_shape[0], :self.frame_shape[1]]
+
+    # ------------------------------------------------------------------
+    # Kalıcılık
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        """Haritayı .npz olarak kaydet (geçici dosya + rename)"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            frame_shape=np.array(self.frame_shape),
+            cell_size=self.cell_size,
+            decay=self.decay,
+            static_heat=self.static_heat,
+            motion_heat=self.motion_heat,
+            suppressed=self.suppressed,
+            frames=self.frames,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, **params):
+        """Kaydedilmiş haritayı yükle; okunamazsa None"""
+        # Izgara geometrisi dosyadan gelir
+        params = {k: v for k, v in params.items() if k not in ('cell_size', 'decay')}
+        try:
+            with np.load(path) as data:
+                suppression = cls(tuple(data['frame_shape']), cell_size=int(data['cell_size']),
+                                  decay=float(data['decay']), **params)
+                suppression.static_heat = data['static_heat'].astype(np.float32)
+                suppression.motion_heat = data['motion_heat'].astype(np.float32)
+                suppression.suppressed = data['suppressed'].astype(bool)
+                suppression.frames = int(data['frames'])
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Bastırma haritası yüklenemedi: {os.path.basename(path)} ({e})")
+            return None
+        if suppression.static_heat.shape != suppression.grid_shape:
+            print(f"⚠️ Bastırma haritası boyutu uyuşmuyor: {os.path.basename(path)}")
+            return None
+        return suppression
+
+    @classmethod
+    def load_or_create(cls, path, frame_shape, **params):
+        """Kayıtlı harita aynı kare boyutundaysa onu, değilse yenisini döndür"""
+        if path and os.path.exists(path):
+            suppression = cls.load(path, **params)
+            if suppression is not None and suppression.frame_shape == tuple(frame_shape[:2]):
+                return suppression
+        return cls(frame_shape, **params)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+📝 TESPİT LOGU (JSON Lines)
+===========================
+Video tester'ların kare bazlı tespit çıktısını tek bir ortak formatta yazar.
+Analitik-only (headless) çalıştırmalarda video yerine bu log üretilir;
+izlenmek istenen klipler sonradan log + kaynak videodan render edilir.
+
+Format (her satır bir JSON nesnesi):
+    {"type": "header", "version": 1, "video": ..., "fps": ..., "width": ...,
+     "height": ..., "pipeline": ..., "model": ..., "camera": ..., "pool_polygon": [...]}
+    {"type": "frame", "index": 0, "t": 0.0, "detections": [
+        {"bbox": [x1, y1, x2, y2], "conf": 0.87, "class": "person",
+         "track_id": 3, "in_pool": true, ...}]}
+    ...
+    {"type": "summary", ...}            # opsiyonel, close(summary=...) ile
+
+`index` kaynak videodaki 0 tabanlı kare sırasıdır (render sırasında
+kareleri eşlemek için kullanılır).
+"""
+
+import json
+from datetime import datetime
+
+LOG_VERSION = 1
+
+
+def detection_record(bbox, confidence, class_name=None, track_id=None, in_pool=None, **extra):
+    """
+    Log'a yazılacak tek tespit kaydını oluştur
+
+    Args:
+        bbox (tuple): (x1, y1, x2, y2)
+        confidence (float): Güven skoru
+        class_name (str): Sınıf adı / sınıflandırma etiketi
+        track_id (int): Takip ID'si (varsa)
+        in_pool (bool): Havuz içinde mi (varsa)
+        **extra: Pipeline'a özel ek alanlar (ör. stable=True)
+
+    Returns:
+        dict: JSON'a yazılabilir kayıt
+    """
+    record = {
+        'bbox': [round(float(v), 1) for v in bbox],
+        'conf': round(float(confidence), 4),
+    }
+    if class_name is not None:
+        record['class'] = class_name
+    if track_id is not None:
+        record['track_id'] = int(track_id)
+    if in_pool is not None:
+        record['in_pool'] = bool(in_pool)
+    record.update(extra)
+    return record
+
+
+class DetectionLogWriter:
+    """
+    📝 Kare bazlı tespit logu yazıcı
+
+    Kullanım:
+        with DetectionLogWriter(path, video_path, fps, (w, h), pipeline="pool_zone") as log:
+            log.write_frame(index, timestamp, [detection_record(...), ...])
+    """
+
+    def __init__(self, path, video_path, fps, frame_size, pipeline, model=None,
+                 pool_polygon=None, camera=None, extra=None):
+        """
+        Args:
+            path (str): .jsonl dosya yolu
+            video_path (str): Kaynak video (render için)
+            fps (float): Kaynak FPS
+            frame_size (tuple): (width, height)
+            pipeline (str): Üreten tester adı
+            model (str): Model adı
+            pool_polygon (list): Havuz poligonu (varsa)
+            camera (str): Kamera adı (çoklu kamera)
+            extra (dict): Header'a eklenecek ek alanlar
+        """
+        self.path = str(path)
+        self.frames_written = 0
+        self._file = open(self.path, 'w', encoding='utf-8')
+
+        header = {
+            'type': 'header',
+            'version': LOG_VERSION,
+            'video': str(video_path),
+            'fps': float(fps) if fps else 0.0,
+            'width': int(frame_size[0]),
+            'height': int(frame_size[1]),
+            'pipeline': pipeline,
+            'model': model,
+            'camera': camera,
+            'pool_polygon': [[int(x), int(y)] for x, y in pool_polygon] if pool_polygon is not None else None,
+            'created': datetime.now().isoformat(timespec='seconds'),
+        }
+        if extra:
+            header.update(extra)
+        self._write(header)
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        self._file.write("\n")
+
+    def write_frame(self, index, timestamp, detections):
+        """
+        Tek karenin tespitlerini yaz
+
+        Args:
+            index (int): Kaynak videodaki 0 tabanlı kare sırası
+            timestamp (float): Saniye
+            detections (list): detection_record() çıktıları
+        """
+        self._write({
+            'type': 'frame',
+            'index': int(index),
+            't': round(float(timestamp), 3),
+            'detections': detections,
+        })
+        self.frames_written += 1
+
+    def close(self, summary=None):
+        """Logu kapat, istenirse özet satırı ekle"""
+        if self._file.closed:
+            return
+        if summary is not None:
+            record = {'type': 'summary', 'frames': self.frames_written}
+            record.update(summary)
+            self._write(record)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def iter_detection_log(path):
+    """
+    Log kayıtlarını sırayla döndür (header, frame..., summary)
+
+    Args:
+        path (str): .jsonl dosya yolu
+
+    Yields:
+        dict: Kayıt
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🏊 HAVUZ GEOMETRİSİ - RASTER MASKE
+=================================
+Havuz poligonunu kare çözünürlüğünde bir kez rasterize eder; nokta-içinde
+testleri kutu başına `cv2.pointPolygonTest` yerine tek bir dizi indekslemesi
+ile, tüm kutular için aynı anda yapılır.
+"""
+
+import json
+
+import cv2
+import numpy as np
+
+
+def load_pool_polygon(json_path):
+    """
+    pool_area_*.json dosyasından poligonu oku
+
+    Returns:
+        np.ndarray: (N, 2) int32 noktalar veya None
+    """
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ Havuz alanı yüklenemedi: {e}")
+        return None
+
+    points = data.get('polygon_points') if isinstance(data, dict) else data
+    if not points:
+        return None
+    return np.asarray(points, dtype=np.int32).reshape(-1, 2)
+
+
+def rasterize_polygon(polygon, frame_shape):
+    """
+    Poligonu uint8 maskeye çiz (içi 1)
+
+    Args:
+        polygon (array-like): (N, 2) noktalar
+        frame_shape (tuple): (height, width[, ...])
+
+    Returns:
+        np.ndarray: (height, width) uint8 maske
+    """
+    height, width = frame_shape[:2]
+    mask = np.zeros((height, width), dtype=np.uint8)
+    points = np.asarray(polygon, dtype=np.int32).reshape(-1, 1, 2)
+    cv2.fillPoly(mask, [points], 1)
+    return mask
+
+
+def points_in_mask(mask, xs, ys):
+    """
+    Noktaların maske içinde olup olmadığını vektörel olarak döndür
+
+    Args:
+        mask (np.ndarray): rasterize_polygon() çıktısı
+        xs, ys (array-like): Piksel koordinatları
+
+    Returns:
+        np.ndarray: bool dizisi (kare dışındaki noktalar False)
+    """
+    xs = np.asarray(xs).astype(np.int64)
+    ys = np.asarray(ys).astype(np.int64)
+    height, width = mask.shape[:2]
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    result = np.zeros(xs.shape, dtype=bool)
+    result[inside] = mask[ys[inside], xs[inside]] > 0
+    return result
+
+
+class PoolMask:
+    """
+    🗺️ Çözünürlük başına önbelleğe alınmış havuz maskesi
+
+    Farklı boyutlu kareler gelirse her boyut için bir kez rasterize edilir.
+    Poligon yoksa her nokta havuz içi sayılır.
+    """
+
+    def __init__(self, polygon):
+        self.polygon = None if polygon is None else np.asarray(polygon, dtype=np.int32).reshape(-1, 2)
+        self._masks = {}
+
+    def mask_for(self, frame_shape):
+        """Verilen kare boyutu için maske"""
+        key = tuple(frame_shape[:2])
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = rasterize_polygon(self.polygon, key)
+            self._masks[key] = mask
+        return mask
+
+    def contains(self, frame_shape, xs, ys):
+        """Noktalar havuz içinde mi (vektörel)"""
+        if self.polygon is None:
+            return np.ones(np.shape(xs), dtype=bool)
+        return points_in_mask(self.mask_for(frame_shape), xs, ys)
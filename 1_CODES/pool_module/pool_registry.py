@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🗂️ HAVUZ ALANI KAYIT DEFTERİ
+===========================
+`pool_area_*.json` dosyalarını bir kez indeksler: video / kamera ID'si ve
+sürüm (dosya adındaki zaman damgası) bazında. Her dosya bir kez parse edilip
+derlenir (NumPy poligon, merkez, alan, ROI, çözünürlük başına maske) ve
+değişmez PoolArea nesnesi olarak verilir.
+
+- Arama O(1): normalize edilmiş ad -> anahtar -> sürümler (eski -> yeni)
+- Klasör `check_interval` saniyede bir taranır; sadece eklenen / değişen
+  dosyalar yeniden derlenir
+- get_registry(): aynı klasör için süreç içinde tek registry
+
+Kullanım:
+    area = get_registry(Paths.OUTPUT_DIR).find("KAMERA 1.mp4")
+    area.polygon, area.centroid, area.contains(frame.shape, xs, ys)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.config import Paths
+from pool_module.pool_geometry import PoolMask
+
+# pool_area_<video/kamera>[_YYYYMMDD_HHMMSS].json
+POOL_FILE_PATTERN = re.compile(r'^pool_area_(?P<key>.+?)(?:_(?P<version>\d{8}_\d{6}))?\.json$', re.IGNORECASE)
+# Uzantı gibi görünen son ek (.mp4, .MOV ...); 'kamera.1' gibi adlar korunur
+VIDEO_EXT_PATTERN = re.compile(r'\.[A-Za-z][A-Za-z0-9]{1,4}')
+
+
+def normalize_key(name):
+    """Video adı / kamera ID -> registry anahtarı ('Kamera 1.mp4' -> 'KAMERA_1')"""
+    base = os.path.basename(str(name))
+    stem, ext = os.path.splitext(base)
+    if VIDEO_EXT_PATTERN.fullmatch(ext):
+        base = stem
+    return base.replace(' ', '_').upper()
+
+
+@dataclass(frozen=True)
+class PoolArea:
+    """Derlenmiş, değişmez havuz alanı"""
+    key: str
+    version: str
+    path: str
+    video_name: str
+    polygon: np.ndarray = field(repr=False, compare=False)
+    centroid: Tuple[int, int]
+    area: float
+    roi: Tuple[int, int, int, int]  # x, y, w, h
+    _mask: PoolMask = field(repr=False, compare=False)
+
+    @property
+    def file_name(self):
+        return os.path.basename(self.path)
+
+    @property
+    def signature(self):
+        """Poligon geometrisinin kısa özeti (aynı dosya yerinde düzenlenince değişir)"""
+        return hashlib.blake2b(np.ascontiguousarray(self.polygon).tobytes(), digest_size=6).hexdigest()
+
+    @property
+    def points(self):
+        """JSON'daki gibi [[x, y], ...] listesi"""
+        return self.polygon.tolist()
+
+    def mask_for(self, frame_shape):
+        """Kare boyutu için (salt okunur) maske; boyut başına bir kez çizilir"""
+        mask = self._mask.mask_for(frame_shape)
+        mask.flags.writeable = False
+        return mask
+
+    def contains(self, frame_shape, xs, ys):
+        """Noktalar havuz içinde mi (vektörel, maske üzerinden)"""
+        return self._mask.contains(frame_shape, xs, ys)
+
+    def contains_point(self, x, y):
+        """Tek nokta testi (kare boyutu bilinmiyorsa)"""
+        if len(self.polygon) < 3:
+            return False
+        rx, ry, rw, rh = self.roi
+        if not (rx <= x < rx + rw and ry <= y < ry + rh):
+            return False
+        return cv2.pointPolygonTest(self.polygon, (float(x), float(y)), False) >= 0
+
+
+def compile_pool_area(path):
+    """
+    JSON dosyasını PoolArea'ya derle
+
+    Returns:
+        PoolArea veya okunamazsa / poligon yoksa None
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"❌ Havuz alanı yüklenemedi: {os.path.basename(path)} ({e})")
+        return None
+
+    points = data.get('polygon_points') if isinstance(data, dict) else data
+    if not points:
+        return None
+    try:
+        polygon = np.asarray(points, dtype=np.int32).reshape(-1, 2)
+    except (TypeError, ValueError):
+        print(f"❌ Geçersiz poligon: {os.path.basename(path)}")
+        return None
+    polygon.flags.writeable = False
+
+    match = POOL_FILE_PATTERN.match(os.path.basename(path))
+    key = match.group('key') if match else os.path.splitext(os.path.basename(path))[0]
+    version = (match.group('version') if match else None) or ''
+    if not version and isinstance(data, dict):
+        version = str(data.get('timestamp') or '')
+
+    moments = cv2.moments(polygon)
+    if moments['m00']:
+        centroid = (int(moments['m10'] / moments['m00']), int(moments['m01'] / moments['m00']))
+    else:
+        centroid = (int(np.mean(polygon[:, 0])), int(np.mean(polygon[:, 1])))
+
+    return PoolArea(
+        key=normalize_key(key),
+        version=version,
+        path=os.path.abspath(path),
+        video_name=data.get('video_name', '') if isinstance(data, dict) else '',
+        polygon=polygon,
+        centroid=centroid,
+        area=float(cv2.contourArea(polygon)) if len(polygon) >= 3 else 0.0,
+        roi=tuple(int(v) for v in cv2.boundingRect(polygon)),
+        _mask=PoolMask(polygon),
+    )
+
+
+class PoolRegistry:
+    """
+    🗂️ Klasör bazlı havuz alanı indeksi
+    """
+
+    def __init__(self, pool_dir, check_interval=2.0):
+        """
+        Args:
+            pool_dir (str): pool_area_*.json klasörü
+            check_interval (float): Klasör değişiklik kontrolü aralığı (sn)
+        """
+        self.pool_dir = os.path.abspath(pool_dir)
+        self.check_interval = check_interval
+
+        self._lock = threading.RLock()
+        self._by_path = {}   # path -> ((mtime_ns, size), PoolArea | None)
+        self._by_key = {}    # anahtar -> (PoolArea, ...) eski -> yeni
+        self._lookups = {}   # sorgu -> anahtar (None: bulunamadı)
+        self._last_check = 0.0
+
+        # İndeks her değiştiğinde artar; tüketiciler kendi önbelleklerini bununla tazeler
+        self.generation = 0
+        self.refresh(force=True)
+
+    def _scan(self):
+        entries = {}
+        try:
+            with os.scandir(self.pool_dir) as it:
+                for entry in it:
+                    if POOL_FILE_PATTERN.match(entry.name) and entry.is_file():
+                        stat = entry.stat()
+                        entries[os.path.abspath(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return entries
+
+    def refresh(self, force=False):
+        """
+        Klasörü kontrol et; eklenen / değişen dosyaları derle
+
+        Returns:
+            bool: İndeks değiştiyse True
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_check < self.check_interval:
+                return False
+            self._last_check = now
+
+            entries = self._scan()
+            if entries == {path: signature for path, (signature, _) in self._by_path.items()}:
+                return False
+
+            by_path = {}
+            for path, signature in entries.items():
+                cached = self._by_path.get(path)
+                if cached is not None and cached[0] == signature:
+                    by_path[path] = cached
+                else:
+                    by_path[path] = (signature, compile_pool_area(path))
+
+            by_key = {}
+            for _, area in by_path.values():
+                if area is not None:
+                    by_key.setdefault(area.key, []).append(area)
+
+            self._by_path = by_path
+            self._by_key = {key: tuple(sorted(areas, key=lambda a: (a.version, a.path)))
+                            for key, areas in by_key.items()}
+            self._lookups = {}
+            self.generation += 1
+            return True
+
+    def _resolve(self, query):
+        if query in self._by_key:
+            return query
+        # Eski davranış: dosya adında video adı geçiyorsa, en yeni sürüme sahip olan
+        matches = [key for key in self._by_key if query in key]
+        if not matches:
+            return None
+        return max(matches, key=lambda key: self._by_key[key][-1].version)
+
+    def versions(self, name):
+        """Video / kamera için tüm sürümler (eski -> yeni)"""
+        self.refresh()
+        query = normalize_key(name)
+        with self._lock:
+            if query not in self._lookups:
+                self._lookups[query] = self._resolve(query)
+            key = self._lookups[query]
+            return self._by_key.get(key, ()) if key is not None else ()
+
+    def find(self, name, version=None) -> Optional[PoolArea]:
+        """
+        Video adı / kamera ID için havuz alanı
+
+        Args:
+            name (str): Video dosya adı / yolu veya kamera ID ('KAMERA_1')
+            version (str): Belirli sürüm (None: en yeni)
+
+        Returns:
+            PoolArea veya None
+        """
+        versions = self.versions(name)
+        if not versions:
+            return None
+        if version is None:
+            return versions[-1]
+        for area in versions:
+            if area.version == version:
+                return area
+        return None
+
+    def load(self, path) -> Optional[PoolArea]:
+        """Dosya yolundan havuz alanı (indeksteyse parse edilmez)"""
+        path = os.path.abspath(path)
+        self.refresh()
+        with self._lock:
+            cached = self._by_path.get(path)
+        if cached is not None:
+            return cached[1]
+        return compile_pool_area(path)
+
+    def all(self):
+        """Tüm derlenmiş alanlar (dosya adına göre sıralı)"""
+        self.refresh()
+        with self._lock:
+            areas = [area for _, area in self._by_path.values() if area is not None]
+        return sorted(areas, key=lambda a: a.file_name)
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(pool_dir=None):
+    """Klasör için paylaşılan PoolRegistry (varsayılan: Paths.OUTPUT_DIR)"""
+    pool_dir = os.path.abspath(pool_dir or Paths.OUTPUT_DIR)
+    with _registries_lock:
+        registry = _registries.get(pool_dir)
+        if registry is None:
+            registry = PoolRegistry(pool_dir)
+            _registries[pool_dir] = registry
+        return registry
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🗺️ ÇOK BÖLGELİ HAVUZ HARİTASI
+============================
+Bir kamera için istenen sayıda etiketli poligon (kulvar, derin bölüm,
+sığ / çocuk alanı, merdiven, havuz kenarı, yansıma noktaları) tek bir
+etiket rasterına (uint8, 0 = arka plan) derlenir. Her tespitin bölgesi
+tek dizi indekslemesiyle bulunur; eşik, tracker ve alarm parametreleri
+bölgeden gelir.
+
+Bölge dosyası: <havuz klasörü>/pool_zones_<video/kamera>[_YYYYMMDD_HHMMSS].json
+    {
+      "video_name": "KAMERA 1.mp4",
+      "zones": [
+        {"name": "havuz", "type": "pool", "polygon": [[x, y], ...]},
+        {"name": "derin", "type": "deep", "polygon": [...], "alert_seconds": 3},
+        {"name": "yansima_1", "type": "reflection", "polygon": [...]}
+      ]
+    }
+Çakışan bölgelerde öncelik: tip önceliği (ZONE_TYPES), eşitse dosyadaki sıra
+(sonraki kazanır). Bölge dosyası yoksa pool_area_*.json tek 'pool' bölgesi olur.
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from dataclasses import dataclass, field, replace
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.config import Paths
+from pool_module.pool_registry import get_registry, normalize_key
+
+ZONE_FILE_PATTERN = re.compile(r'^pool_zones_(?P<key>.+?)(?:_(?P<version>\d{8}_\d{6}))?\.json$', re.IGNORECASE)
+
+# Tip -> varsayılan parametreler
+#   priority: çakışmada büyük olan üstte kalır
+#   confidence: tespit için gereken minimum confidence
+#   in_pool: bölgedeki kişi suda sayılır mı
+#   max_track_distance / max_lost_frames: tracker parametreleri
+#   alert_seconds: hareketsiz / kayıp kalma süresi alarmı (None: alarm yok)
+#   drowning_confidence: 'person_drowning' sınıfını kabul eşiği
+#   suppress: statik yanlış pozitif bastırması uygulanabilir mi (su içinde
+#       hareketsiz kişi = olası kurban; sadece yansıma ve havuz dışı)
+ZONE_TYPES = {
+    'background': dict(priority=0, confidence=0.15, in_pool=False, max_track_distance=80,
+                       max_lost_frames=15, alert_seconds=None, drowning_confidence=None, suppress=True, color=(128, 128, 128)),
+    'poolside':   dict(priority=1, confidence=0.15, in_pool=False, max_track_distance=80,
+                       max_lost_frames=15, alert_seconds=None, drowning_confidence=None, suppress=True, color=(255, 0, 0)),
+    'pool':       dict(priority=2, confidence=0.05, in_pool=True, max_track_distance=80,
+                       max_lost_frames=15, alert_seconds=10.0, drowning_confidence=0.5, suppress=False, color=(0, 255, 255)),
+    'lane':       dict(priority=3, confidence=0.05, in_pool=True, max_track_distance=100,
+                       max_lost_frames=15, alert_seconds=10.0, drowning_confidence=0.5, suppress=False, color=(255, 255, 0)),
+    'shallow':    dict(priority=4, confidence=0.05, in_pool=True, max_track_distance=60,
+                       max_lost_frames=20, alert_seconds=15.0, drowning_confidence=0.6, suppress=False, color=(0, 255, 0)),
+    'deep':       dict(priority=4, confidence=0.04, in_pool=True, max_track_distance=80,
+                       max_lost_frames=8, alert_seconds=5.0, drowning_confidence=0.35, suppress=False, color=(0, 0, 255)),
+    'stairs':     dict(priority=5, confidence=0.10, in_pool=True, max_track_distance=60,
+                       max_lost_frames=15, alert_seconds=20.0, drowning_confidence=0.6, suppress=False, color=(255, 0, 255)),
+    'reflection': dict(priority=6, confidence=0.25, in_pool=True, max_track_distance=80,
+                       max_lost_frames=15, alert_seconds=10.0, drowning_confidence=0.5, suppress=True, color=(200, 200, 200)),
+}
+
+# Bölge tanımında tip varsayılanını ezebilecek alanlar
+ZONE_PARAMS = ('confidence', 'in_pool', 'max_track_distance', 'max_lost_frames',
+               'alert_seconds', 'drowning_confidence', 'suppress', 'color')
+
+
+@dataclass(frozen=True)
+class ZoneSpec:
+    """Derlenmiş, değişmez bölge"""
+    zone_id: int
+    name: str
+    kind: str
+    polygon: Optional[np.ndarray] = field(repr=False, compare=False)
+    priority: int
+    confidence: float
+    in_pool: bool
+    max_track_distance: float
+    max_lost_frames: int
+    alert_seconds: Optional[float]
+    drowning_confidence: Optional[float]
+    suppress: bool
+    color: Tuple[int, int, int]
+    centroid: Tuple[int, int] = (0, 0)
+
+
+def make_zone(zone_id, name, kind, polygon=None, **params):
+    """Tip varsayılanları + verilen parametrelerle ZoneSpec oluştur"""
+    if kind not in ZONE_TYPES:
+        raise ValueError(f"Bilinmeyen bölge tipi: {kind} (geçerli: {', '.join(ZONE_TYPES)})")
+    values = dict(ZONE_TYPES[kind])
+    values.update({k: v for k, v in params.items() if k in ZONE_PARAMS or k == 'priority'})
+
+    centroid = (0, 0)
+    if polygon is not None:
+        polygon = np.asarray(polygon, dtype=np.int32).reshape(-1, 2)
+        polygon.flags.writeable = False
+        moments = cv2.moments(polygon)
+        if moments['m00']:
+            centroid = (int(moments['m10'] / moments['m00']), int(moments['m01'] / moments['m00']))
+        elif len(polygon):
+            centroid = (int(np.mean(polygon[:, 0])), int(np.mean(polygon[:, 1])))
+
+    return ZoneSpec(
+        zone_id=zone_id,
+        name=name,
+        kind=kind,
+        polygon=polygon,
+        priority=int(values['priority']),
+        confidence=float(values['confidence']),
+        in_pool=bool(values['in_pool']),
+        max_track_distance=float(values['max_track_distance']),
+        max_lost_frames=int(values['max_lost_frames']),
+        alert_seconds=None if values['alert_seconds'] is None else float(values['alert_seconds']),
+        drowning_confidence=None if values['drowning_confidence'] is None else float(values['drowning_confidence']),
+        suppress=bool(values['suppress']),
+        color=tuple(int(c) for c in values['color']),
+        centroid=centroid,
+    )
+
+
+class ZoneMap:
+    """
+    🗺️ Bölge etiket rasterı (çözünürlük başına bir kez çizilir)
+    """
+
+    def __init__(self, zones, source=None, **background):
+        """
+        Args:
+            zones (list): ZoneSpec listesi (zone_id 1..255)
+            source (str): Tanım dosyası (log için)
+            **background: Arka plan (hiçbir bölge dışı) parametreleri
+        """
+        ids = [zone.zone_id for zone in zones]
+        if len(set(ids)) != len(ids) or any(not 1 <= i <= 255 for i in ids):
+            raise ValueError("zone_id değerleri tekil ve 1..255 aralığında olmalı")
+        self.source = source
+        self.background = make_zone(0, 'background', 'background', **background)
+        self.zones = tuple(zones)
+
+        # zone_id -> ZoneSpec (dizi indeksi = zone_id)
+        self._by_id = [self.background] * 256
+        for zone in self.zones:
+            self._by_id[zone.zone_id] = zone
+        # Vektörel sorgular için zone_id -> parametre tabloları
+        self.confidence_table = np.array([z.confidence for z in self._by_id], dtype=np.float32)
+        self.in_pool_table = np.array([z.in_pool for z in self._by_id], dtype=bool)
+        self.suppress_table = np.array([z.suppress for z in self._by_id], dtype=bool)
+        self._labels = {}
+
+    def __len__(self):
+        return len(self.zones)
+
+    def __iter__(self):
+        return iter(self.zones)
+
+    @property
+    def min_confidence(self):
+        """En düşük bölge eşiği: model bununla çalıştırılır, bölge eşiği sonra uygulanır"""
+        return float(self.confidence_table.min())
+
+    @property
+    def primary(self):
+        """Havuzun kendisi: suda sayılan en büyük bölge (geriye dönük uyum)"""
+        water = [z for z in self.zones if z.in_pool and z.polygon is not None and len(z.polygon) >= 3]
+        if not water:
+            return None
+        return max(water, key=lambda z: cv2.contourArea(z.polygon))
+
+    def labels_for(self, frame_shape):
+        """Kare boyutu için (salt okunur) etiket rasterı"""
+        key = tuple(frame_shape[:2])
+        labels = self._labels.get(key)
+        if labels is None:
+            labels = np.zeros(key, dtype=np.uint8)
+            # Düşük öncelik önce çizilir; üstteki bölge kazanır
+            order = sorted(enumerate(self.zones), key=lambda item: (item[1].priority, item[0]))
+            for _, zone in order:
+                if zone.polygon is not None and len(zone.polygon) >= 3:
+                    cv2.fillPoly(labels, [zone.polygon.reshape(-1, 1, 2)], zone.zone_id)
+            labels.flags.writeable = False
+            self._labels[key] = labels
+        return labels
+
+    def zone_ids(self, frame_shape, xs, ys):
+        """Noktaların bölge ID'leri (vektörel; kare dışı = 0)"""
+        labels = self.labels_for(frame_shape)
+        xs = np.asarray(xs).astype(np.int64)
+        ys = np.asarray(ys).astype(np.int64)
+        height, width = labels.shape
+        inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        ids = np.zeros(xs.shape, dtype=np.uint8)
+        ids[inside] = labels[ys[inside], xs[inside]]
+        return ids
+
+    def zone(self, zone_id):
+        """ID -> ZoneSpec (bilinmeyen ID: arka plan)"""
+        return self._by_id[int(zone_id)]
+
+    def zone_at(self, frame_shape, x, y):
+        """Tek nokta için ZoneSpec"""
+        return self.zone(self.zone_ids(frame_shape, [x], [y])[0])
+
+    def lookup(self, frame_shape, xs, ys):
+        """Noktalar için ZoneSpec listesi"""
+        return [self._by_id[i] for i in self.zone_ids(frame_shape, xs, ys)]
+
+    def render_preview(self, frame_shape, alpha=0.45, frame=None):
+        """Bölgeleri renkli göster (kontrol için)"""
+        labels = self.labels_for(frame_shape)
+        palette = np.array([z.color for z in self._by_id], dtype=np.uint8)
+        colored = palette[labels]
+        if frame is None:
+            return colored
+        blended = cv2.addWeighted(frame, 1 - alpha, colored, alpha, 0)
+        blended[labels == 0] = frame[labels == 0]
+        return blended
+
+    # ------------------------------------------------------------------
+    # Yükleme
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_pool_area(cls, pool_area, **params):
+        """Tek poligonlu pool_area'dan tek 'pool' bölgeli harita"""
+        zone = make_zone(1, 'pool', 'pool', pool_area.polygon, **params)
+        return cls([zone], source=pool_area.path)
+
+    @classmethod
+    def from_dict(cls, data, source=None):
+        """Bölge tanımı sözlüğünden harita"""
+        zones = []
+        for index, item in enumerate(data.get('zones') or []):
+            polygon = item.get('polygon') or item.get('polygon_points')
+            if not polygon or len(polygon) < 3:
+                print(f"⚠️ Bölge atlandı (poligon yok): {item.get('name', index)}")
+                continue
+            zone_id = int(item.get('id', len(zones) + 1))
+            params = {k: item[k] for k in ZONE_PARAMS + ('priority',) if k in item}
+            zones.append(make_zone(zone_id, item.get('name', f"zone_{zone_id}"),
+                                   item.get('type', 'pool'), polygon, **params))
+        background = {k: v for k, v in (data.get('background') or {}).items() if k in ZONE_PARAMS}
+        return cls(zones, source=source, **background)
+
+    @classmethod
+    def load(cls, path):
+        """Bölge dosyasını yükle; hatalıysa None"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls.from_dict(data, source=os.path.abspath(path))
+        except (OSError, ValueError) as e:
+            print(f"❌ Bölge haritası yüklenemedi: {os.path.basename(path)} ({e})")
+            return None
+
+    def with_params(self, kind, **params):
+        """Bir tipteki tüm bölgelerin parametrelerini değiştirilmiş yeni harita"""
+        zones = [replace(z, **params) if z.kind == kind else z for z in self.zones]
+        return ZoneMap(zones, source=self.source,
+                       **{k: getattr(self.background, k) for k in ZONE_PARAMS})
+
+
+def find_zone_file(name, pool_dir=None):
+    """Video / kamera için en yeni pool_zones_*.json yolu (yoksa None)"""
+    pool_dir = pool_dir or Paths.OUTPUT_DIR
+    query = normalize_key(name)
+    candidates = []
+    try:
+        with os.scandir(pool_dir) as it:
+            for entry in it:
+                match = ZONE_FILE_PATTERN.match(entry.name)
+                if match and entry.is_file():
+                    key = normalize_key(match.group('key'))
+                    candidates.append((key == query, key, match.group('version') or '', entry.path))
+    except OSError:
+        return None
+    # Önce tam eşleşme, sonra ad içinde geçen; en yeni sürüm
+    exact = [c for c in candidates if c[0]]
+    matches = exact or [c for c in candidates if query in c[1]]
+    if not matches:
+        return None
+    return max(matches, key=lambda c: c[2])[3]
+
+
+def load_zone_map(name, pool_dir=None):
+    """
+    Video / kamera için bölge haritası
+
+    Önce pool_zones_*.json, yoksa registry'deki pool_area (tek bölge).
+
+    Returns:
+        ZoneMap veya hiçbir tanım yoksa None
+    """
+    zone_file = find_zone_file(name, pool_dir)
+    if zone_file:
+        zone_map = ZoneMap.load(zone_file)
+        if zone_map is not None and len(zone_map):
+            return zone_map
+    pool_area = get_registry(pool_dir).find(name)
+    if pool_area is None:
+        return None
+    return ZoneMap.from_pool_area(pool_area)
+
+
+def main():
+    """Bölge haritasını kontrol et ve önizleme kaydet"""
+    parser = argparse.ArgumentParser(description="🗺️ Havuz bölge haritası önizleme")
+    parser.add_argument("name", help="Video adı / kamera ID (örn: 'KAMERA 1.mp4')")
+    parser.add_argument("--pool-dir", default=None, help="pool_area / pool_zones klasörü")
+    parser.add_argument("--frame", default=None, help="Üzerine çizilecek kare (opsiyonel)")
+    parser.add_argument("--size", default="1920x1080", help="Kare yoksa boyut (GxY)")
+    parser.add_argument("--output", default="zone_preview.png", help="Önizleme dosyası")
+    args = parser.parse_args()
+
+    zone_map = load_zone_map(args.name, args.pool_dir)
+    if zone_map is None:
+        print(f"❌ Bölge tanımı bulunamadı: {args.name}")
+        return 1
+
+    print(f"✅ Bölge haritası: {zone_map.source}")
+    for zone in zone_map:
+        print(f"  {zone.zone_id:3d} {zone.name:<20} {zone.kind:<11} conf>={zone.confidence:.2f} "
+              f"alarm={zone.alert_seconds}s")
+
+    frame = cv2.imread(args.frame) if args.frame else None
+    if frame is not None:
+        shape = frame.shape
+    else:
+        width, height = (int(v) for v in args.size.lower().split('x'))
+        shape = (height, width)
+    cv2.imwrite(args.output, zone_map.render_preview(shape, frame=frame))
+    print(f"💾 Önizleme: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
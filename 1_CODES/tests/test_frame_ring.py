@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+"""
+🧪 PAYLAŞIMLI BELLEK KARE HALKASI TESTİ
+======================================
+FrameRing'in referans sayımı, en-yeni / sıralı okuma modları, süreçler
+arası kopyasız paylaşım ve VideoCapture'ın yuvaya yerinde yazmasını test
+eder. Ardından 1080p ve 4K karelerin süreçler arası taşınma hızını
+multiprocessing.Queue (pickle) ile karşılaştırır.
+"""
+
+import cv2
+import sys
+import os
+import time
+import tempfile
+import multiprocessing
+import numpy as np
+
+# Modülleri import et
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from video_module.frame_ring import FrameRing, capture_to_ring
+
+BENCH_SECONDS = 2.0
+BENCH_SHAPES = {
+    '1080p': (1080, 1920, 3),
+    '4K': (2160, 3840, 3),
+}
+
+
+def test_refcount_and_modes():
+    """Tutulan yuvanın üzerine yazılmaz; en-yeni ve sıralı okuma"""
+    ring = FrameRing.create((4, 6, 3), slots=3)
+    try:
+        for i in range(1, 4):
+            ring.write(np.full((4, 6, 3), i, dtype=np.uint8), frame_number=i)
+
+        latest = ring.reader(latest=True).read(timeout=0.1)
+        assert latest.seq == 3 and latest.frame[0, 0, 0] == 3
+        assert not latest.frame.flags.writeable
+
+        ordered = ring.reader(latest=False)
+        first = ordered.read(timeout=0.1)
+        assert first.seq == 1 and first.frame_number == 1
+
+        # 2 yuva tutuluyor: üretici sadece kalan yuvaya yazabilir
+        ring.write(np.full((4, 6, 3), 4, dtype=np.uint8))
+        assert ring.write(np.full((4, 6, 3), 5, dtype=np.uint8)) == 5
+        assert first.frame[0, 0, 0] == 1 and latest.frame[0, 0, 0] == 3
+
+        # Sıralı okuyucu ezilen 2. kareyi 'dropped' olarak görür
+        first.release()
+        latest.release()
+        nxt = ordered.read(timeout=0.1)
+        assert nxt.seq == 3 and nxt.dropped == 1
+        nxt.release()
+
+        # Tüm yuvalar tutulunca yazma (beklemeden) düşer
+        holder = ring.reader(latest=False)
+        refs = [holder.read(timeout=0.1) for _ in range(3)]
+        assert ring.write(np.zeros((4, 6, 3), dtype=np.uint8)) is None
+        assert ring.get_stats()['producer_drops'] == 1
+        for ref in refs:
+            ref.release()
+
+        # Küçük kare kapasiteli yuvaya sığar
+        ring.write(np.full((2, 3, 3), 9, dtype=np.uint8))
+        small = ring.reader().read(timeout=0.1)
+        assert small.frame.shape == (2, 3, 3) and small.frame.max() == 9
+        small.release()
+    finally:
+        ring.close()
+        ring.unlink()
+    print("✅ Referans sayımı ve okuma modları doğru çalışıyor")
+
+
+def _checksum_consumer(ring, results):
+    """Çocuk süreç: sıralı oku, her karenin ilk pikselini topla"""
+    reader = ring.reader(latest=False)
+    total = 0
+    while True:
+        ref = reader.read(timeout=2.0)
+        if ref is None:
+            break
+        with ref:
+            total += int(ref.frame[0, 0, 0])
+    results.put((reader.frames_read, reader.frames_dropped, total))
+
+
+def test_cross_process():
+    """Başka süreç aynı yuvaları kopyasız okur"""
+    ring = FrameRing.create((8, 8, 3), slots=16)
+    results = multiprocessing.Queue()
+    consumer = multiprocessing.Process(target=_checksum_consumer, args=(ring, results))
+    consumer.start()
+    try:
+        for i in range(1, 11):
+            while ring.write(np.full((8, 8, 3), i, dtype=np.uint8), timeout=1.0) is None:
+                pass
+        ring.stop()
+        frames_read, dropped, total = results.get(timeout=10)
+        consumer.join(timeout=5)
+    finally:
+        ring.close()
+        ring.unlink()
+    assert frames_read + dropped == 10, (frames_read, dropped)
+    assert dropped == 0 and total == sum(range(1, 11)), (dropped, total)
+    print("✅ Süreçler arası okuma doğru")
+
+
+def test_capture_in_place():
+    """VideoCapture kareyi doğrudan yuvaya yazar"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        video_path = os.path.join(temp_dir, "ring_test.avi")
+        out = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (160, 120))
+        for i in range(12):
+            out.write(np.full((120, 160, 3), i * 20, dtype=np.uint8))
+        out.release()
+
+        ring = FrameRing.create((120, 160, 3), slots=16)
+        try:
+            published = capture_to_ring(video_path, ring)
+            assert published == 12 and ring.closed
+            reader = ring.reader(latest=False)
+            values = []
+            while True:
+                ref = reader.read(timeout=0.1)
+                if ref is None:
+                    break
+                with ref:
+                    values.append(int(ref.frame.mean()))
+            assert len(values) == 12 and values == sorted(values), values
+        finally:
+            ring.close()
+            ring.unlink()
+    print("✅ VideoCapture yuvaya yerinde yazıyor")
+
+
+# ----------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------
+
+def _ring_consumer(ring, results):
+    reader = ring.reader(latest=False)
+    while True:
+        ref = reader.read(timeout=2.0)
+        if ref is None:
+            break
+        with ref:
+            ref.frame[::64, ::64].sum()   # Kareye dokun (kopyasız)
+    results.put((reader.frames_read, reader.frames_dropped))
+
+
+def _queue_consumer(queue, results):
+    frames = 0
+    while True:
+        frame = queue.get()
+        if frame is None:
+            break
+        frame[::64, ::64].sum()
+        frames += 1
+    results.put((frames, 0))
+
+
+def _bench_ring(shape):
+    ring = FrameRing.create(shape, slots=8)
+    results = multiprocessing.Queue()
+    consumer = multiprocessing.Process(target=_ring_consumer, args=(ring, results))
+    consumer.start()
+    source = np.random.randint(0, 255, shape, dtype=np.uint8)
+    start = time.perf_counter()
+    try:
+        while time.perf_counter() - start < BENCH_SECONDS:
+            slot, view = ring.reserve(timeout=1.0)
+            if slot is None:
+                continue
+            np.copyto(view, source)   # Alım okuyucusunun yuvaya yazmasının yerine
+            ring.commit(slot)
+        ring.stop()
+        frames, dropped = results.get(timeout=10)
+        elapsed = time.perf_counter() - start
+        consumer.join(timeout=5)
+    finally:
+        ring.close()
+        ring.unlink()
+    return frames / elapsed, dropped
+
+
+def _bench_queue(shape):
+    queue = multiprocessing.Queue(maxsize=8)
+    results = multiprocessing.Queue()
+    consumer = multiprocessing.Process(target=_queue_consumer, args=(queue, results))
+    consumer.start()
+    source = np.random.randint(0, 255, shape, dtype=np.uint8)
+    start = time.perf_counter()
+    while time.perf_counter() - start < BENCH_SECONDS:
+        queue.put(source)
+    queue.put(None)
+    frames, _ = results.get(timeout=30)
+    elapsed = time.perf_counter() - start
+    consumer.join(timeout=5)
+    return frames / elapsed
+
+
+def benchmark():
+    """1080p / 4K: paylaşımlı halka vs multiprocessing.Queue (süreçler arası FPS)"""
+    print(f"📊 Süreçler arası kare taşıma ({BENCH_SECONDS:.0f}s / ölçüm)")
+    print(f"{'Çözünürlük':<12}{'Halka FPS':>12}{'Düşen':>8}{'Queue FPS':>12}{'Hızlanma':>10}")
+    rows = {}
+    for label, shape in BENCH_SHAPES.items():
+        ring_fps, dropped = _bench_ring(shape)
+        queue_fps = _bench_queue(shape)
+        rows[label] = (ring_fps, queue_fps)
+        print(f"{label:<12}{ring_fps:>12.1f}{dropped:>8}{queue_fps:>12.1f}{ring_fps / max(queue_fps, 1e-9):>9.1f}x")
+    return rows
+
+
+def run_all_tests():
+    """Tüm halka testlerini ve benchmark'ı çalıştır"""
+    print("="*50)
+    print("🧪 PAYLAŞIMLI BELLEK HALKASI TESTLERİ")
+    print("="*50)
+
+    test_refcount_and_modes()
+    test_cross_process()
+    test_capture_in_place()
+
+    print("-" * 30)
+    benchmark()
+
+    print("-" * 30)
+    print("✅ Halka testleri tamamlandı!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""
+🧪 ÇALIŞMA ZAMANI AYARLARI TESTİ
+===============================
+Aynı ada yerinde yeniden yazılan havuz alanı dosyasının (simple_pool_definer
+`pool_area_<video>.json` yazar) poll() tarafından değişiklik olarak
+raporlandığını ve yeni poligonun ayarlara yansıdığını test eder.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Modülleri import et
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.runtime_config import RuntimeConfig
+
+OLD_POLYGON = [[10, 10], [200, 10], [200, 150], [10, 150]]
+NEW_POLYGON = [[20, 30], [300, 30], [300, 220], [20, 220]]
+
+
+def _write_pool(path, polygon, mtime_ns=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'video_name': 'KAMERA_1', 'polygon_points': polygon}, f)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_pool_rewritten_in_place():
+    """Aynı dosya yerinde düzenlenince poll() değişikliği raporlar"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pool_path = os.path.join(temp_dir, "pool_area_KAMERA_1.json")
+        _write_pool(pool_path, OLD_POLYGON)
+
+        runtime = RuntimeConfig(config_path=os.path.join(temp_dir, "runtime.json"), control_port=0,
+                                pool_dir=temp_dir, check_interval=0,
+                                change_log_path=os.path.join(temp_dir, "changes.jsonl"))
+        runtime.registry.check_interval = 0
+        try:
+            settings = runtime.register("KAMERA_1")
+            assert settings.pool_zone.points == OLD_POLYGON
+            assert runtime.poll(1) == {}
+
+            # Aynı dosya adı, farklı poligon (mtime kesin değişsin)
+            _write_pool(pool_path, NEW_POLYGON, os.stat(pool_path).st_mtime_ns + 1_000_000_000)
+            diff = runtime.poll(2)
+            assert 'pool_geometry' in diff.get('KAMERA_1', {}), diff
+            assert 'pool_zone' not in diff['KAMERA_1']
+            assert runtime.settings_for("KAMERA_1").pool_zone.points == NEW_POLYGON
+
+            with open(os.path.join(temp_dir, "changes.jsonl"), 'r', encoding='utf-8') as f:
+                records = [json.loads(line) for line in f]
+            assert len(records) == 1 and records[0]['frame'] == 2
+            assert runtime.poll(3) == {}
+        finally:
+            runtime.close()
+    print("✅ Yerinde düzenlenen havuz alanı poll() ile yakalanıyor")
+
+
+def run_all_tests():
+    """Tüm runtime config testlerini çalıştır"""
+    print("="*50)
+    print("🧪 RUNTIME CONFIG TESTLERİ")
+    print("="*50)
+
+    test_pool_rewritten_in_place()
+
+    print("-" * 30)
+    print("✅ Runtime config testleri tamamlandı!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
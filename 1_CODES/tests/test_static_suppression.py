@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+"""
+🧪 STATİK BASTIRMA HARİTASI TESTİ
+================================
+Sabit bir "hayalet" tespitin (parlama, merdiven) binlerce kare boyunca
+bastırılmış kaldığını, hücrede gerçek hareket görülünce bastırmanın
+bittiğini ve bastırılamaz (su içi) tespitlerin hiç düşürülmediğini test eder.
+"""
+
+import sys
+import os
+
+# Modülleri import et
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from detection_module.static_suppression import StaticSuppressionMap
+
+FRAME_SHAPE = (480, 640)
+GHOST = (100.0, 100.0)
+GHOST_FRAMES = 8000
+
+
+def _warm_up(suppression, max_frames=GHOST_FRAMES):
+    """Hayalet bastırılana kadar besle; bastırmanın başladığı kare"""
+    for frame in range(max_frames):
+        keep = suppression.process([GHOST[0]], [GHOST[1]], [0.3])
+        if not keep[0]:
+            return frame
+    return None
+
+
+def test_constant_ghost_stays_suppressed():
+    """Sabit hayalet, ısınmadan sonra bir daha geçmez"""
+    suppression = StaticSuppressionMap(FRAME_SHAPE)
+    warmup = _warm_up(suppression)
+    assert warmup is not None, "Hayalet hiç bastırılmadı"
+
+    passed = 0
+    for _ in range(GHOST_FRAMES):
+        keep = suppression.process([GHOST[0]], [GHOST[1]], [0.3])
+        passed += int(keep[0])
+    assert passed == 0, f"{passed}/{GHOST_FRAMES} hayalet tespiti geçti"
+    assert suppression.suppressed_cells == 1
+    print(f"✅ Sabit hayalet {warmup}. karede bastırıldı, {GHOST_FRAMES} kare boyunca bastırılmış kaldı")
+
+
+def test_motion_releases_cell():
+    """Hücrede gerçek hareket (yüksek confidence, yer değiştiren kişi) bastırmayı bitirir"""
+    suppression = StaticSuppressionMap(FRAME_SHAPE)
+    assert _warm_up(suppression) is not None
+
+    released = None
+    for frame in range(2000):
+        walker_x = 96.0 if frame % 2 else 124.0
+        keep = suppression.process([GHOST[0], walker_x], [GHOST[1], 110.0], [0.3, 0.9])
+        assert keep[1], "Yüksek confidence'lı tespit bastırıldı"
+        if keep[0]:
+            released = frame
+            break
+    assert released is not None, "Hareket kanıtı hücreyi serbest bırakmadı"
+    print(f"✅ Hareket {released} karede bastırmayı bitirdi")
+
+
+def test_ineligible_never_suppressed():
+    """eligible=False (su içi bölge) tespitleri bastırılmış hücrede de tutulur"""
+    suppression = StaticSuppressionMap(FRAME_SHAPE)
+    assert _warm_up(suppression) is not None
+
+    keep = suppression.process([GHOST[0]], [GHOST[1]], [0.3], eligible=[False])
+    assert keep[0]
+    keep = suppression.process([GHOST[0]], [GHOST[1]], [0.3], moving=[True])
+    assert keep[0]
+    print("✅ Su içi ve tracker'ın onayladığı tespitler bastırılmıyor")
+
+
+def run_all_tests():
+    """Tüm bastırma testlerini çalıştır"""
+    print("="*50)
+    print("🧪 STATİK BASTIRMA TESTLERİ")
+    print("="*50)
+
+    test_constant_ghost_stays_suppressed()
+    test_motion_releases_cell()
+    test_ineligible_never_suppressed()
+
+    print("-" * 30)
+    print("✅ Bastırma testleri tamamlandı!")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -10,14 +10,15 @@ import cv2
 import os
 import sys
 import time
-import json
 import numpy as np
 from datetime import datetime
 from collections import defaultdict
 
 # Ana dizini path'e ekle
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from core.config import Paths, Detection, System, get_project_info
+from core.config import Paths, Detection, System, Profiling, get_project_info
+from core.instrumentation import StageTimers
+from pool_module.pool_registry import get_registry
 
 class AllModelsPoolTracker:
     """
@@ -30,37 +31,20 @@ class AllModelsPoolTracker:
         print(f"📊 {len(self.info['videos'])} video, {len(self.info['models'])} model bulundu")
     
     def find_pool_area_for_video(self, video_name):
-        """Video için en son havuz alanı dosyasını bul"""
-        if not os.path.exists(Paths.OUTPUT_DIR):
-            return None
-        
-        video_base = os.path.splitext(video_name)[0].replace(" ", "_")
-        
-        pool_files = []
-        for file in os.listdir(Paths.OUTPUT_DIR):
-            if file.startswith("pool_area_") and file.endswith(".json"):
-                if video_base.upper() in file.upper():
-                    pool_files.append(file)
-        
-        if not pool_files:
+        """Video için en son havuz alanı dosyasını bul (registry, O(1))"""
+        pool_area = get_registry(Paths.OUTPUT_DIR).find(video_name)
+        if pool_area is None:
             print(f"❌ {video_name} için havuz alanı bulunamadı!")
             return None
-        
-        pool_files.sort(reverse=True)
-        return os.path.join(Paths.OUTPUT_DIR, pool_files[0])
+        return pool_area.path
     
     def load_pool_area(self, pool_file_path):
-        """Havuz alanını JSON dosyasından yükle"""
-        try:
-            with open(pool_file_path, 'r', encoding='utf-8') as f:
-                pool_data = json.load(f)
-            
-            polygon = np.array(pool_data['polygon_points'], dtype=np.int32)
-            return polygon
-            
-        except Exception as e:
-            print(f"❌ Havuz alanı yüklenemedi: {e}")
+        """Havuz alanını yükle (registry'de derlenmişse JSON tekrar okunmaz)"""
+        pool_area = get_registry(os.path.dirname(pool_file_path)).load(pool_file_path)
+        if pool_area is None:
             return None
+        
+        return pool_area.polygon
     
     def is_point_in_pool(self, polygon, x, y):
         """Nokta havuz içinde mi kontrol et"""
@@ -135,6 +119,7 @@ class AllModelsPoolTracker:
         pool_outside_count = 0
         unique_pool_persons = set()
         unique_outside_persons = set()
+        timers = StageTimers(enabled=Profiling.ENABLED, pipeline="all_models_pool_tracker")
         
         # Kişi takip sistemi
         person_tracks = {}
@@ -144,7 +129,8 @@ class AllModelsPoolTracker:
         # İşleme döngüsü
         try:
             while True:
-                ret, frame = cap.read()
+                with timers.stage('decode'):
+                    ret, frame = cap.read()
                 if not ret:
                     break
                 
@@ -158,17 +144,22 @@ class AllModelsPoolTracker:
                 
                 # Havuz alanını çiz (sadece video kaydediliyorsa)
                 if save_video:
-                    overlay = frame.copy()
-                    cv2.fillPoly(overlay, [pool_polygon], (0, 255, 255))
-                    cv2.addWeighted(overlay, 0.2, frame, 0.8, 0, frame)
-                    cv2.polylines(frame, [pool_polygon], True, (0, 255, 255), 3)
+                    with timers.stage('draw'):
+                        overlay = frame.copy()
+                        cv2.fillPoly(overlay, [pool_polygon], (0, 255, 255))
+                        cv2.addWeighted(overlay, 0.2, frame, 0.8, 0, frame)
+                        cv2.polylines(frame, [pool_polygon], True, (0, 255, 255), 3)
                 
                 # Normal tespit
-                results = model(frame, conf=Detection.CONFIDENCE_THRESHOLD, verbose=False)
+                with timers.stage('detect'):
+                    results = model(frame, conf=Detection.CONFIDENCE_THRESHOLD, verbose=False)
+                timers.record_yolo_speed(results)
                 
                 # Havuz içi için düşük confidence
                 pool_confidence = max(0.3, Detection.CONFIDENCE_THRESHOLD - 0.2)
-                results_pool = model(frame, conf=pool_confidence, verbose=False)
+                with timers.stage('detect'):
+                    results_pool = model(frame, conf=pool_confidence, verbose=False)
+                timers.record_yolo_speed(results_pool)
                 
                 # Tespitleri topla
                 current_frame_persons = []
@@ -208,7 +199,10 @@ class AllModelsPoolTracker:
                                 center_y = (y1 + y2) // 2
                                 
                                 # Sadece havuz içindekiler için düşük confidence
-                                if self.is_point_in_pool(pool_polygon, center_x, center_y):
+                                with timers.stage('zone_test'):
+                                    in_pool = self.is_point_in_pool(pool_polygon, center_x, center_y)
+                                
+                                if in_pool:
                                     area = (x2 - x1) * (y2 - y1)
                                     if area > Detection.MIN_AREA // 2:
                                         # Dublicate kontrolü
@@ -235,34 +229,36 @@ class AllModelsPoolTracker:
                     center_x, center_y = person['center']
                     
                     # Track ID ata
-                    current_pos = (center_x, center_y)
-                    best_match_id = None
-                    min_distance = float('inf')
+                    with timers.stage('tracking'):
+                        current_pos = (center_x, center_y)
+                        best_match_id = None
+                        min_distance = float('inf')
                     
-                    for track_id, track_info in person_tracks.items():
-                        if frame_count - track_info['last_frame'] < 30:
-                            last_pos = track_info['positions'][-1]
-                            distance = self.calculate_distance(current_pos, last_pos)
+                        for track_id, track_info in person_tracks.items():
+                            if frame_count - track_info['last_frame'] < 30:
+                                last_pos = track_info['positions'][-1]
+                                distance = self.calculate_distance(current_pos, last_pos)
                             
-                            if distance < max_track_distance and distance < min_distance:
-                                min_distance = distance
-                                best_match_id = track_id
+                                if distance < max_track_distance and distance < min_distance:
+                                    min_distance = distance
+                                    best_match_id = track_id
                     
-                    if best_match_id is not None:
-                        person_tracks[best_match_id]['positions'].append(current_pos)
-                        person_tracks[best_match_id]['last_frame'] = frame_count
-                        track_id = best_match_id
-                    else:
-                        track_id = next_track_id
-                        next_track_id += 1
-                        person_tracks[track_id] = {
-                            'positions': [current_pos],
-                            'first_frame': frame_count,
-                            'last_frame': frame_count
-                        }
+                        if best_match_id is not None:
+                            person_tracks[best_match_id]['positions'].append(current_pos)
+                            person_tracks[best_match_id]['last_frame'] = frame_count
+                            track_id = best_match_id
+                        else:
+                            track_id = next_track_id
+                            next_track_id += 1
+                            person_tracks[track_id] = {
+                                'positions': [current_pos],
+                                'first_frame': frame_count,
+                                'last_frame': frame_count
+                            }
                     
                     # Havuz içi/dışı sayımı
-                    is_in_pool = self.is_point_in_pool(pool_polygon, center_x, center_y)
+                    with timers.stage('zone_test'):
+                        is_in_pool = self.is_point_in_pool(pool_polygon, center_x, center_y)
                     
                     if is_in_pool:
                         frame_inside += 1
@@ -273,24 +269,25 @@ class AllModelsPoolTracker:
                     
                     # Video çizimleri (sadece kayıt yapılıyorsa)
                     if save_video:
-                        x1, y1, x2, y2 = person['bbox']
-                        conf = person['conf']
-                        is_enhanced = person.get('enhanced', False)
+                        with timers.stage('draw'):
+                            x1, y1, x2, y2 = person['bbox']
+                            conf = person['conf']
+                            is_enhanced = person.get('enhanced', False)
                         
-                        if is_in_pool:
-                            color = (0, 255, 0)
-                            thickness = 3
-                            label = f"#{track_id}: {conf:.2f}"
-                            if is_enhanced:
-                                label += " [E]"
-                        else:
-                            color = (0, 0, 255)
-                            thickness = 2
-                            label = f"#{track_id}: {conf:.2f}"
+                            if is_in_pool:
+                                color = (0, 255, 0)
+                                thickness = 3
+                                label = f"#{track_id}: {conf:.2f}"
+                                if is_enhanced:
+                                    label += " [E]"
+                            else:
+                                color = (0, 0, 255)
+                                thickness = 2
+                                label = f"#{track_id}: {conf:.2f}"
                         
-                        cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
-                        cv2.putText(frame, label, (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-                        cv2.circle(frame, (center_x, center_y), 5, color, -1)
+                            cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
+                            cv2.putText(frame, label, (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+                            cv2.circle(frame, (center_x, center_y), 5, color, -1)
                 
                 # Sayaçları güncelle
                 total_detections += len(current_frame_persons)
@@ -299,22 +296,26 @@ class AllModelsPoolTracker:
                 
                 # Video bilgileri ekle (sadece kayıt yapılıyorsa)
                 if save_video:
-                    progress_percent = (elapsed / max_duration) * 100
+                    with timers.stage('draw'):
+                        progress_percent = (elapsed / max_duration) * 100
                     
-                    # Bilgi paneli
-                    cv2.rectangle(frame, (5, 5), (width-5, 100), (0, 0, 0), -1)
-                    cv2.rectangle(frame, (5, 5), (width-5, 100), (255, 255, 255), 2)
+                        # Bilgi paneli
+                        cv2.rectangle(frame, (5, 5), (width-5, 100), (0, 0, 0), -1)
+                        cv2.rectangle(frame, (5, 5), (width-5, 100), (255, 255, 255), 2)
                     
-                    cv2.putText(frame, f"Model: {model_name} | Kare: {frame_count} | %{progress_percent:.1f}", 
-                               (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                    cv2.putText(frame, f"Bu kare - Havuz: {frame_inside} | Dis: {frame_outside}", 
-                               (10, 45), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                    cv2.putText(frame, f"Benzersiz - Havuz: {len(unique_pool_persons)} | Dis: {len(unique_outside_persons)}", 
-                               (10, 65), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                    cv2.putText(frame, f"FPS: {frame_count/elapsed:.1f} | Süre: {elapsed:.0f}s/92s", 
-                               (10, 85), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                        cv2.putText(frame, f"Model: {model_name} | Kare: {frame_count} | %{progress_percent:.1f}", 
+                                   (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                        cv2.putText(frame, f"Bu kare - Havuz: {frame_inside} | Dis: {frame_outside}", 
+                                   (10, 45), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                        cv2.putText(frame, f"Benzersiz - Havuz: {len(unique_pool_persons)} | Dis: {len(unique_outside_persons)}", 
+                                   (10, 65), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                        cv2.putText(frame, f"FPS: {frame_count/elapsed:.1f} | Süre: {elapsed:.0f}s/92s", 
+                                   (10, 85), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
                     
-                    out.write(frame)
+                    with timers.stage('encode'):
+                        out.write(frame)
+                
+                timers.end_frame()
         
         except Exception as e:
             print(f"❌ {model_name} işleme hatası: {e}")
@@ -345,6 +346,14 @@ class AllModelsPoolTracker:
             f.write(f"🆔 Benzersiz Havuz Kişisi: {len(unique_pool_persons)}\n")
             f.write(f"🆔 Benzersiz Dış Kişi: {len(unique_outside_persons)}\n")
             f.write(f"💾 Video Kaydı: {'Evet' if save_video else 'Hayır (disk tasarrufu)'}\n")
+            
+            f.write(f"\n⏱️  AŞAMA SÜRELERİ (kare başına):\n")
+            for line in timers.format_lines():
+                f.write(f"   {line}\n")
+        
+        # Aşama süreleri JSON (+ opsiyonel Prometheus)
+        timers.save(os.path.join(output_folder, "stage_timings.json"), Profiling.PROMETHEUS_FILE,
+                    {'model': model_name, 'video': video_name})
         
         return {
             'model_name': model_name,
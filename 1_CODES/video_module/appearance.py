@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🎨 UCUZ GÖRÜNÜM TANIMLAYICILARI (RE-ID)
+======================================
+Su altına dalan ya da başkasının arkasında kalan yüzücüler tracker'ın kayıp
+limitini aşınca yeni ID ile geri gelir. Bu modül her tespit için küçük bir
+görünüm vektörü üretir ve kaybolan track'lerin vektörlerini sınırlı bir
+galeride tutar; geri gelen kişi eski ID'sini alır.
+
+- Tanımlayıcı: üst gövde kırpıntısının nicemlenmiş HSV histogramı
+  (varsayılan 8x4x4 = 128 kutu). Karedeki tüm kutular tek seferde
+  örneklenir (kutu başına 16x16 ızgara), tek cvtColor + tek bincount
+- Vektörler L1 normalize edilip karekökü alınır: iki vektörün iç çarpımı
+  Bhattacharyya katsayısıdır, mesafe = 1 - iç çarpım ∈ [0, 1]
+- Galeri: track başına en fazla `max_samples` farklı örnek, en fazla
+  `max_lost` kayıp track, `max_lost_frames` kareden eski kayıplar silinir
+
+Kullanım:
+    descriptors = extract_descriptors(frame, bboxes)      # (N, 128)
+    gallery.add(track_id, descriptors[i])                 # eşleşen track'ler
+    gallery.mark_lost(track_id, frame_number, position)   # track silinince
+    for det_idx, track_id in gallery.reidentify(descriptors, frame_number, positions):
+        ...
+"""
+
+from collections import OrderedDict, deque
+
+import cv2
+import numpy as np
+
+from video_module.spatial_hash import greedy_assign
+
+
+DEFAULT_BINS = (8, 4, 4)
+
+
+def descriptor_size(bins=DEFAULT_BINS):
+    return int(bins[0] * bins[1] * bins[2])
+
+
+def extract_descriptors(frame, bboxes, bins=DEFAULT_BINS, upper_ratio=0.5, grid=16):
+    """
+    Karedeki tüm kutular için görünüm vektörleri (toplu)
+
+    Args:
+        frame (np.ndarray): BGR kare
+        bboxes (array-like): (N, 4) x1, y1, x2, y2
+        bins (tuple): H, S, V kutu sayıları
+        upper_ratio (float): Kutunun üstten kullanılacak oranı (üst gövde; su
+            altındaki bacaklar ve su yüzeyi yansıması dışarıda kalır)
+        grid (int): Kutu başına grid x grid örnek piksel
+
+    Returns:
+        np.ndarray: (N, D) float32, her satır birim uzunlukta (sqrt-L1)
+    """
+    size = descriptor_size(bins)
+    boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    count = len(boxes)
+    if count == 0:
+        return np.empty((0, size), dtype=np.float32)
+
+    height, width = frame.shape[:2]
+    x1 = np.clip(boxes[:, 0], 0, width - 1)
+    x2 = np.clip(boxes[:, 2], x1 + 1, width)
+    y1 = np.clip(boxes[:, 1], 0, height - 1)
+    y2 = np.clip(y1 + (boxes[:, 3] - boxes[:, 1]) * upper_ratio, y1 + 1, height)
+
+    # Kutu başına grid x grid örnek koordinatı: (N, grid)
+    steps = (np.arange(grid) + 0.5) / grid
+    xs = np.minimum((x1[:, None] + (x2 - x1)[:, None] * steps).astype(np.int64), width - 1)
+    ys = np.minimum((y1[:, None] + (y2 - y1)[:, None] * steps).astype(np.int64), height - 1)
+
+    # (N, grid, grid, 3) -> tek cvtColor çağrısı için (N * grid, grid, 3)
+    samples = frame[ys[:, :, None], xs[:, None, :]]
+    hsv = cv2.cvtColor(np.ascontiguousarray(samples.reshape(count * grid, grid, 3)), cv2.COLOR_BGR2HSV)
+    hsv = hsv.reshape(count, grid * grid, 3).astype(np.int64)
+
+    h_bins, s_bins, v_bins = bins
+    h = hsv[:, :, 0] * h_bins // 180
+    s = hsv[:, :, 1] * s_bins // 256
+    v = hsv[:, :, 2] * v_bins // 256
+    index = (h * s_bins + s) * v_bins + v
+    index += (np.arange(count) * size)[:, None]
+
+    histograms = np.bincount(index.ravel(), minlength=count * size).reshape(count, size)
+    descriptors = np.sqrt(histograms / float(grid * grid)).astype(np.float32)
+    return descriptors
+
+
+def appearance_distance(a, b):
+    """
+    Bhattacharyya mesafesi (1 - katsayı)
+
+    Args:
+        a (np.ndarray): (D,) veya (N, D)
+        b (np.ndarray): (D,) veya (M, D)
+
+    Returns:
+        float veya np.ndarray: (N, M)
+    """
+    similarity = np.asarray(a, dtype=np.float32) @ np.asarray(b, dtype=np.float32).T
+    return np.clip(1.0 - similarity, 0.0, 1.0)
+
+
+class AppearanceGallery:
+    """
+    🖼️ Track başına sınırlı görünüm örnekleri ve kayıp track kaydı
+    """
+
+    def __init__(self, max_samples=8, novelty=0.05, max_lost=64, max_lost_frames=900):
+        """
+        Args:
+            max_samples (int): Track başına en fazla örnek sayısı
+            novelty (float): Yeni örnek, mevcut örneklere en az bu kadar uzaksa eklenir
+            max_lost (int): Saklanacak en fazla kayıp track
+            max_lost_frames (int): Kayıp track bu kadar kareden sonra unutulur
+        """
+        self.max_samples = max_samples
+        self.novelty = novelty
+        self.max_lost = max_lost
+        self.max_lost_frames = max_lost_frames
+
+        self.samples = {}            # track_id -> deque[np.ndarray]
+        self.lost = OrderedDict()    # track_id -> (kayıp karesi, son pozisyon); eskiden yeniye
+        self.reidentified = 0
+
+    def add(self, track_id, descriptor):
+        """Track'in görünüm örneklerini güncelle (yeterince farklıysa ekle)"""
+        if descriptor is None:
+            return
+        samples = self.samples.get(track_id)
+        if samples is None:
+            samples = deque(maxlen=self.max_samples)
+            self.samples[track_id] = samples
+        elif min(appearance_distance(sample, descriptor) for sample in samples) < self.novelty:
+            return
+        samples.append(np.asarray(descriptor, dtype=np.float32))
+
+    def distances(self, track_ids, descriptors):
+        """
+        Track'ler ile tanımlayıcılar arasındaki en küçük örnek mesafesi
+
+        Returns:
+            np.ndarray: (len(track_ids), len(descriptors)); örneği olmayan track: 1.0
+        """
+        descriptors = np.asarray(descriptors, dtype=np.float32).reshape(len(descriptors), -1)
+        result = np.ones((len(track_ids), len(descriptors)), dtype=np.float32)
+        if not len(descriptors):
+            return result
+        for row, track_id in enumerate(track_ids):
+            samples = self.samples.get(track_id)
+            if samples:
+                result[row] = appearance_distance(np.stack(samples), descriptors).min(axis=0)
+        return result
+
+    def mark_lost(self, track_id, frame_number, position=None):
+        """Track silindi: örneklerini kayıp galerisine taşı"""
+        if track_id not in self.samples:
+            return
+        self.lost[track_id] = (frame_number, position)
+        self.lost.move_to_end(track_id)
+        while len(self.lost) > self.max_lost:
+            old_id, _ = self.lost.popitem(last=False)
+            self.samples.pop(old_id, None)
+
+    def remove(self, track_id):
+        self.lost.pop(track_id, None)
+        self.samples.pop(track_id, None)
+
+    def expire(self, frame_number):
+        """Çok eski kayıpları unut"""
+        while self.lost:
+            track_id, (lost_frame, _) = next(iter(self.lost.items()))
+            if frame_number - lost_frame <= self.max_lost_frames:
+                break
+            self.remove(track_id)
+
+    def reidentify(self, descriptors, frame_number, positions=None, max_distance=0.25, max_travel=None):
+        """
+        Yeni tespitleri kayıp track'lerle eşleştir (bire bir, en benzerden başlayarak)
+
+        Args:
+            descriptors (np.ndarray): (M, D) yeni tespitlerin tanımlayıcıları
+            positions (list): Tespit merkezleri (max_travel ile birlikte)
+            max_distance (float): Kabul edilen en büyük görünüm mesafesi
+            max_travel (float): Son görüldüğü yerden en fazla uzaklık (None: sınırsız)
+
+        Returns:
+            list: [(detection_index, track_id), ...]; eşleşen track'ler galeride
+                tekrar aktif sayılır
+        """
+        self.expire(frame_number)
+        if not self.lost or not len(descriptors):
+            return []
+
+        track_ids = list(self.lost)
+        cost = self.distances(track_ids, descriptors)
+        valid = cost <= max_distance
+        if max_travel is not None and positions is not None:
+            last = np.array([self.lost[t][1] if self.lost[t][1] is not None else (np.nan, np.nan)
+                             for t in track_ids], dtype=np.float64)
+            points = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+            travel = np.hypot(last[:, None, 0] - points[None, :, 0], last[:, None, 1] - points[None, :, 1])
+            valid &= ~(travel > max_travel)
+
+        rows, cols = np.nonzero(valid)
+        matches = []
+        for row, col in greedy_assign(rows, cols, cost[rows, cols]):
+            track_id = track_ids[row]
+            del self.lost[track_id]
+            matches.append((col, track_id))
+        self.reidentified += len(matches)
+        return matches
@@ -10,14 +10,18 @@ import cv2
 import os
 import sys
 import time
-import json
 import numpy as np
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
 
 # Ana dizini path'e ekle
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from core.config import Paths, Detection, System, get_project_info
+from core.config import Paths, Detection, System, Profiling, get_project_info
+from core.instrumentation import StageTimers
+from pool_module.pool_registry import get_registry
+from video_module.overlay_renderer import OverlayRenderer
+from video_module.track_archive import TrackArchive, TrackLifecycle
+from video_module.spatial_hash import candidate_pairs, greedy_assign
 
 class EnhancedPoolTracker:
     """
@@ -29,45 +33,31 @@ class EnhancedPoolTracker:
         self.person_tracks = {}  # Kişi takip bilgileri
         self.next_track_id = 1
         self.max_track_distance = 100  # Maksimum takip mesafesi
+        self.track_timeout = 30        # Bu kadar kare görülmeyen track arşivlenir
+        self.position_history_size = 10
+        self.lifecycle = TrackLifecycle()
         
         print(f"🏊 {System.PROJECT_NAME} - Gelişmiş Havuz Takip Sistemi")
         print(f"📊 {len(self.info['videos'])} video, {len(self.info['models'])} model bulundu")
     
     def find_pool_area_for_video(self, video_name):
-        """Video için en son havuz alanı dosyasını bul"""
-        if not os.path.exists(Paths.OUTPUT_DIR):
-            return None
-        
-        video_base = os.path.splitext(video_name)[0].replace(" ", "_")
-        
-        pool_files = []
-        for file in os.listdir(Paths.OUTPUT_DIR):
-            if file.startswith("pool_area_") and file.endswith(".json"):
-                if video_base.upper() in file.upper():
-                    pool_files.append(file)
-        
-        if not pool_files:
+        """Video için en son havuz alanı dosyasını bul (registry, O(1))"""
+        pool_area = get_registry(Paths.OUTPUT_DIR).find(video_name)
+        if pool_area is None:
             print(f"❌ {video_name} için havuz alanı bulunamadı!")
             return None
-        
-        pool_files.sort(reverse=True)
-        return os.path.join(Paths.OUTPUT_DIR, pool_files[0])
+        return pool_area.path
     
     def load_pool_area(self, pool_file_path):
-        """Havuz alanını JSON dosyasından yükle"""
-        try:
-            with open(pool_file_path, 'r', encoding='utf-8') as f:
-                pool_data = json.load(f)
-            
-            polygon = np.array(pool_data['polygon_points'], dtype=np.int32)
-            print(f"✅ Havuz alanı yüklendi: {os.path.basename(pool_file_path)}")
-            print(f"🔢 Nokta sayısı: {len(polygon)}")
-            
-            return polygon
-            
-        except Exception as e:
-            print(f"❌ Havuz alanı yüklenemedi: {e}")
+        """Havuz alanını yükle (registry'de derlenmişse JSON tekrar okunmaz)"""
+        pool_area = get_registry(os.path.dirname(pool_file_path)).load(pool_file_path)
+        if pool_area is None:
             return None
+        
+        print(f"✅ Havuz alanı yüklendi: {pool_area.file_name}")
+        print(f"🔢 Nokta sayısı: {len(pool_area.polygon)}")
+        
+        return pool_area.polygon
     
     def is_point_in_pool(self, polygon, x, y):
         """Nokta havuz içinde mi kontrol et"""
@@ -81,42 +71,70 @@ class EnhancedPoolTracker:
         """İki nokta arası mesafe"""
         return np.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
     
-    def assign_track_id(self, center_x, center_y, frame_number):
-        """Kişiye takip ID'si ata"""
-        current_pos = (center_x, center_y)
-        
-        # Mevcut track'ler arasından en yakınını bul
-        best_match_id = None
-        min_distance = float('inf')
-        
-        for track_id, track_info in self.person_tracks.items():
-            if frame_number - track_info['last_frame'] < 30:  # 30 kare içinde görülmüş
-                last_pos = track_info['positions'][-1]
-                distance = self.calculate_distance(current_pos, last_pos)
+    def prune_tracks(self, frame_number):
+        """Süresi dolan track'leri sıcak yapıdan çıkar ve arşivle (kare başında bir kez)"""
+        return self.lifecycle.evict(
+            self.person_tracks,
+            lambda track_info: frame_number - track_info['last_frame'] >= self.track_timeout
+        )
+    
+    def assign_track_ids(self, centers, frame_number, in_pool_flags=None):
+        """
+        Karedeki tüm kişilere takip ID'si ata (bire bir, en yakından başlayarak)
+        
+        Adaylar spatial hash ile bulunur: her tespit sadece komşu hücrelerdeki
+        canlı track'lerle karşılaştırılır.
+        
+        Returns:
+            list: centers ile aynı sırada track ID'leri
+        """
+        if in_pool_flags is None:
+            in_pool_flags = [None] * len(centers)
+        
+        # Son 30 karede görülmüş track'ler
+        track_ids = [track_id for track_id, track_info in self.person_tracks.items()
+                     if frame_number - track_info['last_frame'] < self.track_timeout]
+        track_points = [self.person_tracks[track_id]['positions'][-1] for track_id in track_ids]
+        
+        rows, cols, distances = candidate_pairs(track_points, centers, self.max_track_distance)
+        assigned = [None] * len(centers)
+        for row, col in greedy_assign(rows, cols, distances):
+            assigned[col] = track_ids[row]
+        
+        for index, current_pos in enumerate(centers):
+            current_pos = tuple(current_pos)
+            track_id = assigned[index]
+            
+            if track_id is not None:
+                # Eşleşme bulundu
+                self.person_tracks[track_id]['positions'].append(current_pos)
+                self.person_tracks[track_id]['last_frame'] = frame_number
+            else:
+                # Yeni track oluştur
+                track_id = self.next_track_id
+                self.next_track_id += 1
                 
-                if distance < self.max_track_distance and distance < min_distance:
-                    min_distance = distance
-                    best_match_id = track_id
-        
-        # Eşleşme bulundu
-        if best_match_id is not None:
-            self.person_tracks[best_match_id]['positions'].append(current_pos)
-            self.person_tracks[best_match_id]['last_frame'] = frame_number
-            return best_match_id
-        
-        # Yeni track oluştur
-        new_id = self.next_track_id
-        self.next_track_id += 1
-        
-        self.person_tracks[new_id] = {
-            'positions': [current_pos],
-            'first_frame': frame_number,
-            'last_frame': frame_number,
-            'in_pool_frames': 0,
-            'out_pool_frames': 0
-        }
-        
-        return new_id
+                self.person_tracks[track_id] = {
+                    'positions': deque([current_pos], maxlen=self.position_history_size),
+                    'first_frame': frame_number,
+                    'last_frame': frame_number,
+                    'in_pool_frames': 0,
+                    'out_pool_frames': 0
+                }
+                assigned[index] = track_id
+            
+            self._observe(track_id, frame_number, current_pos, in_pool_flags[index])
+        
+        return assigned
+    
+    def assign_track_id(self, center_x, center_y, frame_number, in_pool=None):
+        """Tek kişiye takip ID'si ata"""
+        return self.assign_track_ids([(center_x, center_y)], frame_number, [in_pool])[0]
+    
+    def _observe(self, track_id, frame_number, position, in_pool):
+        """Arşiv özeti için track gözlemi"""
+        class_name = None if in_pool is None else ("person_swimming" if in_pool else "person_poolside")
+        self.lifecycle.observe(track_id, frame_number, position, in_pool, class_name)
     
     def create_output_folder(self, model_name, video_name):
         """Model ve video için özel klasör oluştur"""
@@ -198,6 +216,27 @@ class EnhancedPoolTracker:
         unique_pool_persons = set()
         unique_outside_persons = set()
         processing_times = []
+        timers = StageTimers(enabled=Profiling.ENABLED, pipeline="enhanced_pool_tracker")
+        
+        # Statik çizimler (kamera başına bir kez hazırlanır)
+        pool_layer = OverlayRenderer()
+        pool_layer.add_polygon(pool_polygon, fill_color=(0, 255, 255), fill_alpha=0.25,  # Sarı, yarı saydam
+                               outline_color=(0, 255, 255), outline_thickness=4)
+        
+        hud_layer = OverlayRenderer()
+        hud_layer.add_rectangle((5, 5), (width-5, 140), (0, 0, 0))
+        hud_layer.add_rectangle((5, 5), (width-5, 140), (255, 255, 255), thickness=2)
+        hud_layer.add_rectangle((5, height-80), (width-5, height-5), (0, 0, 0))
+        hud_layer.add_rectangle((5, height-80), (width-5, height-5), (255, 255, 255), thickness=2)
+        hud_layer.add_text(f"Video: {video_name}", (10, height-55), (0, 255, 255))
+        hud_layer.add_text(f"Model: {model_name}", (10, height-35), (0, 255, 255))
+        hud_layer.add_text("GELISMIS HAVUZ TAKIP - HASSASIYET ARTIRILDI", (10, height-15), (0, 255, 0))
+        
+        # Track yaşam döngüsü: ölen track'ler track_archive.jsonl'e özetlenir
+        self.lifecycle = TrackLifecycle(TrackArchive(
+            os.path.join(output_folder, "track_archive.jsonl"),
+            pipeline="enhanced_pool_tracker", camera=video_name
+        ))
         
         # Takip istatistikleri
         track_stats = defaultdict(lambda: {'pool_time': 0, 'outside_time': 0, 'total_frames': 0})
@@ -207,7 +246,8 @@ class EnhancedPoolTracker:
         
         try:
             while True:
-                ret, frame = cap.read()
+                with timers.stage('decode'):
+                    ret, frame = cap.read()
                 if not ret:
                     print("📹 Video sonu")
                     break
@@ -215,19 +255,17 @@ class EnhancedPoolTracker:
                 frame_count += 1
                 frame_start = time.time()
                 
-                # Havuz alanını çiz (yarı saydam)
-                overlay = frame.copy()
-                cv2.fillPoly(overlay, [pool_polygon], (0, 255, 255))  # Sarı
-                cv2.addWeighted(overlay, 0.25, frame, 0.75, 0, frame)
-                
-                # Havuz sınırını çiz (kalın çizgi)
-                cv2.polylines(frame, [pool_polygon], True, (0, 255, 255), 4)
+                # Ölü track'leri at (atama maliyeti sadece canlı track'lerle orantılı)
+                with timers.stage('tracking'):
+                    self.prune_tracks(frame_count)
                 
                 # HAVUZ İÇİ İÇİN DÜŞÜK CONFIDENCE THRESHOLD
                 pool_confidence = max(0.3, Detection.CONFIDENCE_THRESHOLD - 0.2)
                 
                 # Kişi tespiti - NORMAL CONFIDENCE
-                results = model(frame, conf=Detection.CONFIDENCE_THRESHOLD, verbose=False)
+                with timers.stage('detect'):
+                    results = model(frame, conf=Detection.CONFIDENCE_THRESHOLD, verbose=False)
+                timers.record_yolo_speed(results)
                 
                 # Bu karedeki sayaçlar
                 frame_detections = 0
@@ -264,7 +302,9 @@ class EnhancedPoolTracker:
                 
                 # HAVUZ İÇİ İÇİN İKİNCİ GEÇIŞ - DÜŞÜK CONFIDENCE
                 if pool_confidence < Detection.CONFIDENCE_THRESHOLD:
-                    results_pool = model(frame, conf=pool_confidence, verbose=False)
+                    with timers.stage('detect'):
+                        results_pool = model(frame, conf=pool_confidence, verbose=False)
+                    timers.record_yolo_speed(results_pool)
                     
                     for r in results_pool:
                         boxes = r.boxes
@@ -280,7 +320,10 @@ class EnhancedPoolTracker:
                                     center_x = (x1 + x2) // 2
                                     center_y = (y1 + y2) // 2
                                     
-                                    if self.is_point_in_pool(pool_polygon, center_x, center_y):
+                                    with timers.stage('zone_test'):
+                                        in_pool = self.is_point_in_pool(pool_polygon, center_x, center_y)
+                                    
+                                    if in_pool:
                                         area = (x2 - x1) * (y2 - y1)
                                         if area > Detection.MIN_AREA // 2:  # Havuz içi için daha küçük alan
                                             # Bu tespit zaten var mı kontrol et
@@ -299,19 +342,27 @@ class EnhancedPoolTracker:
                                                     'pool_enhanced': True
                                                 })
                 
+                # Havuz dolgusu + sınırı (tespitten sonra: model çizimsiz kareyi görür)
+                with timers.stage('draw'):
+                    pool_layer.composite(frame)
+                
                 # Tespitleri işle ve çiz
-                for person in current_frame_persons:
+                # Havuz içinde mi?
+                with timers.stage('zone_test'):
+                    in_pool_flags = [self.is_point_in_pool(pool_polygon, *person['center'])
+                                     for person in current_frame_persons]
+                
+                # Takip ID'leri (karedeki tüm kişiler için tek eşleştirme)
+                with timers.stage('tracking'):
+                    track_ids = self.assign_track_ids([person['center'] for person in current_frame_persons],
+                                                      frame_count, in_pool_flags)
+                
+                for person, is_in_pool, track_id in zip(current_frame_persons, in_pool_flags, track_ids):
                     x1, y1, x2, y2 = person['bbox']
                     center_x, center_y = person['center']
                     conf = person['conf']
                     is_enhanced = person.get('pool_enhanced', False)
                     
-                    # Takip ID'si ata
-                    track_id = self.assign_track_id(center_x, center_y, frame_count)
-                    
-                    # Havuz içinde mi?
-                    is_in_pool = self.is_point_in_pool(pool_polygon, center_x, center_y)
-                    
                     if is_in_pool:
                         frame_inside += 1
                         unique_pool_persons.add(track_id)
@@ -338,19 +389,20 @@ class EnhancedPoolTracker:
                     
                     track_stats[track_id]['total_frames'] += 1
                     
-                    # Kutuyu çiz
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
-                    cv2.putText(frame, label, 
-                              (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 
-                              0.5, color, 2)
+                    with timers.stage('draw'):
+                        # Kutuyu çiz
+                        cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
+                        cv2.putText(frame, label, 
+                                  (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 
+                                  0.5, color, 2)
                     
-                    # Merkez noktayı işaretle (daha büyük)
-                    cv2.circle(frame, (center_x, center_y), 6, color, -1)
+                        # Merkez noktayı işaretle (daha büyük)
+                        cv2.circle(frame, (center_x, center_y), 6, color, -1)
                     
-                    # Track ID'sini merkeze yaz
-                    cv2.putText(frame, str(track_id), 
-                               (center_x-10, center_y+5), cv2.FONT_HERSHEY_SIMPLEX, 
-                               0.6, (255, 255, 255), 2)
+                        # Track ID'sini merkeze yaz
+                        cv2.putText(frame, str(track_id), 
+                                   (center_x-10, center_y+5), cv2.FONT_HERSHEY_SIMPLEX, 
+                                   0.6, (255, 255, 255), 2)
                 
                 # Sayaçları güncelle
                 total_detections += len(current_frame_persons)
@@ -361,46 +413,37 @@ class EnhancedPoolTracker:
                 elapsed = time.time() - start_time
                 progress_percent = (elapsed / max_duration) * 100
                 
-                # Üst bilgi paneli
-                info_text1 = f"Kare: {frame_count} | %{progress_percent:.1f} | Tespit: {len(current_frame_persons)}"
-                info_text2 = f"Bu kare - Havuz Ici: {frame_inside} | Havuz Disi: {frame_outside}"
-                info_text3 = f"TOPLAM - Ici: {pool_inside_count} | Disi: {pool_outside_count}"
-                info_text4 = f"BENZERSIZ - Havuz: {len(unique_pool_persons)} | Dis: {len(unique_outside_persons)}"
+                with timers.stage('draw'):
+                    # Üst bilgi paneli
+                    info_text1 = f"Kare: {frame_count} | %{progress_percent:.1f} | Tespit: {len(current_frame_persons)}"
+                    info_text2 = f"Bu kare - Havuz Ici: {frame_inside} | Havuz Disi: {frame_outside}"
+                    info_text3 = f"TOPLAM - Ici: {pool_inside_count} | Disi: {pool_outside_count}"
+                    info_text4 = f"BENZERSIZ - Havuz: {len(unique_pool_persons)} | Dis: {len(unique_outside_persons)}"
                 
-                # Bilgi paneli arka planı
-                cv2.rectangle(frame, (5, 5), (width-5, 140), (0, 0, 0), -1)
-                cv2.rectangle(frame, (5, 5), (width-5, 140), (255, 255, 255), 2)
+                    # Panel arka planları + sabit yazılar
+                    hud_layer.composite(frame)
                 
-                cv2.putText(frame, info_text1, (10, 25), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                cv2.putText(frame, info_text2, (10, 45), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                cv2.putText(frame, info_text3, (10, 65), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                cv2.putText(frame, info_text4, (10, 85), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                    cv2.putText(frame, info_text1, (10, 25), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                    cv2.putText(frame, info_text2, (10, 45), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                    cv2.putText(frame, info_text3, (10, 65), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                    cv2.putText(frame, info_text4, (10, 85), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
                 
-                # Süre ve FPS
-                time_text = f"Süre: {elapsed:.0f}s/92s (1:32)"
-                fps_text = f"FPS: {frame_count/elapsed:.1f}"
-                cv2.putText(frame, time_text, (10, 105), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                cv2.putText(frame, fps_text, (10, 125), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                
-                # Alt bilgi paneli
-                cv2.rectangle(frame, (5, height-80), (width-5, height-5), (0, 0, 0), -1)
-                cv2.rectangle(frame, (5, height-80), (width-5, height-5), (255, 255, 255), 2)
-                
-                cv2.putText(frame, f"Video: {video_name}", (10, height-55), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-                cv2.putText(frame, f"Model: {model_name}", (10, height-35), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-                cv2.putText(frame, "GELISMIS HAVUZ TAKIP - HASSASIYET ARTIRILDI", (10, height-15), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+                    # Süre ve FPS
+                    time_text = f"Süre: {elapsed:.0f}s/92s (1:32)"
+                    fps_text = f"FPS: {frame_count/elapsed:.1f}"
+                    cv2.putText(frame, time_text, (10, 105), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                    cv2.putText(frame, fps_text, (10, 125), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
                 
                 # Video'ya yaz
-                out.write(frame)
+                with timers.stage('encode'):
+                    out.write(frame)
+                timers.end_frame()
                 
                 # Performans takibi
                 frame_time = time.time() - frame_start
@@ -424,6 +467,7 @@ class EnhancedPoolTracker:
         finally:
             cap.release()
             out.release()
+            self.lifecycle.close()
         
         # Sonuçları hesapla ve kaydet
         elapsed_total = time.time() - start_time
@@ -454,6 +498,7 @@ class EnhancedPoolTracker:
             f.write(f"🆔 Benzersiz Havuz Kişisi: {len(unique_pool_persons)}\n")
             f.write(f"🆔 Benzersiz Dış Kişi: {len(unique_outside_persons)}\n")
             f.write(f"📈 Uzun Süreli Havuz Kullanıcısı: {len(long_term_pool_persons)}\n")
+            f.write(f"🗄️  Arşivlenen Track: {self.lifecycle.retired} (track_archive.jsonl)\n")
             f.write(f"⚡ Ortalama İşleme Süresi: {avg_processing_time:.3f}s/kare\n")
             f.write(f"💾 Çıktı Video: enhanced_pool_tracking.mp4\n\n")
             
@@ -464,6 +509,14 @@ class EnhancedPoolTracker:
                 pool_ratio = (stats['pool_time'] / stats['total_frames'] * 100) if stats['total_frames'] > 0 else 0
                 f.write(f"Kişi #{track_id}: Havuz {stats['pool_time']} kare (%{pool_ratio:.1f}) | "
                        f"Dış {stats['outside_time']} kare | Toplam {stats['total_frames']} kare\n")
+            
+            f.write(f"\n⏱️  AŞAMA SÜRELERİ (kare başına):\n")
+            for line in timers.format_lines():
+                f.write(f"   {line}\n")
+        
+        # Aşama süreleri JSON (+ opsiyonel Prometheus)
+        timers.save(os.path.join(output_folder, "stage_timings.json"), Profiling.PROMETHEUS_FILE,
+                    {'model': model_name, 'video': video_name})
         
         print(f"\n📊 GELİŞMİŞ TAKİP SONUÇLARI (1:32 DAKİKA):")
         print(f"   🎬 İşlenen kare: {frame_count}")
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+💍 PAYLAŞIMLI BELLEK KARE HALKASI
+================================
+Alım, inference ve çizim ayrı süreçlere taşındığında 4K BGR kareleri
+multiprocessing kuyruklarından pickle ile geçirmek kazancı yer. Bu halka
+sabit boyutlu kare yuvalarını tek bir `multiprocessing.shared_memory`
+bloğunda tutar:
+
+- Üretici (VideoCapture okuyucusu) boş yuvayı ayırır ve kareyi doğrudan
+  yuvaya yazar (`cap.read(view)`), sonra sıra numarasıyla yayınlar
+- Tüketiciler (dedektör, çizim, klip kaydı) kopyasız NumPy görünümü alır;
+  referans sayısı > 0 olan yuvanın üzerine yazılmaz
+- Tüketici modu: `latest=True` en yeni kare (dedektör, eskiler atlanır),
+  `latest=False` sıradaki kare (klip kaydı; ezilen kareler `dropped` sayılır)
+- Tüm yuvalar tutuluyorsa üretici bekler veya kareyi düşürür (sayılır)
+
+Meta veri (sıra no, referans sayısı, kare no, zaman damgası, boyut) aynı
+bloktadır; değişiklikler tek bir multiprocessing.Condition altında yapılır,
+kare verisi kilit dışında kopyalanır.
+
+Kullanım:
+    ring = FrameRing.create((1080, 1920, 3), slots=8)
+    Process(target=capture_to_ring, args=("kamera.mp4", ring)).start()
+
+    reader = ring.reader(latest=True)          # başka süreçte de kullanılabilir
+    ref = reader.read(timeout=1.0)             # None: zaman aşımı / halka kapandı
+    if ref is not None:
+        with ref:
+            detections = model(ref.frame)
+    ...
+    ring.close(); ring.unlink()
+"""
+
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+# Kontrol alanı (int64): yayınlanan son sıra no, kapalı bayrağı, üretici düşürmeleri
+_CONTROL = 4
+_WRITE_SEQ, _CLOSED, _PRODUCER_DROPS = 0, 1, 2
+
+_SLOT_META = np.dtype([
+    ('seq', np.int64),            # 0: boş, -1: yazılıyor, > 0: yayınlandı
+    ('refs', np.int64),
+    ('frame_number', np.int64),
+    ('timestamp', np.float64),
+    ('height', np.int32),
+    ('width', np.int32),
+])
+
+_ALIGN = 64
+
+
+def _aligned(size):
+    return -(-size // _ALIGN) * _ALIGN
+
+
+class FrameRef:
+    """
+    🔖 Tüketicinin tuttuğu yuva (kopyasız görünüm)
+
+    release() (veya with bloğunun sonu) çağrılana kadar yuvanın üzerine
+    yazılmaz; görünüm release sonrası kullanılmamalı.
+    """
+
+    __slots__ = ('ring', 'slot', 'seq', 'frame_number', 'timestamp', 'frame', 'dropped')
+
+    def __init__(self, ring, slot, seq, frame_number, timestamp, frame, dropped=0):
+        self.ring = ring
+        self.slot = slot
+        self.seq = seq
+        self.frame_number = frame_number
+        self.timestamp = timestamp
+        self.frame = frame
+        self.dropped = dropped
+
+    def release(self):
+        if self.ring is not None:
+            self.ring._release(self.slot)
+            self.ring = None
+            self.frame = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class RingReader:
+    """Tüketici başına okuma konumu ve atlanan kare sayacı"""
+
+    def __init__(self, ring, latest=True):
+        self.ring = ring
+        self.latest = latest
+        self.last_seq = 0
+        self.frames_read = 0
+        self.frames_dropped = 0
+
+    def read(self, timeout=1.0):
+        """
+        Sıradaki / en yeni kareyi al
+
+        Returns:
+            FrameRef veya None (zaman aşımı ya da halka kapandı)
+        """
+        ref = self.ring.acquire(self.last_seq, timeout=timeout, latest=self.latest)
+        if ref is None:
+            return None
+        ref.dropped = ref.seq - self.last_seq - 1 if self.last_seq else 0
+        self.frames_dropped += ref.dropped
+        self.frames_read += 1
+        self.last_seq = ref.seq
+        return ref
+
+
+class FrameRing:
+    """
+    💍 Sabit yuvalı, referans sayımlı paylaşımlı bellek halkası
+
+    Nesne multiprocessing.Process argümanı olarak çocuk süreçlere verilir;
+    çocukta aynı bloğa ve aynı kilide bağlanır.
+    """
+
+    def __init__(self, name, frame_shape, slots, dtype, condition, owner=False, shm=None):
+        self.name = name
+        self.frame_shape = tuple(int(v) for v in frame_shape)
+        self.slots = int(slots)
+        self.dtype = np.dtype(dtype)
+        self.condition = condition
+        self.owner = owner
+        self._shm = shm
+        self._attach()
+
+    @classmethod
+    def create(cls, frame_shape, slots=8, dtype=np.uint8, name=None):
+        """
+        Yeni halka oluştur (oluşturan süreç unlink() çağırmalı)
+
+        Args:
+            frame_shape (tuple): Yuva kapasitesi (yükseklik, genişlik, kanal)
+            slots (int): Yuva sayısı (tüketicilerin aynı anda tuttuğu kare + 2 önerilir)
+        """
+        slot_bytes = _aligned(int(np.prod(frame_shape)) * np.dtype(dtype).itemsize)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=cls._layout(slots, slot_bytes)[-1])
+        ring = cls(shm.name, frame_shape, slots, dtype, multiprocessing.Condition(), owner=True, shm=shm)
+        ring._control[:] = 0
+        ring._meta[:] = 0
+        return ring
+
+    @staticmethod
+    def _layout(slots, slot_bytes):
+        """(meta başlangıcı, veri başlangıcı, toplam boyut)"""
+        meta_offset = _CONTROL * 8
+        data_offset = _aligned(meta_offset + slots * _SLOT_META.itemsize)
+        return meta_offset, data_offset, data_offset + slots * slot_bytes
+
+    def _attach(self):
+        shm = self._shm
+        if shm is None:
+            try:
+                # Python 3.13+: bağlanan süreç resource_tracker'a kaydolmaz
+                shm = shared_memory.SharedMemory(name=self.name, track=False)
+            except TypeError:
+                shm = shared_memory.SharedMemory(name=self.name)
+            self._shm = shm
+
+        self.slot_bytes = _aligned(int(np.prod(self.frame_shape)) * self.dtype.itemsize)
+        meta_offset, data_offset, _ = self._layout(self.slots, self.slot_bytes)
+        self._control = np.ndarray((_CONTROL,), dtype=np.int64, buffer=shm.buf, offset=0)
+        self._meta = np.ndarray((self.slots,), dtype=_SLOT_META, buffer=shm.buf, offset=meta_offset)
+        self._data = np.ndarray((self.slots, self.slot_bytes), dtype=np.uint8, buffer=shm.buf, offset=data_offset)
+
+    def __getstate__(self):
+        return {'name': self.name, 'frame_shape': self.frame_shape, 'slots': self.slots,
+                'dtype': self.dtype.str, 'condition': self.condition}
+
+    def __setstate__(self, state):
+        self.__init__(state['name'], state['frame_shape'], state['slots'], state['dtype'], state['condition'])
+
+    def _view(self, slot, shape):
+        size = int(np.prod(shape)) * self.dtype.itemsize
+        if size > self.slot_bytes:
+            raise ValueError(f"kare yuvaya sığmıyor: {shape} > {self.frame_shape}")
+        return self._data[slot, :size].view(self.dtype).reshape(shape)
+
+    # ------------------------------------------------------------------
+    # Üretici
+    # ------------------------------------------------------------------
+
+    def reserve(self, shape=None, timeout=None):
+        """
+        Yazmak için boş (referanssız) en eski yuvayı ayır
+
+        Args:
+            shape (tuple): Kare boyutu (None: yuva kapasitesi)
+            timeout (float): Tüm yuvalar tutuluyorsa bekleme (None / 0: beklemeden düşür)
+
+        Returns:
+            tuple: (slot, görünüm) veya yer yoksa (None, None)
+        """
+        shape = tuple(shape) if shape is not None else self.frame_shape
+        deadline = time.monotonic() + (timeout or 0.0)
+        with self.condition:
+            while True:
+                free = np.flatnonzero((self._meta['refs'] == 0) & (self._meta['seq'] >= 0))
+                if len(free):
+                    slot = int(free[np.argmin(self._meta['seq'][free])])
+                    self._meta['seq'][slot] = -1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._control[_CLOSED]:
+                    self._control[_PRODUCER_DROPS] += 1
+                    return None, None
+                self.condition.wait(remaining)
+        return slot, self._view(slot, shape)
+
+    def commit(self, slot, frame_number=None, timestamp=None, shape=None):
+        """Yazılan yuvayı yayınla; tüketicileri uyandır"""
+        shape = tuple(shape) if shape is not None else self.frame_shape
+        with self.condition:
+            seq = int(self._control[_WRITE_SEQ]) + 1
+            self._control[_WRITE_SEQ] = seq
+            meta = self._meta[slot]
+            meta['frame_number'] = seq if frame_number is None else frame_number
+            meta['timestamp'] = time.time() if timestamp is None else timestamp
+            meta['height'], meta['width'] = shape[0], shape[1]
+            meta['seq'] = seq
+            self.condition.notify_all()
+        return seq
+
+    def abort(self, slot):
+        """Ayrılan yuvayı yayınlamadan bırak"""
+        with self.condition:
+            self._meta['seq'][slot] = 0
+            self.condition.notify_all()
+
+    def write(self, frame, frame_number=None, timestamp=None, timeout=None):
+        """Kareyi kopyalayarak yaz (yerinde yazamayan üreticiler için)"""
+        slot, view = self.reserve(frame.shape, timeout)
+        if slot is None:
+            return None
+        np.copyto(view, frame)
+        return self.commit(slot, frame_number, timestamp, frame.shape)
+
+    # ------------------------------------------------------------------
+    # Tüketici
+    # ------------------------------------------------------------------
+
+    def reader(self, latest=True):
+        return RingReader(self, latest)
+
+    def acquire(self, after_seq=0, timeout=1.0, latest=True):
+        """
+        after_seq'ten yeni bir kareyi tut (referans sayısı +1)
+
+        Args:
+            latest (bool): True: en yeni kare, False: sıradaki (en eski yeni) kare
+
+        Returns:
+            FrameRef veya None
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while True:
+                seqs = self._meta['seq']
+                ready = np.flatnonzero(seqs > after_seq)
+                if len(ready):
+                    pick = np.argmax(seqs[ready]) if latest else np.argmin(seqs[ready])
+                    slot = int(ready[pick])
+                    meta = self._meta[slot]
+                    meta['refs'] += 1
+                    seq = int(meta['seq'])
+                    frame_number = int(meta['frame_number'])
+                    timestamp = float(meta['timestamp'])
+                    shape = (int(meta['height']), int(meta['width'])) + self.frame_shape[2:]
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._control[_CLOSED]:
+                    return None
+                self.condition.wait(remaining)
+
+        frame = self._view(slot, shape)
+        frame.flags.writeable = False
+        return FrameRef(self, slot, seq, frame_number, timestamp, frame)
+
+    def _release(self, slot):
+        with self.condition:
+            self._meta['refs'][slot] -= 1
+            self.condition.notify_all()
+
+    # ------------------------------------------------------------------
+    # Durum / kapanış
+    # ------------------------------------------------------------------
+
+    @property
+    def last_seq(self):
+        return int(self._control[_WRITE_SEQ])
+
+    @property
+    def closed(self):
+        return bool(self._control[_CLOSED])
+
+    def get_stats(self):
+        with self.condition:
+            return {
+                'slots': self.slots,
+                'frame_shape': self.frame_shape,
+                'published': int(self._control[_WRITE_SEQ]),
+                'producer_drops': int(self._control[_PRODUCER_DROPS]),
+                'held_slots': int((self._meta['refs'] > 0).sum()),
+            }
+
+    def stop(self):
+        """Halkayı kapalı işaretle: bekleyen okuyucular None alır"""
+        with self.condition:
+            self._control[_CLOSED] = 1
+            self.condition.notify_all()
+
+    def close(self):
+        """Bu süreçteki bağlantıyı kapat (açık FrameRef görünümleri bırakılmış olmalı)"""
+        self._control = self._meta = self._data = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def unlink(self):
+        """Bloğu sistemden sil (sadece oluşturan süreç)"""
+        if not self.owner:
+            return
+        if self._shm is not None:
+            self._shm.unlink()
+        else:
+            shared_memory.SharedMemory(name=self.name).unlink()
+
+
+def capture_to_ring(source, ring, max_frames=None, stop_on_end=True):
+    """
+    VideoCapture okuyucusu: kareleri doğrudan halka yuvalarına yazar
+
+    Args:
+        source (int | str): cv2.VideoCapture kaynağı
+        ring (FrameRing): Hedef halka (yuva boyutu kaynak çözünürlüğüne eşit olmalı)
+        max_frames (int): En fazla kare (None: kaynak bitene kadar)
+        stop_on_end (bool): Bitince halkayı kapat (okuyucular None alır)
+
+    Returns:
+        int: Yayınlanan kare sayısı
+    """
+    cap = cv2.VideoCapture(source)
+    published = 0
+    frame_number = 0
+    try:
+        while cap.isOpened() and (max_frames is None or frame_number < max_frames):
+            slot, view = ring.reserve(timeout=1.0)
+            if slot is None:
+                if ring.closed:
+                    break
+                # Tüm yuvalar tutuluyor: kareyi okuyup at (kaynak gerçek zamanda akar)
+                if not cap.grab():
+                    break
+                frame_number += 1
+                continue
+            ret, frame = cap.read(view)
+            if not ret:
+                ring.abort(slot)
+                break
+            if frame is not view and not np.shares_memory(frame, view):
+                # Boyut uyuşmadıysa OpenCV yeni dizi ayırır: kopyala
+                np.copyto(view, frame)
+            ring.commit(slot, frame_number, cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+            frame_number += 1
+            published += 1
+    finally:
+        cap.release()
+        if stop_on_end:
+            ring.stop()
+    return published
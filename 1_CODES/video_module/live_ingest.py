@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+📡 CANLI GÖRÜNTÜ ALIMI (KAMERA / RTSP / DOSYA)
+=============================================
+Kamera cihazı, RTSP/HTTP akışı veya gerçek zaman hızında oynatılan video
+dosyasını tek bir kaynak olarak sunar.
+
+- Okuma thread'i sürekli en yeni kareyi tutar (drop-oldest): inference
+  kameradan yavaşsa eski kareler birikmez, atlanır ve sayılır
+- Akış koparsa artan bekleme süreleriyle (backoff) yeniden bağlanılır
+- Her kare alındığı anda damgalanır; alım -> inference gecikmesi ve
+  düşürülen kare sayıları `get_stats()` ile okunur
+- Dosya kaynağı kendi FPS'inde (gerçek zaman) oynatılır; kamera yerine
+  test/deneme amaçlı kullanılır
+
+Kullanım:
+    with LiveSource("rtsp://kamera/stream") as source:
+        while True:
+            ret, frame, info = source.read()
+            if not ret:
+                break
+            detections = model(frame)
+            source.mark_processed(info)
+"""
+
+import os
+import sys
+import time
+import threading
+
+import cv2
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.instrumentation import StageHistogram
+
+STREAM_PREFIXES = ('rtsp://', 'rtsps://', 'rtmp://', 'http://', 'https://', 'udp://', 'tcp://')
+
+
+def parse_source(source):
+    """
+    Kaynağı türüne göre ayır
+
+    Args:
+        source (int | str): Cihaz indeksi, akış URL'si veya dosya yolu
+
+    Returns:
+        tuple: (tür, değer) - tür: 'device' | 'stream' | 'file'
+    """
+    if isinstance(source, int):
+        return 'device', source
+    text = str(source).strip()
+    if text.isdigit():
+        return 'device', int(text)
+    if text.lower().startswith(STREAM_PREFIXES):
+        return 'stream', text
+    return 'file', text
+
+
+class LiveSource:
+    """
+    📡 En-yeni-kare semantiğiyle canlı kaynak
+
+    Okuma thread'i tek bir kare yuvasına yazar; tüketici okumadan yeni
+    kare gelirse eskisi düşürülür.
+    """
+
+    def __init__(self, source, realtime=None, loop=False, reconnect=True,
+                 backoff_initial=0.5, backoff_max=10.0, max_reconnects=None, name=None):
+        """
+        Args:
+            source (int | str): Cihaz indeksi, RTSP/HTTP URL veya video dosyası
+            realtime (bool): Dosyayı kendi FPS'inde oynat (None: dosyada açık)
+            loop (bool): Dosya bitince başa sar
+            reconnect (bool): Akış/cihaz koparsa yeniden bağlan
+            backoff_initial (float): İlk yeniden bağlanma beklemesi (saniye)
+            backoff_max (float): Maksimum bekleme (saniye)
+            max_reconnects (int): Art arda başarısız deneme sınırı (None: sınırsız)
+            name (str): Log'larda görünecek kaynak adı
+        """
+        self.source = source
+        self.kind, self.target = parse_source(source)
+        self.realtime = (self.kind == 'file') if realtime is None else realtime
+        self.loop = loop
+        self.reconnect = reconnect and self.kind != 'file'
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.max_reconnects = max_reconnects
+        self.name = name or str(source)
+
+        self.fps = 0.0
+        self.width = 0
+        self.height = 0
+
+        self._cap = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._condition = threading.Condition()
+        self._latest = None          # (frame, info)
+        self._last_read_seq = 0
+        self._finished = False
+
+        # Sayaçlar
+        self.frames_captured = 0
+        self.frames_delivered = 0
+        self.frames_dropped = 0
+        self.reconnects = 0
+        self.read_failures = 0
+        self._handoff_latency = StageHistogram()
+        self._inference_latency = StageHistogram()
+
+    # ------------------------------------------------------------------
+    # Bağlantı
+    # ------------------------------------------------------------------
+
+    def _open(self):
+        """Kaynağı aç, özellikleri oku"""
+        if self.kind == 'stream':
+            cap = cv2.VideoCapture(self.target, cv2.CAP_FFMPEG)
+        else:
+            cap = cv2.VideoCapture(self.target)
+
+        if not cap.isOpened():
+            cap.release()
+            return False
+
+        if self.kind != 'file':
+            # Sürücü tarafındaki tamponu küçült (destekleyen backend'lerde)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self._cap = cap
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        self.width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        return True
+
+    def _close_capture(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+    def _reconnect(self):
+        """
+        Artan beklemelerle yeniden bağlan
+
+        Returns:
+            bool: Bağlantı kuruldu mu (durdurulduysa / sınır aşıldıysa False)
+        """
+        self._close_capture()
+        delay = self.backoff_initial
+        attempts = 0
+
+        while not self._stop_event.is_set():
+            if self.max_reconnects is not None and attempts >= self.max_reconnects:
+                print(f"❌ {self.name}: {attempts} denemede bağlanılamadı, vazgeçildi")
+                return False
+
+            print(f"🔄 {self.name}: yeniden bağlanılıyor ({delay:.1f}s sonra)...")
+            if self._stop_event.wait(delay):
+                return False
+
+            attempts += 1
+            if self._open():
+                self.reconnects += 1
+                print(f"✅ {self.name}: bağlantı yeniden kuruldu")
+                return True
+            delay = min(delay * 2, self.backoff_max)
+
+        return False
+
+    # ------------------------------------------------------------------
+    # Okuma thread'i
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """
+        Kaynağı aç ve okuma thread'ini başlat
+
+        Returns:
+            bool: Başarılı mı
+        """
+        if self._thread is not None:
+            return True
+
+        if not self._open():
+            if not self.reconnect:
+                print(f"❌ Kaynak açılamadı: {self.name}")
+                return False
+            if not self._reconnect():
+                return False
+
+        print(f"📡 Kaynak açıldı ({self.kind}): {self.name} - "
+              f"{self.width}x{self.height} @ {self.fps:.1f} FPS")
+
+        self._stop_event.clear()
+        self._finished = False
+        self._thread = threading.Thread(target=self._reader_loop, daemon=True)
+        self._thread.start()
+        return True
+
+    def _reader_loop(self):
+        frame_interval = 1.0 / self.fps if self.realtime and self.fps > 0 else 0.0
+        playback_start = time.monotonic()
+        played = 0
+
+        while not self._stop_event.is_set():
+            if frame_interval:
+                # Dosyayı gerçek zaman hızında oynat
+                wait = playback_start + played * frame_interval - time.monotonic()
+                if wait > 0 and self._stop_event.wait(wait):
+                    break
+
+            ret, frame = self._cap.read()
+            captured_at = time.monotonic()
+
+            if not ret:
+                if self.kind == 'file':
+                    if self.loop:
+                        self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        playback_start = time.monotonic()
+                        played = 0
+                        continue
+                    break
+
+                self.read_failures += 1
+                if not self.reconnect or not self._reconnect():
+                    break
+                playback_start = time.monotonic()
+                played = 0
+                continue
+
+            played += 1
+            self.frames_captured += 1
+            info = {
+                'seq': self.frames_captured,
+                'captured_at': captured_at,
+                'source_time': self._cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0,
+            }
+
+            with self._condition:
+                if self._latest is not None and self._latest[1]['seq'] > self._last_read_seq:
+                    # Okunmamış kare eziliyor
+                    self.frames_dropped += 1
+                self._latest = (frame, info)
+                self._condition.notify_all()
+
+        with self._condition:
+            self._finished = True
+            self._condition.notify_all()
+        self._close_capture()
+
+    # ------------------------------------------------------------------
+    # Tüketici API
+    # ------------------------------------------------------------------
+
+    def read(self, timeout=5.0):
+        """
+        En yeni (daha önce okunmamış) kareyi al
+
+        Args:
+            timeout (float): Yeni kare için maksimum bekleme (saniye)
+
+        Returns:
+            tuple: (success, frame, info) - info: seq, captured_at, source_time,
+                latency (alım -> teslim, saniye), dropped (önceki okumadan beri atlanan)
+        """
+        if self._thread is None and not self.start():
+            return False, None, None
+
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._latest is None or self._latest[1]['seq'] <= self._last_read_seq:
+                if self._finished:
+                    return False, None, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False, None, None
+                self._condition.wait(remaining)
+
+            frame, info = self._latest
+            previous_seq = self._last_read_seq
+            self._last_read_seq = info['seq']
+
+        latency = time.monotonic() - info['captured_at']
+        self._handoff_latency.record(latency)
+        self.frames_delivered += 1
+
+        info = dict(info)
+        info['latency'] = latency
+        info['dropped'] = info['seq'] - previous_seq - 1
+        return True, frame, info
+
+    def mark_processed(self, info):
+        """
+        Kare işlendikten sonra çağrılır: alım -> inference sonu gecikmesini kaydeder
+
+        Args:
+            info (dict): read() ile dönen bilgi
+        """
+        if info is not None:
+            self._inference_latency.record(time.monotonic() - info['captured_at'])
+
+    def get_stats(self):
+        """
+        Alım istatistikleri
+
+        Returns:
+            dict: Sayaçlar ve gecikme yüzdelikleri (ms)
+        """
+        def latency_summary(histogram):
+            if histogram.count == 0:
+                return None
+            return {
+                'mean_ms': round(histogram.mean() * 1000, 2),
+                'p50_ms': round(histogram.percentile(50) * 1000, 2),
+                'p95_ms': round(histogram.percentile(95) * 1000, 2),
+                'p99_ms': round(histogram.percentile(99) * 1000, 2),
+            }
+
+        captured = self.frames_captured
+        return {
+            'source': self.name,
+            'kind': self.kind,
+            'frames_captured': captured,
+            'frames_delivered': self.frames_delivered,
+            'frames_dropped': self.frames_dropped,
+            'drop_rate': self.frames_dropped / captured if captured else 0.0,
+            'reconnects': self.reconnects,
+            'read_failures': self.read_failures,
+            'handoff_latency': latency_summary(self._handoff_latency),
+            'inference_latency': latency_summary(self._inference_latency),
+        }
+
+    def is_running(self):
+        """Okuma thread'i hâlâ kare üretiyor mu"""
+        return self._thread is not None and not self._finished
+
+    def stop(self):
+        """Okuma thread'ini durdur ve kaynağı kapat"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._close_capture()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
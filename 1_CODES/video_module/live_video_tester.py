@@ -29,9 +29,18 @@ import glob
 project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
+# core modülleri (1_CODES) için path
+sys.path.append(str(Path(__file__).parent.parent))
+
 from ultralytics import YOLO
 import logging
 from object_tracker import ObjectTracker
+from core.config import Profiling, Output, Runtime, Inference
+from core.runtime_config import RuntimeConfig
+from core.instrumentation import StageTimers
+from video_module.appearance import extract_descriptors
+from detection_module.inference_server import InferenceClient
+from output_manager.detection_log import DetectionLogWriter, detection_record
 
 def setup_logger(name, log_file):
     """Simple logger setup"""
@@ -57,16 +66,22 @@ def setup_logger(name, log_file):
     return logger
 
 class LiveVideoTester:
-    def __init__(self, video_path, model_path="yolov8x.pt"):
+    # Havuz alanı / runtime ayarları için kamera anahtarı
+    CAMERA = "KAMERA_1"
+    
+    def __init__(self, video_path, model_path="yolov8x.pt", render_video=None):
         """
         🎯 Live Video Tester Initialization
         
         Args:
             video_path (str): Input video dosya yolu
             model_path (str): YOLO model dosya yolu
+            render_video (bool): False ise çizim/encode yapılmaz (sadece analitik).
+                None ise Output.RENDER_VIDEO kullanılır
         """
         self.video_path = video_path
         self.model_path = model_path
+        self.render_video = Output.RENDER_VIDEO if render_video is None else render_video
         
         # Video dosya ismini al
         self.video_name = Path(video_path).stem
@@ -91,18 +106,32 @@ class LiveVideoTester:
         # Detection data storage
         self.detection_data = []
         
-        # Pool area yükle
-        self.pool_area = self._load_pool_area()
+        # Aşama bazlı zamanlayıcılar
+        self.timers = StageTimers(enabled=Profiling.ENABLED, pipeline="live_tester")
+        
+        # Çalışma zamanı ayarları (eşikler, tracker, havuz alanı; yeniden başlatmadan değişir)
+        self.runtime = RuntimeConfig(
+            pool_dir=Path(__file__).parent.parent.parent / "3_OUTPUT",
+            change_log_path=os.path.join(self.output_dir, Runtime.CHANGE_LOG_NAME),
+            logger=self.logger
+        )
+        self.settings = self.runtime.register(self.CAMERA, max_distance=150, max_disappeared=30)
+        self.pool_area = self.settings.pool_zone.points if self.settings.pool_zone else None
+        if self.pool_area is None:
+            self.logger.warning(f"⚠️ Pool area dosyası bulunamadı: pool_area_{self.CAMERA}_*.json")
         
         # Object tracker başlat
-        self.tracker = ObjectTracker(max_disappeared=30, max_distance=150)
+        self.tracker = ObjectTracker(max_disappeared=self.settings.max_disappeared,
+                                     max_distance=self.settings.max_distance)
         
         self.logger.info(f"🚀 Live Video Tester başlatıldı")
         self.logger.info(f"📹 Video: {self.video_name}")
         self.logger.info(f"🤖 Model: {self.model_path}")
         self.logger.info(f"📂 Output: {self.output_dir}")
+        if not self.render_video:
+            self.logger.info(f"📊 Sadece analitik mod: video render edilmeyecek")
         if self.pool_area:
-            self.logger.info(f"🏊 Pool area yüklendi: {len(self.pool_area)} nokta")
+            self.logger.info(f"🏊 Pool area yüklendi: {len(self.pool_area)} nokta ({self.settings.pool_zone.file_name})")
         self.logger.info(f"👥 Object tracker başlatıldı")
 
     def _create_output_directory(self):
@@ -116,72 +145,31 @@ class LiveVideoTester:
         
         return str(output_dir)
 
-    def _load_pool_area(self):
-        """🏊 Pool area JSON dosyasını yükle"""
-        try:
-            output_dir = Path(__file__).parent.parent.parent / "3_OUTPUT"
-            
-            # KAMERA 1 için pool area dosyalarını ara
-            pattern = f"pool_area_KAMERA_1_*.json"
-            pool_files = list(output_dir.glob(pattern))
-            
-            if not pool_files:
-                self.logger.warning(f"⚠️ Pool area dosyası bulunamadı: {pattern}")
-                return None
-            
-            # En son dosyayı al (tarih sıralaması)
-            latest_file = sorted(pool_files)[-1]
-            
-            with open(latest_file, 'r') as f:
-                pool_data = json.load(f)
-            
-            if 'polygon_points' in pool_data:
-                points = pool_data['polygon_points']
-                self.logger.info(f"✅ Pool area yüklendi: {latest_file.name}")
-                return points
-            else:
-                self.logger.warning(f"⚠️ Pool area formatı hatalı: {latest_file.name}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"❌ Pool area yükleme hatası: {e}")
-            return None
-
-    def _point_in_polygon(self, x, y, polygon):
-        """📍 Nokta polygon içinde mi kontrol et"""
-        if not polygon or len(polygon) < 3:
-            return False
-        
-        n = len(polygon)
-        inside = False
-        
-        p1x, p1y = polygon[0]
-        for i in range(1, n + 1):
-            p2x, p2y = polygon[i % n]
-            if y > min(p1y, p2y):
-                if y <= max(p1y, p2y):
-                    if x <= max(p1x, p2x):
-                        if p1y != p2y:
-                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                        if p1x == p2x or x <= xinters:
-                            inside = not inside
-            p1x, p1y = p2x, p2y
-        
-        return inside
+    def _apply_runtime_settings(self):
+        """🔄 Yeni ayarları al; model ve track'ler korunur"""
+        self.settings = self.runtime.settings_for(self.CAMERA)
+        self.settings.apply_to_tracker(self.tracker)
+        self.pool_area = self.settings.pool_zone.points if self.settings.pool_zone else None
 
     def _classify_location(self, center_x, center_y):
         """🏊 Konum sınıflandırması: havuz içi/dışı"""
-        if not self.pool_area:
+        pool_zone = self.settings.pool_zone
+        if pool_zone is None:
             return "person_swimming"  # Default
         
-        if self._point_in_polygon(center_x, center_y, self.pool_area):
+        if pool_zone.contains_point(center_x, center_y):
             return "person_swimming"  # Havuz içi
         else:
             return "person_poolside"  # Havuz dışı
 
     def load_model(self):
-        """🤖 YOLO model yükle"""
+        """🤖 YOLO model yükle (POOL_INFERENCE_SERVER varsa ortak sunucuya bağlan)"""
         try:
+            if Inference.SERVER:
+                self.model = InferenceClient.connect(Inference.SERVER)
+                self.logger.info(f"🧠 Inference sunucusu kullanılıyor: {Inference.SERVER} (yerel model yüklenmedi)")
+                return True
+            
             models_dir = Path(__file__).parent.parent.parent / "MODELS"
             model_full_path = models_dir / self.model_path
             
@@ -212,47 +200,47 @@ class LiveVideoTester:
         
         Returns:
             tuple: (annotated_frame, detections_list, track_assignments)
+                annotated_frame aynı karedir (yerinde çizilir); analitik modda çizilmez
         """
         try:
             # YOLO detection
             start_time = time.time()
-            results = self.model(frame, verbose=False)
+            with self.timers.stage('detect'):
+                results = self.model(frame, conf=self.settings.low_confidence_threshold, verbose=False)
             detection_time = time.time() - start_time
+            self.timers.record_yolo_speed(results)
             
             detections = []
-            annotated_frame = frame.copy()
             
             # Results process et - sadece person detection'ları al
             person_detections = []
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
+            low_detections = []  # Düşük confidence: sadece mevcut track'leri uzatır
+            with self.timers.stage('postprocess'):
+                for result in results:
+                    boxes = result.boxes
+                    if boxes is None:
+                        continue
                     for i, box in enumerate(boxes):
                         # Koordinatları al
                         x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
                         confidence = box.conf[0].cpu().numpy()
                         class_id = int(box.cls[0].cpu().numpy())
                         
-                        # Class name al
-                        class_name = self.model.names[class_id]
-                        
-                        # Sadece person ve yeterli confidence
-                        if class_id == 0 and confidence > 0.3:
+                        # Sadece person, yeterli alan; confidence'a göre yüksek / düşük (runtime eşikleri)
+                        tier = self.settings.tier(confidence, (x1, y1, x2, y2)) if class_id == 0 else None
+                        if tier is not None:
                             # Center point hesapla
                             center_x = int((x1 + x2) / 2)
                             center_y = int((y1 + y2) / 2)
                             
-                            # Pool area sınıflandırması
-                            classified_class = self._classify_location(center_x, center_y)
-                            
                             # Detection data hazırla
                             detection_info = {
                                 'frame_number': frame_number,
                                 'timestamp': timestamp,
                                 'detection_id': f"{frame_number}_{i}",
                                 'class_id': class_id,
-                                'class_name': class_name,
-                                'classified_class': classified_class,
+                                'class_name': self.model.names[class_id],
+                                'classified_class': None,
                                 'confidence': float(confidence),
                                 'bbox': {
                                     'x1': float(x1), 'y1': float(y1),
@@ -261,14 +249,35 @@ class LiveVideoTester:
                                 'center': {'x': center_x, 'y': center_y},
                                 'detection_time': detection_time
                             }
-                            person_detections.append(detection_info)
+                            if tier == 'high':
+                                person_detections.append(detection_info)
+                            else:
+                                low_detections.append(detection_info)
+            
+            # Pool area sınıflandırması
+            with self.timers.stage('zone_test'):
+                for detection_info in person_detections + low_detections:
+                    detection_info['classified_class'] = self._classify_location(
+                        detection_info['center']['x'], detection_info['center']['y']
+                    )
+            
+            # Görünüm vektörleri (re-ID): karedeki tüm kutular tek seferde
+            with self.timers.stage('appearance'):
+                candidates = person_detections + low_detections
+                descriptors = extract_descriptors(frame, [
+                    (d['bbox']['x1'], d['bbox']['y1'], d['bbox']['x2'], d['bbox']['y2']) for d in candidates
+                ])
+                for detection_info, descriptor in zip(candidates, descriptors):
+                    detection_info['appearance'] = descriptor
             
             # Tracking update
-            track_assignments = self.tracker.update(person_detections)
+            with self.timers.stage('tracking'):
+                track_assignments = self.tracker.update(person_detections, low_detections)
             
-            # Tracked objects'i çiz
+            # Track bilgilerini detection'lara işle
             for track_id, detection in track_assignments.items():
                 self.detection_count += 1
+                detection.pop('appearance', None)  # Galeride tutuluyor; detection kayıtlarında gereksiz
                 
                 # Track bilgilerini al
                 track_info = self.tracker.get_object_info(track_id)
@@ -277,68 +286,78 @@ class LiveVideoTester:
                 detection['track_id'] = track_id
                 detection['track_stable'] = track_info['stable'] if track_info else False
                 detections.append(detection)
-                
-                # Çizim bilgileri
-                x1, y1 = int(detection['bbox']['x1']), int(detection['bbox']['y1'])
-                x2, y2 = int(detection['bbox']['x2']), int(detection['bbox']['y2'])
-                center_x, center_y = detection['center']['x'], detection['center']['y']
-                confidence = detection['confidence']
-                classified_class = detection['classified_class']
-                
-                # Sınıflandırmaya göre renk belirle
-                if classified_class == "person_swimming":
-                    color = (0, 255, 0)  # Yeşil - havuz içi
-                    label_prefix = "Swimming"
-                else:  # person_poolside
-                    color = (0, 0, 255)  # Kırmızı - havuz dışı
-                    label_prefix = "Poolside"
-                
-                # Track stability'ye göre kalınlık
-                thickness = 3 if track_info and track_info['stable'] else 2
-                
-                # Bounding box çiz
-                cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, thickness)
-                
-                # Center point çiz
-                cv2.circle(annotated_frame, (center_x, center_y), 6, color, -1)
-                
-                # Trajectory çiz (son 5 nokta)
-                self.tracker.draw_trajectory(annotated_frame, track_id, color, 2)
-                
-                # Text bilgileri
-                stability = "✓" if track_info and track_info['stable'] else "○"
-                label = f"{stability} ID:{track_id} {label_prefix} {confidence:.2f}"
-                coord_text = f"({center_x},{center_y})"
-                
-                # Label background
-                (label_w, label_h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
-                cv2.rectangle(annotated_frame, 
-                            (x1, y1-25), (x1+label_w+5, y1), 
-                            color, -1)
-                
-                # Label text
-                cv2.putText(annotated_frame, label,
-                          (x1+2, y1-5), cv2.FONT_HERSHEY_SIMPLEX, 
-                          0.5, (255, 255, 255), 1)
-                
-                # Koordinat text
-                cv2.putText(annotated_frame, coord_text,
-                          (x1, y2+15), cv2.FONT_HERSHEY_SIMPLEX, 
-                          0.4, color, 1)
             
-            # Tracker istatistiklerini frame'e ekle
-            stats = self.tracker.get_statistics()
-            stats_text = f"Active: {stats['active_objects']} | Total: {stats['total_created']} | Lost: {stats['total_lost']}"
-            cv2.putText(annotated_frame, stats_text,
-                      (10, annotated_frame.shape[0]-10), cv2.FONT_HERSHEY_SIMPLEX, 
-                      0.5, (255, 255, 255), 1)
+            # Çizim (analitik modda tamamen atlanır, kare kopyalanmaz)
+            if self.render_video:
+                with self.timers.stage('draw'):
+                    self._draw_tracks(frame, detections)
             
-            return annotated_frame, detections, track_assignments
+            return frame, detections, track_assignments
             
         except Exception as e:
             self.logger.error(f"❌ Detection+Tracking hatası frame {frame_number}: {e}")
             return frame, [], {}
 
+    def _draw_tracks(self, annotated_frame, detections):
+        """🎨 Track'li detection'ları ve tracker istatistiklerini kareye çiz"""
+        for detection in detections:
+            track_id = detection['track_id']
+            
+            # Çizim bilgileri
+            x1, y1 = int(detection['bbox']['x1']), int(detection['bbox']['y1'])
+            x2, y2 = int(detection['bbox']['x2']), int(detection['bbox']['y2'])
+            center_x, center_y = detection['center']['x'], detection['center']['y']
+            confidence = detection['confidence']
+            classified_class = detection['classified_class']
+            
+            # Sınıflandırmaya göre renk belirle
+            if classified_class == "person_swimming":
+                color = (0, 255, 0)  # Yeşil - havuz içi
+                label_prefix = "Swimming"
+            else:  # person_poolside
+                color = (0, 0, 255)  # Kırmızı - havuz dışı
+                label_prefix = "Poolside"
+            
+            # Track stability'ye göre kalınlık
+            thickness = 3 if detection['track_stable'] else 2
+            
+            # Bounding box çiz
+            cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, thickness)
+            
+            # Center point çiz
+            cv2.circle(annotated_frame, (center_x, center_y), 6, color, -1)
+            
+            # Trajectory çiz (son 5 nokta)
+            self.tracker.draw_trajectory(annotated_frame, track_id, color, 2)
+            
+            # Text bilgileri
+            stability = "✓" if detection['track_stable'] else "○"
+            label = f"{stability} ID:{track_id} {label_prefix} {confidence:.2f}"
+            coord_text = f"({center_x},{center_y})"
+            
+            # Label background
+            (label_w, label_h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
+            cv2.rectangle(annotated_frame, 
+                        (x1, y1-25), (x1+label_w+5, y1), 
+                        color, -1)
+            
+            # Label text
+            cv2.putText(annotated_frame, label,
+                      (x1+2, y1-5), cv2.FONT_HERSHEY_SIMPLEX, 
+                      0.5, (255, 255, 255), 1)
+            
+            # Koordinat text
+            cv2.putText(annotated_frame, coord_text,
+                      (x1, y2+15), cv2.FONT_HERSHEY_SIMPLEX, 
+                      0.4, color, 1)
+        
+        # Tracker istatistiklerini frame'e ekle
+        stats = self.tracker.get_statistics()
+        stats_text = f"Active: {stats['active_objects']} | Total: {stats['total_created']} | Lost: {stats['total_lost']}"
+        cv2.putText(annotated_frame, stats_text,
+                  (10, annotated_frame.shape[0]-10), cv2.FONT_HERSHEY_SIMPLEX, 
+                  0.5, (255, 255, 255), 1)
+
     def _get_color_for_confidence(self, confidence):
         """🎨 Confidence'a göre renk belirle"""
         if confidence > 0.8:
@@ -366,10 +385,19 @@ class LiveVideoTester:
         
         self.logger.info(f"📊 Video özellikleri: {frame_width}x{frame_height}, {fps} FPS, {total_frames} frame")
         
-        # Output video writer
-        output_video_path = os.path.join(self.output_dir, "live_test_result.mp4")
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_video_path, fourcc, fps, (frame_width, frame_height))
+        # Output video writer (analitik modda açılmaz)
+        out = None
+        if self.render_video:
+            output_video_path = os.path.join(self.output_dir, "live_test_result.mp4")
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = cv2.VideoWriter(output_video_path, fourcc, fps, (frame_width, frame_height))
+        
+        # Tespit logu (her iki modda yazılır; sonradan render için)
+        detection_log = DetectionLogWriter(
+            os.path.join(self.output_dir, Output.DETECTION_LOG_NAME),
+            self.video_path, fps, (frame_width, frame_height),
+            pipeline="live_tester", model=self.model_path, pool_polygon=self.pool_area
+        )
         
         # CSV dosyası için başlık
         csv_path = os.path.join(self.output_dir, "coordinates_log.csv")
@@ -387,7 +415,8 @@ class LiveVideoTester:
                 writer.writeheader()
                 
                 while True:
-                    ret, frame = cap.read()
+                    with self.timers.stage('decode'):
+                        ret, frame = cap.read()
                     if not ret:
                         break
                     
@@ -400,17 +429,35 @@ class LiveVideoTester:
                     
                     frame_timestamp = self.frame_count / fps
                     
+                    # Bekleyen ayar değişikliklerini kareler arasında uygula
+                    if self.runtime.poll(self.frame_count):
+                        self._apply_runtime_settings()
+                    
                     # Detection yap
                     annotated_frame, detections, track_assignments = self.detect_objects(
                         frame, self.frame_count, frame_timestamp
                     )
                     
-                    # Frame info overlay
-                    self._add_frame_info(annotated_frame, self.frame_count, 
-                                       len(detections), frame_timestamp)
+                    if self.render_video:
+                        # Frame info overlay
+                        with self.timers.stage('draw'):
+                            self._add_frame_info(annotated_frame, self.frame_count, 
+                                               len(detections), frame_timestamp)
+                        
+                        # Video'ya yaz
+                        with self.timers.stage('encode'):
+                            out.write(annotated_frame)
                     
-                    # Video'ya yaz
-                    out.write(annotated_frame)
+                    # Tespit loguna yaz
+                    detection_log.write_frame(self.frame_count - 1, frame_timestamp, [
+                        detection_record(
+                            (d['bbox']['x1'], d['bbox']['y1'], d['bbox']['x2'], d['bbox']['y2']),
+                            d['confidence'], d['classified_class'], d['track_id'],
+                            in_pool=d['classified_class'] == "person_swimming",
+                            stable=d['track_stable']
+                        )
+                        for d in detections
+                    ])
                     
                     # CSV'ye detection'ları yaz
                     for detection in detections:
@@ -436,6 +483,7 @@ class LiveVideoTester:
                     
                     # Detection data'yı kaydet
                     self.detection_data.extend(detections)
+                    self.timers.end_frame()
                     
                     # Progress log (her 50 frame'de bir)
                     if self.frame_count % 50 == 0:
@@ -448,7 +496,10 @@ class LiveVideoTester:
         
         finally:
             cap.release()
-            out.release()
+            if out is not None:
+                out.release()
+            detection_log.close()
+            self.runtime.close()
         
         self.total_time = time.time() - start_time
         self.logger.info(f"✅ Video işleme tamamlandı!")
@@ -488,7 +539,8 @@ class LiveVideoTester:
                 'video_name': self.video_name,
                 'model_used': self.model_path,
                 'test_timestamp': self.timestamp,
-                'total_processing_time': round(self.total_time, 2)
+                'total_processing_time': round(self.total_time, 2),
+                'render_video': self.render_video
             },
             'frame_stats': {
                 'total_frames': self.frame_count,
@@ -513,7 +565,8 @@ class LiveVideoTester:
                 'stable_track_detections': len(stable_tracks),
                 'tracking_success_rate': round(len(tracked_detections) / self.detection_count * 100, 2) if self.detection_count > 0 else 0,
                 'track_stability_rate': round(len(stable_tracks) / len(tracked_detections) * 100, 2) if tracked_detections else 0
-            }
+            },
+            'stage_timings': self.timers.summary()
         }
         
         # JSON olarak kaydet
@@ -521,6 +574,10 @@ class LiveVideoTester:
         with open(metrics_path, 'w', encoding='utf-8') as f:
             json.dump(metrics, f, indent=2, ensure_ascii=False)
         
+        # Prometheus textfile (opsiyonel)
+        if Profiling.PROMETHEUS_FILE:
+            self.timers.write_prometheus(Profiling.PROMETHEUS_FILE, {'video': self.video_name})
+        
         # Log'a yazdır
         self.logger.info("📊 PERFORMANCE METRICS")
         self.logger.info(f"⏱️  Total Time: {metrics['test_info']['total_processing_time']}s")
@@ -534,6 +591,9 @@ class LiveVideoTester:
         self.logger.info(f"📈 Tracking Success: {metrics['tracking_metrics']['tracking_success_rate']}%")
         self.logger.info(f"✅ Track Stability: {metrics['tracking_metrics']['track_stability_rate']}%")
         self.logger.info(f"🔄 Lost Tracks: {metrics['tracking_metrics']['total_tracks_lost']}")
+        self.logger.info("⏱️ STAGE TIMINGS")
+        for line in self.timers.format_lines():
+            self.logger.info(line)
         
         return metrics
 
@@ -574,7 +634,9 @@ def main():
         
         print(f"\n📂 Output Klasörü: {tester.output_dir}")
         print("📁 Oluşturulan dosyalar:")
-        print("   📹 live_test_result.mp4")
+        if tester.render_video:
+            print("   📹 live_test_result.mp4")
+        print(f"   🧾 {Output.DETECTION_LOG_NAME}")
         print("   📊 coordinates_log.csv") 
         print("   📝 detection_log.txt")
         print("   📈 performance_metrics.json")
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🎞️ LOG RENDERER - TESPİT LOGUNDAN VİDEO ÜRETİMİ
+===============================================
+Inference'ı yeniden çalıştırmadan, tespit/track logu + kaynak videodan
+istenen zaman aralığı için işaretlenmiş MP4 üretir.
+
+Desteklenen loglar:
+- detections.jsonl / detections_camN.jsonl (output_manager.detection_log)
+- coordinates_log.csv (LiveVideoTester, frame_number 1 tabanlı)
+- multi_camera_coordinates.csv (MultiCameraTracker, frame_number 0 tabanlı, camera_id)
+
+Aralık segmentlere bölünür, her segment ayrı süreçte doğrudan kendi
+başlangıç karesine seek ederek render edilir, sonra parçalar birleştirilir.
+Zaman <-> kare çevrimi ve seek, seek indeksiyle (pts + keyframe) yapılır;
+değişken kare hızlı .MOV dosyalarında da segmentler doğru kareden başlar.
+
+Kullanım:
+    python log_renderer.py 3_OUTPUT/.../detections.jsonl --around 754 --window 30
+    python log_renderer.py coordinates_log.csv --video "0_DATA/kamera2.mov" --start 60 --end 90
+"""
+
+import os
+import sys
+import csv
+import bisect
+import shutil
+import argparse
+import tempfile
+import subprocess
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from output_manager.detection_log import iter_detection_log
+from video_module.overlay_renderer import OverlayRenderer
+from video_module.seek_index import load_seek_index
+
+TRAIL_LENGTH = 20          # Yörünge için geriye bakılan kare sayısı
+POOL_COLOR = (0, 255, 0)   # Havuz içi - yeşil
+OUT_COLOR = (0, 0, 255)    # Havuz dışı - kırmızı
+
+
+def load_detection_log(log_path, camera_id=None):
+    """
+    Logu okuyup kare indeksine göre tespitleri döndür
+
+    Args:
+        log_path (str): .jsonl veya .csv log
+        camera_id (int): Çok kameralı CSV'de filtrelenecek kamera
+
+    Returns:
+        tuple: (meta dict, {index: [detection, ...]})
+    """
+    if log_path.lower().endswith('.csv'):
+        return _load_csv_log(log_path, camera_id)
+
+    meta = {}
+    frames = {}
+    for record in iter_detection_log(log_path):
+        record_type = record.get('type')
+        if record_type == 'header':
+            meta = record
+        elif record_type == 'frame':
+            frames[record['index']] = record['detections']
+    return meta, frames
+
+
+def _load_csv_log(log_path, camera_id=None):
+    """coordinates_log.csv / multi_camera_coordinates.csv oku"""
+    frames = defaultdict(list)
+
+    with open(log_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        multi_camera = 'camera_id' in reader.fieldnames
+        # LiveVideoTester frame_number'ı 1'den, MultiCameraTracker 0'dan başlatır
+        index_offset = 0 if multi_camera else 1
+
+        for row in reader:
+            if multi_camera and camera_id is not None and int(row['camera_id']) != camera_id:
+                continue
+
+            track_field = row.get('local_track_id') if multi_camera else row.get('track_id')
+            track_id = int(track_field) if track_field not in (None, '', 'N/A') else None
+
+            frames[int(row['frame_number']) - index_offset].append({
+                'bbox': [float(row['x1']), float(row['y1']), float(row['x2']), float(row['y2'])],
+                'conf': float(row['confidence']),
+                'class': row.get('classified_class') or row.get('class_name'),
+                'track_id': track_id,
+                'in_pool': row.get('classified_class') == 'person_swimming',
+                'stable': row.get('track_stable') == 'True',
+            })
+
+    meta = {'pipeline': 'csv', 'camera': f"CAMERA {camera_id}" if camera_id else None}
+    return meta, dict(frames)
+
+
+def _track_trails(frames, first_index, last_index, trail_length):
+    """
+    Her kare için track yörüngelerini logdan hesapla
+
+    Segmentler bağımsız render edildiği için yörünge, tracker durumuna
+    değil logdaki son `trail_length` karedeki merkezlere dayanır.
+
+    Returns:
+        dict: {index: {track_id: [(x, y), ...]}}
+    """
+    history = defaultdict(lambda: deque(maxlen=trail_length))
+    trails = {}
+
+    for index in range(max(0, first_index - trail_length), last_index):
+        for detection in frames.get(index, ()):
+            track_id = detection.get('track_id')
+            if track_id is None:
+                continue
+            x1, y1, x2, y2 = detection['bbox']
+            history[track_id].append((index, (int((x1 + x2) / 2), int((y1 + y2) / 2))))
+
+        if index >= first_index:
+            trails[index] = {
+                track_id: [point for seen, point in points if seen > index - trail_length]
+                for track_id, points in history.items()
+                if points and points[-1][0] == index
+            }
+
+    return trails
+
+
+def _seek_exact(cap, seek_time, target_time, fps):
+    """
+    Keyframe'e zaman damgasıyla git, hedef kareye kadar grab() ile ilerle
+
+    Args:
+        cap (cv2.VideoCapture): Açık video
+        seek_time (float): Hedeften önceki keyframe'in zamanı (saniye)
+        target_time (float): Segmentin ilk karesinin zamanı (saniye)
+        fps (float): Yarım kare tolerans için
+
+    Returns:
+        bool: Hedef kare grab() edildi mi (retrieve() ile alınır)
+    """
+    tolerance = 0.5 / (fps or 30.0)
+
+    # Backend hedefi aşarsa (VFR'de kare<->zaman çevrimi kayar) daha geriden tekrar dene
+    for margin in (0.0, 2.0, None):
+        start_time = 0.0 if margin is None else max(0.0, seek_time - margin)
+        cap.set(cv2.CAP_PROP_POS_MSEC, start_time * 1000.0)
+
+        first = True
+        while cap.grab():
+            t = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            if first and t > target_time + tolerance and start_time > 0:
+                break
+            first = False
+            if t >= target_time - tolerance:
+                return True
+        if not first:
+            return False
+    return False
+
+
+def _render_segment(job):
+    """
+    Tek segmenti render et (ProcessPoolExecutor işçisi)
+
+    Args:
+        job (dict): video_path, output_path, start_index, end_index, fps,
+            times (segment karelerinin zamanları, indeks yoksa None),
+            seek_time, frames, trails, pool_polygon, title
+
+    Returns:
+        tuple: (output_path, yazılan kare sayısı)
+    """
+    cap = cv2.VideoCapture(job['video_path'])
+    if not cap.isOpened():
+        return job['output_path'], 0
+
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = job['fps']
+    times = job['times']
+
+    # Doğrudan segment başına seek
+    pending = None
+    if times:
+        if not _seek_exact(cap, job['seek_time'], times[0], fps):
+            cap.release()
+            return job['output_path'], 0
+        ret, frame = cap.retrieve()
+        pending = frame if ret else None
+    else:
+        # İndeks yok: eski davranış
+        cap.set(cv2.CAP_PROP_POS_FRAMES, job['start_index'])
+
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    out = cv2.VideoWriter(job['output_path'], fourcc, fps, (width, height))
+
+    renderer = OverlayRenderer()
+    if job['pool_polygon']:
+        renderer.add_polygon(job['pool_polygon'], fill_color=(0, 255, 255), fill_alpha=0.2,
+                             outline_color=(0, 255, 255), outline_thickness=3)
+    renderer.add_rectangle((10, 10), (420, 80), (0, 0, 0), alpha=0.6)
+    if job['title']:
+        renderer.add_text(job['title'], (10, height - 15), (0, 255, 255))
+
+    frames = job['frames']
+    trails = job['trails']
+    written = 0
+
+    for index in range(job['start_index'], job['end_index']):
+        if pending is not None:
+            frame, pending = pending, None
+        else:
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+        detections = frames.get(index, ())
+        renderer.composite(frame)
+
+        for detection in detections:
+            x1, y1, x2, y2 = (int(v) for v in detection['bbox'])
+            color = POOL_COLOR if detection.get('in_pool') else OUT_COLOR
+            thickness = 3 if detection.get('stable') else 2
+            track_id = detection.get('track_id')
+
+            label = f"{detection['conf']:.2f}"
+            if track_id is not None:
+                label = f"ID:{track_id} {label}"
+                trail = trails.get(index, {}).get(track_id)
+                if trail:
+                    renderer.draw_trajectory(frame, trail, color, 2, fade_steps=4)
+
+            renderer.draw_box(frame, (x1, y1, x2, y2), color, thickness, label=label,
+                              center=((x1 + x2) // 2, (y1 + y2) // 2))
+
+        renderer.draw_text_lines(frame, [
+            f"Frame: {index}  Time: {times[index - job['start_index']] if times else index / fps:.2f}s",
+            (f"Detections: {len(detections)}", (0, 255, 0)),
+        ], (20, 38), 28, font_scale=0.6)
+
+        out.write(frame)
+        written += 1
+
+    cap.release()
+    out.release()
+    return job['output_path'], written
+
+
+def _concat_segments(part_paths, output_path, fps):
+    """Parçaları birleştir (ffmpeg varsa yeniden encode etmeden)"""
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg:
+        list_path = output_path + ".parts.txt"
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for part in part_paths:
+                f.write(f"file '{os.path.abspath(part)}'\n")
+        result = subprocess.run([ffmpeg, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+                                 '-i', list_path, '-c', 'copy', output_path])
+        os.remove(list_path)
+        if result.returncode == 0:
+            return
+
+    # Yedek yol: OpenCV ile ardışık oku-yaz
+    out = None
+    for part in part_paths:
+        cap = cv2.VideoCapture(part)
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if out is None:
+                height, width = frame.shape[:2]
+                out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+            out.write(frame)
+        cap.release()
+    if out is not None:
+        out.release()
+
+
+def render_from_log(log_path, output_path, video_path=None, start=0.0, end=None,
+                    camera_id=None, workers=None, segment_seconds=10.0):
+    """
+    Logdan işaretlenmiş video üret
+
+    Args:
+        log_path (str): Tespit logu (.jsonl / .csv)
+        output_path (str): Çıktı MP4
+        video_path (str): Kaynak video (JSONL header'ında varsa opsiyonel)
+        start (float): Başlangıç (saniye)
+        end (float): Bitiş (saniye, None: video sonu)
+        camera_id (int): Çok kameralı CSV için kamera
+        workers (int): Süreç sayısı (None: CPU sayısı)
+        segment_seconds (float): Segment uzunluğu
+
+    Returns:
+        int: Yazılan kare sayısı
+    """
+    meta, frames = load_detection_log(log_path, camera_id)
+    video_path = video_path or meta.get('video')
+    if not video_path or not os.path.exists(video_path):
+        print(f"❌ Kaynak video bulunamadı: {video_path}")
+        return 0
+
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or meta.get('fps') or 30.0
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    # VFR videolarda int(t * fps) kayar: zaman -> kare çevrimi pts üzerinden
+    index = load_seek_index(video_path)
+    pts = index['pts'] if index else None
+    keyframes = index['keyframes'] if index else []
+    if pts:
+        total_frames = len(pts)
+        start_index = bisect.bisect_left(pts, start - 1e-6)
+        end_index = total_frames if end is None else bisect.bisect_left(pts, end - 1e-6)
+    else:
+        start_index = max(0, int(start * fps))
+        end_index = total_frames if end is None else min(total_frames, int(end * fps))
+    if end_index <= start_index:
+        print(f"❌ Geçersiz aralık: {start}s - {end}s")
+        return 0
+
+    segment_frames = max(1, int(segment_seconds * fps))
+    title = os.path.basename(video_path)
+    if meta.get('camera'):
+        title = f"{meta['camera']} | {title}"
+
+    temp_dir = tempfile.mkdtemp(prefix="log_render_")
+    jobs = []
+    for segment_start in range(start_index, end_index, segment_frames):
+        segment_end = min(end_index, segment_start + segment_frames)
+        seek_time = None
+        if pts:
+            # Segment başından önceki keyframe (bilgi yoksa ~2 sn geriden)
+            k = bisect.bisect_right(keyframes, segment_start) - 1
+            seek_time = pts[keyframes[k]] if k >= 0 else max(0.0, pts[segment_start] - 2.0)
+        jobs.append({
+            'video_path': video_path,
+            'output_path': os.path.join(temp_dir, f"part_{len(jobs):04d}.mp4"),
+            'start_index': segment_start,
+            'end_index': segment_end,
+            'fps': fps,
+            'times': pts[segment_start:segment_end] if pts else None,
+            'seek_time': seek_time,
+            # İşçiye sadece kendi segmentinin verisi gönderilir
+            'frames': {i: frames[i] for i in range(segment_start, segment_end) if i in frames},
+            'trails': _track_trails(frames, segment_start, segment_end, TRAIL_LENGTH),
+            'pool_polygon': meta.get('pool_polygon'),
+            'title': title,
+        })
+
+    print(f"🎞️ {len(jobs)} segment render ediliyor ({start_index}-{end_index}. kareler)...")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_render_segment, jobs))
+
+        part_paths = [path for path, written in results if written > 0]
+        total_written = sum(written for _, written in results)
+
+        if part_paths:
+            _concat_segments(part_paths, output_path, fps)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(f"✅ {total_written} kare yazıldı: {output_path}")
+    return total_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tespit logundan işaretlenmiş video üret")
+    parser.add_argument("log", help="detections.jsonl veya coordinates CSV")
+    parser.add_argument("--video", help="Kaynak video (JSONL header'ındakini ezer)")
+    parser.add_argument("--output", help="Çıktı MP4 (varsayılan: log klasörü)")
+    parser.add_argument("--start", type=float, default=0.0, help="Başlangıç (saniye)")
+    parser.add_argument("--end", type=float, help="Bitiş (saniye)")
+    parser.add_argument("--around", type=float, help="Olay anı (saniye); --window ile birlikte")
+    parser.add_argument("--window", type=float, default=30.0, help="Olay etrafındaki klip süresi")
+    parser.add_argument("--camera", type=int, help="Çok kameralı CSV için kamera ID")
+    parser.add_argument("--workers", type=int, help="Süreç sayısı")
+    parser.add_argument("--segment", type=float, default=10.0, help="Segment uzunluğu (saniye)")
+
+    args = parser.parse_args()
+
+    start, end = args.start, args.end
+    if args.around is not None:
+        start = max(0.0, args.around - args.window / 2)
+        end = args.around + args.window / 2
+
+    output_path = args.output
+    if not output_path:
+        end_label = f"{end:.0f}" if end is not None else "end"
+        output_path = os.path.join(os.path.dirname(os.path.abspath(args.log)),
+                                   f"render_{start:.0f}_{end_label}.mp4")
+
+    render_from_log(args.log, output_path, video_path=args.video, start=start, end=end,
+                    camera_id=args.camera, workers=args.workers, segment_seconds=args.segment)
+
+
+if __name__ == "__main__":
+    main()
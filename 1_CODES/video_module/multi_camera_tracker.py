@@ -30,8 +30,17 @@ import sys
 project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
+# core modülleri (1_CODES) için path
+sys.path.append(str(Path(__file__).parent.parent))
+
 from ultralytics import YOLO
 from object_tracker import ObjectTracker
+from core.config import Profiling, Output, Runtime, Inference
+from core.instrumentation import StageTimers
+from core.runtime_config import RuntimeConfig
+from video_module.appearance import extract_descriptors
+from detection_module.inference_server import InferenceClient
+from output_manager.detection_log import DetectionLogWriter, detection_record
 
 def setup_logger(name, log_file):
     """Simple logger setup"""
@@ -58,7 +67,10 @@ def setup_logger(name, log_file):
     return logger
 
 class MultiCameraTracker:
-    def __init__(self, camera1_path, camera2_path, model_path="yolov8x.pt"):
+    # camera_id -> havuz alanı / runtime ayarları anahtarı
+    CAMERAS = {1: "KAMERA_1", 2: "KAMERA_2"}
+    
+    def __init__(self, camera1_path, camera2_path, model_path="yolov8x.pt", render_video=None):
         """
         🎬🎬 Multi-Camera Tracker Initialization
         
@@ -66,10 +78,13 @@ class MultiCameraTracker:
             camera1_path (str): KAMERA 1 video path
             camera2_path (str): KAMERA 2 video path
             model_path (str): YOLO model path
+            render_video (bool): False ise çizim/encode yapılmaz (sadece analitik).
+                None ise Output.RENDER_VIDEO kullanılır
         """
         self.camera1_path = Path(camera1_path)
         self.camera2_path = Path(camera2_path)
         self.model_path = model_path
+        self.render_video = Output.RENDER_VIDEO if render_video is None else render_video
         
         # Timestamp for output naming
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -94,6 +109,12 @@ class MultiCameraTracker:
         # Pool areas
         self.pool_area_cam1 = None
         self.pool_area_cam2 = None
+        self.pool_zone_cam1 = None
+        self.pool_zone_cam2 = None
+        
+        # Çalışma zamanı ayarları (eşikler, tracker, havuz alanı; yeniden başlatmadan değişir)
+        self.runtime = None
+        self.settings = {}
         
         # Models and trackers
         self.model = None
@@ -104,10 +125,15 @@ class MultiCameraTracker:
         self.cross_matches = {}
         self.global_track_id = 1
         
+        # Aşama bazlı zamanlayıcılar
+        self.timers = StageTimers(enabled=Profiling.ENABLED, pipeline="multi_camera")
+        
         self.logger.info(f"🎬🎬 Multi-Camera Tracker başlatıldı")
         self.logger.info(f"📹 Camera 1: {self.camera1_path.name}")
         self.logger.info(f"📹 Camera 2: {self.camera2_path.name}")
         self.logger.info(f"📂 Output: {self.output_dir}")
+        if not self.render_video:
+            self.logger.info(f"📊 Sadece analitik mod: video render edilmeyecek")
 
     def _create_output_directory(self):
         """📁 OUTPUT klasörü oluştur"""
@@ -121,32 +147,48 @@ class MultiCameraTracker:
         return str(output_dir)
 
     def _load_pool_areas(self):
-        """🏊 Pool area'larını yükle"""
-        pool_dir = Path(__file__).parent.parent.parent / "3_OUTPUT"
-        
-        # KAMERA 1 pool area
-        cam1_pattern = "pool_area_KAMERA_1_*.json"
-        cam1_files = list(pool_dir.glob(cam1_pattern))
-        if cam1_files:
-            with open(cam1_files[0], 'r') as f:
-                self.pool_area_cam1 = json.load(f)
-            self.logger.info(f"✅ Camera 1 pool area yüklendi: {len(self.pool_area_cam1)} nokta")
-        
-        # KAMERA 2 pool area (varsa)
-        cam2_pattern = "pool_area_KAMERA_2_*.json"
-        cam2_files = list(pool_dir.glob(cam2_pattern))
-        if cam2_files:
-            with open(cam2_files[0], 'r') as f:
-                self.pool_area_cam2 = json.load(f)
-            self.logger.info(f"✅ Camera 2 pool area yüklendi: {len(self.pool_area_cam2)} nokta")
+        """🏊 Pool area'larını ve kamera ayarlarını yükle (runtime config üzerinden)"""
+        self.runtime = RuntimeConfig(
+            pool_dir=Path(__file__).parent.parent.parent / "3_OUTPUT",
+            change_log_path=os.path.join(self.output_dir, Runtime.CHANGE_LOG_NAME),
+            logger=self.logger
+        )
+        for camera in self.CAMERAS.values():
+            self.runtime.register(camera, max_distance=150, max_disappeared=30)
+        self._apply_runtime_settings()
+        
+        if self.pool_zone_cam1 is not None:
+            self.logger.info(f"✅ Camera 1 pool area yüklendi: {len(self.pool_area_cam1)} nokta "
+                             f"({self.pool_zone_cam1.file_name})")
+        if self.settings[2].pool_zone is not None:
+            self.logger.info(f"✅ Camera 2 pool area yüklendi: {len(self.pool_area_cam2)} nokta "
+                             f"({self.pool_zone_cam2.file_name})")
         else:
-            # Camera 1'in pool area'sını Camera 2 için de kullan (geçici)
-            self.pool_area_cam2 = self.pool_area_cam1
             self.logger.warning("⚠️ Camera 2 pool area bulunamadı, Camera 1'in area'sı kullanılıyor")
 
+    def _apply_runtime_settings(self):
+        """🔄 Kamera ayarlarını (yeniden) al; model ve track'ler korunur"""
+        self.settings = {camera_id: self.runtime.settings_for(camera)
+                         for camera_id, camera in self.CAMERAS.items()}
+        
+        self.pool_zone_cam1 = self.settings[1].pool_zone
+        # KAMERA 2 pool area yoksa Camera 1'in area'sı kullanılır (geçici)
+        self.pool_zone_cam2 = self.settings[2].pool_zone or self.pool_zone_cam1
+        self.pool_area_cam1 = self.pool_zone_cam1.points if self.pool_zone_cam1 is not None else None
+        self.pool_area_cam2 = self.pool_zone_cam2.points if self.pool_zone_cam2 is not None else None
+        
+        for camera_id, tracker in ((1, self.tracker_cam1), (2, self.tracker_cam2)):
+            if tracker is not None:
+                self.settings[camera_id].apply_to_tracker(tracker)
+
     def _load_model(self):
-        """🤖 YOLO model yükle"""
+        """🤖 YOLO model yükle (POOL_INFERENCE_SERVER varsa ortak sunucuya bağlan)"""
         try:
+            if Inference.SERVER:
+                self.model = InferenceClient.connect(Inference.SERVER)
+                self.logger.info(f"🧠 Inference sunucusu kullanılıyor: {Inference.SERVER} (yerel model yüklenmedi)")
+                return True
+            
             # Model path kontrolü
             models_dir = Path(__file__).parent.parent.parent / "MODELS"
             full_model_path = models_dir / self.model_path
@@ -166,34 +208,11 @@ class MultiCameraTracker:
             self.logger.error(f"❌ Model yükleme hatası: {e}")
             return False
 
-    def _point_in_polygon(self, point, polygon):
-        """📍 Nokta polygon içinde mi kontrol et"""
-        if not polygon:
-            return False
-        
-        x, y = point
-        n = len(polygon)
-        inside = False
-        
-        p1x, p1y = polygon[0]
-        for i in range(1, n + 1):
-            p2x, p2y = polygon[i % n]
-            if y > min(p1y, p2y):
-                if y <= max(p1y, p2y):
-                    if x <= max(p1x, p2x):
-                        if p1y != p2y:
-                            xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                        if p1x == p2x or x <= xinters:
-                            inside = not inside
-            p1x, p1y = p2x, p2y
-        
-        return inside
-
     def _classify_location(self, center_x, center_y, camera_id):
         """🏊 Konum sınıflandırması"""
-        pool_area = self.pool_area_cam1 if camera_id == 1 else self.pool_area_cam2
+        pool_zone = self.pool_zone_cam1 if camera_id == 1 else self.pool_zone_cam2
         
-        if pool_area and self._point_in_polygon((center_x, center_y), pool_area):
+        if pool_zone is not None and pool_zone.contains_point(center_x, center_y):
             return "person_swimming"
         else:
             return "person_poolside"
@@ -211,39 +230,39 @@ class MultiCameraTracker:
         
         Returns:
             tuple: (annotated_frame, detections_list, track_assignments)
+                annotated_frame aynı karedir (yerinde çizilir); analitik modda çizilmez
         """
         try:
             # YOLO detection
             start_time = time.time()
-            results = self.model(frame, verbose=False)
+            with self.timers.stage('detect'):
+                results = self.model(frame, conf=self.settings[camera_id].low_confidence_threshold, verbose=False)
             detection_time = time.time() - start_time
+            self.timers.record_yolo_speed(results)
             
             detections = []
-            annotated_frame = frame.copy()
             
             # Results process et - sadece person detection'ları al
             person_detections = []
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
+            low_detections = []  # Düşük confidence: sadece mevcut track'leri uzatır
+            with self.timers.stage('postprocess'):
+                for result in results:
+                    boxes = result.boxes
+                    if boxes is None:
+                        continue
                     for i, box in enumerate(boxes):
                         # Koordinatları al
                         x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
                         confidence = box.conf[0].cpu().numpy()
                         class_id = int(box.cls[0].cpu().numpy())
                         
-                        # Class name al
-                        class_name = self.model.names[class_id]
-                        
-                        # Sadece person ve yeterli confidence
-                        if class_id == 0 and confidence > 0.3:
+                        # Sadece person, yeterli alan; confidence'a göre yüksek / düşük (runtime eşikleri)
+                        tier = self.settings[camera_id].tier(confidence, (x1, y1, x2, y2)) if class_id == 0 else None
+                        if tier is not None:
                             # Center point hesapla
                             center_x = int((x1 + x2) / 2)
                             center_y = int((y1 + y2) / 2)
                             
-                            # Pool area sınıflandırması
-                            classified_class = self._classify_location(center_x, center_y, camera_id)
-                            
                             # Detection data hazırla
                             detection_info = {
                                 'frame_number': frame_number,
@@ -251,8 +270,8 @@ class MultiCameraTracker:
                                 'camera_id': camera_id,
                                 'detection_id': f"cam{camera_id}_{frame_number}_{i}",
                                 'class_id': class_id,
-                                'class_name': class_name,
-                                'classified_class': classified_class,
+                                'class_name': self.model.names[class_id],
+                                'classified_class': None,
                                 'confidence': float(confidence),
                                 'bbox': {
                                     'x1': float(x1), 'y1': float(y1),
@@ -261,14 +280,35 @@ class MultiCameraTracker:
                                 'center': {'x': center_x, 'y': center_y},
                                 'detection_time': detection_time
                             }
-                            person_detections.append(detection_info)
+                            if tier == 'high':
+                                person_detections.append(detection_info)
+                            else:
+                                low_detections.append(detection_info)
+            
+            # Pool area sınıflandırması
+            with self.timers.stage('zone_test'):
+                for detection_info in person_detections + low_detections:
+                    detection_info['classified_class'] = self._classify_location(
+                        detection_info['center']['x'], detection_info['center']['y'], camera_id
+                    )
+            
+            # Görünüm vektörleri (re-ID): karedeki tüm kutular tek seferde
+            with self.timers.stage('appearance'):
+                candidates = person_detections + low_detections
+                descriptors = extract_descriptors(frame, [
+                    (d['bbox']['x1'], d['bbox']['y1'], d['bbox']['x2'], d['bbox']['y2']) for d in candidates
+                ])
+                for detection_info, descriptor in zip(candidates, descriptors):
+                    detection_info['appearance'] = descriptor
             
             # Tracking update
-            track_assignments = tracker.update(person_detections)
+            with self.timers.stage('tracking'):
+                track_assignments = tracker.update(person_detections, low_detections)
             
-            # Tracked objects'i çiz
+            # Track bilgilerini detection'lara işle
             for track_id, detection in track_assignments.items():
                 self.detection_count += 1
+                detection.pop('appearance', None)  # Galeride tutuluyor; detection kayıtlarında gereksiz
                 
                 # Track bilgilerini al
                 track_info = tracker.get_object_info(track_id)
@@ -277,61 +317,71 @@ class MultiCameraTracker:
                 detection['local_track_id'] = track_id
                 detection['track_stable'] = track_info['stable'] if track_info else False
                 detections.append(detection)
-                
-                # Çizim bilgileri
-                x1, y1 = int(detection['bbox']['x1']), int(detection['bbox']['y1'])
-                x2, y2 = int(detection['bbox']['x2']), int(detection['bbox']['y2'])
-                center_x, center_y = detection['center']['x'], detection['center']['y']
-                confidence = detection['confidence']
-                classified_class = detection['classified_class']
-                
-                # Kameraya göre base renk
-                if camera_id == 1:
-                    base_color = (255, 100, 100)  # Kırmızımsı - Camera 1
-                else:
-                    base_color = (100, 100, 255)  # Mavimsi - Camera 2
-                
-                # Sınıflandırmaya göre renk ayarla
-                if classified_class == "person_swimming":
-                    color = (0, 255, 0)  # Yeşil - havuz içi
-                    label_prefix = "Swimming"
-                else:  # person_poolside
-                    color = base_color  # Kameraya özel renk - havuz dışı
-                    label_prefix = "Poolside"
-                
-                # Track stability'ye göre kalınlık
-                thickness = 3 if track_info and track_info['stable'] else 2
-                
-                # Bounding box çiz
-                cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, thickness)
-                
-                # Center point çiz
-                cv2.circle(annotated_frame, (center_x, center_y), 6, color, -1)
-                
-                # Trajectory çiz
-                tracker.draw_trajectory(annotated_frame, track_id, color, 2)
-                
-                # Text bilgileri
-                stability = "✓" if track_info and track_info['stable'] else "○"
-                label = f"CAM{camera_id} {stability} ID:{track_id} {label_prefix} {confidence:.2f}"
-                
-                # Label background
-                (label_w, label_h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
-                cv2.rectangle(annotated_frame, 
-                            (x1, y1-25), (x1+label_w+5, y1), 
-                            color, -1)
-                
-                # Label text
-                cv2.putText(annotated_frame, label,
-                          (x1+2, y1-5), cv2.FONT_HERSHEY_SIMPLEX, 
-                          0.5, (255, 255, 255), 1)
             
-            return annotated_frame, detections, track_assignments
+            # Çizim (analitik modda tamamen atlanır, kare kopyalanmaz)
+            if self.render_video:
+                with self.timers.stage('draw'):
+                    self._draw_tracks(frame, detections, camera_id, tracker)
+            
+            return frame, detections, track_assignments
             
         except Exception as e:
             self.logger.error(f"❌ Camera {camera_id} detection hatası frame {frame_number}: {e}")
             return frame, [], {}
 
+    def _draw_tracks(self, annotated_frame, detections, camera_id, tracker):
+        """🎨 Tek kameranın track'li detection'larını kareye çiz"""
+        for detection in detections:
+            track_id = detection['local_track_id']
+            
+            # Çizim bilgileri
+            x1, y1 = int(detection['bbox']['x1']), int(detection['bbox']['y1'])
+            x2, y2 = int(detection['bbox']['x2']), int(detection['bbox']['y2'])
+            center_x, center_y = detection['center']['x'], detection['center']['y']
+            confidence = detection['confidence']
+            classified_class = detection['classified_class']
+            
+            # Kameraya göre base renk
+            if camera_id == 1:
+                base_color = (255, 100, 100)  # Kırmızımsı - Camera 1
+            else:
+                base_color = (100, 100, 255)  # Mavimsi - Camera 2
+            
+            # Sınıflandırmaya göre renk ayarla
+            if classified_class == "person_swimming":
+                color = (0, 255, 0)  # Yeşil - havuz içi
+                label_prefix = "Swimming"
+            else:  # person_poolside
+                color = base_color  # Kameraya özel renk - havuz dışı
+                label_prefix = "Poolside"
+            
+            # Track stability'ye göre kalınlık
+            thickness = 3 if detection['track_stable'] else 2
+            
+            # Bounding box çiz
+            cv2.rectangle(annotated_frame, (x1, y1), (x2, y2), color, thickness)
+            
+            # Center point çiz
+            cv2.circle(annotated_frame, (center_x, center_y), 6, color, -1)
+            
+            # Trajectory çiz
+            tracker.draw_trajectory(annotated_frame, track_id, color, 2)
+            
+            # Text bilgileri
+            stability = "✓" if detection['track_stable'] else "○"
+            label = f"CAM{camera_id} {stability} ID:{track_id} {label_prefix} {confidence:.2f}"
+            
+            # Label background
+            (label_w, label_h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
+            cv2.rectangle(annotated_frame, 
+                        (x1, y1-25), (x1+label_w+5, y1), 
+                        color, -1)
+            
+            # Label text
+            cv2.putText(annotated_frame, label,
+                      (x1+2, y1-5), cv2.FONT_HERSHEY_SIMPLEX, 
+                      0.5, (255, 255, 255), 1)
+
     def process_multi_camera(self):
         """
         🎬🎬 Multi-camera processing ana fonksiyonu
@@ -348,8 +398,10 @@ class MultiCameraTracker:
             self._load_pool_areas()
             
             # Object trackers başlat
-            self.tracker_cam1 = ObjectTracker(max_disappeared=30, max_distance=150)
-            self.tracker_cam2 = ObjectTracker(max_disappeared=30, max_distance=150)
+            self.tracker_cam1 = ObjectTracker(max_disappeared=self.settings[1].max_disappeared,
+                                              max_distance=self.settings[1].max_distance)
+            self.tracker_cam2 = ObjectTracker(max_disappeared=self.settings[2].max_disappeared,
+                                              max_distance=self.settings[2].max_distance)
             
             # Video'ları aç
             cap1 = cv2.VideoCapture(str(self.camera1_path))
@@ -374,10 +426,27 @@ class MultiCameraTracker:
             self.logger.info(f"📊 Camera 1: {width1}x{height1}, {fps1} FPS")
             self.logger.info(f"📊 Camera 2: {width2}x{height2}, {fps2} FPS")
             
-            # Output video writer
-            output_video_path = os.path.join(self.output_dir, "multi_camera_result.mp4")
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(output_video_path, fourcc, min(fps1, fps2), (combined_width, combined_height))
+            # Output video writer (analitik modda açılmaz)
+            out = None
+            if self.render_video:
+                output_video_path = os.path.join(self.output_dir, "multi_camera_result.mp4")
+                fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+                out = cv2.VideoWriter(output_video_path, fourcc, min(fps1, fps2), (combined_width, combined_height))
+            
+            # Kamera başına tespit logu (her iki modda yazılır; sonradan render için)
+            log_stem = os.path.splitext(Output.DETECTION_LOG_NAME)[0]
+            detection_logs = {}
+            for camera_id, video_path, fps, size, pool_area in (
+                (1, self.camera1_path, fps1, (width1, height1), self.pool_area_cam1),
+                (2, self.camera2_path, fps2, (width2, height2), self.pool_area_cam2),
+            ):
+                if isinstance(pool_area, dict):
+                    pool_area = pool_area.get('polygon_points')
+                detection_logs[camera_id] = DetectionLogWriter(
+                    os.path.join(self.output_dir, f"{log_stem}_cam{camera_id}.jsonl"),
+                    video_path, fps, size, pipeline="multi_camera", model=self.model_path,
+                    pool_polygon=pool_area, camera=f"CAMERA {camera_id}"
+                )
             
             # CSV dosyası için başlık
             csv_path = os.path.join(self.output_dir, "multi_camera_coordinates.csv")
@@ -398,8 +467,9 @@ class MultiCameraTracker:
                 
                 while True:
                     # Her iki kameradan frame oku
-                    ret1, frame1 = cap1.read()
-                    ret2, frame2 = cap2.read()
+                    with self.timers.stage('decode'):
+                        ret1, frame1 = cap1.read()
+                        ret2, frame2 = cap2.read()
                     
                     if not ret1 or not ret2:
                         self.logger.info("📹 Video sonuna ulaşıldı")
@@ -412,6 +482,10 @@ class MultiCameraTracker:
                     
                     frame_timestamp = self.frame_count / min(fps1, fps2)
                     
+                    # Bekleyen ayar değişikliklerini kareler arasında uygula (iki kamera aynı anda)
+                    if self.runtime.poll(self.frame_count):
+                        self._apply_runtime_settings()
+                    
                     # Her iki kameradan detection yap
                     annotated_frame1, detections1, tracks1 = self.detect_objects_single_camera(
                         frame1, self.frame_count, frame_timestamp, 1, self.tracker_cam1
@@ -421,31 +495,46 @@ class MultiCameraTracker:
                         frame2, self.frame_count, frame_timestamp, 2, self.tracker_cam2
                     )
                     
-                    # Frame'leri yan yana birleştir
-                    # Frame2'yi Camera 1 boyutuna scale et
-                    if height2 != height1:
-                        frame2_resized = cv2.resize(annotated_frame2, (width2, height1))
-                    else:
-                        frame2_resized = annotated_frame2
-                    
-                    combined_frame = np.hstack((annotated_frame1, frame2_resized))
-                    
-                    # Divider line çiz
-                    cv2.line(combined_frame, (width1, 0), (width1, height1), (255, 255, 255), 3)
-                    
-                    # Frame info overlay
-                    info_text = f"Frame: {self.frame_count} | Cam1: {len(detections1)} | Cam2: {len(detections2)} | Time: {frame_timestamp:.1f}s"
-                    cv2.putText(combined_frame, info_text,
-                              (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                    if self.render_video:
+                        with self.timers.stage('draw'):
+                            # Frame'leri yan yana birleştir
+                            # Frame2'yi Camera 1 boyutuna scale et
+                            if height2 != height1:
+                                frame2_resized = cv2.resize(annotated_frame2, (width2, height1))
+                            else:
+                                frame2_resized = annotated_frame2
+                        
+                            combined_frame = np.hstack((annotated_frame1, frame2_resized))
+                        
+                            # Divider line çiz
+                            cv2.line(combined_frame, (width1, 0), (width1, height1), (255, 255, 255), 3)
+                        
+                            # Frame info overlay
+                            info_text = f"Frame: {self.frame_count} | Cam1: {len(detections1)} | Cam2: {len(detections2)} | Time: {frame_timestamp:.1f}s"
+                            cv2.putText(combined_frame, info_text,
+                                      (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                        
+                            # Camera labels
+                            cv2.putText(combined_frame, "CAMERA 1",
+                                      (10, height1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 100, 100), 2)
+                            cv2.putText(combined_frame, "CAMERA 2",
+                                      (width1+10, height1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (100, 100, 255), 2)
                     
-                    # Camera labels
-                    cv2.putText(combined_frame, "CAMERA 1",
-                              (10, height1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 100, 100), 2)
-                    cv2.putText(combined_frame, "CAMERA 2",
-                              (width1+10, height1-10), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (100, 100, 255), 2)
+                        # Video'ya yaz
+                        with self.timers.stage('encode'):
+                            out.write(combined_frame)
                     
-                    # Video'ya yaz
-                    out.write(combined_frame)
+                    # Tespit loglarına yaz
+                    for camera_id, camera_detections in ((1, detections1), (2, detections2)):
+                        detection_logs[camera_id].write_frame(self.frame_count, frame_timestamp, [
+                            detection_record(
+                                (d['bbox']['x1'], d['bbox']['y1'], d['bbox']['x2'], d['bbox']['y2']),
+                                d['confidence'], d['classified_class'], d['local_track_id'],
+                                in_pool=d['classified_class'] == "person_swimming",
+                                stable=d['track_stable']
+                            )
+                            for d in camera_detections
+                        ])
                     
                     # CSV'ye her iki kameranın detection'larını yaz
                     for detection in detections1 + detections2:
@@ -474,6 +563,7 @@ class MultiCameraTracker:
                     # Detection data'yı kaydet
                     self.camera1_data.extend(detections1)
                     self.camera2_data.extend(detections2)
+                    self.timers.end_frame()
                     
                     # Progress log (her 50 frame'de bir)
                     if self.frame_count % 50 == 0 and self.frame_count > 0:
@@ -485,7 +575,11 @@ class MultiCameraTracker:
             # Cleanup
             cap1.release()
             cap2.release()
-            out.release()
+            if out is not None:
+                out.release()
+            for detection_log in detection_logs.values():
+                detection_log.close()
+            self.runtime.close()
             
             # İşlem süresi
             self.total_time = time.time() - start_time
@@ -526,7 +620,8 @@ class MultiCameraTracker:
                 'camera2_video': self.camera2_path.name,
                 'model_used': self.model_path,
                 'test_timestamp': self.timestamp,
-                'total_processing_time': round(self.total_time, 2)
+                'total_processing_time': round(self.total_time, 2),
+                'render_video': self.render_video
             },
             'frame_stats': {
                 'total_frames': self.frame_count,
@@ -564,7 +659,8 @@ class MultiCameraTracker:
                 'total_poolside': len(cam1_poolside) + len(cam2_poolside),
                 'overall_swimming_ratio': round((len(cam1_swimming) + len(cam2_swimming)) / (len(cam1_detections) + len(cam2_detections)) * 100, 2) if (cam1_detections or cam2_detections) else 0,
                 'total_tracks': cam1_stats['total_created'] + cam2_stats['total_created']
-            }
+            },
+            'stage_timings': self.timers.summary()
         }
         
         # JSON olarak kaydet
@@ -572,6 +668,10 @@ class MultiCameraTracker:
         with open(metrics_path, 'w', encoding='utf-8') as f:
             json.dump(metrics, f, indent=2, ensure_ascii=False)
         
+        # Prometheus textfile (opsiyonel)
+        if Profiling.PROMETHEUS_FILE:
+            self.timers.write_prometheus(Profiling.PROMETHEUS_FILE)
+        
         # Log'a yazdır
         self.logger.info("📊 MULTI-CAMERA PERFORMANCE METRICS")
         self.logger.info(f"⏱️  Total Time: {metrics['test_info']['total_processing_time']}s")
@@ -589,6 +689,9 @@ class MultiCameraTracker:
         self.logger.info(f"🎯 Total Detections: {metrics['combined_metrics']['total_combined_detections']}")
         self.logger.info(f"🏊 Total Swimming: {metrics['combined_metrics']['total_swimming']} ({metrics['combined_metrics']['overall_swimming_ratio']}%)")
         self.logger.info(f"🆔 Total Tracks: {metrics['combined_metrics']['total_tracks']}")
+        self.logger.info("⏱️ STAGE TIMINGS")
+        for line in self.timers.format_lines():
+            self.logger.info(line)
         
         return metrics
 
@@ -630,7 +733,9 @@ def main():
         
         print(f"\n📂 Output Klasörü: {tracker.output_dir}")
         print("📁 Oluşturulan dosyalar:")
-        print("   📹 multi_camera_result.mp4")
+        if tracker.render_video:
+            print("   📹 multi_camera_result.mp4")
+        print(f"   🧾 {os.path.splitext(Output.DETECTION_LOG_NAME)[0]}_cam1/2.jsonl")
         print("   📊 multi_camera_coordinates.csv") 
         print("   📝 multi_camera_log.txt")
         print("   📈 multi_camera_metrics.json")
@@ -10,13 +10,14 @@ import cv2
 import os
 import sys
 import time
-import json
 import numpy as np
 from datetime import datetime
 
 # Ana dizini path'e ekle
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from core.config import Paths, Detection, System, get_project_info
+from core.config import Paths, Detection, System, Profiling, get_project_info
+from core.instrumentation import StageTimers
+from pool_module.pool_registry import get_registry
 
 class MultiVideoPoolTester:
     """
@@ -29,45 +30,23 @@ class MultiVideoPoolTester:
         print(f"📊 {len(self.info['videos'])} video, {len(self.info['models'])} model bulundu")
     
     def find_pool_area_for_video(self, video_name):
-        """Video için en son havuz alanı dosyasını bul"""
-        if not os.path.exists(Paths.OUTPUT_DIR):
-            return None
-        
-        # Video adından dosya adı formatını oluştur
-        video_base = os.path.splitext(video_name)[0].replace(" ", "_")
-        
-        # Eşleşen dosyaları bul
-        pool_files = []
-        for file in os.listdir(Paths.OUTPUT_DIR):
-            if file.startswith("pool_area_") and file.endswith(".json"):
-                if video_base.upper() in file.upper():
-                    pool_files.append(file)
-        
-        if not pool_files:
+        """Video için en son havuz alanı dosyasını bul (registry, O(1))"""
+        pool_area = get_registry(Paths.OUTPUT_DIR).find(video_name)
+        if pool_area is None:
             print(f"❌ {video_name} için havuz alanı bulunamadı!")
             return None
-        
-        # En son olanı seç
-        pool_files.sort(reverse=True)
-        latest_pool_file = pool_files[0]
-        
-        return os.path.join(Paths.OUTPUT_DIR, latest_pool_file)
+        return pool_area.path
     
     def load_pool_area(self, pool_file_path):
-        """Havuz alanını JSON dosyasından yükle"""
-        try:
-            with open(pool_file_path, 'r', encoding='utf-8') as f:
-                pool_data = json.load(f)
-            
-            polygon = np.array(pool_data['polygon_points'], dtype=np.int32)
-            print(f"✅ Havuz alanı yüklendi: {os.path.basename(pool_file_path)}")
-            print(f"🔢 Nokta sayısı: {len(polygon)}")
-            
-            return polygon
-            
-        except Exception as e:
-            print(f"❌ Havuz alanı yüklenemedi: {e}")
+        """Havuz alanını yükle (registry'de derlenmişse JSON tekrar okunmaz)"""
+        pool_area = get_registry(os.path.dirname(pool_file_path)).load(pool_file_path)
+        if pool_area is None:
             return None
+        
+        print(f"✅ Havuz alanı yüklendi: {pool_area.file_name}")
+        print(f"🔢 Nokta sayısı: {len(pool_area.polygon)}")
+        
+        return pool_area.polygon
     
     def is_point_in_pool(self, polygon, x, y):
         """Nokta havuz içinde mi kontrol et"""
@@ -154,12 +133,14 @@ class MultiVideoPoolTester:
         pool_inside_count = 0
         pool_outside_count = 0
         processing_times = []
+        timers = StageTimers(enabled=Profiling.ENABLED, pipeline="multi_video_pool_tester")
         
         print(f"🔄 5 dakikalık işleme başlıyor... (Ctrl+C ile durdurun)")
         
         try:
             while True:
-                ret, frame = cap.read()
+                with timers.stage('decode'):
+                    ret, frame = cap.read()
                 if not ret:
                     print("📹 Video sonu")
                     break
@@ -167,16 +148,19 @@ class MultiVideoPoolTester:
                 frame_count += 1
                 frame_start = time.time()
                 
-                # Havuz alanını çiz (yarı saydam)
-                overlay = frame.copy()
-                cv2.fillPoly(overlay, [pool_polygon], (0, 255, 255))  # Sarı
-                cv2.addWeighted(overlay, 0.2, frame, 0.8, 0, frame)
+                with timers.stage('draw'):
+                    # Havuz alanını çiz (yarı saydam)
+                    overlay = frame.copy()
+                    cv2.fillPoly(overlay, [pool_polygon], (0, 255, 255))  # Sarı
+                    cv2.addWeighted(overlay, 0.2, frame, 0.8, 0, frame)
                 
-                # Havuz sınırını çiz
-                cv2.polylines(frame, [pool_polygon], True, (0, 255, 255), 3)
+                    # Havuz sınırını çiz
+                    cv2.polylines(frame, [pool_polygon], True, (0, 255, 255), 3)
                 
                 # Kişi tespiti
-                results = model(frame, conf=Detection.CONFIDENCE_THRESHOLD, verbose=False)
+                with timers.stage('detect'):
+                    results = model(frame, conf=Detection.CONFIDENCE_THRESHOLD, verbose=False)
+                timers.record_yolo_speed(results)
                 
                 # Bu karedeki sayaçlar
                 frame_detections = 0
@@ -204,7 +188,8 @@ class MultiVideoPoolTester:
                                     center_y = (y1 + y2) // 2
                                     
                                     # Havuz içinde mi?
-                                    is_in_pool = self.is_point_in_pool(pool_polygon, center_x, center_y)
+                                    with timers.stage('zone_test'):
+                                        is_in_pool = self.is_point_in_pool(pool_polygon, center_x, center_y)
                                     
                                     if is_in_pool:
                                         frame_inside += 1
@@ -217,14 +202,15 @@ class MultiVideoPoolTester:
                                         color = (0, 0, 255)
                                         label = f"HAVUZ DISI: {conf:.2f}"
                                     
-                                    # Kutuyu çiz
-                                    cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-                                    cv2.putText(frame, label, 
-                                              (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 
-                                              0.5, color, 2)
+                                    with timers.stage('draw'):
+                                        # Kutuyu çiz
+                                        cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+                                        cv2.putText(frame, label, 
+                                                  (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 
+                                                  0.5, color, 2)
                                     
-                                    # Merkez noktayı işaretle
-                                    cv2.circle(frame, (center_x, center_y), 4, color, -1)
+                                        # Merkez noktayı işaretle
+                                        cv2.circle(frame, (center_x, center_y), 4, color, -1)
                 
                 # Sayaçları güncelle
                 total_detections += frame_detections
@@ -233,35 +219,38 @@ class MultiVideoPoolTester:
                 
                 # İlerleme bilgisi ekle
                 elapsed = time.time() - start_time
-                progress_percent = (elapsed / max_duration) * 100
+                with timers.stage('draw'):
+                    progress_percent = (elapsed / max_duration) * 100
                 
-                info_text1 = f"Kare: {frame_count} | {progress_percent:.1f}% | {frame_detections} tespit"
-                info_text2 = f"Bu kare - Ici: {frame_inside} | Disi: {frame_outside}"
-                info_text3 = f"TOPLAM - Ici: {pool_inside_count} | Disi: {pool_outside_count}"
+                    info_text1 = f"Kare: {frame_count} | {progress_percent:.1f}% | {frame_detections} tespit"
+                    info_text2 = f"Bu kare - Ici: {frame_inside} | Disi: {frame_outside}"
+                    info_text3 = f"TOPLAM - Ici: {pool_inside_count} | Disi: {pool_outside_count}"
                 
-                cv2.putText(frame, info_text1, (10, 30), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                cv2.putText(frame, info_text2, (10, 55), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                cv2.putText(frame, info_text3, (10, 80), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                    cv2.putText(frame, info_text1, (10, 30), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                    cv2.putText(frame, info_text2, (10, 55), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                    cv2.putText(frame, info_text3, (10, 80), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
                 
-                # Süre ve FPS
-                time_text = f"Süre: {elapsed:.0f}s/{max_duration}s"
-                fps_text = f"FPS: {frame_count/elapsed:.1f}"
-                cv2.putText(frame, time_text, (10, 105), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-                cv2.putText(frame, fps_text, (10, 130), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                    # Süre ve FPS
+                    time_text = f"Süre: {elapsed:.0f}s/{max_duration}s"
+                    fps_text = f"FPS: {frame_count/elapsed:.1f}"
+                    cv2.putText(frame, time_text, (10, 105), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+                    cv2.putText(frame, fps_text, (10, 130), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
                 
-                # Video ve model adı
-                cv2.putText(frame, video_name, (10, height-50), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-                cv2.putText(frame, model_name, (10, height-25), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+                    # Video ve model adı
+                    cv2.putText(frame, video_name, (10, height-50), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+                    cv2.putText(frame, model_name, (10, height-25), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
                 
                 # Video'ya yaz
-                out.write(frame)
+                with timers.stage('encode'):
+                    out.write(frame)
+                timers.end_frame()
                 
                 # Performans takibi
                 frame_time = time.time() - frame_start
@@ -308,6 +297,14 @@ class MultiVideoPoolTester:
             f.write(f"🚶 Havuz Dışı: {pool_outside_count} (%{100-pool_inside_percent:.1f})\n")
             f.write(f"⚡ Ortalama İşleme Süresi: {avg_processing_time:.3f}s/kare\n")
             f.write(f"💾 Çıktı Video: 5min_pool_result.mp4\n")
+            
+            f.write(f"\n⏱️  AŞAMA SÜRELERİ (kare başına):\n")
+            for line in timers.format_lines():
+                f.write(f"   {line}\n")
+        
+        # Aşama süreleri JSON (+ opsiyonel Prometheus)
+        timers.save(os.path.join(output_folder, "stage_timings.json"), Profiling.PROMETHEUS_FILE,
+                    {'model': model_name, 'video': video_name})
         
         print(f"\n📊 5 DAKİKA TEST SONUÇLARI:")
         print(f"   🎬 İşlenen kare: {frame_count}")
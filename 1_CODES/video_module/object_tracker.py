@@ -9,23 +9,37 @@
 - Object lifecycle management
 - Multi-person tracking
 - Lost object recovery
+- Appearance re-identification (HSV histogram galerisi)
 
 📅 Date: 31 Temmuz 2025
 """
 
+import os
+import sys
+import cv2
 import numpy as np
 import math
 from collections import OrderedDict
-from scipy.spatial import distance as dist
+
+# Ana dizini path'e ekle
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from video_module.spatial_hash import candidate_pairs, greedy_assign
+from video_module.appearance import AppearanceGallery
+from video_module.overlay_renderer import draw_faded_polyline
 
 class ObjectTracker:
-    def __init__(self, max_disappeared=30, max_distance=100):
+    def __init__(self, max_disappeared=30, max_distance=100, appearance_weight=0.5,
+                 reid_distance=0.25, reid_travel_factor=3.0):
         """
         🎯 Object Tracker Initialization
         
         Args:
             max_disappeared (int): Maksimum kayıp frame sayısı
             max_distance (float): Maksimum eşleştirme mesafesi
+            appearance_weight (float): Eşleştirme maliyetinde görünüm mesafesinin ağırlığı
+                (detection'larda 'appearance' varsa; maliyet = mesafe / max_distance + ağırlık * görünüm)
+            reid_distance (float): Kayıp track'e geri bağlamak için en büyük görünüm mesafesi
+            reid_travel_factor (float): Geri bağlamada son konumdan en fazla max_distance katı uzaklık
         """
         # Track ID counter
         self.next_object_id = 1
@@ -37,16 +51,25 @@ class ObjectTracker:
         # Parameters
         self.max_disappeared = max_disappeared
         self.max_distance = max_distance
+        self.appearance_weight = appearance_weight
+        self.reid_distance = reid_distance
+        self.reid_travel_factor = reid_travel_factor
+        
+        # Görünüm galerisi (silinen track'ler sınırlı süre / sayıda saklanır)
+        self.gallery = AppearanceGallery()
+        self.frame_index = 0
         
         # Statistics
         self.total_objects_created = 0
         self.total_objects_lost = 0
+        self.total_low_confidence_matches = 0
+        self.total_reidentified = 0
         
         print(f"🎯 Object Tracker başlatıldı")
         print(f"   📊 Max disappeared: {max_disappeared} frame")
         print(f"   📏 Max distance: {max_distance} pixel")
 
-    def register_object(self, centroid, bbox, confidence, class_name):
+    def register_object(self, centroid, bbox, confidence, class_name, object_id=None):
         """
         👤 Yeni obje kaydet
         
@@ -55,11 +78,14 @@ class ObjectTracker:
             bbox (dict): Bounding box koordinatları
             confidence (float): Güven skoru
             class_name (str): Sınıf adı
+            object_id (int): Görünümle geri bağlanan kayıp track'in ID'si (None: yeni ID)
         
         Returns:
             int: Atanan track ID
         """
-        object_id = self.next_object_id
+        revived = object_id is not None
+        if not revived:
+            object_id = self.next_object_id
         
         self.objects[object_id] = {
             'centroid': centroid,
@@ -76,14 +102,16 @@ class ObjectTracker:
         }
         
         self.disappeared[object_id] = 0
-        self.next_object_id += 1
-        self.total_objects_created += 1
+        if not revived:
+            self.next_object_id += 1
+            self.total_objects_created += 1
         
         return object_id
 
     def deregister_object(self, object_id):
-        """🗑️ Objeyi sistemden çıkar"""
+        """🗑️ Objeyi sistemden çıkar (görünümü kayıp galerisinde kalır)"""
         if object_id in self.objects:
+            self.gallery.mark_lost(object_id, self.frame_index, self.objects[object_id]['centroid'])
             del self.objects[object_id]
             del self.disappeared[object_id]
             self.total_objects_lost += 1
@@ -160,20 +188,29 @@ class ObjectTracker:
         
         return (int(predicted_x), int(predicted_y))
 
-    def update(self, detections):
+    def update(self, detections, low_confidence_detections=None):
         """
-        🔄 Ana tracking fonksiyonu
+        🔄 Ana tracking fonksiyonu (ByteTrack tarzı iki aşamalı eşleştirme)
+        
+        1. Mevcut objeler yüksek confidence'lı detection'larla eşleştirilir
+        2. Eşleşmeyen objeler düşük confidence'lı detection'larla eşleştirilir;
+           bunlar sadece mevcut track'leri uzatır, yeni obje oluşturmaz
+           (yarı batık yüzücüler ikinci bir inference olmadan takipte kalır)
         
         Args:
-            detections (list): Detection listesi
+            detections (list): Detection listesi (yüksek confidence)
+            low_confidence_detections (list): Sadece mevcut track'leri uzatabilen
+                düşük confidence'lı detection'lar (opsiyonel)
             
         Returns:
             dict: object_id -> detection mapping
         """
         result = {}
+        low_confidence_detections = low_confidence_detections or []
+        self.frame_index += 1
         
         # Eğer detection yoksa, sadece disappeared counter'ı artır
-        if len(detections) == 0:
+        if len(detections) == 0 and len(low_confidence_detections) == 0:
             for object_id in list(self.disappeared.keys()):
                 self.disappeared[object_id] += 1
                 
@@ -183,17 +220,9 @@ class ObjectTracker:
             
             return result
         
-        # İlk detection'larsa, hepsini register et
+        # İlk detection'larsa, hepsini register et (düşük confidence'lılar track başlatmaz)
         if len(self.objects) == 0:
-            for detection in detections:
-                centroid = (detection['center']['x'], detection['center']['y'])
-                bbox = detection['bbox']
-                confidence = detection['confidence']
-                class_name = detection['classified_class']
-                
-                object_id = self.register_object(centroid, bbox, confidence, class_name)
-                result[object_id] = detection
-            
+            self._register_detections(detections, range(len(detections)), result)
             return result
         
         # Mevcut objeler ve yeni detection'lar arasında eşleştirme yap
@@ -208,79 +237,118 @@ class ObjectTracker:
             else:
                 object_centroids.append(self.objects[object_id]['centroid'])
         
-        # Detection centroid'leri
-        detection_centroids = []
-        for detection in detections:
-            detection_centroids.append((detection['center']['x'], detection['center']['y']))
+        # 1. aşama: tüm objeler <-> yüksek confidence
+        used_object_indices = set()
+        used_detection_indices = self._match(
+            object_ids, object_centroids, range(len(object_ids)), detections, used_object_indices, result
+        )
+        
+        # 2. aşama: eşleşmeyen objeler <-> düşük confidence
+        if low_confidence_detections:
+            remaining = [i for i in range(len(object_ids)) if i not in used_object_indices]
+            if remaining:
+                matched = len(result)
+                self._match(object_ids, object_centroids, remaining, low_confidence_detections,
+                            used_object_indices, result)
+                self.total_low_confidence_matches += len(result) - matched
+        
+        # Eşleşmeyen (yüksek confidence'lı) detection'ları kaydet (önce kayıp track'lere geri bağla)
+        unmatched = [j for j in range(len(detections)) if j not in used_detection_indices]
+        self._register_detections(detections, unmatched, result)
+        
+        # Eşleşmeyen objelerin disappeared counter'ını artır
+        for i in range(len(object_ids)):
+            if i not in used_object_indices:
+                object_id = object_ids[i]
+                self.disappeared[object_id] += 1
+                
+                # Çok uzun kayıpsa sil
+                if self.disappeared[object_id] > self.max_disappeared:
+                    self.deregister_object(object_id)
+        
+        return result
+
+    def _match(self, object_ids, object_centroids, object_indices, detections, used_object_indices, result):
+        """
+        🔗 Seçili objeleri detection'larla eşleştir ve güncelle
         
-        # Mesafe matrisi hesapla
-        if len(object_centroids) > 0 and len(detection_centroids) > 0:
-            D = dist.cdist(np.array(object_centroids), np.array(detection_centroids))
-            
-            # Hungarian algorithm yerine basit min assignment
-            used_detection_indices = set()
-            used_object_indices = set()
+        Seyrek aday çiftleri (spatial hash, hücre = max_distance) + açgözlü eşleştirme
+        
+        Returns:
+            set: Kullanılan detection indeksleri
+        """
+        used_detection_indices = set()
+        if len(detections) == 0:
+            return used_detection_indices
+        
+        object_indices = list(object_indices)
+        detection_centroids = [(detection['center']['x'], detection['center']['y']) for detection in detections]
+        rows, cols, distances = candidate_pairs(
+            [object_centroids[i] for i in object_indices], detection_centroids, self.max_distance
+        )
+        
+        # Görünüm varsa maliyete ekle (mesafe kapısı aynı kalır)
+        costs = distances
+        descriptors = self._descriptors(detections)
+        if descriptors is not None and self.appearance_weight > 0 and len(rows):
+            appearance = self.gallery.distances([object_ids[i] for i in object_indices], descriptors)
+            costs = distances / self.max_distance + self.appearance_weight * appearance[rows, cols]
+        
+        # En düşük maliyetli eşleştirmelerden başlayarak güncelle
+        for row, detection_idx in greedy_assign(rows, cols, costs):
+            object_idx = object_indices[row]
+            object_id = object_ids[object_idx]
+            detection = detections[detection_idx]
             
-            # En yakın eşleştirmeleri bul
-            for _ in range(min(len(object_ids), len(detections))):
-                min_distance = float('inf')
-                min_object_idx = -1
-                min_detection_idx = -1
-                
-                for i in range(len(object_ids)):
-                    if i in used_object_indices:
-                        continue
-                    
-                    for j in range(len(detections)):
-                        if j in used_detection_indices:
-                            continue
-                        
-                        if D[i, j] < min_distance and D[i, j] < self.max_distance:
-                            min_distance = D[i, j]
-                            min_object_idx = i
-                            min_detection_idx = j
-                
-                # Eşleştirme bulunduysa güncelle
-                if min_object_idx != -1 and min_detection_idx != -1:
-                    object_id = object_ids[min_object_idx]
-                    detection = detections[min_detection_idx]
-                    
-                    centroid = (detection['center']['x'], detection['center']['y'])
-                    bbox = detection['bbox']
-                    confidence = detection['confidence']
-                    class_name = detection['classified_class']
-                    
-                    self.update_object(object_id, centroid, bbox, confidence, class_name)
-                    result[object_id] = detection
-                    
-                    used_object_indices.add(min_object_idx)
-                    used_detection_indices.add(min_detection_idx)
-                else:
-                    break
+            centroid = (detection['center']['x'], detection['center']['y'])
+            bbox = detection['bbox']
+            confidence = detection['confidence']
+            class_name = detection['classified_class']
             
-            # Eşleşmeyen detection'ları yeni obje olarak kaydet
-            for j in range(len(detections)):
-                if j not in used_detection_indices:
-                    detection = detections[j]
-                    centroid = (detection['center']['x'], detection['center']['y'])
-                    bbox = detection['bbox']
-                    confidence = detection['confidence']
-                    class_name = detection['classified_class']
-                    
-                    object_id = self.register_object(centroid, bbox, confidence, class_name)
-                    result[object_id] = detection
+            self.update_object(object_id, centroid, bbox, confidence, class_name)
+            self.gallery.add(object_id, detection.get('appearance'))
+            result[object_id] = detection
             
-            # Eşleşmeyen objelerin disappeared counter'ını artır
-            for i in range(len(object_ids)):
-                if i not in used_object_indices:
-                    object_id = object_ids[i]
-                    self.disappeared[object_id] += 1
-                    
-                    # Çok uzun kayıpsa sil
-                    if self.disappeared[object_id] > self.max_disappeared:
-                        self.deregister_object(object_id)
+            used_object_indices.add(object_idx)
+            used_detection_indices.add(detection_idx)
         
-        return result
+        return used_detection_indices
+
+    def _register_detections(self, detections, indices, result):
+        """
+        👤 Eşleşmeyen detection'ları kaydet
+        
+        Görünümü kayıp bir track'e yeterince benzeyen (ve makul uzaklıkta olan)
+        detection eski ID'yi alır; diğerleri yeni ID ile kaydedilir.
+        """
+        indices = list(indices)
+        revived = {}
+        descriptors = self._descriptors([detections[j] for j in indices])
+        if descriptors is not None:
+            positions = [(detections[j]['center']['x'], detections[j]['center']['y']) for j in indices]
+            for k, object_id in self.gallery.reidentify(
+                    descriptors, self.frame_index, positions, max_distance=self.reid_distance,
+                    max_travel=self.max_distance * self.reid_travel_factor):
+                revived[indices[k]] = object_id
+            self.total_reidentified += len(revived)
+        
+        for j in indices:
+            detection = detections[j]
+            centroid = (detection['center']['x'], detection['center']['y'])
+            bbox = detection['bbox']
+            confidence = detection['confidence']
+            class_name = detection['classified_class']
+            
+            object_id = self.register_object(centroid, bbox, confidence, class_name, revived.get(j))
+            self.gallery.add(object_id, detection.get('appearance'))
+            result[object_id] = detection
+
+    @staticmethod
+    def _descriptors(detections):
+        """Detection'ların görünüm vektörleri; biri bile eksikse None"""
+        if not detections or any(detection.get('appearance') is None for detection in detections):
+            return None
+        return np.stack([detection['appearance'] for detection in detections])
 
     def get_object_info(self, object_id):
         """
@@ -326,6 +394,8 @@ class ObjectTracker:
             'active_objects': len(self.objects),
             'total_created': self.total_objects_created,
             'total_lost': self.total_objects_lost,
+            'low_confidence_matches': self.total_low_confidence_matches,
+            'reidentified': self.total_reidentified,
             'next_id': self.next_object_id
         }
 
@@ -345,15 +415,9 @@ class ObjectTracker:
         trajectory = self.objects[object_id]['trajectory']
         
         if len(trajectory) > 1:
-            import cv2
-            
-            # Trajectory çizgilerini çiz
-            for i in range(1, len(trajectory)):
-                # Şeffaflık efekti için alpha blending
-                alpha = i / len(trajectory)
-                line_color = tuple(int(c * alpha) for c in color)
-                
-                cv2.line(frame, trajectory[i-1], trajectory[i], line_color, thickness)
+            # Trajectory çizgilerini çiz - solma efekti 4 kademede,
+            # segment başına cv2.line yerine kademe başına tek polylines
+            draw_faded_polyline(frame, list(trajectory), color, thickness, fade_steps=4)
             
             # Son pozisyonda büyük nokta
             cv2.circle(frame, trajectory[-1], 8, color, -1)
\ No newline at end of file
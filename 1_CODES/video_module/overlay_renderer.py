@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🎨 OVERLAY RENDERER - HIZLI ÇİZİM KATMANI
+=========================================
+Her karede değişmeyen çizimleri (havuz dolgusu, havuz sınırı, panel
+arka planları, sabit başlıklar/lejant) kamera başına bir kez hazırlar.
+
+- Statik katman ilk karede (veya boyut değişince) rasterize edilir,
+  önceden çarpılmış renk + ters alfa olarak uint16 tamsayı maskelere çevrilir
+- Kompozit işlem sadece statik öğelerin sınır kutularında (ROI), kare
+  üzerinde yerinde yapılır: `frame.copy()` + `cv2.addWeighted` yok
+- Dinamik öğeler (kutular, sayaçlar, yörüngeler) yardımcı metotlarla
+  doğrudan kareye çizilir
+- `enabled=False` iken tüm çizim çağrıları hiçbir iş yapmadan döner
+  (video çıktısı istenmediğinde kullanılır)
+"""
+
+import cv2
+import numpy as np
+
+
+class OverlayRenderer:
+    """
+    🖌️ Statik katman + dinamik çizim yardımcıları
+
+    Kullanım:
+        renderer = OverlayRenderer(enabled=save_video)
+        renderer.add_polygon(pool_polygon, fill_color=(0, 255, 255), fill_alpha=0.25,
+                             outline_color=(0, 255, 255), outline_thickness=4)
+        renderer.add_rectangle((5, 5), (width-5, 140), (0, 0, 0))
+        ...
+        renderer.composite(frame)          # statik katman (yerinde)
+        renderer.draw_box(frame, bbox, color, label="POOL 0.85")
+    """
+
+    def __init__(self, enabled=True):
+        """
+        Args:
+            enabled (bool): False ise hiçbir şey çizilmez
+        """
+        self.enabled = enabled
+        self._primitives = []
+        self._frame_shape = None
+        self._layers = []
+
+    # ------------------------------------------------------------------
+    # Statik katman tanımı
+    # ------------------------------------------------------------------
+
+    def add_polygon(self, polygon, fill_color=None, fill_alpha=1.0,
+                    outline_color=None, outline_thickness=2, outline_alpha=1.0):
+        """Poligon dolgusu ve/veya sınırı ekle"""
+        points = np.asarray(polygon, dtype=np.int32).reshape(-1, 1, 2)
+        if fill_color is not None:
+            self._add('fill_poly', fill_color, fill_alpha, points=points)
+        if outline_color is not None:
+            self._add('polylines', outline_color, outline_alpha,
+                      points=points, thickness=outline_thickness)
+
+    def add_rectangle(self, top_left, bottom_right, color, alpha=1.0, thickness=-1):
+        """Dikdörtgen ekle (thickness=-1 dolu panel arka planı)"""
+        self._add('rectangle', color, alpha, top_left=tuple(top_left),
+                  bottom_right=tuple(bottom_right), thickness=thickness)
+
+    def add_circle(self, center, radius, color, alpha=1.0, thickness=-1):
+        """Daire ekle"""
+        self._add('circle', color, alpha, center=tuple(center), radius=radius, thickness=thickness)
+
+    def add_text(self, text, org, color, font_scale=0.6, thickness=2, alpha=1.0):
+        """Sabit yazı ekle (başlık, lejant, model adı)"""
+        self._add('text', color, alpha, text=text, org=tuple(org),
+                  font_scale=font_scale, thickness=thickness)
+
+    def clear(self):
+        """Statik katmanı tamamen sil (ör. havuz alanı değişti)"""
+        self._primitives = []
+        self.invalidate()
+
+    def invalidate(self):
+        """Bir sonraki kompozitte statik katmanı yeniden rasterize et"""
+        self._frame_shape = None
+        self._layers = []
+
+    def _add(self, kind, color, alpha, **params):
+        self._primitives.append((kind, tuple(int(c) for c in color), float(alpha), params))
+        self.invalidate()
+
+    # ------------------------------------------------------------------
+    # Rasterize + kompozit
+    # ------------------------------------------------------------------
+
+    def _draw_mask(self, mask, kind, params):
+        """Tek öğeyi tek kanallı maskeye 255 ile çiz"""
+        if kind == 'fill_poly':
+            cv2.fillPoly(mask, [params['points']], 255)
+        elif kind == 'polylines':
+            cv2.polylines(mask, [params['points']], True, 255, params['thickness'])
+        elif kind == 'rectangle':
+            cv2.rectangle(mask, params['top_left'], params['bottom_right'], 255, params['thickness'])
+        elif kind == 'circle':
+            cv2.circle(mask, params['center'], params['radius'], 255, params['thickness'])
+        elif kind == 'text':
+            cv2.putText(mask, params['text'], params['org'], cv2.FONT_HERSHEY_SIMPLEX,
+                        params['font_scale'], 255, params['thickness'])
+
+    def _build(self, frame_shape):
+        """Statik öğeleri ROI bazlı önceden karıştırılmış maskelere çevir"""
+        height, width = frame_shape[:2]
+        premult = np.zeros((height, width, 3), dtype=np.float32)
+        coverage = np.zeros((height, width), dtype=np.float32)
+        rois = []
+
+        mask = np.zeros((height, width), dtype=np.uint8)
+        for kind, color, alpha, params in self._primitives:
+            mask[:] = 0
+            self._draw_mask(mask, kind, params)
+            bbox = cv2.boundingRect(mask)
+            if bbox[2] == 0 or bbox[3] == 0:
+                continue
+
+            x, y, w, h = bbox
+            a = mask[y:y+h, x:x+w].astype(np.float32) * (alpha / 255.0)
+            # "over" bileşimi: yeni öğe önceki statik öğelerin üstüne
+            keep = 1.0 - a
+            premult[y:y+h, x:x+w] *= keep[..., None]
+            premult[y:y+h, x:x+w] += a[..., None] * np.array(color, dtype=np.float32)
+            coverage[y:y+h, x:x+w] = a + coverage[y:y+h, x:x+w] * keep
+            rois.append([x, y, x + w, y + h])
+
+        self._layers = []
+        for x1, y1, x2, y2 in self._merge_rois(rois):
+            a = coverage[y1:y2, x1:x2]
+            inv = np.rint((1.0 - a) * 255).astype(np.uint16)
+            pm = np.rint(premult[y1:y2, x1:x2] * 255).astype(np.uint16)
+            # Toplam 255*255'i aşmasın (uint16 taşması olmasın)
+            np.minimum(pm, (255 * (255 - inv))[..., None], out=pm)
+            self._layers.append((y1, y2, x1, x2, inv[..., None], pm))
+
+        self._frame_shape = frame_shape
+
+    @staticmethod
+    def _merge_rois(rois):
+        """Kesişen ROI'leri birleştir (her piksel tek kez karıştırılsın)"""
+        merged = []
+        for roi in rois:
+            roi = list(roi)
+            changed = True
+            while changed:
+                changed = False
+                for other in merged:
+                    if roi[0] < other[2] and other[0] < roi[2] and roi[1] < other[3] and other[1] < roi[3]:
+                        roi = [min(roi[0], other[0]), min(roi[1], other[1]),
+                               max(roi[2], other[2]), max(roi[3], other[3])]
+                        merged.remove(other)
+                        changed = True
+                        break
+            merged.append(roi)
+        return merged
+
+    def composite(self, frame):
+        """
+        Statik katmanı kareye yerinde uygula
+
+        Args:
+            frame (np.ndarray): BGR kare (değiştirilir)
+
+        Returns:
+            np.ndarray: Aynı kare
+        """
+        if not self.enabled or not self._primitives:
+            return frame
+
+        if self._frame_shape != frame.shape:
+            self._build(frame.shape)
+
+        for y1, y2, x1, x2, inv, pm in self._layers:
+            roi = frame[y1:y2, x1:x2]
+            blended = roi.astype(np.uint16)
+            blended *= inv
+            blended += pm
+            # /255 tamsayı yaklaşımı: (x + 128 + ((x + 128) >> 8)) >> 8
+            blended += 128
+            blended += blended >> 8
+            blended >>= 8
+            roi[...] = blended
+
+        return frame
+
+    # ------------------------------------------------------------------
+    # Dinamik çizim yardımcıları
+    # ------------------------------------------------------------------
+
+    def draw_box(self, frame, bbox, color, thickness=2, label=None, label_scale=0.6,
+                 label_thickness=2, label_offset=10, center=None, center_radius=5):
+        """Tespit kutusu + opsiyonel etiket ve merkez noktası"""
+        if not self.enabled:
+            return
+        x1, y1, x2, y2 = bbox
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
+        if label:
+            cv2.putText(frame, label, (x1, y1 - label_offset),
+                        cv2.FONT_HERSHEY_SIMPLEX, label_scale, color, label_thickness)
+        if center is not None:
+            cv2.circle(frame, center, center_radius, color, -1)
+
+    def draw_text_lines(self, frame, lines, origin, line_height, color=(255, 255, 255),
+                        font_scale=0.6, thickness=2):
+        """
+        Alt alta yazı satırları çiz
+
+        Args:
+            lines (list): str veya (str, renk) elemanları
+        """
+        if not self.enabled:
+            return
+        x, y = origin
+        for i, line in enumerate(lines):
+            if isinstance(line, tuple):
+                text, line_color = line
+            else:
+                text, line_color = line, color
+            cv2.putText(frame, text, (x, y + i * line_height),
+                        cv2.FONT_HERSHEY_SIMPLEX, font_scale, line_color, thickness)
+
+    def draw_trajectory(self, frame, points, color, thickness=2, fade_steps=0):
+        """
+        Yörüngeyi tek polylines çağrısıyla çiz
+
+        Args:
+            points (list): (x, y) noktaları (eskiden yeniye)
+            fade_steps (int): >0 ise eski kısımlar bu kadar kademede soluklaşır
+        """
+        if not self.enabled or len(points) < 2:
+            return
+        draw_faded_polyline(frame, points, color, thickness, fade_steps)
+
+
+def draw_faded_polyline(frame, points, color, thickness=2, fade_steps=0):
+    """
+    Noktaları segment segment değil kademe başına tek polylines ile çiz
+
+    fade_steps=0 tek renk; aksi halde segmentler `fade_steps` parlaklık
+    grubuna ayrılır ve her grup tek çağrıda çizilir.
+    """
+    pts = np.asarray(points, dtype=np.int32).reshape(-1, 1, 2)
+    segment_count = len(pts) - 1
+    if segment_count < 1:
+        return
+
+    if fade_steps <= 0:
+        cv2.polylines(frame, [pts], False, color, thickness)
+        return
+
+    groups = {}
+    for i in range(1, segment_count + 1):
+        level = min(fade_steps, int(np.ceil(i / segment_count * fade_steps)))
+        groups.setdefault(level, []).append(pts[i-1:i+1])
+
+    for level, segments in groups.items():
+        alpha = level / fade_steps
+        level_color = tuple(int(c * alpha) for c in color)
+        cv2.polylines(frame, segments, False, level_color, thickness)
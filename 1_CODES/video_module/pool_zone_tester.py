@@ -16,7 +16,10 @@ from datetime import datetime
 
 # Ana dizini path'e ekle
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from core.config import Paths, Detection, System, get_project_info
+from core.config import Paths, Detection, System, Profiling, Output, get_project_info
+from core.instrumentation import StageTimers
+from output_manager.detection_log import DetectionLogWriter, detection_record
+from video_module.overlay_renderer import OverlayRenderer
 
 class PoolZoneTester:
     """
@@ -98,14 +101,19 @@ class PoolZoneTester:
         print(f"📁 Çıktı klasörü: {folder_name}")
         return output_path
     
-    def test_with_pool_zones(self, model_name, max_duration=120):
+    def test_with_pool_zones(self, model_name, max_duration=120, render_video=None):
         """
         Havuz alanı ile model testi
         
         Args:
             model_name: Model dosyası adı
             max_duration: Maksimum test süresi (saniye)
+            render_video: False ise çizim/encode yapılmaz, sadece log + rapor
+                (None ise Output.RENDER_VIDEO)
         """
+        if render_video is None:
+            render_video = Output.RENDER_VIDEO
+
         # Havuz alanını yükle
         if not self.load_pool_area():
             return False
@@ -169,10 +177,24 @@ class PoolZoneTester:
             cap.release()
             return False
         
-        # Çıktı video
-        output_video_path = os.path.join(output_folder, f"pool_zone_result.mp4")
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_video_path, fourcc, fps, (width, height))
+        # Çıktı video (analitik modda açılmaz)
+        out = None
+        if render_video:
+            output_video_path = os.path.join(output_folder, f"pool_zone_result.mp4")
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = cv2.VideoWriter(output_video_path, fourcc, fps, (width, height))
+        
+        # Tespit logu (her iki modda yazılır)
+        detection_log = DetectionLogWriter(
+            os.path.join(output_folder, Output.DETECTION_LOG_NAME), kamera2_video, fps, (width, height),
+            pipeline="pool_zone_tester", model=model_name, pool_polygon=self.pool_polygon.tolist()
+        )
+        
+        # Havuz dolgusu + sınırı (bir kez hazırlanır)
+        pool_layer = OverlayRenderer(enabled=render_video)
+        pool_layer.add_polygon(self.pool_polygon, fill_color=(0, 255, 255), fill_alpha=0.2,  # Sarı
+                               outline_color=(0, 255, 255), outline_thickness=3)
+        pool_layer.add_text(f"Model: {model_name}", (10, height-50), (0, 255, 255), font_scale=0.7)
         
         # Test log dosyası
         log_path = os.path.join(output_folder, "pool_zone_log.txt")
@@ -184,12 +206,14 @@ class PoolZoneTester:
         pool_inside_count = 0
         pool_outside_count = 0
         processing_times = []
+        timers = StageTimers(enabled=Profiling.ENABLED, pipeline="pool_zone_tester")
         
         print(f"🔄 İşleme başlıyor... (Ctrl+C ile durdurun)")
         
         try:
             while True:
-                ret, frame = cap.read()
+                with timers.stage('decode'):
+                    ret, frame = cap.read()
                 if not ret:
                     print("📹 Video sonu")
                     break
@@ -197,21 +221,21 @@ class PoolZoneTester:
                 frame_count += 1
                 frame_start = time.time()
                 
-                # Havuz alanını çiz (yarı saydam)
-                overlay = frame.copy()
-                cv2.fillPoly(overlay, [self.pool_polygon], (0, 255, 255))  # Sarı
-                cv2.addWeighted(overlay, 0.2, frame, 0.8, 0, frame)
-                
-                # Havuz sınırını çiz
-                cv2.polylines(frame, [self.pool_polygon], True, (0, 255, 255), 3)
-                
                 # Kişi tespiti
-                results = model(frame, conf=Detection.CONFIDENCE_THRESHOLD, verbose=False)
+                with timers.stage('detect'):
+                    results = model(frame, conf=Detection.CONFIDENCE_THRESHOLD, verbose=False)
+                timers.record_yolo_speed(results)
+                
+                # Havuz alanını çiz (yarı saydam, tespitten sonra)
+                if render_video:
+                    with timers.stage('draw'):
+                        pool_layer.composite(frame)
                 
                 # Bu karedeki sayaçlar
                 frame_detections = 0
                 frame_inside = 0
                 frame_outside = 0
+                frame_records = []
                 
                 # Tespitleri işle
                 for r in results:
@@ -234,7 +258,8 @@ class PoolZoneTester:
                                     center_y = (y1 + y2) // 2
                                     
                                     # Havuz içinde mi?
-                                    is_in_pool = self.is_point_in_pool(center_x, center_y)
+                                    with timers.stage('zone_test'):
+                                        is_in_pool = self.is_point_in_pool(center_x, center_y)
                                     
                                     if is_in_pool:
                                         frame_inside += 1
@@ -247,44 +272,40 @@ class PoolZoneTester:
                                         color = (0, 0, 255)
                                         label = f"HAVUZ DISI: {conf:.2f}"
                                     
-                                    # Kutuyu çiz
-                                    cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-                                    cv2.putText(frame, label, 
-                                              (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 
-                                              0.6, color, 2)
+                                    frame_records.append(detection_record(
+                                        (x1, y1, x2, y2), conf, "person", in_pool=is_in_pool))
                                     
-                                    # Merkez noktayı işaretle
-                                    cv2.circle(frame, (center_x, center_y), 5, color, -1)
+                                    if render_video:
+                                        with timers.stage('draw'):
+                                            # Kutuyu çiz + merkez noktayı işaretle
+                                            pool_layer.draw_box(frame, (x1, y1, x2, y2), color, 2, label=label,
+                                                                center=(center_x, center_y))
                 
                 # Sayaçları güncelle
                 total_detections += frame_detections
                 pool_inside_count += frame_inside
                 pool_outside_count += frame_outside
                 
+                # Tespit loguna yaz
+                detection_log.write_frame(frame_count - 1, (frame_count - 1) / fps, frame_records)
+                
                 # İlerleme bilgisi ekle
                 elapsed = time.time() - start_time
-                info_text1 = f"Kare: {frame_count} | Toplam: {frame_detections}"
-                info_text2 = f"Havuz Ici: {frame_inside} | Havuz Disi: {frame_outside}"
-                info_text3 = f"TOPLAM - Ici: {pool_inside_count} | Disi: {pool_outside_count}"
-                
-                cv2.putText(frame, info_text1, (10, 30), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                cv2.putText(frame, info_text2, (10, 60), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                cv2.putText(frame, info_text3, (10, 90), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                
-                # FPS
-                fps_text = f"FPS: {frame_count/elapsed:.1f}"
-                cv2.putText(frame, fps_text, (10, 120), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                
-                # Model adı
-                cv2.putText(frame, f"Model: {model_name}", (10, height-50), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-                
-                # Video'ya yaz
-                out.write(frame)
+                if render_video:
+                    with timers.stage('draw'):
+                        info_text1 = f"Kare: {frame_count} | Toplam: {frame_detections}"
+                        info_text2 = f"Havuz Ici: {frame_inside} | Havuz Disi: {frame_outside}"
+                        info_text3 = f"TOPLAM - Ici: {pool_inside_count} | Disi: {pool_outside_count}"
+                        
+                        # Sayaçlar + FPS (model adı statik katmanda)
+                        pool_layer.draw_text_lines(frame, [info_text1, info_text2, info_text3,
+                                                           f"FPS: {frame_count/elapsed:.1f}"],
+                                                   (10, 30), 30, font_scale=0.7)
+                    
+                    # Video'ya yaz
+                    with timers.stage('encode'):
+                        out.write(frame)
+                timers.end_frame()
                 
                 # Performans takibi
                 frame_time = time.time() - frame_start
@@ -306,7 +327,8 @@ class PoolZoneTester:
         
         finally:
             cap.release()
-            out.release()
+            if out is not None:
+                out.release()
         
         # Sonuçları hesapla ve kaydet
         elapsed_total = time.time() - start_time
@@ -329,7 +351,25 @@ class PoolZoneTester:
             f.write(f"🚶 Havuz Dışı: {pool_outside_count}\n")
             f.write(f"📈 Havuz İçi Oranı: {(pool_inside_count/total_detections*100):.1f}%\n")
             f.write(f"⚡ Ortalama İşleme Süresi: {avg_processing_time:.3f}s/kare\n")
-            f.write(f"💾 Çıktı Video: pool_zone_result.mp4\n")
+            f.write(f"💾 Çıktı Video: {'pool_zone_result.mp4' if render_video else 'Yok (sadece analitik)'}\n")
+            f.write(f"🧾 Tespit Logu: {Output.DETECTION_LOG_NAME}\n")
+            
+            f.write(f"\n⏱️  AŞAMA SÜRELERİ (kare başına):\n")
+            for line in timers.format_lines():
+                f.write(f"   {line}\n")
+        
+        # Aşama süreleri JSON (+ opsiyonel Prometheus)
+        timers.save(os.path.join(output_folder, "stage_timings.json"), Profiling.PROMETHEUS_FILE,
+                    {'model': model_name, 'video': video_name})
+        
+        # Tespit logunu özetle kapat
+        detection_log.close(summary={
+            'elapsed': round(elapsed_total, 2),
+            'avg_fps': round(avg_fps, 2),
+            'total_detections': total_detections,
+            'pool_inside': pool_inside_count,
+            'pool_outside': pool_outside_count,
+        })
         
         print(f"\n📊 HAVUZ ALANI TEST SONUÇLARI:")
         print(f"   🎬 İşlenen kare: {frame_count}")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🗂️ SEEK İNDEKSİ
+==============
+Videonun kare zaman damgalarını ve keyframe'lerini çıkarıp videonun yanına
+`<video>.seekindex.json` olarak önbelleğe alır (dosya boyutu + mtime ile
+doğrulanır). ffprobe varsa paket listesi okunur, yoksa OpenCV ile taranır.
+
+Tam kare seek (VideoProcessor) ve keyframe hizalı kare çıkarma
+(dataset_module.frame_extractor) bu indeksi kullanır.
+"""
+
+import os
+import time
+import json
+import shutil
+import bisect
+import subprocess
+
+import cv2
+
+SEEK_INDEX_VERSION = 1
+SEEK_INDEX_SUFFIX = ".seekindex.json"
+
+
+def _probe_frame_index(video_path):
+    """
+    ffprobe ile paket zaman damgalarını ve keyframe'leri oku
+
+    Returns:
+        tuple: (sıralı pts listesi, keyframe pts listesi) veya None
+    """
+    ffprobe = shutil.which('ffprobe')
+    if not ffprobe:
+        return None
+
+    try:
+        result = subprocess.run(
+            [ffprobe, '-v', 'error', '-select_streams', 'v:0',
+             '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', video_path],
+            capture_output=True, text=True, timeout=600)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+
+    pts, keyframes = [], []
+    for line in result.stdout.splitlines():
+        fields = line.strip().split(',')
+        if len(fields) < 2 or fields[0] in ('', 'N/A'):
+            continue
+        t = float(fields[0])
+        pts.append(t)
+        if 'K' in fields[1]:
+            keyframes.append(t)
+
+    if not pts:
+        return None
+    # Paketler decode sırasında gelir (B-frame), gösterim sırasına çevir
+    pts.sort()
+    return pts, keyframes
+
+
+def _scan_frame_index(video_path):
+    """
+    OpenCV ile tüm kareleri grab() edip zaman damgalarını topla (yavaş yedek yol)
+
+    Keyframe bilgisi alınamaz; seek sırasında hedefin biraz gerisine
+    zaman damgasıyla gidilip ileri sarılır.
+    """
+    cap = cv2.VideoCapture(video_path)
+    pts = []
+    while cap.grab():
+        pts.append(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+    cap.release()
+    return pts, []
+
+
+def load_seek_index(video_path, rebuild=False, allow_scan=True):
+    """
+    Videonun seek indeksini önbellekten yükle veya oluştur
+
+    Args:
+        video_path (str): Video dosyası
+        rebuild (bool): Önbelleği yok say
+        allow_scan (bool): ffprobe yoksa tüm videoyu OpenCV ile tara
+
+    Returns:
+        dict: {'source', 'pts': [...], 'keyframes': [kare no, ...]} (pts ilk kareye göre),
+            ffprobe yok ve allow_scan=False ise None
+    """
+    cache_path = video_path + SEEK_INDEX_SUFFIX
+    stat = os.stat(video_path)
+
+    if not rebuild and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if (index.get('version') == SEEK_INDEX_VERSION and index.get('size') == stat.st_size
+                    and index.get('mtime') == int(stat.st_mtime)):
+                return index
+        except (OSError, ValueError):
+            pass
+
+    started = time.time()
+    probed = _probe_frame_index(video_path)
+    source = 'ffprobe'
+    if probed is None:
+        if not allow_scan:
+            return None
+        source = 'opencv'
+        print("⚠️  ffprobe bulunamadı, seek indeksi OpenCV ile taranıyor (tek seferlik)...")
+        probed = _scan_frame_index(video_path)
+
+    pts, keyframe_pts = probed
+    origin = pts[0] if pts else 0.0
+    pts = [round(t - origin, 6) for t in pts]
+    keyframes = sorted({bisect.bisect_left(pts, round(t - origin, 6) - 1e-4) for t in keyframe_pts})
+
+    index = {
+        'version': SEEK_INDEX_VERSION,
+        'size': stat.st_size,
+        'mtime': int(stat.st_mtime),
+        'source': source,
+        'pts': pts,
+        'keyframes': keyframes,
+    }
+
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, separators=(',', ':'))
+    except OSError as e:
+        print(f"⚠️  Seek indeksi kaydedilemedi: {e}")
+
+    print(f"🗂️  Seek indeksi ({source}): {len(pts)} kare, {len(keyframes)} keyframe, "
+          f"{time.time() - started:.1f}s")
+    return index
@@ -14,7 +14,8 @@ from datetime import datetime
 
 # Ana dizini path'e ekle
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from core.config import Paths, Detection, System, get_project_info
+from core.config import Paths, Detection, System, Profiling, get_project_info
+from core.instrumentation import StageTimers
 
 class SingleModelTester:
     """
@@ -119,12 +120,14 @@ class SingleModelTester:
         frame_count = 0
         total_detections = 0
         processing_times = []
+        timers = StageTimers(enabled=Profiling.ENABLED, pipeline="single_model_tester")
         
         print(f"🔄 İşleme başlıyor... (Ctrl+C ile durdurun)")
         
         try:
             while True:
-                ret, frame = cap.read()
+                with timers.stage('decode'):
+                    ret, frame = cap.read()
                 if not ret:
                     print("📹 Video sonu")
                     break
@@ -133,7 +136,9 @@ class SingleModelTester:
                 frame_start = time.time()
                 
                 # Kişi tespiti
-                results = model(frame, conf=Detection.CONFIDENCE_THRESHOLD, verbose=False)
+                with timers.stage('detect'):
+                    results = model(frame, conf=Detection.CONFIDENCE_THRESHOLD, verbose=False)
+                timers.record_yolo_speed(results)
                 
                 # Tespitleri say ve çiz
                 detections = 0
@@ -153,31 +158,35 @@ class SingleModelTester:
                                 area = (x2 - x1) * (y2 - y1)
                                 if area > Detection.MIN_AREA:
                                     # Çiz
-                                    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                                    cv2.putText(frame, f"Person: {conf:.2f}", 
-                                              (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 
-                                              0.6, (0, 255, 0), 2)
+                                    with timers.stage('draw'):
+                                        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+                                        cv2.putText(frame, f"Person: {conf:.2f}", 
+                                                  (x1, y1-10), cv2.FONT_HERSHEY_SIMPLEX, 
+                                                  0.6, (0, 255, 0), 2)
                 
                 total_detections += detections
                 
                 # İlerleme bilgisi ekle
                 elapsed = time.time() - start_time
-                info_text = f"Kare: {frame_count} | Tespit: {detections} | " \
-                           f"Toplam: {total_detections} | Süre: {elapsed:.1f}s"
-                cv2.putText(frame, info_text, (10, 30), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                with timers.stage('draw'):
+                    info_text = f"Kare: {frame_count} | Tespit: {detections} | " \
+                               f"Toplam: {total_detections} | Süre: {elapsed:.1f}s"
+                    cv2.putText(frame, info_text, (10, 30), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
                 
-                # FPS
-                fps_text = f"FPS: {frame_count/elapsed:.1f}"
-                cv2.putText(frame, fps_text, (10, 70), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+                    # FPS
+                    fps_text = f"FPS: {frame_count/elapsed:.1f}"
+                    cv2.putText(frame, fps_text, (10, 70), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
                 
-                # Model adı
-                cv2.putText(frame, model_name, (10, height-50), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
+                    # Model adı
+                    cv2.putText(frame, model_name, (10, height-50), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
                 
                 # Video'ya yaz
-                out.write(frame)
+                with timers.stage('encode'):
+                    out.write(frame)
+                timers.end_frame()
                 
                 # Performans takibi
                 frame_time = time.time() - frame_start
@@ -221,6 +230,14 @@ class SingleModelTester:
             f.write(f"📈 Kare Başına Tespit: {avg_detections_per_frame:.2f}\n")
             f.write(f"⚡ Ortalama İşleme Süresi: {avg_processing_time:.3f}s/kare\n")
             f.write(f"💾 Çıktı Video: detection_result.mp4\n")
+            
+            f.write(f"\n⏱️  AŞAMA SÜRELERİ (kare başına):\n")
+            for line in timers.format_lines():
+                f.write(f"   {line}\n")
+        
+        # Aşama süreleri JSON (+ opsiyonel Prometheus)
+        timers.save(os.path.join(output_folder, "stage_timings.json"), Profiling.PROMETHEUS_FILE,
+                    {'model': model_name, 'video': video_name})
         
         print(f"\n📊 TEST SONUÇLARI:")
         print(f"   🎬 İşlenen kare: {frame_count}")
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+🗄️ TRACK YAŞAM DÖNGÜSÜ VE ARŞİVİ
+===============================
+Uzun çalışmalarda (10+ saat) tracker durumunun sınırsız büyümesini engeller:
+ölen track'ler sıcak yapılardan (tracker sözlükleri) çıkarılır, özetleri
+(ID, ilk / son kare, havuzda kalma, yol uzunluğu, sınıf histogramı) satır
+başına bir JSON kaydı olarak eklemeli arşiv dosyasına yazılır.
+
+- observe(): track güncellendikçe özet artımlı tutulur (O(1), geçmiş listesi yok)
+- evict(): tracker sözlüğünden ölü track'leri çıkarır ve arşivler; maliyet
+  sadece canlı track sayısıyla orantılı
+- hold_frames > 0 ise çıkarılan özetler re-ID penceresi boyunca bekletilir:
+  revive() ile geri gelen track aynı özete devam eder (arşivde tek kayıt,
+  ilk kare ve yol uzunluğu korunur), pencere dolunca arşive yazılır
+- close(): bekleyenleri ve kalan track'leri 'end' nedeniyle arşivler
+
+Kayıt formatı (track_archive.jsonl):
+    {"type": "header", "pipeline": ..., "camera": ..., "created": ...}
+    {"type": "track", "track_id": 7, "first_frame": 120, "last_frame": 968,
+     "frames": 801, "pool_frames": 640, "path_length": 2314.5,
+     "classes": {"person_swimming": 640, "person_poolside": 161}, "reason": "lost"}
+"""
+
+import os
+import json
+import math
+from collections import OrderedDict
+from datetime import datetime
+
+
+class TrackSummary:
+    """Tek bir track'in artımlı özeti"""
+
+    __slots__ = ('track_id', 'first_frame', 'last_frame', 'frames', 'pool_frames',
+                 'path_length', 'last_position', 'classes')
+
+    def __init__(self, track_id, frame_number):
+        self.track_id = track_id
+        self.first_frame = frame_number
+        self.last_frame = frame_number
+        self.frames = 0
+        self.pool_frames = 0
+        self.path_length = 0.0
+        self.last_position = None
+        self.classes = {}
+
+    def to_record(self, reason):
+        return {
+            'type': 'track',
+            'track_id': self.track_id,
+            'first_frame': self.first_frame,
+            'last_frame': self.last_frame,
+            'frames': self.frames,
+            'pool_frames': self.pool_frames,
+            'path_length': round(self.path_length, 1),
+            'classes': self.classes,
+            'reason': reason,
+        }
+
+
+class TrackArchive:
+    """
+    📝 Eklemeli track özet dosyası (JSONL, tamponlu)
+    """
+
+    def __init__(self, path, pipeline=None, camera=None, flush_every=50):
+        self.path = path
+        self.flush_every = flush_every
+        self.count = 0
+        self._pending = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._write({
+            'type': 'header',
+            'pipeline': pipeline,
+            'camera': camera,
+            'created': datetime.now().isoformat(timespec='seconds'),
+        })
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self._file.flush()
+            self._pending = 0
+
+    def write(self, summary, reason):
+        self._write(summary.to_record(reason))
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class TrackLifecycle:
+    """
+    ♻️ Track yaşam döngüsü yöneticisi
+    """
+
+    def __init__(self, archive=None, hold_frames=0, max_held=64):
+        """
+        Args:
+            archive (TrackArchive): Özetlerin yazılacağı arşiv (None: sadece bellekten atılır)
+            hold_frames (int): Çıkarılan özet bu kadar kare revive() için bekletilir
+                (tracker'ın re-ID penceresi; 0: hemen arşivlenir)
+            max_held (int): En fazla bekletilen özet (aşılınca en eskisi arşivlenir)
+        """
+        self.archive = archive
+        self.hold_frames = hold_frames
+        self.max_held = max_held
+        self.summaries = {}        # canlı track_id -> TrackSummary
+        self.held = OrderedDict()  # track_id -> (TrackSummary, neden, çıkarıldığı kare); eskiden yeniye
+        self.last_frame = 0
+        self.retired = 0
+
+    def observe(self, track_id, frame_number, position, in_pool=None, class_name=None):
+        """Track bu karede görüldü: özeti güncelle"""
+        summary = self.summaries.get(track_id)
+        if summary is None:
+            summary = TrackSummary(track_id, frame_number)
+            self.summaries[track_id] = summary
+        if summary.last_position is not None:
+            summary.path_length += math.hypot(position[0] - summary.last_position[0],
+                                              position[1] - summary.last_position[1])
+        summary.last_position = position
+        summary.last_frame = frame_number
+        self.last_frame = max(self.last_frame, frame_number)
+        summary.frames += 1
+        if in_pool:
+            summary.pool_frames += 1
+        if class_name is not None:
+            summary.classes[class_name] = summary.classes.get(class_name, 0) + 1
+
+    def _write(self, summary, reason):
+        self.retired += 1
+        if self.archive is not None:
+            self.archive.write(summary, reason)
+
+    def retire(self, track_id, reason='lost'):
+        """Track'i özetten çıkar ve arşive yaz"""
+        summary = self.summaries.pop(track_id, None)
+        if summary is None:
+            return None
+        self._write(summary, reason)
+        return summary
+
+    def hold(self, track_id, reason='lost', frame_number=None):
+        """Track'i özetten çıkar, re-ID penceresi boyunca arşive yazmadan beklet"""
+        summary = self.summaries.pop(track_id, None)
+        if summary is None:
+            return None
+        self.held[track_id] = (summary, reason, self.last_frame if frame_number is None else frame_number)
+        self.held.move_to_end(track_id)
+        while len(self.held) > self.max_held:
+            _, (old_summary, old_reason, _) = self.held.popitem(last=False)
+            self._write(old_summary, old_reason)
+        return summary
+
+    def revive(self, track_id):
+        """Bekleyen track geri geldi: özetine kaldığı yerden devam et"""
+        entry = self.held.pop(track_id, None)
+        if entry is None:
+            return False
+        self.summaries[track_id] = entry[0]
+        return True
+
+    def expire(self, frame_number=None):
+        """Re-ID penceresi dolan bekleyen özetleri arşive yaz"""
+        if frame_number is None:
+            frame_number = self.last_frame
+        while self.held:
+            track_id, (summary, reason, held_frame) = next(iter(self.held.items()))
+            if frame_number - held_frame <= self.hold_frames:
+                break
+            del self.held[track_id]
+            self._write(summary, reason)
+
+    def evict(self, tracks, is_dead, reason='lost', frame_number=None, on_evict=None):
+        """
+        Tracker sözlüğünden ölü track'leri çıkar ve arşivle
+
+        Args:
+            tracks (dict): track_id -> track (yerinde değiştirilir)
+            is_dead (callable): track -> bool
+            frame_number (int): Güncel kare (hold_frames > 0 iken bekleme süresi için;
+                None: son gözlenen kare)
+            on_evict (callable): (track_id, track) -> None; track sözlükten
+                çıkarılmadan hemen önce, track başına bir kez çağrılır
+
+        Returns:
+            list: Çıkarılan track ID'leri
+        """
+        if self.hold_frames > 0:
+            self.expire(frame_number)
+        dead = [track_id for track_id, track in tracks.items() if is_dead(track)]
+        for track_id in dead:
+            if on_evict is not None:
+                on_evict(track_id, tracks[track_id])
+            del tracks[track_id]
+            if self.hold_frames > 0:
+                self.hold(track_id, reason, frame_number)
+            else:
+                self.retire(track_id, reason)
+        return dead
+
+    def close(self, reason='end'):
+        """Bekleyen ve kalan tüm track'leri arşivle ve arşivi kapat"""
+        while self.held:
+            _, (summary, held_reason, _) = self.held.popitem(last=False)
+            self._write(summary, held_reason)
+        for track_id in list(self.summaries):
+            self.retire(track_id, reason)
+        if self.archive is not None:
+            self.archive.close()
+
+
+def iter_track_archive(path):
+    """Arşivdeki track özetlerini sırayla döndür (başlıklar atlanır)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get('type') == 'track':
+                yield record
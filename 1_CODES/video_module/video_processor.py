@@ -4,40 +4,80 @@
 🎬 VIDEO İŞLEME MODÜLÜ
 ====================
 Video dosyalarını işleyerek kişi tespiti yapar.
+
+- Kareler ayrı bir thread'de önden okunur (sınırlı kare kuyruğu)
+- İlk açılışta kare zaman damgası / keyframe indeksi çıkarılır ve videonun
+  yanına `<video>.seekindex.json` olarak kaydedilir (ffprobe, yoksa OpenCV)
+- Seek, indeksten en yakın keyframe'e gidip hedef kareye kadar ilerler:
+  değişken FPS'li telefon videolarında da tam kare
+- Opsiyonel `target_size` ile kareler okuma thread'inde model çözünürlüğüne
+  küçültülür (tüketicide ayrıca `cv2.resize` gerekmez)
 """
 
 import cv2
 import sys
 import os
 import time
+import queue
+import bisect
+import threading
 from datetime import datetime
 
 # Config'i import et
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Paths, System, Camera
+from video_module.seek_index import load_seek_index
 
 class VideoProcessor:
     """
     🎬 Video işleme sınıfı
     """
-    
-    def __init__(self):
+
+    def __init__(self, prefetch=True, queue_size=32, target_size=None, build_index=True):
+        """
+        Args:
+            prefetch (bool): Kareleri ayrı thread'de önden oku
+            queue_size (int): Önden okunan maksimum kare (bellek sınırı)
+            target_size (tuple): (width, height) - okurken küçült (None: orijinal)
+            build_index (bool): Açılışta seek indeksini yükle/oluştur
+        """
         self.current_video = None
+        self.video_path = None
         self.total_frames = 0
         self.current_frame = 0
+        self.current_time = 0.0
         self.fps = 0
         self.width = 0
         self.height = 0
-        
+        self.source_width = 0
+        self.source_height = 0
+
+        self.prefetch = prefetch
+        self.queue_size = queue_size
+        self.target_size = tuple(target_size) if target_size else None
+        self.build_index = build_index
+        self.seek_index = None
+
+        self._queue = None
+        self._reader = None
+        self._stop_event = threading.Event()
+        self._pending = None
+        self._next_index = 0
+        self.reader_error = None   # Okuma thread'ini durduran hata (varsa)
+
+        # Decode istatistikleri (okuma thread'i günceller)
+        self._decoded_frames = 0
+        self._decode_time = 0.0
+
         print("🎬 VideoProcessor başlatıldı")
-    
+
     def load_video(self, video_path):
         """
         Video dosyasını yükle
-        
+
         Args:
             video_path (str): Video dosyası yolu
-            
+
         Returns:
             bool: Başarılı mı
         """
@@ -45,80 +85,255 @@ class VideoProcessor:
             if not os.path.exists(video_path):
                 print(f"❌ Video dosyası bulunamadı: {video_path}")
                 return False
-            
+
+            self.close()
             self.current_video = cv2.VideoCapture(video_path)
-            
+
             if not self.current_video.isOpened():
                 print(f"❌ Video açılamadı: {video_path}")
                 return False
-            
+
             # Video özelliklerini al
+            self.video_path = video_path
             self.total_frames = int(self.current_video.get(cv2.CAP_PROP_FRAME_COUNT))
             self.fps = self.current_video.get(cv2.CAP_PROP_FPS)
-            self.width = int(self.current_video.get(cv2.CAP_PROP_FRAME_WIDTH))
-            self.height = int(self.current_video.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            
+            self.source_width = int(self.current_video.get(cv2.CAP_PROP_FRAME_WIDTH))
+            self.source_height = int(self.current_video.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            self.width, self.height = self.target_size or (self.source_width, self.source_height)
+            self.current_frame = 0
+            self.current_time = 0.0
+            self._next_index = 0
+            self._decoded_frames = 0
+            self._decode_time = 0.0
+
+            if self.build_index:
+                self.seek_index = load_seek_index(video_path)
+                if self.seek_index['pts']:
+                    # Konteyner başlığındaki kare sayısı VFR videoda güvenilmez
+                    self.total_frames = len(self.seek_index['pts'])
+
             print(f"✅ Video yüklendi: {os.path.basename(video_path)}")
-            print(f"📊 Özellikler: {self.width}x{self.height} @ {self.fps:.1f} FPS")
+            print(f"📊 Özellikler: {self.source_width}x{self.source_height} @ {self.fps:.1f} FPS")
+            if self.target_size:
+                print(f"📐 Okuma çözünürlüğü: {self.width}x{self.height}")
             print(f"🎬 Toplam kare: {self.total_frames}")
             print(f"⏱️  Süre: {self.total_frames/self.fps:.1f} saniye")
-            
+
+            self._start_reader()
             return True
-            
+
         except Exception as e:
             print(f"❌ Video yükleme hatası: {e}")
             return False
-    
+
+    def _decode_next(self):
+        """Tek kareyi oku (+ gerekirse küçült), decode süresini say"""
+        started = time.perf_counter()
+        ret, frame = self.current_video.read()
+        if ret:
+            timestamp = self.current_video.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            if self.target_size and (frame.shape[1], frame.shape[0]) != self.target_size:
+                frame = cv2.resize(frame, self.target_size, interpolation=cv2.INTER_AREA)
+            self._decode_time += time.perf_counter() - started
+            self._decoded_frames += 1
+            return True, frame, timestamp
+        return False, None, None
+
+    def _reader_loop(self):
+        """Okuma thread'i: kuyruk doluysa bekler, video sonunda veya hatada None bırakır"""
+        while not self._stop_event.is_set():
+            try:
+                ret, frame, timestamp = self._decode_next()
+            except Exception as e:
+                # Decoder hatası: tüketici sonsuza kadar beklemesin, video sonu gibi bitir
+                self.reader_error = e
+                print(f"❌ Kare okuma hatası: {e}")
+                ret = False
+            item = (frame, timestamp) if ret else None
+            while not self._stop_event.is_set():
+                try:
+                    self._queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            if item is None:
+                return
+
+    def _start_reader(self):
+        if not self.prefetch or self.current_video is None:
+            return
+        self._stop_event.clear()
+        self.reader_error = None
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._reader = threading.Thread(target=self._reader_loop, daemon=True)
+        self._reader.start()
+
+    def _stop_reader(self):
+        if self._reader is None:
+            return
+        self._stop_event.set()
+        self._reader.join()
+        self._reader = None
+        self._queue = None
+
     def get_frame(self):
         """
         Sonraki kareyi al
-        
+
         Returns:
             tuple: (success, frame)
         """
         if self.current_video is None:
             return False, None
-            
-        ret, frame = self.current_video.read()
-        if ret:
-            self.current_frame += 1
-            
-        return ret, frame
-    
+
+        if self._pending is not None:
+            item, self._pending = self._pending, None
+        elif self._queue is not None:
+            while True:
+                try:
+                    item = self._queue.get(timeout=0.5)
+                    break
+                except queue.Empty:
+                    # Thread sentinel bırakamadan öldüyse video sonu say
+                    if not self._reader.is_alive() and self._queue.empty():
+                        item = None
+                        break
+            if item is None:
+                # Sonraki çağrılar da video sonu dönsün
+                self._queue.put(None)
+        else:
+            ret, frame, timestamp = self._decode_next()
+            item = (frame, timestamp) if ret else None
+
+        if item is None:
+            return False, None
+
+        frame, timestamp = item
+        self.current_time = self._frame_time(self._next_index, timestamp)
+        self._next_index += 1
+        self.current_frame += 1
+        return True, frame
+
+    def _frame_time(self, frame_index, fallback):
+        pts = self.seek_index['pts'] if self.seek_index else None
+        if pts and frame_index < len(pts):
+            return pts[frame_index]
+        return fallback
+
     def get_progress(self):
         """
         İşleme ilerlemesini al
-        
+
         Returns:
             dict: İlerleme bilgileri
         """
         if self.total_frames == 0:
-            return {"percent": 0, "current": 0, "total": 0}
-            
+            return {"percent": 0, "current": 0, "total": 0, "decode_fps": 0.0}
+
         percent = (self.current_frame / self.total_frames) * 100
         return {
             "percent": percent,
             "current": self.current_frame,
-            "total": self.total_frames
+            "total": self.total_frames,
+            "time": self.current_time,
+            "decode_fps": self.get_decode_fps(),
+            "buffered": self._queue.qsize() if self._queue is not None else 0
         }
-    
+
+    def get_decode_fps(self):
+        """Sadece okuma+küçültme süresine göre decode hızı (kare/sn)"""
+        if self._decode_time <= 0:
+            return 0.0
+        return self._decoded_frames / self._decode_time
+
+    def seek_to_frame(self, frame_number):
+        """
+        Belirli bir kareye tam olarak git
+
+        En yakın önceki keyframe'e zaman damgasıyla gidilir, hedef kareye
+        kadar grab() ile ilerlenir (retrieve yapılmaz).
+
+        Args:
+            frame_number (int): 0 tabanlı kare numarası
+
+        Returns:
+            bool: Başarılı mı
+        """
+        if self.current_video is None:
+            return False
+
+        frame_number = max(0, min(int(frame_number), max(self.total_frames - 1, 0)))
+        self._stop_reader()
+        self._pending = None
+
+        pts = self.seek_index['pts'] if self.seek_index else None
+        if not pts:
+            # İndeks yok: eski davranış
+            self.current_video.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+            self._next_index = frame_number
+        else:
+            keyframes = self.seek_index['keyframes']
+            k = bisect.bisect_right(keyframes, frame_number) - 1
+            if k >= 0:
+                start_index = keyframes[k]
+            else:
+                # Keyframe bilgisi yok (OpenCV indeksi): ~2 sn geriden başla
+                start_index = bisect.bisect_left(pts, pts[frame_number] - 2.0)
+            target = pts[frame_number]
+            tolerance = 0.5 / (self.fps or 30.0)
+            found = False
+
+            # Backend hedefi aşarsa (VFR'de kare<->zaman çevrimi kayar) daha geriden tekrar dene
+            for margin in (0.0, 2.0, 10.0, None):
+                start_time = 0.0 if margin is None else max(0.0, pts[start_index] - margin)
+                self.current_video.set(cv2.CAP_PROP_POS_MSEC, start_time * 1000.0)
+
+                # Hedef zaman damgasına ulaşana kadar ilerle (yarım kare tolerans)
+                first = True
+                while self.current_video.grab():
+                    t = self.current_video.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                    if first and t > target + tolerance and start_time > 0:
+                        break
+                    first = False
+                    if t >= target - tolerance:
+                        found = True
+                        break
+                if found or first is False:
+                    break
+            if found:
+                ret, frame = self.current_video.retrieve()
+                if ret and self.target_size and (frame.shape[1], frame.shape[0]) != self.target_size:
+                    frame = cv2.resize(frame, self.target_size, interpolation=cv2.INTER_AREA)
+                self._pending = (frame, target) if ret else None
+            self._next_index = frame_number
+
+        self.current_frame = frame_number
+        self.current_time = self._frame_time(frame_number, frame_number / (self.fps or 30.0))
+        self._start_reader()
+        return True
+
     def seek_to_time(self, seconds):
         """
         Belirli bir zamana git
-        
+
         Args:
             seconds (float): Zaman (saniye)
         """
         if self.current_video is None:
             return False
-            
-        frame_number = int(seconds * self.fps)
-        self.current_video.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-        self.current_frame = frame_number
-        return True
-    
+
+        pts = self.seek_index['pts'] if self.seek_index else None
+        if pts:
+            # Zaman damgası >= hedef olan ilk kare
+            frame_number = bisect.bisect_left(pts, seconds - 1e-6)
+        else:
+            frame_number = int(seconds * self.fps)
+        return self.seek_to_frame(frame_number)
+
     def close(self):
         """Video'yu kapat"""
+        self._stop_reader()
+        self._pending = None
         if self.current_video is not None:
             self.current_video.release()
             self.current_video = None
@@ -128,55 +343,64 @@ def test_video_processing():
     print("="*60)
     print("🧪 VIDEO İŞLEME TESTİ")
     print("="*60)
-    
+
     # Test videoları kontrol et
     test_videos = Camera.TEST_VIDEOS
-    
+
     for video_path in test_videos:
         print(f"\n📁 Test ediliyor: {video_path}")
-        
+
         if not os.path.exists(video_path):
             print(f"⚠️  Video bulunamadı: {video_path}")
             continue
-        
+
         # Video processor oluştur
         processor = VideoProcessor()
-        
+
         if not processor.load_video(video_path):
             continue
-        
+
         print(f"🔄 İlk 100 kareyi test ediyorum...")
-        
+
         # İlk 100 kareyi test et
         frame_count = 0
         start_time = time.time()
-        
+
         try:
             while frame_count < 100:
                 ret, frame = processor.get_frame()
                 if not ret:
                     print("📹 Video sonu")
                     break
-                
+
                 frame_count += 1
-                
+
                 # Her 25 karede bir bilgi göster
                 if frame_count % 25 == 0:
                     progress = processor.get_progress()
                     print(f"   📊 İşlenen: {frame_count} kare ({progress['percent']:.1f}%)")
-        
+
+            # Seek testi: video ortasına git
+            middle = processor.total_frames // 2
+            seek_start = time.time()
+            processor.seek_to_frame(middle)
+            ret, frame = processor.get_frame()
+            print(f"   🎯 Seek {middle}. kare: {'✅' if ret else '❌'} "
+                  f"({(time.time() - seek_start) * 1000:.0f} ms, t={processor.current_time:.3f}s)")
+
         except KeyboardInterrupt:
             print("⏹️  Test durduruldu")
-        
+
         finally:
+            decode_fps = processor.get_decode_fps()
             processor.close()
-            
+
         elapsed = time.time() - start_time
         fps = frame_count / elapsed if elapsed > 0 else 0
-        
-        print(f"✅ Test tamamlandı: {frame_count} kare, {fps:.1f} FPS")
+
+        print(f"✅ Test tamamlandı: {frame_count} kare, {fps:.1f} FPS (decode: {decode_fps:.1f} FPS)")
         print("-" * 40)
-    
+
     print("🎉 Tüm video testleri tamamlandı!")
 
 if __name__ == "__main__":
@@ -11,6 +11,9 @@ import os
 import sys
 from pathlib import Path
 
+# 1_CODES'u path'e ekle
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "1_CODES"))
+
 def auto_detect_and_create_labels(frames_dir, labels_dir, model_path=None):
     """
     Framelerde otomatik tespit yapıp YOLO format etiketler oluştur
@@ -56,68 +59,12 @@ def auto_detect_and_create_labels(frames_dir, labels_dir, model_path=None):
         else:
             model_path = "yolov8m.pt"  # Online download
     
-    print(f"🤖 Model yükleniyor: {model_path}")
-    model = YOLO(model_path)
-    
-    # Klasör oluştur
-    os.makedirs(labels_dir, exist_ok=True)
-    
-    # Frame dosyalarını bul
-    frame_files = []
-    for ext in ['.jpg', '.jpeg', '.png']:
-        frame_files.extend(list(Path(frames_dir).glob(f"*{ext}")))
-    
-    frame_files.sort()
-    print(f"📸 {len(frame_files)} frame bulundu")
-    
-    # Class mapping - YOLO'dan bizim class'lara
-    # YOLO class 0 = person → bizim class'larımıza map et
-    class_mapping = {
-        0: 0,  # person → person_swimming (default, sonra manuel düzeltiriz)
-    }
-    
-    total_detections = 0
-    
-    # Her frame'i işle
-    for i, frame_path in enumerate(frame_files, 1):
-        print(f"🔍 İşleniyor {i}/{len(frame_files)}: {frame_path.name}")
-        
-        # YOLO inference
-        results = model(str(frame_path), conf=0.3, verbose=False)
-        
-        # Label dosya yolu
-        label_file = os.path.join(labels_dir, frame_path.stem + '.txt')
-        
-        # Tespit edilen objeler
-        detections = []
-        
-        for result in results:
-            boxes = result.boxes
-            if boxes is not None:
-                for box in boxes:
-                    # Class ID
-                    class_id = int(box.cls[0])
-                    confidence = float(box.conf[0])
-                    
-                    # Sadece person class'ı (0) al
-                    if class_id == 0 and confidence > 0.3:
-                        # Bounding box koordinatları (normalized)
-                        x_center, y_center, width, height = box.xywhn[0]
-                        
-                        # YOLO format: class_id x_center y_center width height
-                        yolo_class = 0  # person_swimming default
-                        detection_line = f"{yolo_class} {x_center:.6f} {y_center:.6f} {width:.6f} {height:.6f}"
-                        detections.append(detection_line)
-                        total_detections += 1
-        
-        # Label dosyasını yaz
-        with open(label_file, 'w') as f:
-            f.write('\n'.join(detections))
-        
-        if detections:
-            print(f"   ✅ {len(detections)} kişi tespit edildi")
-        else:
-            print(f"   ⚠️  Kişi tespit edilmedi")
+    # Batch inference + manifest: sadece yeni/değişen framelar işlenir,
+    # elle düzeltilmiş etiketlerin üzerine yazılmaz
+    from dataset_module.auto_labeler import AutoLabeler
+    labeler = AutoLabeler(model_path, frames_dir, labels_dir, conf=0.3)
+    summary = labeler.run()
+    total_detections = summary['detections']
     
     print(f"\n🎉 Otomatik tespit tamamlandı!")
     print(f"   📊 Toplam tespit: {total_detections}")
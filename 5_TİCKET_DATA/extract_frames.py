@@ -10,6 +10,10 @@ import os
 import sys
 from datetime import datetime
 
+# 1_CODES'u path'e ekle
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "1_CODES"))
+from dataset_module.frame_extractor import extract_frames
+
 def extract_frames_for_annotation(video_path, output_dir, interval=2, max_frames=None):
     """
     Video'dan annotation için frame çıkar
@@ -47,46 +51,20 @@ def extract_frames_for_annotation(video_path, output_dir, interval=2, max_frames
     print(f"   Total Frames: {total_frames}")
     print(f"   Duration: {duration:.1f} seconds")
     
-    # Frame aralığını hesapla
-    frame_step = int(fps * interval)
-    print(f"⏱️  Her {interval} saniyede bir frame ({frame_step} frame atlayarak)")
-    
-    # Çıktı klasörünü oluştur
-    os.makedirs(output_dir, exist_ok=True)
-    
-    extracted_frames = []
-    frame_count = 0
-    
-    # Frame çıkarma döngüsü
-    max_frame_limit = max_frames * frame_step if max_frames else total_frames
-    for frame_idx in range(0, min(total_frames, max_frame_limit), frame_step):
-        if max_frames and frame_count >= max_frames:
-            break
-            
-        # Frame pozisyonunu ayarla
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        ret, frame = cap.read()
-        
-        if not ret:
-            print(f"⚠️  Frame {frame_idx} okunamadı, geçiliyor...")
-            continue
-        
-        # Frame dosya adı
-        timestamp = frame_idx / fps
-        frame_filename = f"frame_{frame_count+1:03d}_{timestamp:.1f}s.jpg"
-        frame_path = os.path.join(output_dir, frame_filename)
-        
-        # Frame'i kaydet
-        cv2.imwrite(frame_path, frame)
-        extracted_frames.append(frame_path)
-        frame_count += 1
-        
-        print(f"✅ Frame {frame_count}/{max_frames}: {frame_filename} ({timestamp:.1f}s)")
-    
     cap.release()
     
+    print(f"⏱️  Her {interval} saniyede bir frame")
+    
+    # Paralel süreçlerle çıkar (keyframe hizalı seek, diskte olanlar atlanır)
+    results, summary = extract_frames(video_path, output_dir, interval=interval,
+                                      name_pattern="frame_{number:03d}_{time:.1f}s.jpg",
+                                      max_frames=max_frames, with_summary=True)
+    extracted_frames = results.get(video_path, [])
+    
     print(f"\n🎉 Frame çıkarma tamamlandı!")
-    print(f"   Toplam çıkarılan: {len(extracted_frames)} frame")
+    print(f"   Yeni çıkarılan: {summary['written']} frame")
+    print(f"   Zaten mevcut (atlandı): {summary['skipped']} frame")
+    print(f"   Toplam: {len(extracted_frames)} frame")
     print(f"   Çıktı klasörü: {output_dir}")
     
     return extracted_frames
@@ -9,10 +9,14 @@
 
 import cv2
 import os
+import sys
 import json
 import numpy as np
 from pathlib import Path
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "1_CODES"))
+from dataset_module.bulk_relabel import relabel_by_pool, print_relabel_summary
+
 class AnnotationFixer:
     def __init__(self, frames_dir, labels_dir, classes_file):
         self.frames_dir = frames_dir
@@ -209,68 +213,30 @@ class AnnotationFixer:
         
         return inside
     
-    def fix_all_annotations(self):
-        """Tüm etiketleri havuz içi/dışı'na göre düzelt"""
+    def fix_all_annotations(self, dry_run=False):
+        """
+        Tüm etiketleri havuz içi/dışı'na göre düzelt
+        
+        Kare boyutları başlıktan/indeksten okunur, tüm kutular tek seferde
+        havuz maskesine göre sınıflandırılır; sadece değişen dosyalar yazılır.
+        
+        Args:
+            dry_run: True ise dosya yazmadan değişiklik özetini göster
+        """
         
         if not self.pool_polygon:
             print("❌ Önce havuz alanını belirlemelisin!")
-            return
+            return None
         
-        print(f"\n🔧 TÜM ETİKETLER DÜZELTİLİYOR...")
+        print(f"\n🔧 TÜM ETİKETLER {'KONTROL EDİLİYOR (dry-run)' if dry_run else 'DÜZELTİLİYOR'}...")
         print("=" * 40)
         
-        fixed_count = 0
-        inside_count = 0
-        outside_count = 0
-        
-        for frame_file in self.frame_files:
-            label_file = Path(self.labels_dir) / f"{frame_file.stem}.txt"
-            
-            if not label_file.exists():
-                continue
-            
-            # Mevcut annotations yükle
-            annotations = []
-            with open(label_file, 'r') as f:
-                for line in f:
-                    parts = line.strip().split()
-                    if len(parts) >= 5:
-                        class_id = int(parts[0])
-                        x_center = float(parts[1])
-                        y_center = float(parts[2])
-                        width = float(parts[3])
-                        height = float(parts[4])
-                        
-                        # Pixel koordinatlara çevir (approximation)
-                        img = cv2.imread(str(frame_file))
-                        h, w = img.shape[:2]
-                        pixel_x = int(x_center * w)
-                        pixel_y = int(y_center * h)
-                        
-                        # Havuz içinde mi kontrol et
-                        is_in_pool = self.point_in_polygon([pixel_x, pixel_y], self.pool_polygon)
-                        
-                        # Class'ı düzelt
-                        if is_in_pool:
-                            new_class = 0  # person_swimming
-                            inside_count += 1
-                        else:
-                            new_class = 2  # person_poolside
-                            outside_count += 1
-                        
-                        if new_class != class_id:
-                            fixed_count += 1
-                        
-                        annotations.append(f"{new_class} {x_center} {y_center} {width} {height}")
-            
-            # Düzeltilmiş annotations kaydet
-            with open(label_file, 'w') as f:
-                f.write('\n'.join(annotations))
+        summary = relabel_by_pool(self.frame_files, self.labels_dir, self.pool_polygon, dry_run=dry_run)
         
-        print(f"✅ Düzeltme tamamlandı!")
-        print(f"   🏊 Havuz içi: {inside_count}")
-        print(f"   🏖️ Havuz dışı: {outside_count}")
-        print(f"   🔧 Düzeltilen: {fixed_count}")
+        if not dry_run:
+            print(f"✅ Düzeltme tamamlandı!")
+        print_relabel_summary(summary, dry_run, self.classes)
+        return summary
 
 def main():
     """Ana fonksiyon"""
@@ -316,7 +282,14 @@ def main():
             print("❌ Havuz alanı belirlenemedi!")
             return
     
-    # Tüm etiketleri düzelt
+    # Önce değişiklik özeti, onaydan sonra yaz
+    summary = fixer.fix_all_annotations(dry_run=True)
+    if not summary or not summary['fixed']:
+        print("✅ Düzeltilecek etiket yok")
+        return
+    if input("Değişiklikler uygulansın mı? (E/h): ").strip().lower() not in ('', 'e', 'evet', 'y'):
+        print("⏹️  Değişiklik yapılmadı")
+        return
     fixer.fix_all_annotations()
     
     print(f"\n🎉 İşlem tamamlandı!")
@@ -7,10 +7,15 @@ YOLOv8x + Havuz Koordinatları ile akıllı annotation
 
 import cv2
 import os
+import sys
 import json
 import numpy as np
 from pathlib import Path
-from ultralytics import YOLO
+
+# 1_CODES'u path'e ekle
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "1_CODES"))
+from dataset_module.auto_labeler import AutoLabeler, read_image, SWIMMING_CLASS
+from dataset_module.label_io import format_yolo_line
 
 class SmartAutoDetect:
     def __init__(self, frames_dir="01_frames", labels_dir="02_labels", pool_area_file="pool_area.json"):
@@ -21,9 +26,10 @@ class SmartAutoDetect:
         # Havuz koordinatlarını yükle
         self.pool_polygon = self.load_pool_area()
         
-        # Model yükle (YOLOv8x)
-        print("🤖 YOLOv8x model yükleniyor...")
-        self.model = YOLO("../4_MODELS/yolov8x.pt")
+        # Model yükle (YOLOv8x) - batch inference + rasterize havuz maskesi
+        self.labeler = AutoLabeler("../4_MODELS/yolov8x.pt", frames_dir, labels_dir,
+                                   conf=0.4, pool_polygon=self.pool_polygon)
+        self.model = self.labeler.model
         print("✅ Model yüklendi!")
     
     def load_pool_area(self):
@@ -70,94 +76,41 @@ class SmartAutoDetect:
     
     def detect_and_classify(self, frame_path):
         """Frame'de tespit yap ve sınıflandır"""
-        results = self.model(str(frame_path), conf=0.4, verbose=False)
+        image = read_image(frame_path)
+        if image is None:
+            return []
         
-        detections = []
+        class_ids, boxes, confidences = self.labeler.detect([image])[0]
         
-        for result in results:
-            boxes = result.boxes
-            if boxes is not None:
-                for box in boxes:
-                    class_id = int(box.cls[0])
-                    confidence = float(box.conf[0])
-                    
-                    if class_id == 0 and confidence > 0.4:
-                        x_center, y_center, width, height = box.xywhn[0]
-                        
-                        img = cv2.imread(str(frame_path))
-                        img_h, img_w = img.shape[:2]
-                        
-                        real_x = int(x_center * img_w)
-                        real_y = int(y_center * img_h)
-                        
-                        if self.point_in_polygon((real_x, real_y), self.pool_polygon):
-                            yolo_class = 0  # person_swimming
-                            class_name = "swimming"
-                        else:
-                            yolo_class = 2  # person_poolside
-                            class_name = "poolside"
-                        
-                        detection_line = f"{yolo_class} {x_center:.6f} {y_center:.6f} {width:.6f} {height:.6f}"
-                        detections.append({
-                            'line': detection_line,
-                            'class': class_name,
-                            'confidence': confidence
-                        })
+        detections = []
+        for yolo_class, box, confidence in zip(class_ids, boxes, confidences):
+            detections.append({
+                'line': format_yolo_line(yolo_class, *box),
+                'class': "swimming" if yolo_class == SWIMMING_CLASS else "poolside",
+                'confidence': float(confidence)
+            })
         
         return detections
     
     def process_unannotated_frames(self):
-        """Annotation'sız frame'leri işle"""
-        unannotated_frames = self.get_unannotated_frames()
-        
-        if not unannotated_frames:
+        """Annotation'sız frame'leri işle (batch, manifest ile kaldığı yerden)"""
+        unannotated = self.get_unannotated_frames()
+        if not unannotated:
             print("✅ Tüm frame'ler zaten annotation'lı!")
             return
         
-        print(f"\n🎯 {len(unannotated_frames)} frame işlenecek...")
+        # Sadece annotation'sız kareler; manifest güncel olanları ayrıca eler
+        summary = self.labeler.run(frames=unannotated)
         
-        total_detections = 0
-        swimming_count = 0
-        poolside_count = 0
-        
-        for i, frame_path in enumerate(unannotated_frames, 1):
-            print(f"🔍 İşleniyor {i}/{len(unannotated_frames)}: {frame_path.name}")
-            
-            detections = self.detect_and_classify(frame_path)
-            
-            label_file = Path(self.labels_dir) / f"{frame_path.stem}.txt"
-            
-            detection_lines = []
-            frame_swimming = 0
-            frame_poolside = 0
-            
-            for detection in detections:
-                detection_lines.append(detection['line'])
-                if detection['class'] == 'swimming':
-                    frame_swimming += 1
-                    swimming_count += 1
-                else:
-                    frame_poolside += 1
-                    poolside_count += 1
-            
-            with open(label_file, 'w') as f:
-                f.write('\n'.join(detection_lines))
-            
-            total_detections += len(detections)
-            
-            if detections:
-                print(f"   ✅ {len(detections)} kişi: {frame_swimming} swimming, {frame_poolside} poolside")
-            else:
-                print(f"   ⚠️  Kişi tespit edilmedi")
-            
-            if i % 50 == 0:
-                print(f"   📊 İlerleme: {i}/{len(unannotated_frames)} - Toplam tespit: {total_detections}")
+        if summary['processed'] == 0:
+            print("✅ Tüm frame'ler zaten annotation'lı!")
+            return
         
         print(f"\n🎉 OTOMATIK TESPİT TAMAMLANDI!")
-        print(f"   📊 Toplam tespit: {total_detections}")
-        print(f"   🏊 Havuz içi: {swimming_count}")
-        print(f"   🚶 Havuz dışı: {poolside_count}")
-        print(f"   ✅ {len(unannotated_frames)} frame otomatik etiketlendi")
+        print(f"   📊 Toplam tespit: {summary['detections']}")
+        print(f"   🏊 Havuz içi: {summary['swimming']}")
+        print(f"   🚶 Havuz dışı: {summary['poolside']}")
+        print(f"   ✅ {summary['processed']} frame otomatik etiketlendi")
         
         return True
 
@@ -6,22 +6,36 @@
 """
 
 import os
+import sys
 import shutil
 import random
 from pathlib import Path
 from collections import defaultdict, Counter
 
+# 1_CODES'u path'e ekle
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "1_CODES"))
+from dataset_module.dataset_index import DatasetIndex, print_stats
+from dataset_module.materialize import (materialize_from_index, verify_materialized,
+                                        write_image_list, print_materialize_result)
+from dataset_module.near_duplicates import (near_duplicate_groups, select_representatives,
+                                            group_split, DEFAULT_THRESHOLD)
+
 class DatasetPreparer:
-    def __init__(self, source_dir="5_TİCKET_DATA", target_dir="8_TRAINING/dataset"):
+    def __init__(self, source_dir="5_TİCKET_DATA", target_dir="8_TRAINING/dataset", link_mode="auto",
+                 dedup_threshold=DEFAULT_THRESHOLD):
         """
         Dataset Preparer
         
         Args:
             source_dir: Kaynak etiketlenmiş data klasörü
             target_dir: Hedef dataset klasörü
+            link_mode: Görüntü kurulum yöntemi (auto/hardlink/reflink/symlink/copy)
+            dedup_threshold: Yakın kopya dHash eşiği (None = kapalı)
         """
         self.source_dir = Path(source_dir)
         self.target_dir = Path(target_dir)
+        self.link_mode = link_mode
+        self.dedup_threshold = dedup_threshold
         
         # Kaynak klasörler
         self.frames_dir = self.source_dir / "01_frames"
@@ -36,6 +50,11 @@ class DatasetPreparer:
         
         self.classes = self.load_classes()
         
+        # Kalıcı dataset indeksi (sadece yeni/değişen dosyalar taranır)
+        self.index = DatasetIndex(self.source_dir)
+        if self.frames_dir.exists():
+            self.index.refresh()
+        
     def load_classes(self):
         """Sınıfları yükle"""
         if self.classes_file.exists():
@@ -49,43 +68,16 @@ class DatasetPreparer:
         """Dataset analizini yap"""
         print("🔍 Dataset analizi...")
         
-        # Frame sayısı
-        if self.frames_dir.exists():
-            frames = list(self.frames_dir.glob("*.jpg"))
-            print(f"📸 Toplam frame: {len(frames)}")
-        else:
+        if not self.frames_dir.exists():
             print(f"❌ Frame klasörü bulunamadı: {self.frames_dir}")
             return False
             
-        # Label sayısı ve dağılımı
-        if self.labels_dir.exists():
-            labels = list(self.labels_dir.glob("*.txt"))
-            print(f"🏷️ Toplam label dosyası: {len(labels)}")
-            
-            # Sınıf dağılımını analiz et
-            class_counts = Counter()
-            total_annotations = 0
-            
-            for label_file in labels:
-                with open(label_file, 'r') as f:
-                    for line in f:
-                        parts = line.strip().split()
-                        if len(parts) >= 5:
-                            class_id = int(parts[0])
-                            if 0 <= class_id < len(self.classes):
-                                class_counts[self.classes[class_id]] += 1
-                                total_annotations += 1
-            
-            print(f"📊 Toplam annotation: {total_annotations}")
-            print("📈 Sınıf dağılımı:")
-            for class_name in self.classes:
-                count = class_counts.get(class_name, 0)
-                percentage = (count / total_annotations * 100) if total_annotations > 0 else 0
-                print(f"   {class_name}: {count} ({percentage:.1f}%)")
-                
-        else:
+        if not self.labels_dir.exists():
             print(f"❌ Label klasörü bulunamadı: {self.labels_dir}")
             return False
+        
+        # Sayılar ve sınıf dağılımı indeksten (etiket dosyaları yeniden açılmaz)
+        print_stats(self.index.stats(), self.classes)
             
         return True
     
@@ -106,14 +98,11 @@ class DatasetPreparer:
         """Geçerli frame-label çiftlerini bul"""
         print("🔍 Geçerli frame-label çiftleri bulunuyor...")
         
-        frames = set(f.stem for f in self.frames_dir.glob("*.jpg"))
-        labels = set(f.stem for f in self.labels_dir.glob("*.txt"))
+        stats = self.index.stats()
+        valid_pairs = self.index.valid_pairs()
         
-        # Ortak dosyalar
-        valid_pairs = frames.intersection(labels)
-        
-        print(f"📸 Frame dosyaları: {len(frames)}")
-        print(f"🏷️ Label dosyaları: {len(labels)}")
+        print(f"📸 Frame dosyaları: {stats['frames']}")
+        print(f"🏷️ Label dosyaları: {stats['labels']}")
         print(f"✅ Geçerli çiftler: {len(valid_pairs)}")
         
         if len(valid_pairs) == 0:
@@ -142,66 +131,98 @@ class DatasetPreparer:
             "all": len(valid_pairs)
         }
         
+        # Yakın kopya grupları (aynı grup train ve val'e bölünmez)
+        groups = None
+        if self.dedup_threshold is not None:
+            groups = near_duplicate_groups(self.index, valid_pairs, self.dedup_threshold)
+            print(f"🪞 {len(valid_pairs)} frame -> {len(groups)} yakın kopya grubu")
+        
         limit = phase_limits.get(phase, len(valid_pairs))
         if len(valid_pairs) > limit:
-            # En kaliteli frame'leri seç (dosya boyutuna göre)
-            frame_sizes = []
-            for pair in valid_pairs:
-                frame_path = self.frames_dir / f"{pair}.jpg"
-                if frame_path.exists():
-                    size = frame_path.stat().st_size
-                    frame_sizes.append((pair, size))
-            
-            # Büyükten küçüğe sırala (daha kaliteli)
-            frame_sizes.sort(key=lambda x: x[1], reverse=True)
-            valid_pairs = [pair for pair, _ in frame_sizes[:limit]]
-            print(f"🎯 {phase} için en kaliteli {limit} frame seçildi")
-        
-        # Karıştır
-        random.shuffle(valid_pairs)
+            if groups is not None:
+                valid_pairs = self.select_diverse(groups, limit)
+                print(f"🎯 {phase} için {limit} çeşitli frame seçildi (grup temsilcileri)")
+            else:
+                # En kaliteli frame'leri seç (dosya boyutuna göre, indeksten sıralı)
+                candidates = set(valid_pairs)
+                valid_pairs = [pair for pair in self.index.valid_pairs(order_by='size')
+                               if pair in candidates][:limit]
+                print(f"🎯 {phase} için en kaliteli {limit} frame seçildi")
         
         # Train/val split
-        val_size = int(len(valid_pairs) * val_split)
-        train_pairs = valid_pairs[val_size:]
-        val_pairs = valid_pairs[:val_size]
+        if groups is not None:
+            train_pairs, val_pairs = group_split(valid_pairs, groups, val_split)
+        else:
+            random.shuffle(valid_pairs)
+            val_size = int(len(valid_pairs) * val_split)
+            train_pairs = valid_pairs[val_size:]
+            val_pairs = valid_pairs[:val_size]
         
         print(f"🚂 Train set: {len(train_pairs)} dosya")
         print(f"✅ Validation set: {len(val_pairs)} dosya")
         
         return train_pairs, val_pairs
     
+    def select_diverse(self, groups, limit):
+        """
+        Gruplardan en fazla `limit` çeşitli frame seç
+        
+        Önce her grubun en iyi temsilcisi alınır; yer kalırsa grup başına
+        temsilci sayısı artırılır (birbirine en uzak kareler). Hâlâ yer
+        kalırsa kalan kareler dosya boyutuna göre eklenir.
+        """
+        sizes = {row['stem']: row['frame_size'] for row in self.index.frames()}
+        by_size = lambda stem: sizes.get(stem, 0)
+        
+        first = select_representatives(groups, self.index, 1)
+        selected = sorted(first, key=by_size, reverse=True)
+        per_group = 1
+        while len(selected) < limit and per_group < max(len(group) for group in groups):
+            per_group *= 2
+            more = select_representatives(groups, self.index, per_group)
+            if len(more) == len(selected):
+                break
+            chosen = set(first)
+            selected = sorted(first, key=by_size, reverse=True) + \
+                sorted((s for s in more if s not in chosen), key=by_size, reverse=True)
+        
+        if len(selected) < limit:
+            chosen = set(selected)
+            rest = sorted((s for group in groups for s in group if s not in chosen), key=by_size, reverse=True)
+            selected += rest[:limit - len(selected)]
+        
+        return selected[:limit]
+    
     def copy_files(self, pairs, target_images_dir, target_labels_dir, set_name):
-        """Dosyaları hedef klasöre kopyala"""
-        print(f"📋 {set_name} dosyaları kopyalanıyor...")
+        """Dosyaları hedef klasöre kur (hardlink/reflink, gerekirse kopya) ve doğrula"""
+        print(f"📋 {set_name} dosyaları kuruluyor ({self.link_mode})...")
         
-        success_count = 0
+        result = materialize_from_index(self.index, pairs, target_images_dir, target_labels_dir,
+                                        mode=self.link_mode)
+        print_materialize_result(result, set_name)
         
-        for pair in pairs:
-            # Frame kopyala
-            source_frame = self.frames_dir / f"{pair}.jpg"
-            target_frame = target_images_dir / f"{pair}.jpg"
-            
-            # Label kopyala
-            source_label = self.labels_dir / f"{pair}.txt"
-            target_label = target_labels_dir / f"{pair}.txt"
-            
-            try:
-                shutil.copy2(source_frame, target_frame)
-                shutil.copy2(source_label, target_label)
-                success_count += 1
-            except Exception as e:
-                print(f"⚠️ Hata {pair}: {e}")
-        
-        print(f"✅ {set_name}: {success_count}/{len(pairs)} dosya kopyalandı")
-        return success_count
+        problems = verify_materialized(self.index, pairs, target_images_dir, target_labels_dir)
+        if problems:
+            print(f"⚠️ {set_name}: {len(problems)} dosya indeksle uyuşmuyor (ör. {problems[0]})")
+        
+        return result['ok'] - len(problems)
     
-    def prepare_dataset(self, phase="phase1", val_split=0.2):
+    def write_lists(self, train_pairs, val_pairs):
+        """Kopyasız mod: YOLO'nun okuyacağı train.txt / val.txt yaz"""
+        train_count = write_image_list(self.index, train_pairs, self.target_dir / "train.txt")
+        val_count = write_image_list(self.index, val_pairs, self.target_dir / "val.txt")
+        print(f"📝 Görüntü listeleri yazıldı: {self.target_dir / 'train.txt'}, {self.target_dir / 'val.txt'}")
+        print("   dataset.yaml içinde: train: train.txt / val: val.txt")
+        return train_count, val_count
+    
+    def prepare_dataset(self, phase="phase1", val_split=0.2, image_list=False):
         """
         Dataset'i hazırla
         
         Args:
             phase: Eğitim fazı
             val_split: Validation split oranı
+            image_list: True ise klasör kurmak yerine train.txt / val.txt yaz
         """
         print(f"🚀 DATASET HAZIRLIĞI - {phase.upper()}")
         print("=" * 50)
@@ -211,7 +232,10 @@ class DatasetPreparer:
             return False
         
         # Klasörler oluştur
-        self.create_directories()
+        if not image_list:
+            self.create_directories()
+        else:
+            self.target_dir.mkdir(parents=True, exist_ok=True)
         
         # Geçerli çiftleri bul
         valid_pairs = self.get_valid_pairs()
@@ -221,9 +245,12 @@ class DatasetPreparer:
         # Train/val split
         train_pairs, val_pairs = self.split_dataset(valid_pairs, val_split, phase)
         
-        # Dosyaları kopyala
-        train_success = self.copy_files(train_pairs, self.train_images, self.train_labels, "TRAIN")
-        val_success = self.copy_files(val_pairs, self.val_images, self.val_labels, "VALIDATION")
+        # Dosyaları kur (veya sadece liste yaz)
+        if image_list:
+            train_success, val_success = self.write_lists(train_pairs, val_pairs)
+        else:
+            train_success = self.copy_files(train_pairs, self.train_images, self.train_labels, "TRAIN")
+            val_success = self.copy_files(val_pairs, self.val_images, self.val_labels, "VALIDATION")
         
         # Classes dosyasını kopyala
         target_classes = self.target_dir / "classes.txt"
@@ -266,10 +293,11 @@ def main():
             return
         
         val_split = float(input("Validation split oranı (0.2 = %20): ") or "0.2")
+        image_list = (input("Format (k=klasör/link, l=görüntü listesi) [k]: ").strip().lower() == "l")
         
         # Dataset preparer oluştur
         preparer = DatasetPreparer()
-        success = preparer.prepare_dataset(phase, val_split)
+        success = preparer.prepare_dataset(phase, val_split, image_list)
         
         if success:
             print(f"\n🎉 {phase.upper()} dataset hazırlığı başarılı!")
@@ -15,12 +15,19 @@ from pathlib import Path
 from datetime import datetime
 from ultralytics import YOLO
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / "1_CODES"))
+from core.config import Output
+from output_manager.detection_log import DetectionLogWriter, detection_record
+
 class TestVideoProcessor:
-    def __init__(self, model_path, work_dir="/home/ubuntu/drowning_detection"):
+    def __init__(self, model_path, work_dir="/home/ubuntu/drowning_detection", render_video=None):
         self.work_dir = Path(work_dir)
         self.model_path = model_path
         self.model = YOLO(model_path)
         
+        # False: sadece analitik (çizim + video encode yok)
+        self.render_video = Output.RENDER_VIDEO if render_video is None else render_video
+        
         # Klasörler
         self.test_videos_dir = self.work_dir / "TEST_VIDEOS"
         self.results_dir = self.work_dir / "TEST_RESULTS"
@@ -59,10 +66,18 @@ class TestVideoProcessor:
         
         print(f"📊 Video bilgileri: {width}x{height}, {fps}fps, {total_frames} frame")
         
-        # Output video setup
-        output_video_path = output_dir / f"{output_name}.mp4"
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(str(output_video_path), fourcc, fps, (width, height))
+        # Output video setup (analitik modda açılmaz)
+        out = None
+        if self.render_video:
+            output_video_path = output_dir / f"{output_name}.mp4"
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = cv2.VideoWriter(str(output_video_path), fourcc, fps, (width, height))
+        
+        # Ortak formatta tespit logu (sonradan render için)
+        detection_log_writer = DetectionLogWriter(
+            output_dir / Output.DETECTION_LOG_NAME, video_path, fps, (width, height),
+            pipeline="test_video_processor", model=Path(self.model_path).name
+        )
         
         # Detection log
         detection_log = []
@@ -105,14 +120,15 @@ class TestVideoProcessor:
                         
                         frame_detections.append(detection)
                         
-                        # Bounding box çiz
-                        color = self.get_class_color(class_name)
-                        cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), color, 2)
-                        
-                        # Label
-                        label = f"{class_name}: {confidence:.2f}"
-                        cv2.putText(frame, label, (int(x1), int(y1-10)), 
-                                  cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+                        if self.render_video:
+                            # Bounding box çiz
+                            color = self.get_class_color(class_name)
+                            cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), color, 2)
+                            
+                            # Label
+                            label = f"{class_name}: {confidence:.2f}"
+                            cv2.putText(frame, label, (int(x1), int(y1-10)), 
+                                      cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
             
             # Frame bilgilerini kaydet
             frame_info = {
@@ -122,9 +138,13 @@ class TestVideoProcessor:
                 "detection_count": len(frame_detections)
             }
             frame_results.append(frame_info)
+            detection_log_writer.write_frame(frame_count, frame_count / fps, [
+                detection_record(d["bbox"], d["confidence"], d["class_name"]) for d in frame_detections
+            ])
             
             # Video'ya frame ekle
-            out.write(frame)
+            if out is not None:
+                out.write(frame)
             
             frame_count += 1
             
@@ -137,9 +157,11 @@ class TestVideoProcessor:
                 
         # Cleanup
         cap.release()
-        out.release()
+        if out is not None:
+            out.release()
         
         processing_time = time.time() - start_time
+        detection_log_writer.close(summary={"processing_time": round(processing_time, 2)})
         print(f"✅ Video işleme tamamlandı: {processing_time:.1f}s")
         
         # Sonuçları kaydet
@@ -170,7 +192,8 @@ class TestVideoProcessor:
                 "filename": video_path.name,
                 "processing_time": processing_time,
                 "processed_date": datetime.now().isoformat(),
-                "model_path": str(self.model_path)
+                "model_path": str(self.model_path),
+                "render_video": self.render_video
             },
             "detection_summary": {
                 "total_frames": len(frame_results),
@@ -315,10 +338,11 @@ def main():
     parser.add_argument("--video", help="İşlenecek video dosyası")
     parser.add_argument("--watch", action="store_true", help="Video klasörünü izle")
     parser.add_argument("--work-dir", default="/home/ubuntu/drowning_detection", help="Çalışma dizini")
+    parser.add_argument("--no-render", action="store_true", help="Sadece analitik: çizim ve video kaydı yapma")
     
     args = parser.parse_args()
     
-    processor = TestVideoProcessor(args.model, args.work_dir)
+    processor = TestVideoProcessor(args.model, args.work_dir, render_video=False if args.no_render else None)
     
     if args.video:
         processor.process_video(args.video)
@@ -9,6 +9,9 @@ import os
 import sys
 from pathlib import Path
 
+# 1_CODES'u path'e ekle
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "1_CODES"))
+
 def auto_label_all_frames():
     """Tüm frame'leri YOLOv8x ile otomatik etiketle"""
     
@@ -35,90 +38,23 @@ def auto_label_all_frames():
         print(f"❌ Model bulunamadı: {model_path}")
         return False
     
-    # Model yükle
-    print(f"🤖 YOLOv8x model yükleniyor...")
-    model = YOLO(model_path)
-    print(f"✅ Model yüklendi!")
-    
-    # Klasör oluştur
-    os.makedirs(labels_dir, exist_ok=True)
-    
-    # Frame dosyalarını bul
-    frame_files = []
-    for ext in ['.jpg', '.jpeg', '.png']:
-        frame_files.extend(list(Path(frames_dir).glob(f"*{ext}")))
-    
-    frame_files.sort()
-    print(f"📸 {len(frame_files)} frame bulundu")
+    # Batch inference + manifest: tekrar çalıştırmada sadece yeni/değişen frame'ler işlenir
+    from dataset_module.auto_labeler import AutoLabeler
+    labeler = AutoLabeler(model_path, frames_dir, labels_dir, conf=0.3)
+    summary = labeler.run()
     
-    if len(frame_files) == 0:
+    handled = summary['processed'] + summary['up_to_date'] + summary['manual']
+    if handled == 0:
         print("❌ Frame bulunamadı!")
         return False
     
-    total_detections = 0
-    successful_frames = 0
-    
-    print(f"\n🔄 Otomatik etiketleme başlıyor...")
-    
-    # Her frame'i işle
-    for i, frame_path in enumerate(frame_files, 1):
-        
-        # İlerleme göster
-        if i % 100 == 0 or i == 1:
-            progress = (i / len(frame_files)) * 100
-            print(f"🔍 İşleniyor {i}/{len(frame_files)}: {progress:.1f}% - {frame_path.name}")
-        
-        # YOLO inference
-        try:
-            results = model(str(frame_path), conf=0.3, verbose=False)
-        except Exception as e:
-            print(f"❌ Model inference hatası {frame_path.name}: {e}")
-            continue
-        
-        # Label dosya yolu
-        label_file = os.path.join(labels_dir, frame_path.stem + '.txt')
-        
-        # Tespit edilen objeler
-        detections = []
-        frame_detections = 0
-        
-        for result in results:
-            boxes = result.boxes
-            if boxes is not None:
-                for box in boxes:
-                    # Class ID
-                    class_id = int(box.cls[0])
-                    confidence = float(box.conf[0])
-                    
-                    # Sadece person class'ı (0) al
-                    if class_id == 0 and confidence > 0.3:
-                        # Bounding box koordinatları (normalized)
-                        x_center, y_center, width, height = box.xywhn[0]
-                        
-                        # YOLO format: class_id x_center y_center width height
-                        # Varsayılan olarak person_swimming (0) ata
-                        yolo_class = 0  # person_swimming
-                        detection_line = f"{yolo_class} {x_center:.6f} {y_center:.6f} {width:.6f} {height:.6f}"
-                        detections.append(detection_line)
-                        frame_detections += 1
-                        total_detections += 1
-        
-        # Label dosyasını yaz
-        with open(label_file, 'w') as f:
-            if detections:
-                f.write('\n'.join(detections))
-            else:
-                f.write('')  # Boş dosya oluştur
-        
-        if detections:
-            successful_frames += 1
-    
     print(f"\n🎉 Otomatik etiketleme tamamlandı!")
-    print(f"   📊 İşlenen frame: {len(frame_files)}")
-    print(f"   ✅ Etiketli frame: {successful_frames}")
-    print(f"   🏷️  Toplam tespit: {total_detections}")
+    print(f"   📊 İşlenen frame: {summary['processed']} (güncel: {summary['up_to_date']}, "
+          f"elle düzenlenmiş: {summary['manual']})")
+    print(f"   🏷️  Toplam tespit: {summary['detections']}")
     print(f"   📁 Label klasörü: {labels_dir}")
-    print(f"   📈 Ortalama tespit/frame: {total_detections/len(frame_files):.1f}")
+    if summary['processed']:
+        print(f"   📈 Ortalama tespit/frame: {summary['detections']/summary['processed']:.1f}")
     
     return True
 
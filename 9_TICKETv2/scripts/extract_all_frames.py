@@ -10,6 +10,10 @@ import os
 import sys
 from pathlib import Path
 
+# 1_CODES'u path'e ekle
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "1_CODES"))
+from dataset_module.frame_extractor import extract_frames
+
 def extract_all_frames_from_video():
     """Havuz_telefon_hasimcan.MOV'dan tüm frame'leri çıkar"""
     
@@ -46,50 +50,26 @@ def extract_all_frames_from_video():
     print(f"   Total Frames: {total_frames}")
     print(f"   Duration: {duration:.1f} seconds")
     
-    # Frame aralığını hesapla (her saniyede 1 frame)
-    frame_step = int(fps)
-    estimated_frames = total_frames // frame_step
-    print(f"⏱️  Her {frame_step} frame'de bir çıkarılacak")
-    print(f"📸 Tahmini çıkarılacak frame sayısı: {estimated_frames}")
-    
-    # Çıktı klasörünü oluştur
-    os.makedirs(output_dir, exist_ok=True)
+    cap.release()
     
-    extracted_count = 0
-    frame_number = 0
+    # Her saniyede 1 frame (paralel süreçler, keyframe hizalı seek, kaldığı yerden devam)
+    estimated_frames = int(duration)
+    print(f"📸 Tahmini çıkarılacak frame sayısı: {estimated_frames}")
     
     print(f"\n🔄 Frame extraction başlıyor...")
     
-    # Frame çıkarma döngüsü
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        # Her 'frame_step' frame'de bir kaydet
-        if frame_number % frame_step == 0:
-            # Frame dosya adı (saniye bazında)
-            second = frame_number // frame_step
-            frame_filename = f"havuz_telefon_{second:04d}s.jpg"
-            frame_path = os.path.join(output_dir, frame_filename)
-            
-            # Frame'i kaydet
-            cv2.imwrite(frame_path, frame)
-            extracted_count += 1
-            
-            # İlerleme göster
-            if extracted_count % 20 == 0:
-                progress = (frame_number / total_frames) * 100
-                print(f"   📊 İşlenen: {extracted_count} frame ({progress:.1f}%)")
-        
-        frame_number += 1
-    
-    cap.release()
+    results, summary = extract_frames(video_path, output_dir, interval=1.0,
+                                      name_pattern="havuz_telefon_{index:04d}s.jpg",
+                                      with_summary=True)
+    total_count = len(results.get(video_path, []))
+    extracted_count = summary['written']
+    skipped_count = summary['skipped']
     
     print(f"\n🎉 Frame extraction tamamlandı!")
     print(f"   📸 Çıkarılan frame sayısı: {extracted_count}")
+    print(f"   ⏭️  Zaten mevcut (atlandı): {skipped_count}")
     print(f"   📁 Frames klasörü: {output_dir}")
-    print(f"   ⏱️  Süre: {duration:.1f} saniye → {extracted_count} frame")
+    print(f"   ⏱️  Süre: {duration:.1f} saniye → {total_count} frame")
     
     return True
 
@@ -6,10 +6,15 @@ GitHub'a upload etmek için küçük sample dataset oluşturur
 """
 
 import os
+import sys
 import shutil
 import random
 from pathlib import Path
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "1_CODES"))
+from dataset_module.dataset_index import DatasetIndex
+from dataset_module.materialize import materialize_pairs, print_materialize_result
+
 def create_mini_dataset(source_dir, target_dir, max_files=200):
     """
     GitHub'a upload edilecek mini dataset oluştur
@@ -38,52 +43,31 @@ def create_mini_dataset(source_dir, target_dir, max_files=200):
     print(f"🔍 Kaynak: {source_path}")
     print(f"📁 Hedef: {target_path}")
     
-    # Tüm frame dosyalarını listele
-    frame_files = list(frames_dir.glob("*.jpg"))
-    print(f"📸 Toplam frame: {len(frame_files)}")
+    # Frame listesi ve boyutları indeksten (dosya sistemi yeniden taranmaz)
+    with DatasetIndex(source_path) as index:
+        index.refresh()
+        frame_rows = index.frames(order_by='size')
+    print(f"📸 Toplam frame: {len(frame_rows)}")
     
-    # En kaliteli frame'leri seç (dosya boyutuna göre)
+    # En kaliteli frame'leri seç (dosya boyutuna göre, büyükten küçüğe)
     print("🎯 En kaliteli frame'ler seçiliyor...")
-    frame_sizes = []
-    for frame in frame_files:
-        if frame.exists():
-            size = frame.stat().st_size
-            frame_sizes.append((frame, size))
-    
-    # Büyükten küçüğe sırala
-    frame_sizes.sort(key=lambda x: x[1], reverse=True)
-    
-    # En iyi N tanesini seç
-    selected_frames = frame_sizes[:max_files]
-    
-    print(f"✅ Seçilen frame sayısı: {len(selected_frames)}")
-    
-    # Dosyaları kopyala
-    copied_count = 0
-    for frame_path, _ in selected_frames:
-        frame_name = frame_path.stem
-        
-        # Frame kopyala
-        source_frame = frame_path
-        target_frame = mini_frames / f"{frame_name}.jpg"
-        
-        # Label kopyala
-        source_label = labels_dir / f"{frame_name}.txt"
-        target_label = mini_labels / f"{frame_name}.txt"
-        
-        try:
-            # Frame kopyala
-            shutil.copy2(source_frame, target_frame)
-            
-            # Label varsa kopyala
-            if source_label.exists():
-                shutil.copy2(source_label, target_label)
-                copied_count += 1
-            else:
-                print(f"⚠️ Label bulunamadı: {frame_name}")
-                
-        except Exception as e:
-            print(f"❌ Hata {frame_name}: {e}")
+    selected_rows = frame_rows[:max_files]
+    
+    print(f"✅ Seçilen frame sayısı: {len(selected_rows)}")
+    
+    # Dosyaları kur (frame'ler hardlink/reflink, gerekirse kopya)
+    pairs = []
+    for row in selected_rows:
+        if row['label_size'] is not None:
+            pairs.append((row['file_name'], f"{row['stem']}.txt"))
+        else:
+            pairs.append((row['file_name'], None))
+            print(f"⚠️ Label bulunamadı: {row['stem']}")
+    result = materialize_pairs(pairs, frames_dir, labels_dir, mini_frames, mini_labels)
+    print_materialize_result(result, "Mini dataset")
+    failed = {frame_name for frame_name, _ in result['failed']}
+    copied_count = sum(1 for frame_name, label_name in pairs
+                       if label_name is not None and frame_name not in failed)
     
     # Classes dosyasını kopyala
     classes_file = source_path / "classes.txt"
@@ -9,10 +9,18 @@ import cv2
 import numpy as np
 from collections import defaultdict, deque
 import json
+import os
+import sys
 import time
 from dataclasses import dataclass
 from typing import List, Tuple, Optional, Dict
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "1_CODES"))
+from video_module.overlay_renderer import OverlayRenderer
+from video_module.track_archive import TrackArchive, TrackLifecycle
+from video_module.spatial_hash import SpatialHash
+from video_module.appearance import AppearanceGallery, extract_descriptors
+
 @dataclass
 class Detection:
     """Tek bir detection bilgisi"""
@@ -21,6 +29,7 @@ class Detection:
     confidence: float
     area: float
     in_pool: bool
+    appearance: Optional[np.ndarray] = None  # HSV histogram tanımlayıcısı (re-ID)
 
 @dataclass
 class Track:
@@ -46,21 +55,35 @@ class ImprovedPoolTracker:
     3. Velocity-based matching
     4. Memory efficient tracking
     5. Robust ID consistency
+    6. İki aşamalı (yüksek / düşük confidence) eşleştirme
+    7. Görünüm tabanlı re-ID (kaybolup geri gelen kişi eski ID'sini alır)
     """
     
-    def __init__(self, config=None):
-        """Initialize tracker with optimized parameters"""
+    def __init__(self, config=None, archive_path=None):
+        """
+        Initialize tracker with optimized parameters
+        
+        Args:
+            archive_path: Ölen track özetlerinin yazılacağı JSONL (None: sadece bellekten atılır)
+        """
         
         # Tracking parametreleri
         self.max_track_distance = 80      # Daha sıkı distance threshold
         self.max_lost_frames = 15         # Kaç frame kaybolabilir
         self.position_history_size = 10   # Position history buffer
-        self.confidence_threshold = 0.3   # Minimum detection confidence
+        self.confidence_threshold = 0.3   # Minimum detection confidence (yeni track açabilir)
+        self.low_confidence_threshold = 0.1  # Bunun üstü sadece mevcut track'leri uzatır
         
         # Velocity tracking için
         self.velocity_weight = 0.3        # Velocity prediction ağırlığı
         self.position_weight = 0.7        # Position matching ağırlığı
         
+        # Görünüm (re-ID) parametreleri
+        self.appearance_weight = 0.3      # Görünüm mesafesi skor cezası ağırlığı
+        self.reid_distance = 0.25         # Kayıp track'e geri bağlama için en büyük görünüm mesafesi
+        self.reid_max_travel = 240        # Son görüldüğü yerden en fazla uzaklık (piksel)
+        self.gallery = AppearanceGallery()
+        
         # Tracking state
         self.tracks: Dict[int, Track] = {}
         self.next_track_id = 1
@@ -73,6 +96,18 @@ class ImprovedPoolTracker:
         self.total_detections = 0
         self.total_tracks_created = 0
         self.id_switches = 0
+        self.total_low_confidence_matches = 0
+        self.total_reidentified = 0
+        
+        # Track yaşam döngüsü: kaybolan track'ler self.tracks'ten çıkarılıp arşivlenir
+        archive = TrackArchive(archive_path, pipeline="improved_tracker") if archive_path else None
+        # Kayıp track'in özeti galerinin re-ID penceresi boyunca bekletilir:
+        # geri gelen track arşivde ikinci bir kayıt açmaz
+        self.lifecycle = TrackLifecycle(archive, hold_frames=self.gallery.max_lost_frames,
+                                        max_held=self.gallery.max_lost)
+        
+        # Statik çizim katmanı (pool sınırı bir kez rasterize edilir)
+        self.renderer = OverlayRenderer()
         
         print("🚀 Improved Pool Tracker initialized")
         
@@ -80,6 +115,8 @@ class ImprovedPoolTracker:
         """Havuz alanını set et"""
         if polygon_points is not None:
             self.pool_polygon = np.array(polygon_points, dtype=np.int32)
+            self.renderer.clear()
+            self.renderer.add_polygon(self.pool_polygon, outline_color=(0, 255, 255), outline_thickness=2)
             print(f"✅ Pool area set with {len(polygon_points)} points")
         
     def is_point_in_pool(self, x: int, y: int) -> bool:
@@ -163,25 +200,43 @@ class ImprovedPoolTracker:
             0.1 * pool_consistency
         )
         
+        # Görünüm cezası (tanımlayıcı ve track örneği varsa)
+        if detection.appearance is not None and track.track_id in self.gallery.samples:
+            appearance_distance = self.gallery.distances([track.track_id], detection.appearance[None, :])[0, 0]
+            total_score -= self.appearance_weight * appearance_distance
+        
         return total_score
     
-    def process_detections(self, detections: List[Detection]) -> Dict[int, Detection]:
-        """Frame'deki tüm detections'ı işle ve track ID'leri ata"""
+    def process_detections(self, detections: List[Detection],
+                           low_confidence_detections: Optional[List[Detection]] = None) -> Dict[int, Detection]:
+        """
+        Frame'deki tüm detections'ı işle ve track ID'leri ata
+        
+        ByteTrack tarzı: track'ler önce yüksek confidence'lı detection'larla,
+        kalanlar düşük confidence'lılarla eşleştirilir. Düşük confidence'lı
+        detection'lar sadece mevcut track'leri uzatır, yeni track açmaz.
+        """
         
         self.frame_number += 1
         self.total_detections += len(detections)
         
         # Active tracks'leri güncelle (lost frame sayısını artır)
         for track in self.tracks.values():
-            if track.is_active:
-                track.lost_frames += 1
-                if track.lost_frames > self.max_lost_frames:
-                    track.is_active = False
-                    print(f"🔄 Track {track.track_id} deactivated (lost too long)")
+            track.lost_frames += 1
+        
+        # Çok uzun kaybolanları çıkar ve arşivle (sonraki kareler sadece canlı track'leri tarar);
+        # görünüm örnekleri re-ID için galeride kalır
+        for track_id in self.lifecycle.evict(self.tracks, self._is_lost, frame_number=self.frame_number,
+                                             on_evict=self._mark_lost):
+            print(f"🔄 Track {track_id} archived (lost too long)")
         
         # Detection to track matching
         assignment = self._assign_detections_to_tracks(detections)
         
+        # Eşleşmeyenler: önce görünümle kayıp track'lere geri bağla
+        new_indices = [detection_idx for detection_idx, track_id in assignment.items() if track_id == -1]
+        assignment.update(self._reidentify(detections, new_indices))
+        
         # Results
         tracked_detections = {}
         
@@ -190,26 +245,54 @@ class ImprovedPoolTracker:
             
             if track_id == -1:  # Yeni track
                 track_id = self._create_new_track(detection)
+            elif track_id not in self.tracks:  # Görünümle geri gelen track
+                self._create_new_track(detection, track_id)
             else:  # Existing track update
                 self._update_track(track_id, detection)
             
             tracked_detections[track_id] = detection
         
+        # 2. aşama: eşleşmeyen track'ler <-> düşük confidence (yeni track yok)
+        if low_confidence_detections:
+            low_assignment = self._assign_detections_to_tracks(
+                low_confidence_detections, used_tracks=set(tracked_detections)
+            )
+            for detection_idx, track_id in low_assignment.items():
+                if track_id != -1:
+                    detection = low_confidence_detections[detection_idx]
+                    self._update_track(track_id, detection)
+                    tracked_detections[track_id] = detection
+                    self.total_low_confidence_matches += 1
+        
         return tracked_detections
     
-    def _assign_detections_to_tracks(self, detections: List[Detection]) -> Dict[int, int]:
-        """Hungarian algorithm benzeri assignment"""
+    def _assign_detections_to_tracks(self, detections: List[Detection],
+                                     used_tracks: Optional[set] = None) -> Dict[int, int]:
+        """Hungarian algorithm benzeri assignment (used_tracks: bu karede zaten eşleşmiş olanlar)"""
         
         assignment = {}
-        used_tracks = set()
+        used_tracks = set(used_tracks or ())
+        
+        # Aday track'ler: son veya tahmini pozisyonu max_track_distance içinde olanlar
+        # (ikisi de uzaktaysa skor en fazla 0.3 olur, 0.5 eşiğini geçemez)
+        track_ids = [track_id for track_id, track in self.tracks.items() if track.is_active]
+        points, owners = [], []
+        for index, track_id in enumerate(track_ids):
+            track = self.tracks[track_id]
+            points.append(track.positions[-1])
+            points.append(self.predict_next_position(track))
+            owners.extend((index, index))
+        spatial_hash = SpatialHash.build(points, self.max_track_distance)
         
         # Her detection için en iyi track'i bul
         for det_idx, detection in enumerate(detections):
             best_track_id = -1
             best_score = 0.5  # Minimum threshold
             
-            for track_id, track in self.tracks.items():
-                if not track.is_active or track_id in used_tracks:
+            for index in sorted({owners[k] for k in spatial_hash.query(*detection.center)}):
+                track_id = track_ids[index]
+                track = self.tracks[track_id]
+                if track_id in used_tracks:
                     continue
                 
                 score = self.calculate_matching_score(detection, track)
@@ -225,12 +308,34 @@ class ImprovedPoolTracker:
         
         return assignment
     
-    def _create_new_track(self, detection: Detection) -> int:
-        """Yeni track oluştur"""
+    def _is_lost(self, track: Track) -> bool:
+        """Track çok uzun kayıp mı"""
+        return track.lost_frames > self.max_lost_frames
+    
+    def _mark_lost(self, track_id: int, track: Track):
+        """Track kayıp olarak çıkarılıyor: görünümünü galeride kayıp olarak işaretle"""
+        self.gallery.mark_lost(track_id, self.frame_number, track.positions[-1])
+    
+    def _reidentify(self, detections: List[Detection], indices: List[int]) -> Dict[int, int]:
+        """Eşleşmeyen detection'ları görünümle kayıp track'lere bağla: detection_idx -> track_id"""
+        indices = [i for i in indices if detections[i].appearance is not None]
+        if not indices:
+            return {}
+        descriptors = np.stack([detections[i].appearance for i in indices])
+        positions = [detections[i].center for i in indices]
+        matches = self.gallery.reidentify(descriptors, self.frame_number, positions,
+                                          max_distance=self.reid_distance, max_travel=self.reid_max_travel)
+        self.total_reidentified += len(matches)
+        return {indices[k]: track_id for k, track_id in matches}
+    
+    def _create_new_track(self, detection: Detection, track_id: Optional[int] = None) -> int:
+        """Yeni track oluştur (track_id: görünümle geri bağlanan kayıp track)"""
         
-        track_id = self.next_track_id
-        self.next_track_id += 1
-        self.total_tracks_created += 1
+        revived = track_id is not None
+        if not revived:
+            track_id = self.next_track_id
+            self.next_track_id += 1
+            self.total_tracks_created += 1
         
         new_track = Track(
             track_id=track_id,
@@ -246,8 +351,14 @@ class ImprovedPoolTracker:
         )
         
         self.tracks[track_id] = new_track
+        if revived:
+            self.lifecycle.revive(track_id)
+        self._observe(track_id, detection)
         
-        print(f"🆕 New track created: ID {track_id} at {detection.center}")
+        if revived:
+            print(f"♻️ Track re-identified: ID {track_id} at {detection.center}")
+        else:
+            print(f"🆕 New track created: ID {track_id} at {detection.center}")
         return track_id
     
     def _update_track(self, track_id: int, detection: Detection):
@@ -272,6 +383,17 @@ class ImprovedPoolTracker:
         track.last_seen_frame = self.frame_number
         track.lost_frames = 0
         track.is_active = True
+        self._observe(track_id, detection)
+    
+    def _observe(self, track_id: int, detection: Detection):
+        """Arşiv özeti ve görünüm galerisi için track gözlemi"""
+        self.gallery.add(track_id, detection.appearance)
+        class_name = "person_swimming" if detection.in_pool else "person_poolside"
+        self.lifecycle.observe(track_id, self.frame_number, detection.center, detection.in_pool, class_name)
+    
+    def close(self):
+        """Kalan track'leri arşivle ve arşivi kapat"""
+        self.lifecycle.close()
     
     def get_active_tracks(self) -> Dict[int, Track]:
         """Active track'leri döndür"""
@@ -286,18 +408,20 @@ class ImprovedPoolTracker:
             'total_detections': self.total_detections,
             'total_tracks_created': self.total_tracks_created,
             'active_tracks': active_count,
+            'archived_tracks': self.lifecycle.retired,
+            'low_confidence_matches': self.total_low_confidence_matches,
+            'reidentified': self.total_reidentified,
             'id_switches': self.id_switches,
             'avg_detections_per_frame': self.total_detections / max(1, self.frame_number)
         }
     
     def visualize_tracks(self, frame: np.ndarray, tracked_detections: Dict[int, Detection]) -> np.ndarray:
-        """Track'leri frame üzerine çiz"""
+        """Track'leri frame üzerine çiz (kare yerinde çizilir, kopya alınmaz)"""
         
-        vis_frame = frame.copy()
+        vis_frame = frame
         
         # Pool area çiz
-        if self.pool_polygon is not None:
-            cv2.polylines(vis_frame, [self.pool_polygon], True, (0, 255, 255), 2)
+        self.renderer.composite(vis_frame)
         
         # Her track için
         for track_id, detection in tracked_detections.items():
@@ -323,19 +447,14 @@ class ImprovedPoolTracker:
                 # Pool dışı - daha mat
                 color = tuple(max(0, c - 50) for c in color)
             
-            # Rectangle çiz
-            cv2.rectangle(vis_frame, (x1, y1), (x2, y2), color, 2)
-            
-            # Track ID ve info
+            # Rectangle + Track ID ve info
             info_text = f"ID:{track_id} ({track_age}f)"
-            cv2.putText(vis_frame, info_text, (x1, y1-10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+            self.renderer.draw_box(vis_frame, (x1, y1, x2, y2), color, 2, label=info_text)
             
-            # Trajectory çiz (son 5 position)
+            # Trajectory çiz (son 5 position, tek polylines)
             if len(track.positions) > 1:
                 points = list(track.positions)[-5:]  # Son 5 pozisyon
-                for i in range(1, len(points)):
-                    cv2.line(vis_frame, points[i-1], points[i], color, 2)
+                self.renderer.draw_trajectory(vis_frame, points, color, 2)
             
             # Velocity arrow
             if abs(track.velocity[0]) > 2 or abs(track.velocity[1]) > 2:
@@ -355,9 +474,7 @@ class ImprovedPoolTracker:
             f"Avg detections/frame: {stats['avg_detections_per_frame']:.1f}"
         ]
         
-        for i, text in enumerate(stats_text):
-            cv2.putText(vis_frame, text, (10, 30 + i*25), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        self.renderer.draw_text_lines(vis_frame, stats_text, (10, 30), 25)
         
         return vis_frame
 
@@ -393,11 +510,12 @@ def test_improved_tracker():
         
         frame_count += 1
         
-        # YOLO detection
-        results = model(frame, conf=0.3, classes=[0], verbose=False)
+        # YOLO detection (düşük eşikle; ikinci inference yok)
+        results = model(frame, conf=tracker.low_confidence_threshold, classes=[0], verbose=False)
         
-        # Convert to Detection objects
+        # Convert to Detection objects (yüksek / düşük confidence ayrı)
         detections = []
+        low_confidence_detections = []
         if results[0].boxes is not None:
             for box in results[0].boxes:
                 x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
@@ -415,10 +533,18 @@ def test_improved_tracker():
                     area=area,
                     in_pool=in_pool
                 )
-                detections.append(detection)
+                if conf >= tracker.confidence_threshold:
+                    detections.append(detection)
+                else:
+                    low_confidence_detections.append(detection)
+        
+        # Görünüm vektörleri (re-ID, tüm kutular tek seferde)
+        candidates = detections + low_confidence_detections
+        for detection, descriptor in zip(candidates, extract_descriptors(frame, [d.bbox for d in candidates])):
+            detection.appearance = descriptor
         
         # Tracking process
-        tracked_detections = tracker.process_detections(detections)
+        tracked_detections = tracker.process_detections(detections, low_confidence_detections)
         
         # Visualization
         vis_frame = tracker.visualize_tracks(frame, tracked_detections)
@@ -435,6 +561,7 @@ def test_improved_tracker():
     
     cap.release()
     cv2.destroyAllWindows()
+    tracker.close()
     
     # Final statistics
     final_stats = tracker.get_track_statistics()
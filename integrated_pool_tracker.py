@@ -7,8 +7,8 @@ Havuz alanı + İyileştirilmiş tracking + Adaptive threshold
 
 import cv2
 import numpy as np
-import json
 import os
+import sys
 import time
 from datetime import datetime
 from collections import deque
@@ -16,13 +16,13 @@ from dataclasses import dataclass
 from typing import List, Tuple, Optional, Dict
 from ultralytics import YOLO
 
-@dataclass
-class PoolZone:
-    """Havuz alanı bilgileri"""
-    polygon: np.ndarray
-    center: Tuple[int, int]
-    area: float
-    confidence_threshold: float = 0.15  # Havuz içi daha hassas
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "1_CODES"))
+from video_module.overlay_renderer import OverlayRenderer
+from pool_module.pool_registry import get_registry, normalize_key
+from pool_module.zone_map import ZoneMap, load_zone_map
+from detection_module.static_suppression import StaticSuppressionMap
+from detection_module.inference_server import InferenceClient
+from core.config import Inference
 
 @dataclass
 class Detection:
@@ -32,16 +32,18 @@ class Detection:
     confidence: float
     area: float
     in_pool: bool
-    zone_distance: float  # Havuz merkezine uzaklık
+    zone_distance: float  # Bölge merkezine uzaklık
+    zone_id: int = 0      # 0: hiçbir bölge (arka plan)
+    zone_name: str = "background"
 
 class IntegratedPoolTracker:
     """
     🎯 Entegre havuz tracking sistemi
     
     Özellikler:
-    1. Adaptive confidence threshold (havuz içi/dışı)
+    1. Adaptive confidence threshold (bölge bazlı)
     2. Pool area integration
-    3. Zone-based optimization
+    3. Multi-zone map (kulvar, derin / sığ, merdiven, yansıma)
     4. Advanced tracking algorithm
     5. Real-time performance
     """
@@ -51,12 +53,21 @@ class IntegratedPoolTracker:
         
         print("🏊 Integrated Pool Tracker Starting...")
         
-        # Model yükle
-        self.model = YOLO(model_path)
-        print(f"✅ Model loaded: {os.path.basename(model_path)}")
+        # Model yükle (POOL_INFERENCE_SERVER varsa ağırlıklar ortak sunucuda)
+        if Inference.SERVER:
+            self.model = InferenceClient.connect(Inference.SERVER)
+            print(f"🧠 Inference server: {Inference.SERVER}")
+        else:
+            self.model = YOLO(model_path)
+            print(f"✅ Model loaded: {os.path.basename(model_path)}")
+        
+        # Bölge haritası (tek etiket rasterı; bölge başına eşik / tracker / alarm)
+        self.zone_map: Optional[ZoneMap] = None
         
-        # Pool zones
-        self.pool_zones: List[PoolZone] = []
+        # Öğrenilen statik yanlış pozitif haritası (ilk karede boyuta göre oluşur)
+        self.suppression: Optional[StaticSuppressionMap] = None
+        self.suppression_path: Optional[str] = None
+        self.suppressed_count = 0
         
         # Tracking parameters
         self.max_track_distance = 80
@@ -66,176 +77,155 @@ class IntegratedPoolTracker:
         # Adaptive thresholds - ÇOK HASSAS AYARLAR
         self.pool_confidence = 0.05      # Havuz içi - ÇOK HASSAS
         self.outside_confidence = 0.15   # Havuz dışı - HASSAS
-        self.water_reflection_threshold = 0.25  # Su yansıması - GEVŞETİLDİ
+        # Derin / sığ / yansıma bölgelerinin eşikleri: pool_module.zone_map.ZONE_TYPES
         
         # Tracking state
         self.tracks = {}
         self.next_track_id = 1
         self.frame_number = 0
+        self.frame_shape = None
         
         # Performance monitoring
         self.fps_tracker = deque(maxlen=30)  # Son 30 frame FPS
         self.detection_counts = deque(maxlen=100)
         
+        # Rendering - statik katmanlar bir kez hazırlanır
+        # (render_enabled=False: video çıktısı yoksa çizim tamamen atlanır)
+        self.render_enabled = True
+        self.scene_layer = OverlayRenderer()
+        self.hud_layer = OverlayRenderer()
+        self.build_static_layers()
+        
         print("🚀 Integrated Pool Tracker Ready!")
     
+    def set_zone_map(self, zone_map: ZoneMap):
+        """Bölge haritasını ayarla ve statik katmanları yeniden hazırla"""
+        self.zone_map = zone_map
+        self.build_static_layers()
+        
+        print(f"✅ Zone map loaded: {os.path.basename(zone_map.source or '')} ({len(zone_map)} zones)")
+        for zone in zone_map:
+            print(f"   {zone.zone_id:2d} {zone.name:<16} {zone.kind:<10} conf>={zone.confidence:.2f}")
+    
     def load_pool_area_from_json(self, json_path: str) -> bool:
-        """JSON dosyasından havuz alanı yükle"""
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                pool_data = json.load(f)
-            
-            polygon = np.array(pool_data['polygon_points'], dtype=np.int32)
-            
-            # Pool zone bilgileri hesapla
-            center_x = int(np.mean(polygon[:, 0]))
-            center_y = int(np.mean(polygon[:, 1]))
-            area = cv2.contourArea(polygon)
-            
-            pool_zone = PoolZone(
-                polygon=polygon,
-                center=(center_x, center_y),
-                area=area,
-                confidence_threshold=self.pool_confidence
-            )
-            
-            self.pool_zones = [pool_zone]  # Tek havuz şimdilik
-            
-            print(f"✅ Pool area loaded: {os.path.basename(json_path)}")
-            print(f"📐 Pool center: {pool_zone.center}")
-            print(f"📏 Pool area: {area:.0f} pixels")
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ Pool area loading error: {e}")
+        """JSON dosyasından havuz alanı yükle (registry'de derlenmiş geometri, tek bölge)"""
+        pool_area = get_registry(os.path.dirname(json_path)).load(json_path)
+        if pool_area is None:
+            print(f"❌ Pool area loading error: {os.path.basename(json_path)}")
             return False
-    
-    def find_pool_json_for_video(self, video_name: str) -> Optional[str]:
-        """Video için havuz JSON dosyasını otomatik bul"""
-        
-        output_dir = "3_OUTPUT"
-        if not os.path.exists(output_dir):
-            return None
-        
-        video_base = os.path.splitext(video_name)[0].replace(" ", "_")
-        
-        # Pool area JSON files ara
-        pool_files = []
-        for file in os.listdir(output_dir):
-            if file.startswith("pool_area_") and file.endswith(".json"):
-                if video_base.upper() in file.upper():
-                    pool_files.append(os.path.join(output_dir, file))
-        
-        if pool_files:
-            # En son dosyayı seç
-            pool_files.sort(reverse=True)
-            return pool_files[0]
-        
-        return None
-    
-    def get_adaptive_confidence(self, center_x: int, center_y: int) -> float:
-        """Adaptive confidence threshold - havuz içi/dışı"""
         
-        if not self.pool_zones:
-            return self.outside_confidence
+        self.set_zone_map(ZoneMap.from_pool_area(pool_area, confidence=self.pool_confidence))
+        print(f"📐 Pool center: {pool_area.centroid}")
+        print(f"📏 Pool area: {pool_area.area:.0f} pixels")
         
-        pool_zone = self.pool_zones[0]
-        
-        # Havuz içinde mi kontrol et
-        result = cv2.pointPolygonTest(pool_zone.polygon, (center_x, center_y), True)
-        
-        if result >= 0:  # Havuz içi
-            # Havuz merkezine uzaklığa göre ayarla
-            distance_to_center = np.sqrt(
-                (center_x - pool_zone.center[0])**2 + 
-                (center_y - pool_zone.center[1])**2
-            )
-            
-            # Merkeze yakınsa daha hassas
-            if distance_to_center < 100:
-                return self.pool_confidence * 0.8  # %20 daha hassas
-            else:
-                return self.pool_confidence
-        else:  # Havuz dışı
-            return self.outside_confidence
+        return True
     
-    def is_water_reflection_area(self, center_x: int, center_y: int) -> bool:
-        """Su yansıması alanında mı kontrol et"""
-        
-        if not self.pool_zones:
+    def load_zones_for_video(self, video_name: str) -> bool:
+        """Video için bölge haritası (pool_zones_*.json, yoksa pool_area_*.json)"""
+        # Kameraya ait bastırma haritası (çalıştırmalar arasında korunur)
+        self.suppression = None
+        self.suppression_path = os.path.join("3_OUTPUT", f"static_suppression_{normalize_key(video_name)}.npz")
+        
+        zone_map = load_zone_map(video_name, "3_OUTPUT")
+        if zone_map is None:
             return False
-        
-        pool_zone = self.pool_zones[0]
-        
-        # Havuz merkezine çok yakınsa yansıma olabilir
-        distance_to_center = np.sqrt(
-            (center_x - pool_zone.center[0])**2 + 
-            (center_y - pool_zone.center[1])**2
-        )
-        
-        # Merkeze çok yakın alanlar yansıma riski taşır
-        return distance_to_center < 50
+        self.set_zone_map(zone_map)
+        return True
+    
+    def find_pool_json_for_video(self, video_name: str) -> Optional[str]:
+        """Video için havuz JSON dosyasını otomatik bul (registry, O(1))"""
+        pool_area = get_registry("3_OUTPUT").find(video_name)
+        return pool_area.path if pool_area is not None else None
+    
+    def get_zone_ids(self, frame_shape, xs, ys) -> np.ndarray:
+        """Noktaların bölge ID'leri (tek raster indekslemesi; harita yoksa 0)"""
+        if self.zone_map is None:
+            return np.zeros(np.shape(xs), dtype=np.uint8)
+        return self.zone_map.zone_ids(frame_shape, xs, ys)
+    
+    def get_adaptive_confidence(self, zone_ids: np.ndarray) -> np.ndarray:
+        """Bölge bazlı confidence eşikleri (harita yoksa havuz dışı eşiği)"""
+        if self.zone_map is None:
+            return np.full(np.shape(zone_ids), self.outside_confidence, dtype=np.float32)
+        return self.zone_map.confidence_table[zone_ids]
     
     def detect_with_adaptive_threshold(self, frame: np.ndarray) -> List[Detection]:
-        """Adaptive threshold ile detection"""
+        """Adaptive threshold ile detection (bölge başına eşik)"""
         
-        # İlk geçiş - düşük threshold ile tüm potansiyel detections
-        results = self.model(frame, conf=0.1, classes=[0], verbose=False)
+        # İlk geçiş - en düşük bölge eşiğiyle tüm potansiyel detections; bölge eşikleri
+        # aşağıda uygulanır (model daha yüksek bir eşikle çalışırsa derin su / havuz
+        # eşikleri hiç etkili olmaz)
+        base_confidence = self.zone_map.min_confidence if self.zone_map is not None else self.outside_confidence
+        results = self.model(frame, conf=base_confidence, classes=[0], verbose=False)
+        self.frame_shape = frame.shape
         
         detections = []
         
-        if results[0].boxes is not None:
-            for box in results[0].boxes:
-                x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                confidence = float(box.conf.item())
-                
-                center_x = (x1 + x2) // 2
-                center_y = (y1 + y2) // 2
-                area = (x2 - x1) * (y2 - y1)
-                
-                # Adaptive threshold hesapla
-                required_confidence = self.get_adaptive_confidence(center_x, center_y)
-                
-                # Su yansıması kontrolü
-                if self.is_water_reflection_area(center_x, center_y):
-                    required_confidence = self.water_reflection_threshold
-                
-                # Confidence check
-                if confidence >= required_confidence:
-                    # Pool membership
-                    in_pool = self.is_point_in_pool(center_x, center_y)
-                    
-                    # Zone distance
-                    zone_distance = 0
-                    if self.pool_zones:
-                        pool_center = self.pool_zones[0].center
-                        zone_distance = np.sqrt(
-                            (center_x - pool_center[0])**2 + 
-                            (center_y - pool_center[1])**2
-                        )
-                    
-                    detection = Detection(
-                        bbox=(x1, y1, x2, y2),
-                        center=(center_x, center_y),
-                        confidence=confidence,
-                        area=area,
-                        in_pool=in_pool,
-                        zone_distance=zone_distance
-                    )
-                    
-                    detections.append(detection)
+        if self.suppression is None:
+            self.suppression = StaticSuppressionMap.load_or_create(self.suppression_path, frame.shape)
+        
+        boxes = results[0].boxes
+        if boxes is not None and len(boxes):
+            xyxy = boxes.xyxy.cpu().numpy().astype(int)
+            confidences = boxes.conf.cpu().numpy()
+        else:
+            xyxy = np.empty((0, 4), dtype=int)
+            confidences = np.empty(0, dtype=np.float32)
+        centers_x = (xyxy[:, 0] + xyxy[:, 2]) // 2
+        centers_y = (xyxy[:, 1] + xyxy[:, 3]) // 2
+        
+        # Bölge ID'leri ve eşikler - tüm kutular için tek seferde
+        zone_ids = self.get_zone_ids(frame.shape, centers_x, centers_y)
+        required = self.get_adaptive_confidence(zone_ids)
+        passed = np.flatnonzero(confidences >= required)
+        
+        # Statik gürültü hücrelerindeki düşük confidence'lı tespitleri düşür, haritayı güncelle
+        # (su içi bölgeler hariç: hareketsiz kalan kişi olası kurban, bastırılmaz)
+        eligible = self.zone_map.suppress_table[zone_ids[passed]] if self.zone_map is not None else None
+        keep = self.suppression.process(centers_x[passed], centers_y[passed], confidences[passed],
+                                        eligible=eligible)
+        self.suppressed_count += int(len(passed) - keep.sum())
+        
+        for i in passed[keep]:
+            x1, y1, x2, y2 = (int(v) for v in xyxy[i])
+            center_x, center_y = int(centers_x[i]), int(centers_y[i])
+            zone = self.zone_map.zone(zone_ids[i]) if self.zone_map is not None else None
+            
+            # Bölge merkezine uzaklık (bölge dışıysa havuzun kendisine)
+            zone_distance = 0
+            reference = zone if zone is not None and zone.zone_id else (
+                self.zone_map.primary if self.zone_map is not None else None)
+            if reference is not None:
+                zone_distance = np.sqrt(
+                    (center_x - reference.centroid[0])**2 + 
+                    (center_y - reference.centroid[1])**2
+                )
+            
+            detection = Detection(
+                bbox=(x1, y1, x2, y2),
+                center=(center_x, center_y),
+                confidence=float(confidences[i]),
+                area=(x2 - x1) * (y2 - y1),
+                in_pool=zone.in_pool if zone is not None else False,
+                zone_distance=zone_distance,
+                zone_id=int(zone_ids[i]),
+                zone_name=zone.name if zone is not None else "background"
+            )
+            
+            detections.append(detection)
         
         self.detection_counts.append(len(detections))
         return detections
     
     def is_point_in_pool(self, x: int, y: int) -> bool:
-        """Nokta havuz içinde mi?"""
-        if not self.pool_zones:
+        """Nokta havuz içinde mi? (suda sayılan herhangi bir bölge)"""
+        if self.zone_map is None:
             return False
-        
-        result = cv2.pointPolygonTest(self.pool_zones[0].polygon, (x, y), False)
-        return result >= 0
+        if self.frame_shape is None:
+            # Henüz kare görülmedi: raster boyutu bilinmiyor, ana havuz poligonu
+            primary = self.zone_map.primary
+            return primary is not None and cv2.pointPolygonTest(primary.polygon, (x, y), False) >= 0
+        return self.zone_map.zone_at(self.frame_shape, x, y).in_pool
     
     def process_video_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, Dict]:
         """Tek frame işle - detection + tracking + visualization"""
@@ -253,35 +243,50 @@ class IntegratedPoolTracker:
         fps = 1.0 / frame_time if frame_time > 0 else 0
         self.fps_tracker.append(fps)
         
-        # Visualization
-        vis_frame = self.visualize_frame(frame, detections)
+        # Visualization (video çıktısı yoksa atlanır)
+        vis_frame = self.visualize_frame(frame, detections) if self.render_enabled else frame
         
         # Statistics
         stats = {
             'frame_number': self.frame_number,
             'detections': len(detections),
             'pool_detections': sum(1 for d in detections if d.in_pool),
+            'suppressed_total': self.suppressed_count,
+            'zone_detections': {name: sum(1 for d in detections if d.zone_name == name)
+                                for name in {d.zone_name for d in detections}},
             'fps': fps,
             'avg_fps': np.mean(self.fps_tracker) if self.fps_tracker else 0
         }
         
         return vis_frame, stats
     
+    def build_static_layers(self):
+        """Havuz sınırı, merkez ve panel arka planını statik katmanlara hazırla"""
+        
+        self.scene_layer.clear()
+        if self.zone_map is not None:
+            for zone in self.zone_map:
+                self.scene_layer.add_polygon(zone.polygon, outline_color=zone.color,
+                                             outline_thickness=3 if zone.kind == 'pool' else 2)
+                
+                # Bölge merkezi + adı
+                self.scene_layer.add_circle(zone.centroid, 6, zone.color)
+                self.scene_layer.add_text(zone.name.upper(), (zone.centroid[0] + 10, zone.centroid[1]),
+                                          zone.color)
+        
+        # Panel background (%70 siyah) + başlık
+        panel_height = 150
+        self.hud_layer.clear()
+        self.hud_layer.add_rectangle((10, 10), (500, panel_height), (0, 0, 0), alpha=0.7)
+        self.hud_layer.add_text("INTEGRATED POOL TRACKER", (20, 35), (255, 255, 255), font_scale=0.8)
+    
     def visualize_frame(self, frame: np.ndarray, detections: List[Detection]) -> np.ndarray:
-        """Frame visualization with advanced features"""
+        """Frame visualization with advanced features (kare yerinde çizilir)"""
         
-        vis_frame = frame.copy()
+        vis_frame = frame
         
         # Pool area çiz
-        if self.pool_zones:
-            pool_zone = self.pool_zones[0]
-            cv2.polylines(vis_frame, [pool_zone.polygon], True, (0, 255, 255), 3)
-            
-            # Pool center
-            cv2.circle(vis_frame, pool_zone.center, 10, (0, 255, 255), -1)
-            cv2.putText(vis_frame, "POOL CENTER", 
-                       (pool_zone.center[0] + 15, pool_zone.center[1]), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        self.scene_layer.composite(vis_frame)
         
         # Detections çiz
         pool_count = 0
@@ -308,20 +313,14 @@ class IntegratedPoolTracker:
                 else:
                     color = (200, 0, 0)      # Düşük confidence - koyu mavi
             
-            # Bounding box
+            # Bounding box + info text + center point
             thickness = 3 if detection.in_pool else 2
-            cv2.rectangle(vis_frame, (x1, y1), (x2, y2), color, thickness)
-            
-            # Info text
             info_text = f"{detection.confidence:.2f}"
-            if detection.in_pool:
-                info_text += " POOL"
+            if detection.zone_id:
+                info_text += f" {detection.zone_name.upper()}"
             
-            cv2.putText(vis_frame, info_text, (x1, y1-10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-            
-            # Center point
-            cv2.circle(vis_frame, detection.center, 5, color, -1)
+            self.scene_layer.draw_box(vis_frame, (x1, y1, x2, y2), color, thickness,
+                                      label=info_text, center=detection.center)
         
         # Statistics panel
         self.draw_stats_panel(vis_frame, pool_count, outside_count)
@@ -331,15 +330,8 @@ class IntegratedPoolTracker:
     def draw_stats_panel(self, frame: np.ndarray, pool_count: int, outside_count: int):
         """İstatistik paneli çiz"""
         
-        # Panel background
-        panel_height = 150
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, 10), (500, panel_height), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-        
-        # Title
-        cv2.putText(frame, "INTEGRATED POOL TRACKER", 
-                   (20, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        # Panel background + title (önceden hazırlanmış)
+        self.hud_layer.composite(frame)
         
         # Statistics
         avg_fps = np.mean(self.fps_tracker) if self.fps_tracker else 0
@@ -353,16 +345,17 @@ class IntegratedPoolTracker:
             f"Avg Detections: {avg_detections:.1f}"
         ]
         
-        for i, text in enumerate(stats_text):
+        lines = []
+        for text in stats_text:
             if "Pool" in text:
                 color = (0, 255, 0)  # Yeşil
             elif "Outside" in text:
                 color = (255, 0, 0)  # Mavi
             else:
                 color = (255, 255, 255)  # Beyaz
-            
-            cv2.putText(frame, text, (20, 65 + i*18),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+            lines.append((text, color))
+        
+        self.hud_layer.draw_text_lines(frame, lines, (20, 65), 18, font_scale=0.5, thickness=1)
     
     def test_integrated_system(self, video_path: str, duration: int = 60):
         """Entegre sistemi test et"""
@@ -371,13 +364,9 @@ class IntegratedPoolTracker:
         print(f"📹 Video: {os.path.basename(video_path)}")
         print(f"⏱️ Duration: {duration} seconds")
         
-        # Pool area otomatik yükle
+        # Bölge haritası / pool area otomatik yükle
         video_name = os.path.basename(video_path)
-        pool_json = self.find_pool_json_for_video(video_name)
-        
-        if pool_json:
-            self.load_pool_area_from_json(pool_json)
-        else:
+        if not self.load_zones_for_video(video_name):
             print("⚠️ Pool area not found - using full frame")
         
         # Video aç
@@ -422,6 +411,12 @@ class IntegratedPoolTracker:
         cap.release()
         out.release()
         
+        # Öğrenilen bastırma haritasını sonraki çalıştırmalar için sakla
+        if self.suppression is not None and self.suppression_path:
+            self.suppression.save(self.suppression_path)
+            print(f"🧱 Suppression map: {self.suppression.suppressed_cells} cells "
+                  f"({os.path.basename(self.suppression_path)})")
+        
         # Final statistics
         total_detections = sum(self.detection_counts)
         avg_fps = np.mean(self.fps_tracker)
@@ -429,6 +424,7 @@ class IntegratedPoolTracker:
         print(f"\n✅ TEST COMPLETED!")
         print(f"📊 Processed frames: {self.frame_number}")
         print(f"🎯 Total detections: {total_detections}")
+        print(f"🧱 Suppressed static detections: {self.suppressed_count}")
         print(f"🚀 Average FPS: {avg_fps:.1f}")
         print(f"💾 Video saved: {output_path}")
         
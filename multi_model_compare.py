@@ -7,12 +7,16 @@ YENİ vs 8x vs best.pt karşılaştırması
 
 import cv2
 import os
+import sys
 import time
 import json
 import numpy as np
 from ultralytics import YOLO
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "1_CODES"))
+from video_module.overlay_renderer import OverlayRenderer
+
 class MultiModelCompare:
     def __init__(self):
         self.pool_polygon = None
@@ -50,8 +54,8 @@ class MultiModelCompare:
         result = cv2.pointPolygonTest(self.pool_polygon, (x, y), False)
         return result >= 0
     
-    def test_single_model(self, video_path, model_path, model_name, duration_seconds=120):
-        """Tek model testi"""
+    def test_single_model(self, video_path, model_path, model_name, duration_seconds=120, save_video=True):
+        """Tek model testi (save_video=False: çizim ve video kaydı yapılmaz)"""
         print(f"\n🤖 {model_name} TEST BAŞLIYOR...")
         
         # Model yükle
@@ -74,10 +78,24 @@ class MultiModelCompare:
         fps = cap.get(cv2.CAP_PROP_FPS)
         
         # Çıktı video
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = f"3_OUTPUT/COMPARE_{model_name}_{timestamp}.mp4"
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+        output_path = None
+        out = None
+        if save_video:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = f"3_OUTPUT/COMPARE_{model_name}_{timestamp}.mp4"
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+        
+        # Statik çizimler: havuz dolgusu/sınırı ve panel (bir kez hazırlanır)
+        pool_layer = OverlayRenderer(enabled=save_video)
+        if self.pool_polygon is not None:
+            pool_layer.add_polygon(self.pool_polygon, fill_color=(0, 255, 255), fill_alpha=0.25,  # %25 şeffaflık
+                                   outline_color=(0, 255, 255), outline_thickness=4)
+        
+        hud_layer = OverlayRenderer(enabled=save_video)
+        hud_layer.add_rectangle((10, 10), (700, 140), (0, 0, 0))  # Siyah arka plan
+        hud_layer.add_rectangle((10, 10), (700, 140), (255, 255, 255), thickness=3)  # Beyaz çerçeve
+        hud_layer.add_text(f"MODEL: {model_name}", (20, 45), (255, 255, 255), font_scale=1.2, thickness=3)
         
         # Sayaçlar
         start_time = time.time()
@@ -98,13 +116,6 @@ class MultiModelCompare:
             
             frame_count += 1
             
-            # Havuz alanını çiz - PARLAK SARI
-            if self.pool_polygon is not None:
-                cv2.polylines(frame, [self.pool_polygon], True, (0, 255, 255), 4)  # Kalın sarı çizgi
-                overlay = frame.copy()
-                cv2.fillPoly(overlay, [self.pool_polygon], (0, 255, 255))  # Sarı dolgu
-                cv2.addWeighted(overlay, 0.25, frame, 0.75, 0, frame)  # %25 şeffaflık
-            
             # HAVUZ İÇİ TESPİT (Çok düşük threshold)
             # YENİ_MODEL için tüm insan sınıfları (0,1,2), diğerleri için sadece 0
             if "drowning_detection" in model_path:
@@ -118,6 +129,9 @@ class MultiModelCompare:
             else:
                 outside_results = model(frame, conf=0.01, classes=[0], verbose=False)  # person
             
+            # Havuz alanını çiz - PARLAK SARI (tespitten sonra, model ham kareyi görür)
+            pool_layer.composite(frame)
+            
             # Havuz içi tespitleri işle
             frame_pool_count = 0
             for r in pool_results:
@@ -132,12 +146,10 @@ class MultiModelCompare:
                         if self.is_point_in_pool(center_x, center_y):
                             frame_pool_count += 1
                             pool_detections += 1
-                            # PARLAK YEŞİL kutu (havuz içi)
-                            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 4)  # Kalın yeşil
-                            cv2.putText(frame, f"POOL {conf:.2f}", (x1, y1-15), 
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 3)  # Kalın yazı
-                            # Merkez noktası
-                            cv2.circle(frame, (center_x, center_y), 6, (0, 255, 0), -1)
+                            # PARLAK YEŞİL kutu (havuz içi) + merkez noktası
+                            pool_layer.draw_box(frame, (x1, y1, x2, y2), (0, 255, 0), thickness=4,
+                                                label=f"POOL {conf:.2f}", label_scale=0.8, label_thickness=3,
+                                                label_offset=15, center=(center_x, center_y), center_radius=6)
             
             # Havuz dışı tespitleri işle
             frame_outside_count = 0
@@ -154,38 +166,34 @@ class MultiModelCompare:
                             frame_outside_count += 1
                             outside_detections += 1
                             # PARLAK KIRMIZI kutu (havuz dışı)
-                            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), 3)  # Kırmızı
-                            cv2.putText(frame, f"OUT {conf:.2f}", (x1, y1-15), 
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-                            cv2.circle(frame, (center_x, center_y), 4, (0, 0, 255), -1)
+                            pool_layer.draw_box(frame, (x1, y1, x2, y2), (0, 0, 255), thickness=3,
+                                                label=f"OUT {conf:.2f}", label_scale=0.7, label_offset=15,
+                                                center=(center_x, center_y), center_radius=4)
             
             # BÜYÜK BİLGİ PANELİ - SİYAH ARKA PLAN
             progress = (elapsed / duration_seconds) * 100
-            cv2.rectangle(frame, (10, 10), (700, 140), (0, 0, 0), -1)  # Siyah arka plan
-            cv2.rectangle(frame, (10, 10), (700, 140), (255, 255, 255), 3)  # Beyaz çerçeve
-            
-            # Model adı - BÜYÜK
-            cv2.putText(frame, f"MODEL: {model_name}", 
-                       (20, 45), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 255), 3)
+            hud_layer.composite(frame)  # Panel + model adı (BÜYÜK)
             
             # Anlık sayaçlar - RENKLI
-            cv2.putText(frame, f"Havuz Ici: {frame_pool_count} (conf>0.01)", 
-                       (20, 75), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-            cv2.putText(frame, f"Havuz Disi: {frame_outside_count} (conf>0.01)", 
-                       (20, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+            hud_layer.draw_text_lines(frame, [
+                (f"Havuz Ici: {frame_pool_count} (conf>0.01)", (0, 255, 0)),
+                (f"Havuz Disi: {frame_outside_count} (conf>0.01)", (0, 0, 255)),
+            ], (20, 75), 25, font_scale=0.8)
             
             # İlerleme çubuğu
-            cv2.putText(frame, f"Süre: {elapsed:.1f}s / {duration_seconds}s (%{progress:.0f})", 
-                       (20, 125), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
+            hud_layer.draw_text_lines(frame, [f"Süre: {elapsed:.1f}s / {duration_seconds}s (%{progress:.0f})"],
+                                      (20, 125), 0, color=(255, 255, 0), font_scale=0.7)
             
-            out.write(frame)
+            if out is not None:
+                out.write(frame)
             
             # İlerleme
             if frame_count % 20 == 0:  # Her saniyede
                 print(f"   ⏱️ {elapsed:.1f}s - Havuz: {pool_detections}, Dış: {outside_detections}")
         
         cap.release()
-        out.release()
+        if out is not None:
+            out.release()
         
         # Sonuçlar
         total_time = time.time() - start_time
@@ -207,7 +215,8 @@ class MultiModelCompare:
         print(f"   🏊 Havuz: {pool_detections}")
         print(f"   🚶 Dış: {outside_detections}")
         print(f"   🚀 FPS: {avg_fps:.1f}")
-        print(f"   💾 Video: {os.path.basename(output_path)}")
+        if output_path:
+            print(f"   💾 Video: {os.path.basename(output_path)}")
         
         return result
     
@@ -247,7 +256,7 @@ class MultiModelCompare:
             for r in results:
                 print(f"{r['model_name']:<12} {r['pool_detections']:<8} "
                       f"{r['outside_detections']:<8} {r['total_detections']:<8} "
-                      f"{r['fps']:<6.1f} {os.path.basename(r['video_path'])}")
+                      f"{r['fps']:<6.1f} {os.path.basename(r['video_path'] or '-')}")
             
             # EN İYİ SONUÇLAR
             best_pool = max(results, key=lambda x: x['pool_detections'])
@@ -6,39 +6,31 @@ Mevcut havuz alanı tanımlamalarını görsel olarak kontrol et
 """
 
 import cv2
-import json
 import os
+import sys
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "1_CODES"))
+from pool_module.pool_registry import get_registry
+
 class PoolAreaValidator:
     """Havuz alanı doğruluğunu kontrol eden araç"""
     
     def __init__(self):
         self.output_dir = "3_OUTPUT"
         self.data_dir = "0_DATA"
+        self.registry = get_registry(self.output_dir)
         
     def get_pool_files(self):
-        """Tüm pool area dosyalarını listele"""
-        pool_files = []
-        
-        if os.path.exists(self.output_dir):
-            for file in os.listdir(self.output_dir):
-                if file.startswith("pool_area_") and file.endswith(".json"):
-                    pool_files.append(file)
-        
-        return sorted(pool_files)
+        """Tüm pool area dosyalarını listele (registry indeksinden)"""
+        return [pool_area.file_name for pool_area in self.registry.all()]
     
     def load_pool_area(self, json_file):
-        """Pool area JSON dosyasını yükle"""
-        try:
-            json_path = os.path.join(self.output_dir, json_file)
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            return data
-        except Exception as e:
-            print(f"❌ Error loading {json_file}: {e}")
-            return None
+        """Derlenmiş pool area (PoolArea) döndür"""
+        pool_area = self.registry.load(os.path.join(self.output_dir, json_file))
+        if pool_area is None:
+            print(f"❌ Error loading {json_file}")
+        return pool_area
     
     def find_video_file(self, video_name):
         """Video dosyasını bul"""
@@ -71,13 +63,13 @@ class PoolAreaValidator:
         print("-" * 50)
         
         # Pool data yükle
-        pool_data = self.load_pool_area(json_file)
-        if not pool_data:
+        pool_area = self.load_pool_area(json_file)
+        if pool_area is None:
             return False
         
-        video_name = pool_data.get('video_name', '')
-        polygon_points = pool_data.get('polygon_points', [])
-        timestamp = pool_data.get('timestamp', '')
+        video_name = pool_area.video_name
+        polygon_points = pool_area.points
+        timestamp = pool_area.version
         
         print(f"📹 Video: {video_name}")
         print(f"📅 Created: {timestamp}")
@@ -108,7 +100,7 @@ class PoolAreaValidator:
         
         # Polygon çiz
         if polygon_points:
-            polygon = np.array(polygon_points, dtype=np.int32)
+            polygon = pool_area.polygon
             
             # Pool area'yı çiz
             overlay = frame.copy()
@@ -125,14 +117,13 @@ class PoolAreaValidator:
                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
             
             # Merkez point
-            center_x = int(np.mean([p[0] for p in polygon_points]))
-            center_y = int(np.mean([p[1] for p in polygon_points]))
+            center_x, center_y = pool_area.centroid
             cv2.circle(frame, (center_x, center_y), 10, (255, 0, 255), -1)
             cv2.putText(frame, "CENTER", (center_x+15, center_y+5),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 255), 2)
             
             # Area hesapla
-            area = cv2.contourArea(polygon)
+            area = pool_area.area
             
             # Info text
             info_text = [
@@ -218,12 +209,12 @@ class PoolAreaValidator:
         results = []
         
         for pool_file in pool_files:
-            pool_data = self.load_pool_area(pool_file)
-            if not pool_data:
+            pool_area = self.load_pool_area(pool_file)
+            if pool_area is None:
                 continue
             
-            video_name = pool_data.get('video_name', '')
-            polygon_points = pool_data.get('polygon_points', [])
+            video_name = pool_area.video_name
+            polygon_points = pool_area.points
             
             video_path = self.find_video_file(video_name)
             video_exists = video_path is not None
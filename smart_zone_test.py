@@ -7,12 +7,18 @@ Havuz içi/dışı farklı hassasiyet ile test
 
 import cv2
 import os
+import sys
 import time
 import json
 import numpy as np
 from ultralytics import YOLO
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "1_CODES"))
+from core.config import Output
+from output_manager.detection_log import DetectionLogWriter, detection_record
+from video_module.overlay_renderer import OverlayRenderer
+
 class SmartZoneTracker:
     def __init__(self):
         self.pool_polygon = None
@@ -191,8 +197,11 @@ class SmartZoneTracker:
         result = cv2.pointPolygonTest(self.pool_polygon, (x, y), False)
         return result >= 0
     
-    def smart_zone_test(self, video_path, model_path, duration_seconds=120):
-        """Akıllı zone test"""
+    def smart_zone_test(self, video_path, model_path, duration_seconds=120, render_video=None):
+        """Akıllı zone test (render_video=False: sadece analitik, video yazılmaz)"""
+        if render_video is None:
+            render_video = Output.RENDER_VIDEO
+        
         print(f"\n🏊 AKILLI ZONE TEST BAŞLIYOR")
         print(f"📹 Video: {video_path}")
         print(f"🤖 Model: {model_path}")
@@ -217,11 +226,30 @@ class SmartZoneTracker:
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         fps = cap.get(cv2.CAP_PROP_FPS)
         
-        # Çıktı video
+        # Çıktı video (analitik modda açılmaz)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = f"3_OUTPUT/SMART_ZONE_TEST_{timestamp}.mp4"
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+        output_path = None
+        out = None
+        if render_video:
+            output_path = f"3_OUTPUT/SMART_ZONE_TEST_{timestamp}.mp4"
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+        
+        # Tespit logu (her iki modda yazılır)
+        log_path = f"3_OUTPUT/SMART_ZONE_TEST_{timestamp}_{Output.DETECTION_LOG_NAME}"
+        detection_log = DetectionLogWriter(
+            log_path, video_path, fps, (width, height), pipeline="smart_zone_test",
+            model=os.path.basename(model_path),
+            pool_polygon=self.pool_polygon.tolist() if self.pool_polygon is not None else None
+        )
+        
+        # Statik çizimler: havuz dolgusu/sınırı + panel arka planı
+        pool_layer = OverlayRenderer(enabled=render_video)
+        if self.pool_polygon is not None:
+            pool_layer.add_polygon(self.pool_polygon, fill_color=(0, 255, 255), fill_alpha=0.2,
+                                   outline_color=(0, 255, 255), outline_thickness=3)
+        hud_layer = OverlayRenderer(enabled=render_video)
+        hud_layer.add_rectangle((10, 10), (600, 120), (0, 0, 0))
         
         # Sayaçlar
         start_time = time.time()
@@ -242,19 +270,16 @@ class SmartZoneTracker:
             
             frame_count += 1
             
-            # Havuz alanını çiz
-            if self.pool_polygon is not None:
-                cv2.polylines(frame, [self.pool_polygon], True, (0, 255, 255), 3)
-                overlay = frame.copy()
-                cv2.fillPoly(overlay, [self.pool_polygon], (0, 255, 255))
-                cv2.addWeighted(overlay, 0.2, frame, 0.8, 0, frame)
-            
             # HAVUZ İÇİ TESPİT (Yüksek hassasiyet)
             pool_results = model(frame, conf=0.15, classes=[0], verbose=False)
             
             # HAVUZ DIŞI TESPİT (Düşük hassasiyet)  
             outside_results = model(frame, conf=0.5, classes=[0], verbose=False)
             
+            # Havuz alanını çiz (tespitten sonra, model ham kareyi görür)
+            pool_layer.composite(frame)
+            frame_records = []
+            
             # Havuz içi tespitleri işle
             frame_pool_count = 0
             for r in pool_results:
@@ -269,10 +294,10 @@ class SmartZoneTracker:
                         if self.is_point_in_pool(center_x, center_y):
                             frame_pool_count += 1
                             pool_detections += 1
+                            frame_records.append(detection_record((x1, y1, x2, y2), conf, "person", in_pool=True))
                             # Yeşil kutu (havuz içi)
-                            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 3)
-                            cv2.putText(frame, f"POOL {conf:.2f}", (x1, y1-10), 
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                            pool_layer.draw_box(frame, (x1, y1, x2, y2), (0, 255, 0), 3,
+                                                label=f"POOL {conf:.2f}", label_scale=0.7)
             
             # Havuz dışı tespitleri işle
             frame_outside_count = 0
@@ -288,35 +313,44 @@ class SmartZoneTracker:
                         if not self.is_point_in_pool(center_x, center_y):
                             frame_outside_count += 1
                             outside_detections += 1
+                            frame_records.append(detection_record((x1, y1, x2, y2), conf, "person", in_pool=False))
                             # Mavi kutu (havuz dışı)
-                            cv2.rectangle(frame, (x1, y1), (x2, y2), (255, 0, 0), 2)
-                            cv2.putText(frame, f"OUT {conf:.2f}", (x1, y1-10), 
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
+                            pool_layer.draw_box(frame, (x1, y1, x2, y2), (255, 0, 0), 2,
+                                                label=f"OUT {conf:.2f}")
             
-            # Bilgi paneli
-            progress = (elapsed / duration_seconds) * 100
-            cv2.rectangle(frame, (10, 10), (600, 120), (0, 0, 0), -1)
-            cv2.putText(frame, f"SMART ZONE TEST | Kare: {frame_count} | %{progress:.1f}", 
-                       (15, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            cv2.putText(frame, f"Havuz Ici: {frame_pool_count} (conf>0.15) | Toplam: {pool_detections}", 
-                       (15, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-            cv2.putText(frame, f"Havuz Disi: {frame_outside_count} (conf>0.5) | Toplam: {outside_detections}", 
-                       (15, 85), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
-            cv2.putText(frame, f"Süre: {elapsed:.1f}s / {duration_seconds}s", 
-                       (15, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            detection_log.write_frame(frame_count - 1, (frame_count - 1) / fps, frame_records)
             
-            out.write(frame)
+            # Bilgi paneli
+            if render_video:
+                progress = (elapsed / duration_seconds) * 100
+                hud_layer.composite(frame)
+                hud_layer.draw_text_lines(frame, [f"SMART ZONE TEST | Kare: {frame_count} | %{progress:.1f}"],
+                                          (15, 35), 0, font_scale=0.7)
+                hud_layer.draw_text_lines(frame, [
+                    (f"Havuz Ici: {frame_pool_count} (conf>0.15) | Toplam: {pool_detections}", (0, 255, 0)),
+                    (f"Havuz Disi: {frame_outside_count} (conf>0.5) | Toplam: {outside_detections}", (255, 0, 0)),
+                    f"Süre: {elapsed:.1f}s / {duration_seconds}s",
+                ], (15, 60), 25)
+                
+                out.write(frame)
             
             # İlerleme
             if frame_count % 60 == 0:  # Her 2 saniyede
                 print(f"   ⏱️ {elapsed:.1f}s - Havuz İçi: {pool_detections}, Dışı: {outside_detections}")
         
         cap.release()
-        out.release()
+        if out is not None:
+            out.release()
         
         # Sonuçlar
         total_time = time.time() - start_time
         avg_fps = frame_count / total_time
+        detection_log.close(summary={
+            'elapsed': round(total_time, 2),
+            'avg_fps': round(avg_fps, 2),
+            'pool_detections': pool_detections,
+            'outside_detections': outside_detections,
+        })
         
         print(f"\n✅ SMART ZONE TEST TAMAMLANDI!")
         print(f"   ⏱️ Süre: {total_time:.1f} saniye")
@@ -324,7 +358,9 @@ class SmartZoneTracker:
         print(f"   🏊 Havuz İçi Tespit: {pool_detections} (conf>0.15)")
         print(f"   🚶 Havuz Dışı Tespit: {outside_detections} (conf>0.5)")
         print(f"   🚀 FPS: {avg_fps:.1f}")
-        print(f"   💾 Video: {output_path}")
+        if output_path:
+            print(f"   💾 Video: {output_path}")
+        print(f"   🧾 Tespit logu: {log_path}")
 
 def main():
     tracker = SmartZoneTracker()
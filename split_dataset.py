@@ -6,10 +6,15 @@ Büyük dataset'i GitHub'a upload edilebilir parçalara böler
 """
 
 import os
+import sys
 import shutil
 import math
 from pathlib import Path
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "1_CODES"))
+from dataset_module.dataset_index import DatasetIndex
+from dataset_module.materialize import materialize_pairs, print_materialize_result
+
 def split_dataset(source_dir, chunk_size_mb=400):
     """
     Dataset'i chunk'lara böl
@@ -23,27 +28,15 @@ def split_dataset(source_dir, chunk_size_mb=400):
     frames_dir = source_path / "01_frames"
     labels_dir = source_path / "02_labels"
     
-    # Tüm dosyaları listele ve boyutlarını hesapla
-    files_with_sizes = []
-    
-    for frame_file in frames_dir.glob("*.jpg"):
-        frame_name = frame_file.stem
-        label_file = labels_dir / f"{frame_name}.txt"
-        
-        if label_file.exists():
-            frame_size = frame_file.stat().st_size
-            label_size = label_file.stat().st_size
-            total_size = frame_size + label_size
-            
-            files_with_sizes.append({
-                'name': frame_name,
-                'frame_path': frame_file,
-                'label_path': label_file,
-                'size': total_size
-            })
-    
-    # Dosyaları boyuta göre sırala
-    files_with_sizes.sort(key=lambda x: x['size'], reverse=True)
+    # Dosya çiftleri ve boyutları indeksten (büyükten küçüğe sıralı)
+    with DatasetIndex(source_path) as index:
+        index.refresh()
+        files_with_sizes = [{
+            'name': row['stem'],
+            'frame_path': frames_dir / row['file_name'],
+            'label_path': labels_dir / f"{row['stem']}.txt",
+            'size': row['frame_size'] + row['label_size']
+        } for row in index.frames(labeled_only=True, order_by='pair_size')]
     
     print(f"📊 Toplam dosya çifti: {len(files_with_sizes)}")
     total_size = sum(f['size'] for f in files_with_sizes)
@@ -82,16 +75,11 @@ def split_dataset(source_dir, chunk_size_mb=400):
         chunk_frames = chunk_dir / "01_frames"
         chunk_labels = chunk_dir / "02_labels"
         
-        chunk_frames.mkdir(parents=True, exist_ok=True)
-        chunk_labels.mkdir(parents=True, exist_ok=True)
-        
-        chunk_size = 0
-        for file_info in chunk:
-            # Frame kopyala
-            shutil.copy2(file_info['frame_path'], chunk_frames / file_info['frame_path'].name)
-            # Label kopyala  
-            shutil.copy2(file_info['label_path'], chunk_labels / file_info['label_path'].name)
-            chunk_size += file_info['size']
+        # Frame'ler hardlink/reflink ile (gerekirse kopya), label'lar kopya
+        pairs = [(f['frame_path'].name, f['label_path'].name) for f in chunk]
+        result = materialize_pairs(pairs, frames_dir, labels_dir, chunk_frames, chunk_labels)
+        print_materialize_result(result, f"Chunk {i:02d}")
+        chunk_size = sum(f['size'] for f in chunk)
         
         # Classes dosyasını her chunk'a kopyala
         classes_file = source_path / "classes.txt"